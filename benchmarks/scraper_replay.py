@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬蟲離線重放基準測試
+以錄製的 HTTP / Playwright 回應重放每個網站的爬取流程，
+報告每秒頁數、每秒職位數、CPU 時間與峰值記憶體
+
+用法:
+    # 首次錄製（需要網路）
+    python benchmarks/scraper_replay.py record --sites indeed linkedin
+
+    # 離線重放，每個請求注入 50ms 延遲，重複 3 次取中位數
+    python benchmarks/scraper_replay.py run --latency 0.05 --repeat 3
+
+每個網站在獨立子進程中執行，峰值記憶體互不影響。
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 添加項目根目錄到 Python 路徑
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+CASSETTE_DIR = Path(__file__).parent / 'cassettes'
+
+# 每個網站的錄製情境
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'indeed': {'search_term': 'python developer', 'location': 'San Francisco, CA', 'results_wanted': 50},
+    'linkedin': {'search_term': 'python developer', 'location': 'San Francisco, CA', 'results_wanted': 25},
+    'zip_recruiter': {'search_term': 'python developer', 'location': 'San Francisco, CA', 'results_wanted': 25},
+    'glassdoor': {'search_term': 'python developer', 'location': 'San Francisco, CA', 'results_wanted': 25},
+    'google': {'search_term': 'python developer', 'google_search_term': 'python developer jobs near San Francisco',
+               'results_wanted': 20},
+    'bayt': {'search_term': 'python developer', 'results_wanted': 20},
+    'naukri': {'search_term': 'python developer', 'location': 'Bangalore', 'results_wanted': 20},
+    'bdjobs': {'search_term': 'python', 'results_wanted': 20},
+    'seek': {'search_term': 'python developer', 'location': 'Sydney', 'results_wanted': 20},
+    '104': {'search_term': 'python', 'location': '台北', 'results_wanted': 20},
+    '1111': {'search_term': 'python', 'location': '台北', 'results_wanted': 20},
+}
+
+# 時間戳等每次請求都會改變的查詢參數
+IGNORED_PARAMS = ('_', 'timestamp', 'ts', 'cb', 'rnd')
+
+
+def _peak_rss_mb() -> float:
+    """目前進程的峰值常駐記憶體（MB）"""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 單位為 KB，macOS 為位元組
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+
+
+def cassette_path(site: str) -> Path:
+    return CASSETTE_DIR / f'{site}.json'
+
+
+def run_site(site: str, mode: str, latency: float = 0.0, jitter: float = 0.0) -> Dict[str, Any]:
+    """在目前進程中錄製或重放單一網站，返回量測結果"""
+    from jobseeker import scrape_jobs
+    from jobseeker.http_replay import use_cassette
+
+    scenario = SCENARIOS[site]
+    with use_cassette(cassette_path(site), mode=mode, latency=latency, jitter=jitter,
+                      ignore_params=IGNORED_PARAMS) as cassette:
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        error = None
+        try:
+            jobs = len(scrape_jobs(site_name=site, verbose=0, **scenario))
+        except Exception as e:
+            jobs = 0
+            error = f'{type(e).__name__}: {e}'
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+    pages = cassette.stats['replayed'] if mode == 'replay' else cassette.stats['recorded']
+    return {
+        'site': site,
+        'mode': mode,
+        'pages': pages,
+        'jobs': jobs,
+        'misses': cassette.stats['misses'],
+        'bytes': cassette.stats['bytes'],
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'pages_per_sec': pages / wall if wall > 0 else 0.0,
+        'jobs_per_sec': jobs / wall if wall > 0 else 0.0,
+        'peak_rss_mb': _peak_rss_mb(),
+        'error': error
+    }
+
+
+def run_in_subprocess(site: str, mode: str, latency: float, jitter: float) -> Dict[str, Any]:
+    """在子進程中執行，避免網站之間共用峰值記憶體與導入快取"""
+    command = [
+        sys.executable, str(Path(__file__).resolve()), 'worker', site,
+        '--mode', mode, '--latency', str(latency), '--jitter', str(jitter)
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    return {'site': site, 'mode': mode, 'error': completed.stderr.strip().splitlines()[-1:] or ['子進程無輸出']}
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """多次執行取中位數（峰值記憶體取最大值）"""
+    ok_runs = [run for run in runs if not run.get('error')]
+    if not ok_runs:
+        return runs[-1]
+    summary = dict(ok_runs[0])
+    for key in ('wall_seconds', 'cpu_seconds', 'pages_per_sec', 'jobs_per_sec'):
+        summary[key] = statistics.median(run[key] for run in ok_runs)
+    summary['peak_rss_mb'] = max(run['peak_rss_mb'] for run in ok_runs)
+    summary['repeat'] = len(ok_runs)
+    return summary
+
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'網站':<14}{'頁數':>6}{'職位':>6}{'頁/秒':>10}{'職位/秒':>10}{'CPU秒':>9}{'峰值MB':>9}  備註"
+    print(header)
+    print('-' * len(header.encode('utf-8')))
+    for result in results:
+        if 'pages' not in result:
+            print(f"{result['site']:<14}{'':>50}  {result.get('error')}")
+            continue
+        note = result.get('error') or (f"未命中 {result['misses']}" if result['misses'] else '')
+        print(f"{result['site']:<14}{result['pages']:>6}{result['jobs']:>6}"
+              f"{result['pages_per_sec']:>10.1f}{result['jobs_per_sec']:>10.1f}"
+              f"{result['cpu_seconds']:>9.2f}{result['peak_rss_mb']:>9.1f}  {note}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='爬蟲離線重放基準測試')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='連線錄製卡帶')
+    record_parser.add_argument('--sites', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+
+    run_parser = subparsers.add_parser('run', help='離線重放並量測')
+    run_parser.add_argument('--sites', nargs='+', choices=list(SCENARIOS),
+                            help='預設為所有已錄製的網站')
+    run_parser.add_argument('--latency', type=float, default=0.0, help='每個請求注入的延遲（秒）')
+    run_parser.add_argument('--jitter', type=float, default=0.0, help='延遲抖動上限（秒）')
+    run_parser.add_argument('--repeat', type=int, default=1, help='重複次數（取中位數）')
+    run_parser.add_argument('--json', dest='json_path', help='將結果寫入 JSON 檔案')
+
+    worker_parser = subparsers.add_parser('worker', help=argparse.SUPPRESS)
+    worker_parser.add_argument('site', choices=list(SCENARIOS))
+    worker_parser.add_argument('--mode', default='replay')
+    worker_parser.add_argument('--latency', type=float, default=0.0)
+    worker_parser.add_argument('--jitter', type=float, default=0.0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        print(json.dumps(run_site(args.site, args.mode, args.latency, args.jitter), ensure_ascii=False))
+        return
+
+    if args.command == 'record':
+        results = [run_in_subprocess(site, 'record', 0.0, 0.0) for site in args.sites]
+        print_table(results)
+        return
+
+    sites = args.sites or [site for site in SCENARIOS if cassette_path(site).exists()]
+    if not sites:
+        print(f'{CASSETTE_DIR} 中沒有卡帶，請先執行 record')
+        return
+    results = [
+        summarize([run_in_subprocess(site, 'replay', args.latency, args.jitter) for _ in range(args.repeat)])
+        for site in sites
+    ]
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,11 +9,12 @@ Date: 2025-01-27
 """
 
 import asyncio
+import functools
 import json
 import logging
 import hashlib
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
@@ -22,7 +23,8 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, Future
 import uuid
 import statistics
-from collections import defaultdict, Counter
+import re
+from collections import defaultdict, deque, Counter
 
 try:
     import redis
@@ -38,11 +40,28 @@ except ImportError:
     PANDAS_AVAILABLE = False
     print("Pandas not available, using basic data analysis")
 
+from jobseeker.cpu_executor import CPUExecutor, SharedBatch, get_cpu_executor, load_batch
+from jobseeker.quality_accumulators import DateHistogram, DistinctCounter
 from task_tracking_service import TaskTrackingService
 from error_handling_manager import ErrorHandlingManager, ErrorInfo, ErrorSeverity, ErrorCategory
 from notification_service import NotificationService, NotificationType, NotificationPriority
 
 
+# 重複檢測阻斷鍵：公司名稱去除法律後綴，標題去除職級詞後取首個詞的前綴
+_BLOCK_TOKEN_PATTERN = re.compile(r'\w+')
+_COMPANY_SUFFIXES = frozenset({
+    'inc', 'ltd', 'llc', 'co', 'corp', 'corporation', 'company', 'limited', 'pty', 'plc', 'gmbh', 'group'
+})
+_TITLE_STOPWORDS = frozenset({
+    'senior', 'sr', 'junior', 'jr', 'lead', 'principal', 'staff', 'head', 'chief', 'intern',
+    'the', 'a', 'an', 'of', 'and', 'for'
+})
+_TITLE_PREFIX_LENGTH = 4
+
+# 相似度比較的欄位
+_SIMILARITY_FIELDS = ('title', 'company', 'location', 'description')
+
+
 class DataQualityLevel(Enum):
     """數據質量等級"""
     EXCELLENT = "excellent"  # 95%+
@@ -126,6 +145,144 @@ class PlatformDataSummary:
     field_quality: Dict[str, float] = field(default_factory=dict)
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_posted_date(value: str) -> Optional[date]:
+    """解析 YYYY-MM-DD 發布日期（同一字串只解析一次），無法解析時返回 None"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+class PlatformQualityAccumulator:
+    """
+    單一平台的可合併品質統計
+    
+    每筆職位只掃描一次，字段覆蓋、類型與格式檢查、一致性、唯一性與發布日期
+    都折疊成計數；新的一頁或一個平台批次到達時直接累加，不同檢查的結果也可合併
+    """
+    
+    # 及時性分桶：(最多天數, 分數)
+    TIMELINESS_BUCKETS = ((1, 1.0), (7, 0.8), (30, 0.6), (90, 0.4))
+    TIMELINESS_OLDER = 0.2
+    TIMELINESS_UNPARSEABLE = 0.5  # 無法解析的日期給中等分數
+    
+    def __init__(self, platform: str, schema: Optional[Dict[str, Any]] = None):
+        self.platform = platform
+        self.schema = schema or {}
+        self.total_jobs = 0
+        self.valid_jobs = 0
+        self.field_coverage: Dict[str, int] = defaultdict(int)
+        self.field_quality_sum: Dict[str, float] = defaultdict(float)
+        self.field_quality_count: Dict[str, int] = defaultdict(int)
+        self.consistency_sum = 0.0
+        self.consistency_count = 0
+        self.signatures = DistinctCounter()
+        self.posted_dates = DateHistogram()
+    
+    def _score_field(self, field_name: str, score: float):
+        self.field_quality_sum[field_name] += score
+        self.field_quality_count[field_name] += 1
+    
+    def add(self, job: Dict[str, Any], signature: str):
+        """折疊一筆職位"""
+        self.total_jobs += 1
+        is_valid = True
+        job_score = 0.0
+        job_checks = 0
+        
+        # 檢查必需字段
+        for field_name in self.schema.get('required_fields', ()):
+            value = job.get(field_name)
+            score = 1.0 if value is not None and str(value).strip() else 0.0
+            if score:
+                self.field_coverage[field_name] += 1
+            else:
+                is_valid = False
+            self._score_field(field_name, score)
+            job_score += score
+            job_checks += 1
+        
+        # 檢查字段類型
+        for field_name, expected_type in self.schema.get('field_types', {}).items():
+            value = job.get(field_name)
+            if value is not None:
+                score = 1.0 if isinstance(value, expected_type) else 0.5
+                is_valid = is_valid and score == 1.0
+                self._score_field(field_name, score)
+                job_score += score
+                job_checks += 1
+        
+        # 檢查字段格式
+        for field_name, pattern in self.schema.get('field_formats', {}).items():
+            value = job.get(field_name)
+            if value is not None:
+                score = 1.0 if re.match(pattern, str(value)) else 0.5
+                is_valid = is_valid and score == 1.0
+                self._score_field(field_name, score)
+                job_score += score
+                job_checks += 1
+        
+        if is_valid:
+            self.valid_jobs += 1
+        if self.schema:
+            self.consistency_sum += job_score / job_checks if job_checks else 0.0
+            self.consistency_count += 1
+        self.signatures.add(signature)
+        
+        # 只有字串日期參與及時性計算
+        date_posted = job.get('date_posted')
+        if date_posted and isinstance(date_posted, str):
+            parsed = _parse_posted_date(date_posted)
+            if parsed is None:
+                self.posted_dates.add_unparseable()
+            else:
+                self.posted_dates.add_date(parsed)
+    
+    def merge(self, other: 'PlatformQualityAccumulator'):
+        """合併另一批次（同一平台）的統計"""
+        self.total_jobs += other.total_jobs
+        self.valid_jobs += other.valid_jobs
+        for field_name, count in other.field_coverage.items():
+            self.field_coverage[field_name] += count
+        for field_name, total in other.field_quality_sum.items():
+            self.field_quality_sum[field_name] += total
+            self.field_quality_count[field_name] += other.field_quality_count[field_name]
+        self.consistency_sum += other.consistency_sum
+        self.consistency_count += other.consistency_count
+        self.signatures.merge(other.signatures)
+        self.posted_dates.merge(other.posted_dates)
+    
+    @property
+    def unique_jobs(self) -> int:
+        # HyperLogLog 估計值可能略高於實際筆數
+        return min(len(self.signatures), self.total_jobs)
+    
+    @property
+    def duplicate_jobs(self) -> int:
+        return self.total_jobs - self.unique_jobs
+    
+    def coverage_ratios(self) -> Dict[str, float]:
+        if not self.total_jobs:
+            return {}
+        return {field_name: count / self.total_jobs for field_name, count in self.field_coverage.items() if count}
+    
+    def quality_means(self) -> Dict[str, float]:
+        return {
+            field_name: self.field_quality_sum[field_name] / count
+            for field_name, count in self.field_quality_count.items() if count
+        }
+    
+    def consistency_score(self) -> float:
+        return self.consistency_sum / self.consistency_count if self.consistency_count else 0.0
+    
+    def timeliness_score(self, today: Optional[date] = None) -> float:
+        return self.posted_dates.mean_score(
+            today or datetime.now().date(), self.TIMELINESS_BUCKETS, self.TIMELINESS_OLDER,
+            unparseable_score=self.TIMELINESS_UNPARSEABLE
+        )
+
+
 @dataclass
 class IntegrityCheckResult:
     """完整性檢查結果"""
@@ -181,6 +338,7 @@ class IntegrityCheckConfig:
     # 聚合設置
     aggregation_strategy: AggregationStrategy = AggregationStrategy.DEDUPLICATE_SMART
     duplicate_threshold: float = 0.85        # 重複判定閾值
+    duplicate_block_max_candidates: int = 200  # 同一阻斷塊內最多比較的候選職位數
     quality_weight: float = 0.3              # 質量權重
     
     # 驗證規則
@@ -201,6 +359,10 @@ class IntegrityCheckConfig:
     # 並發設置
     max_concurrent_checks: int = 5
     max_workers: int = 10
+    
+    # 進程池設置（平台分析是純 CPU 工作，線程池中會被 GIL 串行化）
+    use_process_pool: bool = True
+    process_pool_min_jobs: int = 2000        # 職位總數達到此值才交給工作進程
 
 
 class EnhancedDataIntegrityChecker:
@@ -211,9 +373,11 @@ class EnhancedDataIntegrityChecker:
                  task_tracker: Optional[TaskTrackingService] = None,
                  error_handler: Optional[ErrorHandlingManager] = None,
                  notification_service: Optional[NotificationService] = None,
-                 redis_url: str = "redis://localhost:6379/5"):
+                 redis_url: str = "redis://localhost:6379/5",
+                 cpu_executor: Optional[CPUExecutor] = None):
         """初始化數據完整性檢查器"""
         self.config = config or IntegrityCheckConfig()
+        self.cpu_executor = cpu_executor
         self.task_tracker = task_tracker
         self.error_handler = error_handler
         self.notification_service = notification_service
@@ -228,10 +392,16 @@ class EnhancedDataIntegrityChecker:
         self.platform_schemas: Dict[str, Dict[str, Any]] = {}
         self.quality_history: List[DataQualityMetrics] = []
         
-        # 處理隊列
+        # 各平台跨檢查的累計品質統計（每批折疊，不重新掃描）
+        self.platform_accumulators: Dict[str, PlatformQualityAccumulator] = {}
+        self.accumulator_lock = threading.Lock()
+        
+        # 處理隊列（提交與完成時喚醒處理循環，不輪詢）
         self.check_queue: List[str] = []  # job_ids
         self.processing_jobs: Set[str] = set()
+        self.pending_checks: Dict[str, deque] = {}  # job_id -> 待處理的 check_id
         self.queue_lock = threading.Lock()
+        self.queue_condition = threading.Condition(self.queue_lock)
         
         # 統計信息
         self.stats = {
@@ -435,9 +605,11 @@ class EnhancedDataIntegrityChecker:
                 self.redis_client.expire(f"platform_data:{job_id}", 86400)  # 24小時過期
             
             # 添加到處理隊列
-            with self.queue_lock:
+            with self.queue_condition:
+                self.pending_checks.setdefault(job_id, deque()).append(check_result.check_id)
                 if job_id not in self.check_queue and job_id not in self.processing_jobs:
                     self.check_queue.append(job_id)
+                    self.queue_condition.notify()
             
             logging.info(f"已提交完整性檢查: {job_id} -> {check_result.check_id}")
             return check_result.check_id
@@ -470,38 +642,48 @@ class EnhancedDataIntegrityChecker:
         """檢查處理循環"""
         while not self.shutdown_event.is_set():
             try:
-                jobs_to_process = []
-                
-                # 獲取待處理任務
-                with self.queue_lock:
+                # 等待有任務且有空閒名額（提交、完成與關閉都會喚醒）
+                with self.queue_condition:
+                    while not self.shutdown_event.is_set() and not self._has_queued_work():
+                        self.queue_condition.wait()
+                    if self.shutdown_event.is_set():
+                        break
+                    
                     available_slots = self.config.max_concurrent_checks - len(self.processing_jobs)
-                    if available_slots > 0 and self.check_queue:
-                        jobs_to_process = self.check_queue[:available_slots]
-                        for job_id in jobs_to_process:
-                            self.check_queue.remove(job_id)
-                            self.processing_jobs.add(job_id)
+                    jobs_to_process = self.check_queue[:available_slots]
+                    del self.check_queue[:available_slots]
+                    self.processing_jobs.update(jobs_to_process)
                 
                 # 處理任務
                 for job_id in jobs_to_process:
                     self.executor.submit(self._process_integrity_check, job_id)
                 
-                # 等待下一次處理
-                if not jobs_to_process:
-                    self.shutdown_event.wait(1)
-                
             except Exception as e:
                 logging.error(f"檢查處理循環錯誤: {e}")
                 self.shutdown_event.wait(5)
     
+    def _has_queued_work(self) -> bool:
+        return bool(self.check_queue) and len(self.processing_jobs) < self.config.max_concurrent_checks
+    
+    def _pop_pending_check(self, job_id: str) -> Optional[IntegrityCheckResult]:
+        """從 job_id 索引取出最早提交、仍待處理的檢查結果"""
+        with self.queue_lock:
+            pending = self.pending_checks.get(job_id)
+            check_result = None
+            while pending and check_result is None:
+                result = self.check_results.get(pending.popleft())
+                if result is not None and result.status == "pending":
+                    check_result = result
+            if not pending:
+                self.pending_checks.pop(job_id, None)
+        return check_result
+    
     def _process_integrity_check(self, job_id: str):
         """處理完整性檢查"""
+        check_result = None
         try:
             # 找到對應的檢查結果
-            check_result = None
-            for result in self.check_results.values():
-                if result.job_id == job_id and result.status == "pending":
-                    check_result = result
-                    break
+            check_result = self._pop_pending_check(job_id)
             
             if not check_result:
                 logging.warning(f"找不到待處理的檢查結果: {job_id}")
@@ -545,9 +727,12 @@ class EnhancedDataIntegrityChecker:
                 check_result.issues.append(f"處理錯誤: {str(e)}")
         
         finally:
-            # 從處理集合中移除
-            with self.queue_lock:
+            # 從處理集合中移除；處理期間同一任務又有新提交時重新排隊
+            with self.queue_condition:
                 self.processing_jobs.discard(job_id)
+                if self.pending_checks.get(job_id) and job_id not in self.check_queue:
+                    self.check_queue.append(job_id)
+                self.queue_condition.notify()
     
     def _load_platform_data(self, job_id: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
         """加載平台數據"""
@@ -577,14 +762,21 @@ class EnhancedDataIntegrityChecker:
         """執行完整性檢查"""
         try:
             # 為每個平台創建摘要
-            for platform, jobs in platform_data.items():
-                summary = PlatformDataSummary(platform=platform)
-                summary.total_jobs = len(jobs)
-                
-                # 執行平台特定檢查
-                self._analyze_platform_data(summary, jobs)
-                
+            total_jobs = sum(len(jobs) for jobs in platform_data.values())
+            if self.config.use_process_pool and total_jobs >= self.config.process_pool_min_jobs:
+                analyzed = self._analyze_platforms_in_processes(platform_data)
+            else:
+                analyzed = {}
+                for platform, jobs in platform_data.items():
+                    summary = PlatformDataSummary(platform=platform)
+                    summary.total_jobs = len(jobs)
+                    
+                    # 執行平台特定檢查
+                    analyzed[platform] = (summary, self._analyze_platform_data(summary, jobs))
+            
+            for platform, (summary, accumulator) in analyzed.items():
                 check_result.platform_summaries[platform] = summary
+                self._merge_platform_accumulator(accumulator)
             
             # 執行啟用的檢查
             for check_type in self.config.enabled_checks:
@@ -598,88 +790,88 @@ class EnhancedDataIntegrityChecker:
             logging.error(f"執行完整性檢查失敗: {e}")
             check_result.issues.append(f"檢查執行錯誤: {str(e)}")
     
-    def _analyze_platform_data(self, summary: PlatformDataSummary, jobs: List[Dict[str, Any]]):
-        """分析平台數據"""
+    def _analyze_platforms_in_processes(self, platform_data: Dict[str, List[Dict[str, Any]]]
+                                        ) -> Dict[str, Tuple[PlatformDataSummary, Optional[PlatformQualityAccumulator]]]:
+        """各平台數據放入共享記憶體，在 CPU 工作進程中並行分析"""
+        executor = self.cpu_executor or get_cpu_executor()
+        batches = {platform: SharedBatch.from_records(jobs) for platform, jobs in platform_data.items()}
+        try:
+            futures = {
+                platform: executor.submit(
+                    _analyze_platform_task, platform,
+                    self.platform_schemas.get(platform, {}), batch.handle
+                )
+                for platform, batch in batches.items()
+            }
+            return {platform: future.result() for platform, future in futures.items()}
+        finally:
+            for batch in batches.values():
+                batch.close()
+    
+    def _analyze_platform_data(self, summary: PlatformDataSummary,
+                               jobs: List[Dict[str, Any]]) -> Optional[PlatformQualityAccumulator]:
+        """分析平台數據（單次掃描折疊成累加器），返回此批次的累加器"""
         try:
             start_time = time.time()
             
-            # 獲取平台模式
-            schema = self.platform_schemas.get(summary.platform, {})
-            required_fields = schema.get('required_fields', set())
-            field_types = schema.get('field_types', {})
-            field_formats = schema.get('field_formats', {})
-            
-            valid_jobs = 0
-            duplicate_jobs = 0
-            field_coverage = defaultdict(int)
-            field_quality = defaultdict(list)
-            
-            # 重複檢測
-            job_signatures = set()
-            
+            accumulator = PlatformQualityAccumulator(summary.platform, self.platform_schemas.get(summary.platform, {}))
             for job in jobs:
-                is_valid = True
-                
-                # 檢查必需字段
-                for field in required_fields:
-                    if field in job and job[field] is not None and str(job[field]).strip():
-                        field_coverage[field] += 1
-                        field_quality[field].append(1.0)
-                    else:
-                        field_quality[field].append(0.0)
-                        is_valid = False
-                
-                # 檢查字段類型
-                for field, expected_type in field_types.items():
-                    if field in job and job[field] is not None:
-                        if isinstance(job[field], expected_type):
-                            field_quality[field].append(1.0)
-                        else:
-                            field_quality[field].append(0.5)
-                            is_valid = False
-                
-                # 檢查字段格式
-                import re
-                for field, pattern in field_formats.items():
-                    if field in job and job[field] is not None:
-                        if re.match(pattern, str(job[field])):
-                            field_quality[field].append(1.0)
-                        else:
-                            field_quality[field].append(0.5)
-                            is_valid = False
-                
-                # 重複檢測
-                job_signature = self._generate_job_signature(job)
-                if job_signature in job_signatures:
-                    duplicate_jobs += 1
-                else:
-                    job_signatures.add(job_signature)
-                
-                if is_valid:
-                    valid_jobs += 1
+                accumulator.add(job, self._generate_job_signature(job))
             
-            # 更新摘要
-            summary.valid_jobs = valid_jobs
-            summary.duplicate_jobs = duplicate_jobs
-            summary.unique_jobs = len(job_signatures)
+            self._fill_platform_summary(summary, accumulator)
             summary.processing_time = time.time() - start_time
-            
-            # 計算字段覆蓋率和質量
-            total_jobs = len(jobs)
-            if total_jobs > 0:
-                for field, count in field_coverage.items():
-                    summary.field_coverage[field] = count / total_jobs
-                
-                for field, scores in field_quality.items():
-                    if scores:
-                        summary.field_quality[field] = statistics.mean(scores)
-            
-            # 計算數據質量指標
-            summary.data_quality = self._calculate_data_quality_metrics(summary, jobs)
+            return accumulator
             
         except Exception as e:
             logging.error(f"分析平台數據失敗: {e}")
             summary.errors.append(str(e))
+            return None
+    
+    def _fill_platform_summary(self, summary: PlatformDataSummary, accumulator: PlatformQualityAccumulator):
+        """由累加器填寫平台摘要"""
+        summary.total_jobs = accumulator.total_jobs
+        summary.valid_jobs = accumulator.valid_jobs
+        summary.unique_jobs = accumulator.unique_jobs
+        summary.duplicate_jobs = accumulator.duplicate_jobs
+        
+        # 計算字段覆蓋率和質量
+        summary.field_coverage = accumulator.coverage_ratios()
+        summary.field_quality = accumulator.quality_means()
+        
+        # 計算數據質量指標
+        summary.data_quality = self._calculate_data_quality_metrics(summary, accumulator)
+    
+    def _merge_platform_accumulator(self, accumulator: Optional[PlatformQualityAccumulator]):
+        """將一次檢查的平台統計併入累計統計"""
+        if accumulator is None:
+            return
+        with self.accumulator_lock:
+            running = self.platform_accumulators.get(accumulator.platform)
+            if running is None:
+                running = PlatformQualityAccumulator(accumulator.platform, accumulator.schema)
+                self.platform_accumulators[accumulator.platform] = running
+            running.merge(accumulator)
+    
+    def fold_platform_batch(self, platform: str, jobs: List[Dict[str, Any]]) -> PlatformDataSummary:
+        """
+        將新到達的一頁或一批職位併入平台的累計統計
+        
+        只掃描這一批，返回的摘要反映該平台至今所有批次
+        """
+        summary = PlatformDataSummary(platform=platform)
+        accumulator = self._analyze_platform_data(summary, jobs)
+        self._merge_platform_accumulator(accumulator)
+        return self.get_platform_summary(platform) or summary
+    
+    def get_platform_summary(self, platform: str) -> Optional[PlatformDataSummary]:
+        """獲取平台累計統計的摘要（不重新掃描數據）"""
+        with self.accumulator_lock:
+            accumulator = self.platform_accumulators.get(platform)
+            if accumulator is None:
+                return None
+            summary = PlatformDataSummary(platform=platform)
+            self._fill_platform_summary(summary, accumulator)
+        return summary
     
     def _generate_job_signature(self, job: Dict[str, Any]) -> str:
         """生成職位簽名用於重複檢測"""
@@ -704,11 +896,12 @@ class EnhancedDataIntegrityChecker:
             logging.warning(f"生成職位簽名失敗: {e}")
             return str(uuid.uuid4())
     
-    def _calculate_data_quality_metrics(self, summary: PlatformDataSummary, jobs: List[Dict[str, Any]]) -> DataQualityMetrics:
-        """計算數據質量指標"""
+    def _calculate_data_quality_metrics(self, summary: PlatformDataSummary,
+                                        accumulator: PlatformQualityAccumulator) -> DataQualityMetrics:
+        """計算數據質量指標（讀取累加器，不重新掃描職位）"""
         try:
             metrics = DataQualityMetrics()
-            total_jobs = len(jobs)
+            total_jobs = accumulator.total_jobs
             
             if total_jobs == 0:
                 return metrics
@@ -722,24 +915,16 @@ class EnhancedDataIntegrityChecker:
                 metrics.accuracy_score = statistics.mean(summary.field_quality.values())
             
             # 唯一性分數
-            metrics.uniqueness_score = summary.unique_jobs / total_jobs if total_jobs > 0 else 0
+            metrics.uniqueness_score = summary.unique_jobs / total_jobs
             
             # 有效性分數
-            metrics.validity_score = summary.valid_jobs / total_jobs if total_jobs > 0 else 0
+            metrics.validity_score = summary.valid_jobs / total_jobs
             
             # 一致性分數（基於模式匹配）
-            schema = self.platform_schemas.get(summary.platform, {})
-            if schema:
-                consistency_scores = []
-                for job in jobs:
-                    job_score = self._calculate_job_consistency_score(job, schema)
-                    consistency_scores.append(job_score)
-                
-                if consistency_scores:
-                    metrics.consistency_score = statistics.mean(consistency_scores)
+            metrics.consistency_score = accumulator.consistency_score()
             
             # 及時性分數（基於數據新鮮度）
-            metrics.timeliness_score = self._calculate_timeliness_score(jobs)
+            metrics.timeliness_score = accumulator.timeliness_score()
             
             # 總體分數
             scores = [
@@ -775,91 +960,6 @@ class EnhancedDataIntegrityChecker:
             logging.error(f"計算數據質量指標失敗: {e}")
             return DataQualityMetrics()
     
-    def _calculate_job_consistency_score(self, job: Dict[str, Any], schema: Dict[str, Any]) -> float:
-        """計算單個職位的一致性分數"""
-        try:
-            score = 0.0
-            total_checks = 0
-            
-            # 檢查必需字段
-            required_fields = schema.get('required_fields', set())
-            for field in required_fields:
-                total_checks += 1
-                if field in job and job[field] is not None and str(job[field]).strip():
-                    score += 1.0
-            
-            # 檢查字段類型
-            field_types = schema.get('field_types', {})
-            for field, expected_type in field_types.items():
-                if field in job and job[field] is not None:
-                    total_checks += 1
-                    if isinstance(job[field], expected_type):
-                        score += 1.0
-                    else:
-                        score += 0.5
-            
-            # 檢查字段格式
-            import re
-            field_formats = schema.get('field_formats', {})
-            for field, pattern in field_formats.items():
-                if field in job and job[field] is not None:
-                    total_checks += 1
-                    if re.match(pattern, str(job[field])):
-                        score += 1.0
-                    else:
-                        score += 0.5
-            
-            return score / total_checks if total_checks > 0 else 0.0
-            
-        except Exception as e:
-            logging.warning(f"計算職位一致性分數失敗: {e}")
-            return 0.0
-    
-    def _calculate_timeliness_score(self, jobs: List[Dict[str, Any]]) -> float:
-        """計算及時性分數"""
-        try:
-            if not jobs:
-                return 0.0
-            
-            current_date = datetime.now().date()
-            timeliness_scores = []
-            
-            for job in jobs:
-                date_posted = job.get('date_posted')
-                if date_posted:
-                    try:
-                        # 解析日期
-                        if isinstance(date_posted, str):
-                            job_date = datetime.strptime(date_posted, '%Y-%m-%d').date()
-                        else:
-                            continue
-                        
-                        # 計算天數差異
-                        days_diff = (current_date - job_date).days
-                        
-                        # 計算及時性分數（越新越好）
-                        if days_diff <= 1:
-                            score = 1.0
-                        elif days_diff <= 7:
-                            score = 0.8
-                        elif days_diff <= 30:
-                            score = 0.6
-                        elif days_diff <= 90:
-                            score = 0.4
-                        else:
-                            score = 0.2
-                        
-                        timeliness_scores.append(score)
-                        
-                    except Exception:
-                        timeliness_scores.append(0.5)  # 無法解析的日期給中等分數
-            
-            return statistics.mean(timeliness_scores) if timeliness_scores else 0.0
-            
-        except Exception as e:
-            logging.warning(f"計算及時性分數失敗: {e}")
-            return 0.0
-    
     # 檢查處理器實現
     def _check_platform_coverage(self, check_result: IntegrityCheckResult, platform_data: Dict[str, List[Dict[str, Any]]]):
         """檢查平台覆蓋率"""
@@ -1025,36 +1125,53 @@ class EnhancedDataIntegrityChecker:
             check_result.warnings.append(f"重複檢測錯誤: {str(e)}")
     
     def _detect_cross_platform_duplicates(self, platform_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-        """檢測跨平台重複"""
+        """
+        檢測跨平台重複
+        
+        簽名完全相同的職位直接判定重複；其餘職位按阻斷鍵（公司、標題前綴、地點）分塊，
+        只與同一塊內其他平台的職位計算相似度，避免全體兩兩比較
+        """
         try:
             job_signatures = {}
+            blocks: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = defaultdict(list)
             duplicates = []
+            threshold = self.config.duplicate_threshold
+            max_candidates = self.config.duplicate_block_max_candidates
             
-            # 為所有職位生成簽名
             for platform, jobs in platform_data.items():
                 for i, job in enumerate(jobs):
                     signature = self._generate_job_signature(job)
+                    profile = self._similarity_profile(job)
                     
-                    if signature in job_signatures:
-                        # 發現重複
-                        original = job_signatures[signature]
-                        duplicate_info = {
-                            'signature': signature,
-                            'original_platform': original['platform'],
-                            'original_index': original['index'],
-                            'duplicate_platform': platform,
-                            'duplicate_index': i,
-                            'similarity_score': self._calculate_job_similarity(
-                                original['job'], job
-                            )
-                        }
-                        duplicates.append(duplicate_info)
+                    original = job_signatures.get(signature)
+                    similarity = 0.0
+                    if original is not None:
+                        similarity = self._profile_similarity(original['profile'], profile)
                     else:
-                        job_signatures[signature] = {
-                            'platform': platform,
-                            'index': i,
-                            'job': job
-                        }
+                        # 同一塊內由新到舊比較其他平台的職位
+                        block = blocks[self._blocking_key(job)]
+                        for candidate in reversed(block[-max_candidates:]):
+                            if candidate['platform'] == platform:
+                                continue
+                            candidate_similarity = self._profile_similarity(candidate['profile'], profile)
+                            if candidate_similarity >= threshold:
+                                original, similarity = candidate, candidate_similarity
+                                break
+                        
+                        # 相同簽名的後續職位視為同一原始職位的重複
+                        job_signatures[signature] = original or {'platform': platform, 'index': i, 'profile': profile}
+                        if original is None:
+                            block.append(job_signatures[signature])
+                            continue
+                    
+                    duplicates.append({
+                        'signature': signature,
+                        'original_platform': original['platform'],
+                        'original_index': original['index'],
+                        'duplicate_platform': platform,
+                        'duplicate_index': i,
+                        'similarity_score': similarity
+                    })
             
             return duplicates
             
@@ -1062,38 +1179,57 @@ class EnhancedDataIntegrityChecker:
             logging.error(f"檢測跨平台重複失敗: {e}")
             return []
     
+    def _blocking_key(self, job: Dict[str, Any]) -> Tuple[str, str, str]:
+        """重複檢測阻斷鍵：(正規化公司名稱, 標題首詞前綴, 城市)"""
+        company_tokens = [
+            token for token in _BLOCK_TOKEN_PATTERN.findall(str(job.get('company') or '').lower())
+            if token not in _COMPANY_SUFFIXES
+        ]
+        title_tokens = [
+            token for token in _BLOCK_TOKEN_PATTERN.findall(str(job.get('title') or '').lower())
+            if token not in _TITLE_STOPWORDS
+        ]
+        location = self._normalize_location(str(job.get('location') or '')).split(',')[0].split()
+        return (
+            ' '.join(company_tokens),
+            title_tokens[0][:_TITLE_PREFIX_LENGTH] if title_tokens else '',
+            location[0] if location else ''
+        )
+    
+    @staticmethod
+    def _similarity_profile(job: Dict[str, Any]) -> Tuple[Tuple[str, frozenset], ...]:
+        """相似度比較用的正規化欄位與詞彙集合（每個職位只計算一次）"""
+        profile = []
+        for field in _SIMILARITY_FIELDS:
+            value = str(job.get(field, '')).lower().strip()
+            profile.append((value, frozenset(value.split())))
+        return tuple(profile)
+    
+    @staticmethod
+    def _profile_similarity(profile1: Tuple[Tuple[str, frozenset], ...],
+                            profile2: Tuple[Tuple[str, frozenset], ...]) -> float:
+        similarities = []
+        for (value1, words1), (value2, words2) in zip(profile1, profile2):
+            if value1 and value2:
+                # 簡單的字符串相似度
+                if value1 == value2:
+                    similarity = 1.0
+                elif value1 in value2 or value2 in value1:
+                    similarity = 0.8
+                elif words1 and words2:
+                    # 計算詞彙重疊
+                    similarity = len(words1 & words2) / len(words1 | words2)
+                else:
+                    similarity = 0.0
+                
+                similarities.append(similarity)
+        
+        return statistics.mean(similarities) if similarities else 0.0
+    
     def _calculate_job_similarity(self, job1: Dict[str, Any], job2: Dict[str, Any]) -> float:
         """計算職位相似度"""
         try:
-            # 簡單的相似度計算
-            key_fields = ['title', 'company', 'location', 'description']
-            similarities = []
-            
-            for field in key_fields:
-                value1 = str(job1.get(field, '')).lower().strip()
-                value2 = str(job2.get(field, '')).lower().strip()
-                
-                if value1 and value2:
-                    # 簡單的字符串相似度
-                    if value1 == value2:
-                        similarity = 1.0
-                    elif value1 in value2 or value2 in value1:
-                        similarity = 0.8
-                    else:
-                        # 計算詞彙重疊
-                        words1 = set(value1.split())
-                        words2 = set(value2.split())
-                        if words1 and words2:
-                            intersection = len(words1 & words2)
-                            union = len(words1 | words2)
-                            similarity = intersection / union
-                        else:
-                            similarity = 0.0
-                    
-                    similarities.append(similarity)
-            
-            return statistics.mean(similarities) if similarities else 0.0
-            
+            return self._profile_similarity(self._similarity_profile(job1), self._similarity_profile(job2))
         except Exception as e:
             logging.warning(f"計算職位相似度失敗: {e}")
             return 0.0
@@ -1902,15 +2038,12 @@ class EnhancedDataIntegrityChecker:
         try:
             logging.info("正在關閉數據完整性檢查器...")
             
-            # 停止背景任務
-            self.running = False
+            # 停止背景任務（背景循環以 shutdown_event 判斷是否結束）
+            with self.queue_condition:
+                self.shutdown_event.set()
+                self.queue_condition.notify_all()
             
-            # 等待當前檢查完成
-            if hasattr(self, 'current_checks'):
-                while self.current_checks:
-                    time.sleep(0.1)
-            
-            # 關閉線程池
+            # 關閉線程池（等待當前檢查完成）
             if hasattr(self, 'executor'):
                 self.executor.shutdown(wait=True)
             
@@ -1921,15 +2054,24 @@ class EnhancedDataIntegrityChecker:
                 except Exception as e:
                     logging.warning(f"關閉Redis連接失敗: {e}")
             
-            # 清理緩存
-            self.results_cache.clear()
-            
             logging.info("數據完整性檢查器已關閉")
             
         except Exception as e:
             logging.error(f"關閉檢查器失敗: {e}")
 
 
+def _analyze_platform_task(platform: str, schema: Dict[str, Any],
+                           handle) -> Tuple[PlatformDataSummary, Optional[PlatformQualityAccumulator]]:
+    """工作進程：分析單一平台的數據（只需要該平台的模式，不建立連接與背景任務）"""
+    checker = EnhancedDataIntegrityChecker.__new__(EnhancedDataIntegrityChecker)
+    checker.platform_schemas = {platform: schema}
+    jobs = load_batch(handle)
+    summary = PlatformDataSummary(platform=platform)
+    summary.total_jobs = len(jobs)
+    accumulator = checker._analyze_platform_data(summary, jobs)
+    return summary, accumulator
+
+
 # 測試用例
 if __name__ == "__main__":
     import asyncio
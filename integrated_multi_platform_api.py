@@ -398,7 +398,10 @@ class IntegratedMultiPlatformAPI:
                 
                 if job_status['overall_status'] in ['completed', 'failed', 'cancelled']:
                     raise HTTPException(status_code=400, detail="任務已完成或已取消")
-                
+
+                # 取消排隊與執行中的平台搜尋
+                await self.scheduler.cancel_job(job_id)
+
                 # 發送取消事件
                 await self.sync_manager.emit_event(SyncEvent(
                     event_id=str(uuid.uuid4()),
@@ -1,21 +1,10 @@
 ﻿from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Tuple, Dict, Any, Optional, Union, List
+from typing import TYPE_CHECKING, Tuple, Dict, Any, Optional, Union, List
 import asyncio
+import importlib
 
-import pandas as pd
-
-from jobseeker.bayt import BaytScraper
-from jobseeker.bdjobs import BDJobs
-from jobseeker.glassdoor import Glassdoor
-from jobseeker.google import Google
-from jobseeker.indeed import Indeed
-from jobseeker.linkedin import LinkedIn
-from jobseeker.naukri import Naukri
-from jobseeker.seek import SeekScraper
-from jobseeker.tw104 import Taiwan104Scraper
-from jobseeker.tw1111 import Taiwan1111Scraper
 from jobseeker.model import JobType, Location, JobResponse, Country
 from jobseeker.model import SalarySource, ScraperInput, Site
 from jobseeker.util import (
@@ -27,19 +16,93 @@ from jobseeker.util import (
     convert_to_annual,
     desired_order,
 )
-from jobseeker.ziprecruiter import ZipRecruiter
 from jobseeker.enhanced_config import EnhancedScraperConfig
-
-# 導入非同步爬蟲功能
-from jobseeker.async_scraping import (
-    AsyncConfig, AsyncMode, AsyncScrapingManager,
-    async_scrape_jobs as _async_scrape_jobs,
-    get_global_async_manager, AsyncScrapingResult
+from jobseeker.tracing import get_current_span, start_span, submit_with_context, traced
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from jobseeker.async_scraping import AsyncConfig, AsyncMode, AsyncScrapingResult
+
+
+# 爬蟲類別以 "模組:類別" 字串登記，首次使用時才導入，
+# 只爬取單一網站時不必載入其他爬蟲（及 Playwright 等重量級依賴）
+SCRAPER_MAPPING: Dict[Site, str] = {
+    Site.LINKEDIN: "jobseeker.linkedin:LinkedIn",
+    Site.INDEED: "jobseeker.indeed:Indeed",
+    Site.ZIP_RECRUITER: "jobseeker.ziprecruiter:ZipRecruiter",
+    Site.GLASSDOOR: "jobseeker.glassdoor:Glassdoor",
+    Site.GOOGLE: "jobseeker.google:Google",
+    Site.BAYT: "jobseeker.bayt:BaytScraper",
+    Site.NAUKRI: "jobseeker.naukri:Naukri",
+    Site.BDJOBS: "jobseeker.bdjobs:BDJobs",
+    Site.SEEK: "jobseeker.seek:SeekScraper",
+    Site.T104: "jobseeker.tw104:Taiwan104Scraper",  # Taiwan 104
+    Site.JOB_1111: "jobseeker.tw1111:Taiwan1111Scraper",  # Taiwan 1111
+}
+
+# 非同步管理器支援的網站
+_ASYNC_SITES = (
+    Site.LINKEDIN, Site.INDEED, Site.ZIP_RECRUITER, Site.GLASSDOOR, Site.GOOGLE,
+    Site.BAYT, Site.NAUKRI, Site.BDJOBS, Site.SEEK,
 )
 
+# 延遲導出的名稱（PEP 562），值為 "模組:屬性"
+_LAZY_EXPORTS: Dict[str, str] = {
+    "LinkedIn": "jobseeker.linkedin:LinkedIn",
+    "Indeed": "jobseeker.indeed:Indeed",
+    "ZipRecruiter": "jobseeker.ziprecruiter:ZipRecruiter",
+    "Glassdoor": "jobseeker.glassdoor:Glassdoor",
+    "Google": "jobseeker.google:Google",
+    "BaytScraper": "jobseeker.bayt:BaytScraper",
+    "Naukri": "jobseeker.naukri:Naukri",
+    "BDJobs": "jobseeker.bdjobs:BDJobs",
+    "SeekScraper": "jobseeker.seek:SeekScraper",
+    "Taiwan104Scraper": "jobseeker.tw104:Taiwan104Scraper",
+    "Taiwan1111Scraper": "jobseeker.tw1111:Taiwan1111Scraper",
+    "AsyncConfig": "jobseeker.async_scraping:AsyncConfig",
+    "AsyncMode": "jobseeker.async_scraping:AsyncMode",
+    "AsyncScrapingManager": "jobseeker.async_scraping:AsyncScrapingManager",
+    "AsyncScrapingResult": "jobseeker.async_scraping:AsyncScrapingResult",
+    "get_global_async_manager": "jobseeker.async_scraping:get_global_async_manager",
+}
+
+
+def _import_from_path(path: str) -> Any:
+    """導入 "模組:屬性" 形式的路徑"""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_scraper_class(site: Site) -> type:
+    """
+    取得網站對應的爬蟲類別（首次呼叫時才導入模組）
+    
+    增強版爬蟲（見 EnhancedScraperConfig）啟用時優先使用。
+    """
+    enhanced_path = EnhancedScraperConfig.get_enhanced_scraper_path(site.value)
+    if enhanced_path:
+        try:
+            return _import_from_path(enhanced_path)
+        except ImportError:
+            pass
+    return _import_from_path(SCRAPER_MAPPING[site])
+
+
+def __getattr__(name: str) -> Any:
+    """PEP 562：首次存取時才導入爬蟲類別與非同步工具"""
+    path = _LAZY_EXPORTS.get(name)
+    if path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _import_from_path(path)
+    globals()[name] = value
+    return value
+
 
-# Update the SCRAPER_MAPPING dictionary in the scrape_jobs function
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
+
+@traced("scrape_jobs")
 def scrape_jobs(
     site_name: str | list[str] | Site | list[Site] | None = None,
     search_term: str | None = None,
@@ -67,34 +130,11 @@ def scrape_jobs(
     Scrapes job data from job boards concurrently
     :return: Pandas DataFrame containing job data
     """
-    # 基礎爬蟲映射
-    SCRAPER_MAPPING = {
-        Site.LINKEDIN: LinkedIn,
-        Site.INDEED: Indeed,
-        Site.ZIP_RECRUITER: ZipRecruiter,
-        Site.GLASSDOOR: Glassdoor,
-        Site.GOOGLE: Google,
-        Site.BAYT: BaytScraper,
-        Site.NAUKRI: Naukri,
-        Site.BDJOBS: BDJobs,
-        Site.SEEK: SeekScraper,  # Add Seek to the scraper mapping
-        Site.T104: Taiwan104Scraper,  # Taiwan 104
-        Site.JOB_1111: Taiwan1111Scraper,  # Taiwan 1111
-    }
-    
-    # 獲取增強版爬蟲映射並覆蓋基礎映射
-    enhanced_mapping = EnhancedScraperConfig.get_enhanced_scraper_mapping()
-    if enhanced_mapping:
-        # 記錄增強版爬蟲狀態
+    import pandas as pd
+
+    # 記錄增強版爬蟲狀態
+    if EnhancedScraperConfig.ENABLE_ALL_ENHANCED:
         EnhancedScraperConfig.log_enhanced_status()
-        
-        # 更新映射
-        if 'ziprecruiter' in enhanced_mapping:
-            SCRAPER_MAPPING[Site.ZIP_RECRUITER] = enhanced_mapping['ziprecruiter']
-        if 'google' in enhanced_mapping:
-            SCRAPER_MAPPING[Site.GOOGLE] = enhanced_mapping['google']
-        if 'bayt' in enhanced_mapping:
-            SCRAPER_MAPPING[Site.BAYT] = enhanced_mapping['bayt']
     set_logger_level(verbose)
     job_type = get_enum_from_value(job_type) if job_type else None
 
@@ -131,14 +171,23 @@ def scrape_jobs(
         hours_old=hours_old,
     )
 
+    get_current_span().set_attributes({
+        "search_term": search_term,
+        "location": location,
+        "results_wanted": results_wanted,
+        "sites": [site.value for site in scraper_input.site_type],
+    })
+
     def scrape_site(site: Site) -> Tuple[str, JobResponse]:
-        scraper_class = SCRAPER_MAPPING[site]
-        # BDJobs 不支援 user_agent 參數
-        if site == Site.BDJOBS:
-            scraper = scraper_class(proxies=proxies, ca_cert=ca_cert)
-        else:
-            scraper = scraper_class(proxies=proxies, ca_cert=ca_cert, user_agent=user_agent)
-        scraped_data: JobResponse = scraper.scrape(scraper_input)
+        with start_span("scrape_site", site=site.value) as span:
+            scraper_class = get_scraper_class(site)
+            # BDJobs 不支援 user_agent 參數
+            if site == Site.BDJOBS:
+                scraper = scraper_class(proxies=proxies, ca_cert=ca_cert)
+            else:
+                scraper = scraper_class(proxies=proxies, ca_cert=ca_cert, user_agent=user_agent)
+            scraped_data: JobResponse = scraper.scrape(scraper_input)
+            span.set_attribute("jobs", len(scraped_data.jobs))
         cap_name = site.value.capitalize()
         site_name = "ZipRecruiter" if cap_name == "Zip_recruiter" else cap_name
         site_name = "LinkedIn" if cap_name == "Linkedin" else cap_name
@@ -153,106 +202,110 @@ def scrape_jobs(
 
     with ThreadPoolExecutor() as executor:
         future_to_site = {
-            executor.submit(worker, site): site for site in scraper_input.site_type
+            # 子線程沿用當前追蹤 context
+            submit_with_context(executor, worker, site): site for site in scraper_input.site_type
         }
 
         for future in as_completed(future_to_site):
             site_value, scraped_data = future.result()
             site_to_jobs_dict[site_value] = scraped_data
 
-    jobs_dfs: list[pd.DataFrame] = []
-
-    for site, job_response in site_to_jobs_dict.items():
-        for job in job_response.jobs:
-            job_data = job.dict()
-            job_url = job_data["job_url"]
-            job_data["site"] = site
-            job_data["company"] = job_data["company_name"]
-            job_data["job_type"] = (
-                ", ".join(job_type.value[0] for job_type in job_data["job_type"])
-                if job_data["job_type"]
-                else None
-            )
-            job_data["emails"] = (
-                ", ".join(job_data["emails"]) if job_data["emails"] else None
-            )
-            if job_data["location"]:
-                job_data["location"] = Location(
-                    **job_data["location"]
-                ).display_location()
-
-            # Handle compensation
-            compensation_obj = job_data.get("compensation")
-            if compensation_obj and isinstance(compensation_obj, dict):
-                job_data["interval"] = (
-                    compensation_obj.get("interval").value
-                    if compensation_obj.get("interval")
+    with start_span("assemble_dataframe") as assemble_span:
+        jobs_dfs: list[pd.DataFrame] = []
+
+        for site, job_response in site_to_jobs_dict.items():
+            for job in job_response.jobs:
+                job_data = job.dict()
+                job_url = job_data["job_url"]
+                job_data["site"] = site
+                job_data["company"] = job_data["company_name"]
+                job_data["job_type"] = (
+                    ", ".join(job_type.value[0] for job_type in job_data["job_type"])
+                    if job_data["job_type"]
                     else None
                 )
-                job_data["min_amount"] = compensation_obj.get("min_amount")
-                job_data["max_amount"] = compensation_obj.get("max_amount")
-                job_data["currency"] = compensation_obj.get("currency", "USD")
-                job_data["salary_source"] = SalarySource.DIRECT_DATA.value
-                if enforce_annual_salary and (
-                    job_data["interval"]
-                    and job_data["interval"] != "yearly"
-                    and job_data["min_amount"]
-                    and job_data["max_amount"]
-                ):
-                    convert_to_annual(job_data)
-            else:
-                if country_enum == Country.USA:
-                    (
-                        job_data["interval"],
-                        job_data["min_amount"],
-                        job_data["max_amount"],
-                        job_data["currency"],
-                    ) = extract_salary(
-                        job_data["description"],
-                        enforce_annual_salary=enforce_annual_salary,
+                job_data["emails"] = (
+                    ", ".join(job_data["emails"]) if job_data["emails"] else None
+                )
+                if job_data["location"]:
+                    job_data["location"] = Location(
+                        **job_data["location"]
+                    ).display_location()
+
+                # Handle compensation
+                compensation_obj = job_data.get("compensation")
+                if compensation_obj and isinstance(compensation_obj, dict):
+                    job_data["interval"] = (
+                        compensation_obj.get("interval").value
+                        if compensation_obj.get("interval")
+                        else None
                     )
-                    job_data["salary_source"] = SalarySource.DESCRIPTION.value
+                    job_data["min_amount"] = compensation_obj.get("min_amount")
+                    job_data["max_amount"] = compensation_obj.get("max_amount")
+                    job_data["currency"] = compensation_obj.get("currency", "USD")
+                    job_data["salary_source"] = SalarySource.DIRECT_DATA.value
+                    if enforce_annual_salary and (
+                        job_data["interval"]
+                        and job_data["interval"] != "yearly"
+                        and job_data["min_amount"]
+                        and job_data["max_amount"]
+                    ):
+                        convert_to_annual(job_data)
+                else:
+                    if country_enum == Country.USA:
+                        (
+                            job_data["interval"],
+                            job_data["min_amount"],
+                            job_data["max_amount"],
+                            job_data["currency"],
+                        ) = extract_salary(
+                            job_data["description"],
+                            enforce_annual_salary=enforce_annual_salary,
+                        )
+                        job_data["salary_source"] = SalarySource.DESCRIPTION.value
+
+                job_data["salary_source"] = (
+                    job_data["salary_source"]
+                    if "min_amount" in job_data and job_data["min_amount"]
+                    else None
+                )
 
-            job_data["salary_source"] = (
-                job_data["salary_source"]
-                if "min_amount" in job_data and job_data["min_amount"]
-                else None
-            )
+                #naukri-specific fields
+                job_data["skills"] = (
+                    ", ".join(job_data["skills"]) if job_data["skills"] else None
+                )
+                job_data["experience_range"] = job_data.get("experience_range")
+                job_data["company_rating"] = job_data.get("company_rating")
+                job_data["company_reviews_count"] = job_data.get("company_reviews_count")
+                job_data["vacancy_count"] = job_data.get("vacancy_count")
+                job_data["work_from_home_type"] = job_data.get("work_from_home_type")
 
-            #naukri-specific fields
-            job_data["skills"] = (
-                ", ".join(job_data["skills"]) if job_data["skills"] else None
-            )
-            job_data["experience_range"] = job_data.get("experience_range")
-            job_data["company_rating"] = job_data.get("company_rating")
-            job_data["company_reviews_count"] = job_data.get("company_reviews_count")
-            job_data["vacancy_count"] = job_data.get("vacancy_count")
-            job_data["work_from_home_type"] = job_data.get("work_from_home_type")
+                job_df = pd.DataFrame([job_data])
+                jobs_dfs.append(job_df)
 
-            job_df = pd.DataFrame([job_data])
-            jobs_dfs.append(job_df)
+        if jobs_dfs:
+            # Step 1: Filter out all-NA columns from each DataFrame before concatenation
+            filtered_dfs = [df.dropna(axis=1, how="all") for df in jobs_dfs]
 
-    if jobs_dfs:
-        # Step 1: Filter out all-NA columns from each DataFrame before concatenation
-        filtered_dfs = [df.dropna(axis=1, how="all") for df in jobs_dfs]
+            # Step 2: Concatenate the filtered DataFrames
+            jobs_df = pd.concat(filtered_dfs, ignore_index=True)
 
-        # Step 2: Concatenate the filtered DataFrames
-        jobs_df = pd.concat(filtered_dfs, ignore_index=True)
+            # Step 3: Ensure all desired columns are present, adding missing ones as empty
+            for column in desired_order:
+                if column not in jobs_df.columns:
+                    jobs_df[column] = None  # Add missing columns as empty
 
-        # Step 3: Ensure all desired columns are present, adding missing ones as empty
-        for column in desired_order:
-            if column not in jobs_df.columns:
-                jobs_df[column] = None  # Add missing columns as empty
+            # Reorder the DataFrame according to the desired order
+            jobs_df = jobs_df[desired_order]
 
-        # Reorder the DataFrame according to the desired order
-        jobs_df = jobs_df[desired_order]
+            assemble_span.set_attribute("rows", len(jobs_df))
 
-        # Step 4: Sort the DataFrame as required
-        return jobs_df.sort_values(
-            by=["site", "date_posted"], ascending=[True, False]
-        ).reset_index(drop=True)
-    else:
-        return pd.DataFrame()
+            # Step 4: Sort the DataFrame as required
+            return jobs_df.sort_values(
+                by=["site", "date_posted"], ascending=[True, False]
+            ).reset_index(drop=True)
+        else:
+            return pd.DataFrame()
 
 
 # 非同步爬取函數
@@ -318,6 +371,8 @@ def scrape_jobs_async(
         包含職位資料的 Pandas DataFrame
     """
     
+    from jobseeker.async_scraping import AsyncConfig, AsyncMode
+    
     # 設定日誌級別
     set_logger_level(verbose)
     
@@ -350,25 +405,19 @@ def scrape_jobs_async(
     
     # 執行非同步爬取
     async def _run_async_scrape():
+        from jobseeker.async_scraping import (
+            async_scrape_jobs as _async_scrape_jobs,
+            get_global_async_manager,
+        )
+        
         # 獲取全域管理器
         manager = get_global_async_manager()
         manager.config = async_config
         
-        # 註冊所有爬蟲
-        SCRAPER_MAPPING = {
-            Site.LINKEDIN: LinkedIn,
-            Site.INDEED: Indeed,
-            Site.ZIP_RECRUITER: ZipRecruiter,
-            Site.GLASSDOOR: Glassdoor,
-            Site.GOOGLE: Google,
-            Site.BAYT: BaytScraper,
-            Site.NAUKRI: Naukri,
-            Site.BDJOBS: BDJobs,
-            Site.SEEK: SeekScraper,
-        }
-        
-        for site, scraper_class in SCRAPER_MAPPING.items():
-            if site in sites:
+        # 只註冊（並導入）要爬取的網站
+        for site in sites:
+            if site in _ASYNC_SITES:
+                scraper_class = _import_from_path(SCRAPER_MAPPING[site])
                 # BDJobs 不支援 user_agent 參數
                 if site == Site.BDJOBS:
                     manager.register_sync_scraper(
@@ -437,6 +486,8 @@ def _convert_async_results_to_dataframe(
     Returns:
         包含職位資料的 Pandas DataFrame
     """
+    import pandas as pd
+
     jobs_dfs: list[pd.DataFrame] = []
     
     for site, result in async_results.items():
@@ -536,7 +587,7 @@ def _convert_async_results_to_dataframe(
 
 # 便利函數：創建非同步配置
 def create_async_config(
-    mode: AsyncMode = AsyncMode.THREADED,
+    mode: Optional[AsyncMode] = None,
     max_concurrent_requests: int = 5,
     request_delay: float = 1.0,
     timeout: float = 30.0,
@@ -550,7 +601,7 @@ def create_async_config(
     創建非同步配置
     
     Args:
-        mode: 非同步模式
+        mode: 非同步模式（預設 AsyncMode.THREADED）
         max_concurrent_requests: 最大並發請求數
         request_delay: 請求延遲（秒）
         timeout: 超時時間（秒）
@@ -563,8 +614,10 @@ def create_async_config(
     Returns:
         AsyncConfig 實例
     """
+    from jobseeker.async_scraping import AsyncConfig, AsyncMode
+
     return AsyncConfig(
-        mode=mode,
+        mode=mode or AsyncMode.THREADED,
         max_concurrent_requests=max_concurrent_requests,
         request_delay=request_delay,
         timeout=timeout,
@@ -588,10 +641,13 @@ __all__ = [
     "BaytScraper",
     "Naukri",
     "SeekScraper",
+    "Taiwan104Scraper",
+    "Taiwan1111Scraper",
     
     # 主要函數
     "scrape_jobs",
     "scrape_jobs_async",
+    "get_scraper_class",
     
     # 模型類別
     "Site",
@@ -19,6 +19,7 @@ from jobseeker.error_handling import ScrapingError, retry_with_backoff, async_re
 from jobseeker.performance_monitoring import ScrapingMetrics, async_performance_monitor
 from jobseeker.cache_system import JobCache, CacheStrategy
 from jobseeker.data_quality import DataQualityProcessor, improve_job_data_quality
+from jobseeker.tracing import run_in_executor
 
 
 class AsyncMode(Enum):
@@ -203,7 +204,8 @@ class SyncToAsyncAdapter(AsyncScraper):
             try:
                 # 在線程池中執行同步爬蟲
                 loop = asyncio.get_event_loop()
-                job_response = await loop.run_in_executor(
+                job_response = await run_in_executor(
+                    loop,
                     self.thread_pool,
                     self._run_sync_scraper,
                     scraper_input
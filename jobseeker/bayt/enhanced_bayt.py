@@ -20,6 +20,7 @@ from ..model import (
 )
 from ..util import create_logger, create_session
 from ..anti_detection import AntiDetectionScraper
+from ..http_replay import install_route_replay
 
 log = create_logger("EnhancedBayt")
 
@@ -107,6 +108,8 @@ class EnhancedBaytScraper(Scraper):
                         'Upgrade-Insecure-Requests': '1'
                     }
                 )
+                # 啟用卡帶時改由錄製 / 重放路由處理請求
+                await install_route_replay(self.context)
                 
                 # 注入反檢測腳本
                 await self.context.add_init_script("""
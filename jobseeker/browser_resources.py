@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Playwright 輕量頁面模式
+以 context.route 攔截請求，略過解析用不到的圖片、媒體、字型與第三方追蹤 / 廣告請求，
+並以 domcontentloaded + 選擇器等待取代 networkidle，截圖只在需要或失敗時進行
+
+設計要點:
+1. ResourcePolicy 決定哪些請求中止；未中止的請求以 route.fallback() 交給
+   較早安裝的路由（例如 http_replay 的錄製 / 重放），因此必須在其後安裝
+2. wait_for_content 等待 DOM 就緒與目標選擇器出現，不等待長連線、分析腳本等網路閒置
+3. 截圖模式: never / on_failure / always；OCR 等需要影像的步驟屬於「需要時」截圖
+
+用法:
+    policy = ResourcePolicy()
+    await install_resource_policy(context, policy)
+    await goto_and_wait(page, url, '[data-automation="jobListing"]', timeout=30000)
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 預設中止的資源類型（Playwright request.resource_type）
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# 第三方分析、追蹤與廣告網域（含子網域）
+DEFAULT_BLOCKED_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com', 'googlesyndication.com',
+    'doubleclick.net', 'adservice.google.com', 'facebook.net', 'connect.facebook.com',
+    'hotjar.com', 'hotjar.io', 'clarity.ms', 'bat.bing.com', 'segment.io', 'segment.com',
+    'newrelic.com', 'nr-data.net', 'optimizely.com', 'scorecardresearch.com', 'criteo.com',
+    'criteo.net', 'taboola.com', 'outbrain.com', 'tiktok.com', 'analytics.tiktok.com',
+    'adnxs.com', 'amazon-adsystem.com', 'quantserve.com', 'mixpanel.com', 'fullstory.com',
+    'braze.com', 'appsflyer.com', 'branch.io', 'sentry.io', 'datadoghq.com',
+)
+
+SCREENSHOT_NEVER = 'never'
+SCREENSHOT_ON_FAILURE = 'on_failure'
+SCREENSHOT_ALWAYS = 'always'
+SCREENSHOT_MODES = (SCREENSHOT_NEVER, SCREENSHOT_ON_FAILURE, SCREENSHOT_ALWAYS)
+
+
+def _domain_matches(host: str, domains: Tuple[str, ...]) -> bool:
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+@dataclass
+class ResourcePolicy:
+    """
+    請求攔截策略
+
+    Args:
+        blocked_resource_types: 中止的資源類型（image、media、font、stylesheet 等）
+        blocked_domains: 中止的網域（含子網域）
+        allowed_domains: 永不中止的網域，優先於上面兩項
+    """
+    blocked_resource_types: FrozenSet[str] = DEFAULT_BLOCKED_RESOURCE_TYPES
+    blocked_domains: Tuple[str, ...] = DEFAULT_BLOCKED_DOMAINS
+    allowed_domains: Tuple[str, ...] = ()
+    blocked_requests: int = field(default=0, compare=False)
+    allowed_requests: int = field(default=0, compare=False)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_domains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """判斷請求是否應中止"""
+        host = (urlsplit(url).hostname or '').lower()
+        if self.allowed_domains and _domain_matches(host, self.allowed_domains):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return bool(host) and _domain_matches(host, self.blocked_domains)
+
+    async def handle_route(self, route):
+        """context.route 處理器：中止或交給其他路由 / 網路"""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked_requests += 1
+            await route.abort('blockedbyclient')
+        else:
+            self.allowed_requests += 1
+            await route.fallback()
+
+
+def full_page_policy() -> ResourcePolicy:
+    """不攔截任何請求（需要完整渲染時使用，例如整頁截圖比對）"""
+    return ResourcePolicy(blocked_resource_types=frozenset(), blocked_domains=())
+
+
+async def install_resource_policy(target, policy: Optional[ResourcePolicy]) -> bool:
+    """
+    在 Playwright 非同步 API 的 BrowserContext 或 Page 上安裝攔截策略
+
+    Playwright 由最後安裝的路由先處理，因此要在錄製 / 重放路由之後安裝；
+    策略為 None 或不攔截任何請求時不安裝，返回是否已安裝
+    """
+    if policy is None or not policy.enabled:
+        return False
+    await target.route('**/*', policy.handle_route)
+    return True
+
+
+async def wait_for_content(page, selector: Optional[str], timeout: int = 30000,
+                           previous_url: Optional[str] = None):
+    """
+    等待頁面內容就緒: DOM 載入完成且 selector 出現
+
+    Args:
+        selector: 代表結果已渲染的選擇器（None 時只等待 DOM）
+        timeout: 毫秒
+        previous_url: 點擊換頁時傳入換頁前的網址，先等待網址改變，避免舊頁面的選擇器立即命中
+    """
+    if previous_url is not None:
+        await page.wait_for_url(lambda url: url != previous_url, wait_until='domcontentloaded', timeout=timeout)
+    else:
+        await page.wait_for_load_state('domcontentloaded', timeout=timeout)
+    if selector:
+        await page.wait_for_selector(selector, timeout=timeout)
+
+
+async def goto_and_wait(page, url: str, selector: Optional[str], timeout: int = 30000):
+    """導航到 url，DOM 載入後等待 selector 出現，返回導航回應"""
+    response = await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+    if selector:
+        await page.wait_for_selector(selector, timeout=timeout)
+    return response
@@ -25,6 +25,7 @@ except ImportError:
 
 from jobseeker.model import JobResponse, JobPost, Site
 from jobseeker.enhanced_logging import get_enhanced_logger, LogCategory
+from jobseeker.tracing import start_span, traced
 
 
 class CacheType(Enum):
@@ -125,7 +126,8 @@ class CacheStats:
                 'misses': self.misses,
                 'evictions': self.evictions,
                 'total_requests': self.total_requests,
-                'hit_rate': self.get_hit_rate(),
+                # 已持有鎖，不能再呼叫 get_hit_rate（非重入鎖）
+                'hit_rate': self.hits / self.total_requests * 100 if self.total_requests else 0.0,
                 'total_size': self.total_size
             }
     
@@ -686,6 +688,13 @@ class JobCache:
     def get_jobs(self, site: Site, search_term: str, location: str = "", 
                 **kwargs) -> Optional[JobResponse]:
         """獲取快取的職位搜尋結果"""
+        with start_span("cache.get_jobs", site=site.value, **{"cache.type": self.cache_type.value}) as span:
+            result = self._get_jobs(site, search_term, location, **kwargs)
+            span.set_attribute("cache.hit", result is not None)
+            return result
+    
+    def _get_jobs(self, site: Site, search_term: str, location: str = "", 
+                 **kwargs) -> Optional[JobResponse]:
         key = self.generate_search_key(site, search_term, location, **kwargs)
         
         # 嘗試從不同層級的快取獲取
@@ -709,6 +718,7 @@ class JobCache:
         
         return None
     
+    @traced("cache.set_jobs")
     def set_jobs(self, site: Site, search_term: str, job_response: JobResponse,
                 location: str = "", ttl: Optional[int] = None, **kwargs) -> bool:
         """快取職位搜尋結果"""
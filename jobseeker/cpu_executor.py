@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CPU 密集工作的進程池執行器
+資料品質、重複檢測與完整性檢查等純 CPU 階段在線程池中會被 GIL 串行化，
+交給常駐的工作進程才能在大型結果集上取得真正的多核加速
+
+設計要點:
+1. 工作進程預先啟動（warm）並在初始化時導入重量級模組，首個任務不必等待導入
+2. 批次資料以 SharedBatch 放入共享記憶體，任務只傳遞區塊名稱；
+   多個任務讀取同一批次時，每個工作進程只解碼一次
+3. 記錄列表以 pickle 協定 5 序列化；pyarrow Table 以 Arrow IPC 串流寫入，
+   工作進程直接映射共享記憶體讀取，不複製資料
+4. 共享記憶體由父進程擁有並負責釋放（SharedBatch.close 或 with 區塊）
+5. run() 供 asyncio 使用，等待期間事件循環保持可回應
+
+環境變數 JOBSEEKER_CPU_WORKERS 可覆寫預設的工作進程數。
+
+用法:
+    executor = get_cpu_executor()
+    with SharedBatch.from_records(rows) as batch:
+        parts = executor.map(count_stripe, [(batch.handle, start, stop) for start, stop in split_ranges(len(rows), 8)])
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import asyncio
+import atexit
+import functools
+import importlib
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# 工作進程啟動時預先導入的模組
+DEFAULT_PRELOAD = ('jobseeker.data_quality',)
+
+# 預設工作進程數上限（避免在大型主機上一次啟動過多進程）
+MAX_DEFAULT_WORKERS = 8
+
+# 每個工作進程快取的已解碼批次數量
+WORKER_BATCH_CACHE_SIZE = 4
+
+KIND_PICKLE = 'pickle'
+KIND_ARROW = 'arrow'
+
+
+class BatchHandle(NamedTuple):
+    """共享記憶體批次的可序列化參照（傳給工作進程）"""
+    name: str
+    size: int
+    kind: str
+
+
+class SharedBatch:
+    """
+    放在共享記憶體中的批次資料
+
+    由父進程建立並擁有，任務以 handle 參照；所有任務完成後呼叫 close 釋放。
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, size: int, kind: str):
+        self._shm = shm
+        self.handle = BatchHandle(shm.name, size, kind)
+
+    @classmethod
+    def _allocate(cls, size: int) -> shared_memory.SharedMemory:
+        # 零長度的共享記憶體無法建立
+        return shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+    @classmethod
+    def from_records(cls, records: Sequence[Any]) -> 'SharedBatch':
+        """以 pickle 協定 5 寫入記錄列表（tuple、dict 或可序列化物件）"""
+        payload = pickle.dumps(list(records), protocol=5)
+        shm = cls._allocate(len(payload))
+        shm.buf[:len(payload)] = payload
+        return cls(shm, len(payload), KIND_PICKLE)
+
+    @classmethod
+    def from_table(cls, table: 'pa.Table') -> 'SharedBatch':
+        """以 Arrow IPC 串流寫入表格，工作進程可零複製讀取"""
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError('pyarrow 未安裝，無法建立 Arrow 批次')
+        sink = pa.MockOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        size = sink.size()
+
+        shm = cls._allocate(size)
+        with pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf)) as stream:
+            with pa.ipc.new_stream(stream, table.schema) as writer:
+                writer.write_table(table)
+        return cls(shm, size, KIND_ARROW)
+
+    def load(self) -> Any:
+        """在目前進程讀取批次內容"""
+        return load_batch(self.handle)
+
+    def close(self):
+        """釋放共享記憶體"""
+        if self._shm is None:
+            return
+        _forget_batch(self.handle.name)
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+    def __enter__(self) -> 'SharedBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# 進程內已解碼批次的快取: name -> (shared_memory 或 None, 內容)
+_batch_cache: 'OrderedDict[str, Tuple[Optional[shared_memory.SharedMemory], Any]]' = OrderedDict()
+_batch_cache_lock = threading.Lock()
+
+
+def _release(shm: Optional[shared_memory.SharedMemory]):
+    if shm is None:
+        return
+    try:
+        shm.close()
+    except BufferError:
+        # 仍有 Arrow 陣列參照此區塊，交給垃圾回收
+        pass
+
+
+def _forget_batch(name: str):
+    with _batch_cache_lock:
+        entry = _batch_cache.pop(name, None)
+    if entry is not None:
+        _release(entry[0])
+
+
+def load_batch(handle: BatchHandle) -> Any:
+    """
+    讀取共享記憶體批次（工作進程中使用）
+
+    同一區塊在每個進程只解碼一次；pickle 批次解碼後立即解除映射，
+    Arrow 批次的表格直接參照共享記憶體，保留映射直到被快取淘汰。
+    """
+    with _batch_cache_lock:
+        entry = _batch_cache.get(handle.name)
+        if entry is not None:
+            _batch_cache.move_to_end(handle.name)
+            return entry[1]
+
+    shm = shared_memory.SharedMemory(name=handle.name)
+    if handle.kind == KIND_ARROW:
+        buffer = pa.py_buffer(shm.buf)[:handle.size]
+        value = pa.ipc.open_stream(buffer).read_all()
+        kept = shm
+    else:
+        with shm.buf[:handle.size] as view:
+            value = pickle.loads(view)
+        shm.close()
+        kept = None
+
+    evicted = []
+    with _batch_cache_lock:
+        _batch_cache[handle.name] = (kept, value)
+        while len(_batch_cache) > WORKER_BATCH_CACHE_SIZE:
+            evicted.append(_batch_cache.popitem(last=False)[1][0])
+    for old in evicted:
+        _release(old)
+    return value
+
+
+def split_ranges(total: int, parts: int) -> List[Tuple[int, int]]:
+    """將 [0, total) 切成最多 parts 段長度相近的連續區間"""
+    parts = max(1, min(parts, total))
+    size, extra = divmod(total, parts)
+    ranges = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _init_worker(preload: Tuple[str, ...]):
+    """工作進程初始化：預先導入模組"""
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def _ping(delay: float = 0.0) -> int:
+    if delay:
+        time.sleep(delay)
+    return os.getpid()
+
+
+def _default_workers() -> int:
+    configured = os.environ.get('JOBSEEKER_CPU_WORKERS', '').strip()
+    if configured.isdigit() and int(configured) > 0:
+        return int(configured)
+    return max(1, min(os.cpu_count() or 1, MAX_DEFAULT_WORKERS))
+
+
+def _default_context():
+    # 主進程有日誌、追蹤等背景線程，fork 可能複製到被持有的鎖，改用 forkserver / spawn
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class CPUExecutor:
+    """
+    CPU 工作進程池
+
+    Args:
+        max_workers: 工作進程數（預設為 CPU 核心數，最多 MAX_DEFAULT_WORKERS）
+        preload: 工作進程啟動時導入的模組
+        mp_context: multiprocessing 上下文（預設 forkserver，不支援時為 spawn）
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, preload: Iterable[str] = DEFAULT_PRELOAD,
+                 mp_context=None):
+        self.max_workers = max_workers or _default_workers()
+        self.preload = tuple(preload)
+        self.mp_context = mp_context or _default_context()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=self.mp_context,
+                    initializer=_init_worker,
+                    initargs=(self.preload,)
+                )
+            return self._pool
+
+    def _reset_pool(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def warm(self, timeout: float = 60.0) -> int:
+        """啟動所有工作進程並等待預先導入完成，返回已回應的進程數"""
+        pool = self._get_pool()
+        deadline = time.monotonic() + timeout
+        ready = set()
+        # 先就緒的進程會搶走任務，每輪讓任務稍作停留，直到每個進程都回應過
+        while len(ready) < self.max_workers and time.monotonic() < deadline:
+            futures = [pool.submit(_ping, 0.05) for _ in range(self.max_workers)]
+            ready.update(future.result() for future in futures)
+        return len(ready)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """提交任務（fn 與參數必須可序列化）；進程池損壞時重建一次"""
+        pool = self._get_pool()
+        try:
+            return pool.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            return self._get_pool().submit(fn, *args, **kwargs)
+
+    def map(self, fn: Callable, arguments: Iterable[Tuple]) -> List[Any]:
+        """以每組參數呼叫 fn，按提交順序返回結果"""
+        futures = [self.submit(fn, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """在工作進程中執行並等待結果，不阻塞事件循環"""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def shutdown(self, wait: bool = True):
+        """關閉進程池（之後提交任務會重新建立）"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> 'CPUExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+_cpu_executor: Optional[CPUExecutor] = None
+_cpu_executor_lock = threading.Lock()
+
+
+def get_cpu_executor() -> CPUExecutor:
+    """獲取全域 CPU 執行器（進程池在首次提交任務時才建立）"""
+    global _cpu_executor
+    with _cpu_executor_lock:
+        if _cpu_executor is None:
+            _cpu_executor = CPUExecutor()
+        return _cpu_executor
+
+
+def shutdown_cpu_executor(wait: bool = True):
+    """關閉全域 CPU 執行器"""
+    global _cpu_executor
+    with _cpu_executor_lock:
+        executor, _cpu_executor = _cpu_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown_cpu_executor)
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JobSpy 數據目錄與 Parquet 存儲
+以 SQLite 目錄記錄每次爬取，職位數據以 date/site 分區的 Parquet 檔案追加存放
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 存儲為可選功能
+    pa = None
+    pq = None
+
+try:
+    import duckdb
+except ImportError:  # DuckDB 查詢為可選功能
+    duckdb = None
+
+
+# 分區欄位（寫入目錄名稱，不寫入檔案內容）
+PARTITION_COLUMNS = ("date", "site")
+
+# 支援的過濾運算子
+FILTER_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+
+def parquet_available() -> bool:
+    """檢查是否可使用 Parquet 存儲"""
+    return pa is not None
+
+
+def duckdb_available() -> bool:
+    """檢查是否可使用 DuckDB 查詢"""
+    return duckdb is not None
+
+
+class DataCatalog:
+    """數據目錄（SQLite），取代每次重寫的 data_index.json"""
+
+    def __init__(self, db_path: Path, legacy_index: Optional[Path] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+        if legacy_index is not None:
+            self.import_legacy_index(legacy_index)
+
+    def _connection(self) -> sqlite3.Connection:
+        """取得目前執行緒的連線"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """建立目錄資料表"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scrapes ("
+                "scrape_id TEXT PRIMARY KEY, "
+                "site TEXT NOT NULL, "
+                "search_term TEXT, "
+                "location TEXT, "
+                "timestamp TEXT NOT NULL, "
+                "date TEXT NOT NULL, "
+                "total_records INTEGER NOT NULL DEFAULT 0, "
+                "created_at TEXT, "
+                "filepath TEXT NOT NULL, "
+                "format TEXT NOT NULL DEFAULT 'json', "
+                "custom_metadata TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scrapes_site_date ON scrapes(site, date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scrapes_date ON scrapes(date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scrapes_search_term ON scrapes(search_term)")
+
+    def add(self, filepath: Path, metadata: Dict, format: str = "json"):
+        """新增一筆爬取紀錄"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scrapes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    metadata["scrape_id"],
+                    metadata["site"],
+                    metadata.get("search_term"),
+                    metadata.get("location"),
+                    metadata["timestamp"],
+                    metadata["timestamp"][:8],
+                    metadata.get("total_records", 0),
+                    metadata.get("created_at"),
+                    str(filepath),
+                    format,
+                    json.dumps(metadata.get("custom_metadata") or {}, ensure_ascii=False, default=str),
+                ),
+            )
+
+    def import_legacy_index(self, index_file: Path) -> int:
+        """
+        從舊版 data_index.json 匯入紀錄（目錄為空時才執行）
+
+        Returns:
+            匯入的紀錄數
+        """
+        index_file = Path(index_file)
+        if not index_file.exists() or self.count() > 0:
+            return 0
+
+        with open(index_file, "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+        imported = 0
+        for scrape_id, file_info in index.get("files", {}).items():
+            self.add(file_info["filepath"], dict(file_info, scrape_id=scrape_id), format="json")
+            imported += 1
+        return imported
+
+    def count(self) -> int:
+        """目錄中的紀錄數"""
+        return self._connection().execute("SELECT COUNT(*) FROM scrapes").fetchone()[0]
+
+    def find(
+        self,
+        site: Optional[str] = None,
+        date: Optional[str] = None,
+        search_term: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        依條件查詢爬取紀錄（條件之間為 AND）
+
+        Args:
+            site: 網站
+            date: 日期 (YYYYMMDD)
+            search_term: 搜尋詞
+            date_from: 起始日期 (YYYYMMDD，含)
+            date_to: 結束日期 (YYYYMMDD，含)
+        """
+        clauses, params = [], []
+        for column, operator, value in (
+            ("site", "=", site),
+            ("date", "=", date),
+            ("search_term", "=", search_term),
+            ("date", ">=", date_from),
+            ("date", "<=", date_to),
+        ):
+            if value:
+                clauses.append(f"{column} {operator} ?")
+                params.append(value)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"SELECT * FROM scrapes {where} ORDER BY timestamp", params
+        ).fetchall()
+        return [self._row_to_info(row) for row in rows]
+
+    @staticmethod
+    def _row_to_info(row: sqlite3.Row) -> Dict:
+        """資料列轉為檔案資訊（欄位與舊版索引相同）"""
+        return {
+            "scrape_id": row["scrape_id"],
+            "filepath": row["filepath"],
+            "format": row["format"],
+            "site": row["site"],
+            "search_term": row["search_term"],
+            "location": row["location"],
+            "timestamp": row["timestamp"],
+            "total_records": row["total_records"],
+            "created_at": row["created_at"],
+        }
+
+    def distinct(self, column: str) -> List[str]:
+        """列出欄位的所有值（site、date、search_term）"""
+        if column not in ("site", "date", "search_term"):
+            raise ValueError(f"不支援的欄位: {column}")
+        rows = self._connection().execute(
+            f"SELECT DISTINCT {column} FROM scrapes WHERE {column} IS NOT NULL ORDER BY {column}"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def summary(self) -> Dict:
+        """數據摘要"""
+        row = self._connection().execute(
+            "SELECT COUNT(*) AS total_files, COALESCE(SUM(total_records), 0) AS total_records, "
+            "MIN(date) AS earliest, MAX(date) AS latest FROM scrapes"
+        ).fetchone()
+        return {
+            "total_files": row["total_files"],
+            "total_records": row["total_records"],
+            "sites": self.distinct("site"),
+            "date_range": {"earliest": row["earliest"], "latest": row["latest"]},
+        }
+
+    def site_statistics(self) -> Dict:
+        """各網站統計"""
+        rows = self._connection().execute(
+            "SELECT site, COUNT(*) AS file_count, COALESCE(SUM(total_records), 0) AS total_records "
+            "FROM scrapes GROUP BY site"
+        ).fetchall()
+        return {
+            row["site"]: {
+                "file_count": row["file_count"],
+                "total_records": row["total_records"],
+                "avg_records_per_file": row["total_records"] / row["file_count"] if row["file_count"] else 0,
+            }
+            for row in rows
+        }
+
+    def remove_before(self, date: str) -> int:
+        """移除早於指定日期 (YYYYMMDD) 的紀錄"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM scrapes WHERE date < ?", (date,))
+        return cursor.rowcount
+
+
+class ParquetJobStore:
+    """以 date=YYYYMMDD/site=xxx 分區存放職位數據的 Parquet 存儲"""
+
+    def __init__(self, root: Path, compression: str = "zstd"):
+        self.root = Path(root)
+        self.compression = compression
+
+    def partition_dir(self, date: str, site: str) -> Path:
+        """分區目錄"""
+        return self.root / f"date={date}" / f"site={site}"
+
+    def append(self, date: str, site: str, scrape_id: str, jobs: List[Dict], extra: Optional[Dict] = None) -> Path:
+        """
+        追加一次爬取的職位到對應分區（每次爬取一個檔案，不改寫既有檔案）
+
+        Args:
+            date: 日期 (YYYYMMDD)
+            site: 網站
+            scrape_id: 爬取 ID（作為檔名）
+            jobs: 職位字典列表
+            extra: 每列附加的欄位（例如 search_term、location）
+
+        Returns:
+            寫入的檔案路徑
+        """
+        if pa is None:
+            raise RuntimeError("Parquet 存儲需要安裝 pyarrow")
+
+        records = [dict(job, **(extra or {}), scrape_id=scrape_id) for job in jobs]
+        table = pa.Table.from_pylist(self._normalize_records(records))
+
+        directory = self.partition_dir(date, site)
+        directory.mkdir(parents=True, exist_ok=True)
+        filepath = directory / f"{scrape_id}.parquet"
+        pq.write_table(table, filepath, compression=self.compression)
+        return filepath
+
+    @staticmethod
+    def _normalize_records(records: List[Dict]) -> List[Dict]:
+        """
+        轉為 Arrow 可推斷的欄位型別:
+        巢狀結構序列化為 JSON 字串，型別混雜的欄位統一為字串，分區欄位改名避免衝突
+        """
+        normalized = []
+        column_types: Dict[str, set] = {}
+        for record in records:
+            row = {}
+            for key, value in record.items():
+                if key in PARTITION_COLUMNS:
+                    key = f"job_{key}"
+                if isinstance(value, (dict, list, tuple, set)):
+                    value = json.dumps(list(value) if isinstance(value, (tuple, set)) else value,
+                                       ensure_ascii=False, default=str)
+                elif value is not None and not isinstance(value, (str, bool, int, float)):
+                    value = str(value)
+                if value is not None:
+                    column_types.setdefault(key, set()).add(type(value))
+                row[key] = value
+            normalized.append(row)
+
+        mixed = {
+            key for key, types in column_types.items()
+            if len(types) > 1 and types != {int, float}
+        }
+        if mixed:
+            for row in normalized:
+                for key in mixed:
+                    if row.get(key) is not None:
+                        row[key] = str(row[key])
+        return normalized
+
+    def read(
+        self,
+        files: Sequence[str],
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+    ):
+        """
+        讀取指定檔案，欄位與條件下推至 Parquet 讀取層
+
+        Args:
+            files: Parquet 檔案路徑（通常由 DataCatalog 篩選）
+            columns: 只讀取的欄位
+            filters: [(欄位, 運算子, 值), ...]，條件之間為 AND
+
+        Returns:
+            pandas.DataFrame
+        """
+        if pa is None:
+            raise RuntimeError("Parquet 查詢需要安裝 pyarrow")
+
+        partition_filters = [f for f in (filters or []) if f[0] in PARTITION_COLUMNS]
+        column_filters = [f for f in (filters or []) if f[0] not in PARTITION_COLUMNS]
+
+        tables = []
+        for filepath in files:
+            parts = self._partition_values(filepath)
+            if not all(self._compare(parts.get(column), operator, value)
+                       for column, operator, value in partition_filters):
+                continue
+
+            available = set(pq.read_schema(filepath).names)
+            if any(column not in available for column, _, _ in column_filters):
+                # 過濾欄位不存在於此檔案，不可能有符合的列
+                continue
+            # 檔案缺少的欄位不讀取，合併時補空值
+            file_columns = [c for c in columns if c in available] if columns else None
+            table = pq.read_table(filepath, columns=file_columns, filters=column_filters or None)
+            tables.append(self._with_partition_columns(table, parts, columns))
+
+        if not tables:
+            return pa.table({c: pa.array([], pa.null()) for c in (columns or [])}).to_pandas()
+        return pa.concat_tables(tables, promote_options="permissive").to_pandas()
+
+    @staticmethod
+    def _partition_values(filepath: str) -> Dict[str, str]:
+        """由目錄名稱取得分區值"""
+        return dict(part.split("=", 1) for part in Path(filepath).parent.parts[-2:] if "=" in part)
+
+    @staticmethod
+    def _compare(actual: Optional[str], operator: str, expected: Any) -> bool:
+        """比較分區值（以字串比較）"""
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"不支援的運算子: {operator}")
+        if actual is None:
+            return False
+        if operator in ("in", "not in"):
+            contained = actual in {str(value) for value in expected}
+            return contained if operator == "in" else not contained
+        expected = str(expected)
+        return {
+            "=": actual == expected,
+            "!=": actual != expected,
+            "<": actual < expected,
+            "<=": actual <= expected,
+            ">": actual > expected,
+            ">=": actual >= expected,
+        }[operator]
+
+    @staticmethod
+    def _with_partition_columns(table, parts: Dict[str, str], columns: Optional[List[str]]):
+        """由目錄名稱補上分區欄位"""
+        for name in PARTITION_COLUMNS:
+            if name in parts and (columns is None or name in columns) and name not in table.column_names:
+                table = table.append_column(name, pa.array([parts[name]] * table.num_rows, pa.string()))
+        return table
+
+    def query_duckdb(
+        self,
+        files: Sequence[str],
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+    ):
+        """
+        以 DuckDB 讀取指定檔案（欄位聯集、hive 分區欄位自動帶入）
+
+        Returns:
+            pandas.DataFrame
+        """
+        if duckdb is None:
+            raise RuntimeError("DuckDB 查詢需要安裝 duckdb")
+
+        select = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+        where, params = [], []
+        for column, operator, value in filters or []:
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"不支援的運算子: {operator}")
+            if operator in ("in", "not in"):
+                values = list(value)
+                where.append(f'"{column}" {operator.upper()} ({", ".join("?" for _ in values)})')
+                params.extend(values)
+            else:
+                where.append(f'"{column}" {operator} ?')
+                params.append(value)
+
+        sql = (
+            f"SELECT {select} FROM read_parquet(?, union_by_name=true, hive_partitioning=true)"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+        )
+        with duckdb.connect() as conn:
+            return conn.execute(sql, [list(files)] + params).df()
+
+    def storage_size(self) -> int:
+        """Parquet 檔案總大小（位元組）"""
+        return sum(path.stat().st_size for path in self.root.rglob("*.parquet"))
+
+    def iter_partitions(self) -> Iterable[Path]:
+        """列出日期分區目錄"""
+        if not self.root.exists():
+            return []
+        return sorted(path for path in self.root.iterdir() if path.is_dir() and path.name.startswith("date="))
@@ -17,6 +17,8 @@ import uuid
 import pandas as pd
 from collections import defaultdict
 
+from .data_catalog import DataCatalog, ParquetJobStore, parquet_available
+
 @dataclass
 class DataMetadata:
     """數據元數據"""
@@ -52,16 +54,26 @@ class JobData:
 class DataManager:
     """數據管理器"""
     
-    def __init__(self, base_dir: str = "data"):
+    def __init__(self, base_dir: str = "data", storage_format: Optional[str] = None):
         self.base_dir = Path(base_dir)
         self.setup_directories()
         self.load_config()
+        if storage_format:
+            self.config["storage_format"] = storage_format
+        
+        # 數據目錄（首次使用時匯入舊版 data_index.json）
+        self.catalog = DataCatalog(
+            self.base_dir / "index" / "catalog.db",
+            legacy_index=self.base_dir / "index" / "data_index.json"
+        )
+        self.parquet_store = ParquetJobStore(self.base_dir / "raw" / "parquet")
     
     def setup_directories(self):
         """創建目錄結構"""
         directories = [
             "raw/by_date",
             "raw/by_site", 
+            "raw/parquet",
             "processed/csv",
             "processed/json",
             "processed/combined",
@@ -83,6 +95,8 @@ class DataManager:
             "naming_convention": "{site}_{term}_{location}_{timestamp}",
             "timestamp_format": "%Y%m%d_%H%M%S",
             "supported_formats": ["json", "csv", "xlsx"],
+            # 原始數據存儲格式：parquet（需 pyarrow）或 json
+            "storage_format": "parquet" if parquet_available() else "json",
             "retention_days": 30,
             "compression": True,
             "max_file_size_mb": 100
@@ -122,48 +136,43 @@ class DataManager:
         clean_term = self.sanitize_filename(search_term)
         clean_location = self.sanitize_filename(location)
         
-        # 構建文件名
-        filename = f"{site}_{clean_term}_{clean_location}_{timestamp}.json"
-        
-        # 按日期分類的目錄
-        date_dir = self.base_dir / "raw" / "by_date" / timestamp[:8] / site
-        date_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 按網站分類的目錄
-        site_dir = self.base_dir / "raw" / "by_site" / site
-        site_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 準備數據
-        file_data = {
-            "metadata": {
-                "scrape_id": scrape_id,
-                "site": site,
-                "search_term": search_term,
-                "location": location,
-                "timestamp": timestamp,
-                "total_records": len(data),
-                "scraper_version": "1.0.0",
-                "created_at": datetime.now().isoformat(),
-                "custom_metadata": metadata or {}
-            },
-            "jobs": data
+        # 準備元數據
+        file_metadata = {
+            "scrape_id": scrape_id,
+            "site": site,
+            "search_term": search_term,
+            "location": location,
+            "timestamp": timestamp,
+            "total_records": len(data),
+            "scraper_version": "1.0.0",
+            "created_at": datetime.now().isoformat(),
+            "custom_metadata": metadata or {}
         }
         
-        # 保存到按日期分類的目錄
-        date_filepath = date_dir / filename
-        with open(date_filepath, 'w', encoding='utf-8') as f:
-            json.dump(file_data, f, ensure_ascii=False, indent=2)
-        
-        # 保存到按網站分類的目錄
-        site_filepath = site_dir / filename
-        with open(site_filepath, 'w', encoding='utf-8') as f:
-            json.dump(file_data, f, ensure_ascii=False, indent=2)
+        if self.config["storage_format"] == "parquet":
+            # 追加到 date/site 分區的 Parquet 數據集
+            filepath = self.parquet_store.append(
+                date=timestamp[:8],
+                site=site,
+                scrape_id=scrape_id,
+                jobs=data,
+                extra={"search_term": search_term, "location": location}
+            )
+        else:
+            # 按日期分類的目錄（網站分類改由數據目錄查詢）
+            filename = f"{site}_{clean_term}_{clean_location}_{timestamp}.json"
+            date_dir = self.base_dir / "raw" / "by_date" / timestamp[:8] / site
+            date_dir.mkdir(parents=True, exist_ok=True)
+            
+            filepath = date_dir / filename
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump({"metadata": file_metadata, "jobs": data}, f, ensure_ascii=False, default=str)
         
         # 更新索引
-        self.update_index(date_filepath, file_data["metadata"])
+        self.update_index(filepath, file_metadata)
         
-        print(f"✅ 原始數據已保存: {date_filepath}")
-        return str(date_filepath)
+        print(f"✅ 原始數據已保存: {filepath}")
+        return str(filepath)
     
     def save_processed_data(
         self, 
@@ -227,64 +236,17 @@ class DataManager:
         return str(filepath)
     
     def update_index(self, filepath: Path, metadata: Dict):
-        """更新數據索引"""
-        index_file = self.base_dir / "index" / "data_index.json"
-        
-        # 加載現有索引
-        if index_file.exists():
-            with open(index_file, 'r', encoding='utf-8') as f:
-                index = json.load(f)
-        else:
-            index = {
-                "total_files": 0,
-                "by_site": defaultdict(list),
-                "by_date": defaultdict(list),
-                "by_search_term": defaultdict(list),
-                "files": {}
-            }
-        
-        # 更新索引
-        file_info = {
-            "filepath": str(filepath),
-            "site": metadata["site"],
-            "search_term": metadata["search_term"],
-            "location": metadata["location"],
-            "timestamp": metadata["timestamp"],
-            "total_records": metadata["total_records"],
-            "created_at": metadata["created_at"]
-        }
-        
-        index["total_files"] += 1
-        index["by_site"][metadata["site"]].append(file_info)
-        index["by_date"][metadata["timestamp"][:8]].append(file_info)
-        index["by_search_term"][metadata["search_term"]].append(file_info)
-        index["files"][metadata["scrape_id"]] = file_info
-        
-        # 保存索引
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        """更新數據索引（單筆寫入數據目錄）"""
+        format = "parquet" if Path(filepath).suffix == ".parquet" else "json"
+        self.catalog.add(filepath, metadata, format=format)
     
     def get_data_by_site(self, site: str) -> List[Dict]:
         """根據網站獲取數據"""
-        index_file = self.base_dir / "index" / "data_index.json"
-        if not index_file.exists():
-            return []
-        
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
-        return index.get("by_site", {}).get(site, [])
+        return self.catalog.find(site=site)
     
     def get_data_by_date(self, date: str) -> List[Dict]:
         """根據日期獲取數據"""
-        index_file = self.base_dir / "index" / "data_index.json"
-        if not index_file.exists():
-            return []
-        
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
-        return index.get("by_date", {}).get(date, [])
+        return self.catalog.find(date=date)
     
     def cleanup_old_data(self, days: Optional[int] = None):
         """清理舊數據"""
@@ -307,6 +269,19 @@ class DataManager:
                 shutil.move(str(date_dir), str(archive_dir))
                 archived_count += 1
         
+        # Parquet 分區（date=YYYYMMDD）
+        for partition_dir in self.parquet_store.iter_partitions():
+            if partition_dir.name.split("=", 1)[1] < cutoff_str:
+                archive_dir = self.base_dir / "archive" / "parquet" / partition_dir.name
+                if archive_dir.exists():
+                    shutil.rmtree(archive_dir)
+                archive_dir.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(partition_dir), str(archive_dir))
+                archived_count += 1
+        
+        # 已歸檔的數據不再出現在數據目錄中
+        self.catalog.remove_before(cutoff_str)
+        
         print(f"✅ 已歸檔 {archived_count} 個舊數據目錄")
         return archived_count
     
@@ -333,47 +308,11 @@ class DataManager:
     
     def get_data_summary(self) -> Dict:
         """獲取數據摘要"""
-        index_file = self.base_dir / "index" / "data_index.json"
-        if not index_file.exists():
-            return {"total_files": 0, "total_records": 0}
-        
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
-        total_records = sum(
-            file_info.get("total_records", 0) 
-            for file_info in index.get("files", {}).values()
-        )
-        
-        return {
-            "total_files": index.get("total_files", 0),
-            "total_records": total_records,
-            "sites": list(index.get("by_site", {}).keys()),
-            "date_range": {
-                "earliest": min(index.get("by_date", {}).keys()) if index.get("by_date") else None,
-                "latest": max(index.get("by_date", {}).keys()) if index.get("by_date") else None
-            }
-        }
+        return self.catalog.summary()
     
     def get_site_statistics(self) -> Dict:
         """獲取網站統計"""
-        index_file = self.base_dir / "index" / "data_index.json"
-        if not index_file.exists():
-            return {}
-        
-        with open(index_file, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
-        stats = {}
-        for site, files in index.get("by_site", {}).items():
-            total_records = sum(file_info.get("total_records", 0) for file_info in files)
-            stats[site] = {
-                "file_count": len(files),
-                "total_records": total_records,
-                "avg_records_per_file": total_records / len(files) if files else 0
-            }
-        
-        return stats
+        return self.catalog.site_statistics()
     
     def get_storage_info(self) -> Dict:
         """獲取存儲信息"""
@@ -7,9 +7,10 @@ from __future__ import annotations
 
 import re
 import hashlib
+import string
 import unicodedata
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Set, Tuple, Union
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 from urllib.parse import urlparse
@@ -17,6 +18,71 @@ from difflib import SequenceMatcher
 
 from jobseeker.model import JobPost, JobResponse, JobType, CompensationInterval, Location
 from jobseeker.enhanced_logging import get_enhanced_logger, LogCategory
+from jobseeker.cpu_executor import CPUExecutor, SharedBatch, load_batch, split_ranges
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# 少於此數量的欄位值逐筆處理即可，轉換成 Arrow 陣列不划算
+BATCH_ARROW_MIN_ROWS = 64
+
+# 設定 CPU 執行器時，達到此職位數才分散到工作進程（小批次的進程間傳遞成本高於收益）
+PARALLEL_MIN_JOBS = 2000
+
+_ASCII_UPPERCASE = string.ascii_uppercase.encode('ascii')
+
+# 與 Python str 模式的 \s 完全相同的空白字元集合（RE2 的 \s 只含 ASCII）
+_ARROW_WHITESPACE = r'[\t-\r\x{1c}-\x{20}\x{85}\p{Z}]+'
+
+
+# ASCII 文字中「同一字符連續 5 次」（等同 (.)\1{4,}）的無反向引用寫法，供 RE2 使用
+_ARROW_ASCII_REPEAT = '|'.join(f'\\x{{{code:02x}}}{{5}}' for code in range(128) if code != 10)
+
+
+def _count_upper(text: str) -> int:
+    """計算大寫字母數（ASCII 文字以 bytes.translate 在 C 層完成）"""
+    if text.isascii():
+        data = text.encode('ascii')
+        return len(data) - len(data.translate(None, _ASCII_UPPERCASE))
+    return sum(map(str.isupper, text))
+
+
+def _job_company(job: JobPost) -> Optional[str]:
+    """職位的公司名稱（JobPost 欄位為 company_name）"""
+    company = getattr(job, 'company_name', None)
+    return company if company is not None else getattr(job, 'company', None)
+
+
+def _set_job_company(job: JobPost, value: str):
+    if hasattr(job, 'company_name'):
+        job.company_name = value
+    else:
+        job.company = value
+
+
+def _set_job_title(job: JobPost, value: str):
+    job.title = value
+
+
+def _set_job_description(job: JobPost, value: str):
+    job.description = value
+
+
+# (標題, 公司, 描述) 文字列的欄位名稱與寫回函數
+_TEXT_COLUMNS = (('title', _set_job_title), ('company', _set_job_company), ('description', _set_job_description))
+
+
+def _text_row(job: JobPost) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    return job.title, _job_company(job), job.description
+
+
+def _similarity_input(job: JobPost) -> Tuple[Optional[str], Optional[str], str, Optional[str]]:
+    return job.title, _job_company(job), str(job.location or ''), job.description
 
 
 class DataQualityIssue(Enum):
@@ -80,6 +146,13 @@ class TextCleaner:
             r'\b(?:no experience|no skills required)\b'
         ]
         
+        # 合併為單一預編譯交替式，每段文字只掃描一次
+        self.spam_alternation = '|'.join(f'(?:{pattern})' for pattern in self.spam_patterns)
+        self.spam_pattern = re.compile(self.spam_alternation, re.IGNORECASE)
+        
+        # 重複字符模式
+        self.repeated_char_pattern = re.compile(r'(.)\1{4,}')
+        
         # HTML 標籤模式
         self.html_pattern = re.compile(r'<[^>]+>')
         
@@ -100,8 +173,9 @@ class TextCleaner:
         if remove_html:
             text = self.html_pattern.sub(' ', text)
         
-        # 正規化 Unicode
-        text = unicodedata.normalize('NFKC', text)
+        # 正規化 Unicode（ASCII 文字 NFKC 後不變，跳過）
+        if not text.isascii():
+            text = unicodedata.normalize('NFKC', text)
         
         # 移除特殊字符
         if remove_special_chars:
@@ -118,24 +192,72 @@ class TextCleaner:
         if not text:
             return False
         
-        text_lower = text.lower()
-        
-        for pattern in self.spam_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return True
+        if self.spam_pattern.search(text.lower()):
+            return True
         
         # 檢查過多的大寫字母
         if len(text) > 20:
-            upper_ratio = sum(1 for c in text if c.isupper()) / len(text)
+            upper_ratio = _count_upper(text) / len(text)
             if upper_ratio > 0.7:
                 return True
         
         # 檢查重複字符
-        if re.search(r'(.)\1{4,}', text):
+        if self.repeated_char_pattern.search(text):
             return True
         
         return False
     
+    def clean_batch(self, values: List[Optional[str]]) -> List[str]:
+        """
+        批次清理一欄文字，結果與逐筆 clean_text（預設參數）相同
+        
+        安裝 pyarrow 時以 Arrow 字串運算整欄處理，NFKC 只套用在非 ASCII 的值
+        """
+        if not PYARROW_AVAILABLE or len(values) < BATCH_ARROW_MIN_ROWS:
+            return [self.clean_text(value) for value in values]
+        
+        array = pa.array([value if isinstance(value, str) else None for value in values], type=pa.string())
+        array = pc.replace_substring_regex(array, pattern=self.html_pattern.pattern, replacement=' ')
+        
+        non_ascii = pc.invert(pc.string_is_ascii(array))
+        non_ascii_indices = pc.indices_nonzero(pc.fill_null(non_ascii, False))
+        if len(non_ascii_indices):
+            normalized = pc.utf8_normalize(pc.take(array, non_ascii_indices), form='NFKC')
+            array = pc.replace_with_mask(array, pc.fill_null(non_ascii, False), normalized)
+        
+        array = pc.replace_substring_regex(array, pattern=_ARROW_WHITESPACE, replacement=' ')
+        array = pc.utf8_trim(array, characters=' ')
+        return pc.fill_null(array, '').to_pylist()
+    
+    def detect_spam_batch(self, texts: List[Optional[str]]) -> List[bool]:
+        """
+        批次檢測垃圾內容，結果與逐筆 detect_spam 相同
+        
+        ASCII 文字以 Arrow 向量化判斷（此時 RE2 與 Python 正則語意一致），
+        重複字符改寫為逐字元交替式；非 ASCII 文字仍以預編譯正則逐筆檢查
+        """
+        if not PYARROW_AVAILABLE or len(texts) < BATCH_ARROW_MIN_ROWS:
+            return [self.detect_spam(text) for text in texts]
+        
+        array = pa.array([text if isinstance(text, str) and text else None for text in texts], type=pa.string())
+        lengths = pc.binary_length(array)
+        upper_ratio = pc.divide(pc.cast(pc.count_substring_regex(array, pattern='[A-Z]'), pa.float64()),
+                                pc.cast(lengths, pa.float64()))
+        spam = pc.or_(
+            pc.or_(
+                pc.match_substring_regex(array, pattern=self.spam_alternation, ignore_case=True),
+                pc.and_(pc.greater(lengths, 20), pc.greater(upper_ratio, 0.7))
+            ),
+            pc.match_substring_regex(array, pattern=_ARROW_ASCII_REPEAT)
+        )
+        is_ascii = pc.fill_null(pc.string_is_ascii(array), False).to_pylist()
+        spam = pc.fill_null(spam, False).to_pylist()
+        
+        return [
+            flag if ascii_text else bool(text) and isinstance(text, str) and self.detect_spam(text)
+            for text, ascii_text, flag in zip(texts, is_ascii, spam)
+        ]
+    
     def extract_keywords(self, text: str, min_length: int = 3) -> List[str]:
         """提取關鍵詞"""
         if not text:
@@ -261,7 +383,8 @@ class DataValidator:
         if not job.title or not job.title.strip():
             issues.append(DataQualityIssue.MISSING_REQUIRED_FIELD)
         
-        if not job.company or not job.company.strip():
+        company = _job_company(job)
+        if not company or not company.strip():
             issues.append(DataQualityIssue.MISSING_REQUIRED_FIELD)
         
         # 驗證 URL
@@ -294,22 +417,87 @@ class DataValidator:
             issues.append(DataQualityIssue.INVALID_DATE)
         
         return issues
+    
+    def count_issues(self, jobs: List[JobPost]) -> Dict[DataQualityIssue, int]:
+        """
+        按欄位批次驗證，結果與逐筆 validate_job_post 的問題計數相同
+        
+        URL 驗證結果依值快取（同一公司的 company_url 常重複出現），
+        日期欄位為 date 物件時直接與本批次的時間範圍比較，不必逐格式解析
+        """
+        counts = {issue: 0 for issue in DataQualityIssue}
+        
+        # 必填欄位
+        counts[DataQualityIssue.MISSING_REQUIRED_FIELD] = (
+            sum(1 for job in jobs if not job.title or not job.title.strip())
+            + sum(1 for company in map(_job_company, jobs) if not company or not company.strip())
+        )
+        
+        # URL
+        url_validity: Dict[str, bool] = {}
+        invalid_urls = 0
+        for field in ('job_url', 'job_url_direct', 'company_url'):
+            for url in (getattr(job, field, None) for job in jobs):
+                if not url:
+                    continue
+                valid = url_validity.get(url)
+                if valid is None:
+                    valid = url_validity[url] = self.validate_url(url)
+                if not valid:
+                    invalid_urls += 1
+        counts[DataQualityIssue.INVALID_URL] = invalid_urls
+        
+        # 電子郵件
+        counts[DataQualityIssue.INVALID_EMAIL] = sum(
+            1 for job in jobs if job.emails for email in job.emails if not self.validate_email(email)
+        )
+        
+        # 薪資
+        counts[DataQualityIssue.INVALID_SALARY] = sum(
+            1 for job in jobs
+            if job.compensation and not self.validate_salary(
+                job.compensation.min_amount, job.compensation.max_amount, job.compensation.interval
+            )
+        )
+        
+        # 日期
+        now = datetime.now()
+        latest, earliest = now + timedelta(days=365), now - timedelta(days=365*5)
+        invalid_dates = 0
+        for value in (job.date_posted for job in jobs):
+            if not value:
+                continue
+            if isinstance(value, date) and not isinstance(value, datetime):
+                posted = datetime(value.year, value.month, value.day)
+                valid = earliest <= posted <= latest
+            else:
+                valid = self.validate_date(str(value))
+            if not valid:
+                invalid_dates += 1
+        counts[DataQualityIssue.INVALID_DATE] = invalid_dates
+        
+        return counts
 
 
 class DuplicateDetector:
     """重複檢測器"""
     
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(self, similarity_threshold: float = 0.85, executor: Optional[CPUExecutor] = None,
+                 parallel_min_jobs: int = PARALLEL_MIN_JOBS):
         self.similarity_threshold = similarity_threshold
         self.logger = get_enhanced_logger("duplicate_detector")
         self.text_cleaner = TextCleaner()
+        # 設定後大量職位的兩兩比較分散到工作進程
+        self.executor = executor
+        self.parallel_min_jobs = parallel_min_jobs
     
     def generate_job_hash(self, job: JobPost) -> str:
         """生成職位雜湊值"""
         # 使用關鍵欄位生成雜湊
+        company = _job_company(job)
         key_fields = [
             job.title.lower().strip() if job.title else '',
-            job.company.lower().strip() if job.company else '',
+            company.lower().strip() if company else '',
             str(job.location).lower().strip() if job.location else ''
         ]
         
@@ -322,29 +510,21 @@ class DuplicateDetector:
         combined = '|'.join(cleaned_fields)
         return hashlib.md5(combined.encode()).hexdigest()
     
-    def calculate_similarity(self, job1: JobPost, job2: JobPost) -> float:
-        """計算兩個職位的相似度"""
-        # 標題相似度
-        title1 = self.text_cleaner.clean_text(job1.title or '', remove_special_chars=True)
-        title2 = self.text_cleaner.clean_text(job2.title or '', remove_special_chars=True)
-        title_sim = SequenceMatcher(None, title1.lower(), title2.lower()).ratio()
-        
-        # 公司相似度
-        company1 = self.text_cleaner.clean_text(job1.company or '', remove_special_chars=True)
-        company2 = self.text_cleaner.clean_text(job2.company or '', remove_special_chars=True)
-        company_sim = SequenceMatcher(None, company1.lower(), company2.lower()).ratio()
-        
-        # 地點相似度
-        location1 = str(job1.location or '').lower()
-        location2 = str(job2.location or '').lower()
-        location_sim = SequenceMatcher(None, location1, location2).ratio()
+    def _similarity_fields(self, job: JobPost) -> Tuple[str, str, str, Optional[str]]:
+        """相似度比較用的清理後欄位（標題、公司、地點、描述前 500 字）"""
+        return _similarity_values(self.text_cleaner, *_similarity_input(job))
+    
+    @staticmethod
+    def _weighted_similarity(fields1: Tuple[str, str, str, Optional[str]],
+                             fields2: Tuple[str, str, str, Optional[str]]) -> float:
+        title_sim = SequenceMatcher(None, fields1[0], fields2[0]).ratio()
+        company_sim = SequenceMatcher(None, fields1[1], fields2[1]).ratio()
+        location_sim = SequenceMatcher(None, fields1[2], fields2[2]).ratio()
         
         # 描述相似度（如果有的話）
         desc_sim = 0.0
-        if job1.description and job2.description:
-            desc1 = self.text_cleaner.clean_text(job1.description, remove_special_chars=True)[:500]
-            desc2 = self.text_cleaner.clean_text(job2.description, remove_special_chars=True)[:500]
-            desc_sim = SequenceMatcher(None, desc1.lower(), desc2.lower()).ratio()
+        if fields1[3] is not None and fields2[3] is not None:
+            desc_sim = SequenceMatcher(None, fields1[3], fields2[3]).ratio()
         
         # 加權平均
         weights = [0.4, 0.3, 0.2, 0.1]  # 標題、公司、地點、描述
@@ -353,17 +533,46 @@ class DuplicateDetector:
         weighted_sim = sum(w * s for w, s in zip(weights, similarities))
         return weighted_sim
     
+    @staticmethod
+    def _length_bound(fields1: Tuple[str, str, str, Optional[str]],
+                      fields2: Tuple[str, str, str, Optional[str]]) -> float:
+        """只依字串長度估計的相似度上限（ratio 不會超過此值）"""
+        def bound(a: str, b: str) -> float:
+            total = len(a) + len(b)
+            return 2.0 * min(len(a), len(b)) / total if total else 1.0
+        
+        desc_bound = bound(fields1[3], fields2[3]) if fields1[3] is not None and fields2[3] is not None else 0.0
+        return (0.4 * bound(fields1[0], fields2[0]) + 0.3 * bound(fields1[1], fields2[1])
+                + 0.2 * bound(fields1[2], fields2[2]) + 0.1 * desc_bound)
+    
+    def calculate_similarity(self, job1: JobPost, job2: JobPost) -> float:
+        """計算兩個職位的相似度"""
+        return self._weighted_similarity(self._similarity_fields(job1), self._similarity_fields(job2))
+    
     def find_duplicates(self, jobs: List[JobPost]) -> List[Tuple[int, int, float]]:
-        """找出重複的職位"""
-        duplicates = []
+        """找出重複的職位（每個職位只清理一次，長度上限不足門檻的配對直接跳過）"""
+        if self.executor is not None and len(jobs) >= max(self.parallel_min_jobs, 2):
+            return self._find_duplicates_parallel(jobs)
         
-        for i in range(len(jobs)):
-            for j in range(i + 1, len(jobs)):
-                similarity = self.calculate_similarity(jobs[i], jobs[j])
-                if similarity >= self.similarity_threshold:
-                    duplicates.append((i, j, similarity))
-        
-        return duplicates
+        fields = [self._similarity_fields(job) for job in jobs]
+        return _similar_pairs(fields, self.similarity_threshold, range(len(jobs)))
+    
+    def _find_duplicates_parallel(self, jobs: List[JobPost]) -> List[Tuple[int, int, float]]:
+        """在工作進程中計算欄位與兩兩相似度，結果與 find_duplicates 逐筆計算相同"""
+        executor = self.executor
+        with SharedBatch.from_records([_similarity_input(job) for job in jobs]) as batch:
+            parts = executor.map(_similarity_fields_task, [
+                (batch.handle, start, stop) for start, stop in split_ranges(len(jobs), executor.max_workers)
+            ])
+        fields = [item for part in parts for item in part]
+        
+        # 第 i 列需比較 n-i-1 對，交錯分配列號讓各任務的工作量相近
+        stripes = executor.max_workers * 2
+        with SharedBatch.from_records(fields) as batch:
+            parts = executor.map(_similar_pairs_task, [
+                (batch.handle, offset, stripes, self.similarity_threshold) for offset in range(stripes)
+            ])
+        return sorted(pair for part in parts for pair in part)
     
     def remove_duplicates(self, jobs: List[JobPost]) -> Tuple[List[JobPost], int]:
         """移除重複的職位"""
@@ -428,7 +637,7 @@ class DuplicateDetector:
         
         # 基本資訊
         if job.title: score += 1
-        if job.company: score += 1
+        if _job_company(job): score += 1
         if job.location: score += 1
         if job.description: score += 2
         
@@ -442,26 +651,131 @@ class DuplicateDetector:
         return score
 
 
+def _similarity_values(cleaner: TextCleaner, title: Optional[str], company: Optional[str], location: str,
+                       description: Optional[str]) -> Tuple[str, str, str, Optional[str]]:
+    clean = cleaner.clean_text
+    return (
+        clean(title or '', remove_special_chars=True).lower(),
+        clean(company or '', remove_special_chars=True).lower(),
+        location.lower(),
+        clean(description, remove_special_chars=True)[:500].lower() if description else None
+    )
+
+
+def _similar_pairs(fields: List[Tuple[str, str, str, Optional[str]]], similarity_threshold: float,
+                   rows: Iterable[int]) -> List[Tuple[int, int, float]]:
+    """比較 rows 中每一列與其後所有列，返回達到門檻的 (i, j, 相似度)"""
+    duplicates = []
+    # 浮點誤差容許值，避免上限剛好等於門檻時誤跳過
+    threshold = similarity_threshold - 1e-9
+    length_bound = DuplicateDetector._length_bound
+    weighted_similarity = DuplicateDetector._weighted_similarity
+    
+    for i in rows:
+        for j in range(i + 1, len(fields)):
+            if length_bound(fields[i], fields[j]) < threshold:
+                continue
+            similarity = weighted_similarity(fields[i], fields[j])
+            if similarity >= similarity_threshold:
+                duplicates.append((i, j, similarity))
+    
+    return duplicates
+
+
+def _clean_text_rows(cleaner: TextCleaner, rows: List[Tuple[Optional[str], ...]]
+                     ) -> Tuple[List[List[Optional[str]]], List[int]]:
+    """
+    按欄位清理 (標題, 公司, 描述) 文字列並檢測垃圾描述
+    
+    返回各欄清理後的值（原值為空時為 None）與垃圾描述的列索引
+    """
+    columns = []
+    for position in range(len(_TEXT_COLUMNS)):
+        cleaned: List[Optional[str]] = [None] * len(rows)
+        present = [index for index, row in enumerate(rows) if row[position]]
+        if present:
+            values = cleaner.clean_batch([rows[index][position] for index in present])
+            for index, value in zip(present, values):
+                cleaned[index] = value
+        columns.append(cleaned)
+    
+    # 檢測垃圾內容（使用清理後的描述）
+    descriptions = columns[-1]
+    described = [index for index, value in enumerate(descriptions) if value]
+    flags = cleaner.detect_spam_batch([descriptions[index] for index in described])
+    return columns, [index for index, is_spam in zip(described, flags) if is_spam]
+
+
+# 工作進程內共用的清理器與驗證器（每個進程建立一次）
+_worker_instances: Dict[type, Any] = {}
+
+
+def _worker_instance(cls):
+    instance = _worker_instances.get(cls)
+    if instance is None:
+        instance = _worker_instances[cls] = cls()
+    return instance
+
+
+def _clean_rows_task(handle, start: int, stop: int) -> Tuple[List[List[Optional[str]]], List[int]]:
+    """工作進程：清理共享批次中 [start, stop) 的文字列"""
+    columns, spam = _clean_text_rows(_worker_instance(TextCleaner), load_batch(handle)[start:stop])
+    return columns, [start + index for index in spam]
+
+
+def _count_issues_task(handle, start: int, stop: int) -> Dict[DataQualityIssue, int]:
+    """工作進程：統計共享批次中 [start, stop) 職位的驗證問題"""
+    return _worker_instance(DataValidator).count_issues(load_batch(handle)[start:stop])
+
+
+def _similarity_fields_task(handle, start: int, stop: int) -> List[Tuple[str, str, str, Optional[str]]]:
+    """工作進程：計算共享批次中 [start, stop) 的相似度欄位"""
+    cleaner = _worker_instance(TextCleaner)
+    return [_similarity_values(cleaner, *row) for row in load_batch(handle)[start:stop]]
+
+
+def _similar_pairs_task(handle, offset: int, step: int, similarity_threshold: float) -> List[Tuple[int, int, float]]:
+    """工作進程：比較第 offset, offset+step, ... 列與其後所有列"""
+    fields = load_batch(handle)
+    return _similar_pairs(fields, similarity_threshold, range(offset, len(fields), step))
+
+
 class DataQualityProcessor:
     """資料品質處理器"""
     
     def __init__(self, remove_duplicates: bool = True, 
                  clean_text: bool = True, validate_data: bool = True,
-                 similarity_threshold: float = 0.85):
+                 similarity_threshold: float = 0.85, batch_mode: bool = True,
+                 executor: Optional[CPUExecutor] = None, parallel_min_jobs: int = PARALLEL_MIN_JOBS):
         self.remove_duplicates = remove_duplicates
         self.clean_text = clean_text
         self.validate_data = validate_data
+        # 批次模式按欄位處理清理、垃圾檢測與驗證，報告與逐筆模式相同
+        self.batch_mode = batch_mode
+        # 設定 CPU 執行器時，大批次的批次清理、驗證與重複檢測分散到工作進程
+        self.executor = executor
+        self.parallel_min_jobs = parallel_min_jobs
         
         self.logger = get_enhanced_logger("data_quality")
         self.text_cleaner = TextCleaner()
         self.validator = DataValidator()
-        self.duplicate_detector = DuplicateDetector(similarity_threshold)
+        self.duplicate_detector = DuplicateDetector(similarity_threshold, executor, parallel_min_jobs)
+    
+    def _should_offload(self, count: int) -> bool:
+        return self.executor is not None and count >= max(self.parallel_min_jobs, 1)
+    
+    def _map_ranges(self, task, records: List[Any]) -> List[Any]:
+        """將記錄放入共享記憶體，按連續區間分給工作進程執行 task"""
+        with SharedBatch.from_records(records) as batch:
+            return self.executor.map(task, [
+                (batch.handle, start, stop) for start, stop in split_ranges(len(records), self.executor.max_workers)
+            ])
     
     def process_job_response(self, job_response: JobResponse) -> Tuple[JobResponse, QualityReport]:
         """處理職位響應，改善資料品質"""
         start_time = datetime.now()
         
-        if not job_response.success or not job_response.jobs:
+        if not getattr(job_response, 'success', True) or not job_response.jobs:
             return job_response, QualityReport(
                 total_jobs=0,
                 valid_jobs=0,
@@ -482,12 +796,16 @@ class DataQualityProcessor:
         
         # 1. 資料清理
         if self.clean_text:
-            processed_jobs, field_stats = self._clean_jobs(processed_jobs)
+            clean = self._clean_columns if self.batch_mode else self._clean_jobs
+            processed_jobs, field_stats = clean(processed_jobs)
             cleaned_fields.update(field_stats)
         
         # 2. 資料驗證
         if self.validate_data:
-            processed_jobs, validation_issues = self._validate_jobs(processed_jobs)
+            if self.batch_mode:
+                validation_issues = self._count_issues(processed_jobs)
+            else:
+                processed_jobs, validation_issues = self._validate_jobs(processed_jobs)
             for issue, count in validation_issues.items():
                 issues_found[issue] += count
         
@@ -544,10 +862,11 @@ class DataQualityProcessor:
                     cleaned_fields['title'] = cleaned_fields.get('title', 0) + 1
             
             # 清理公司名稱
-            if job.company:
-                original = job.company
-                job.company = self.text_cleaner.clean_text(job.company)
-                if original != job.company:
+            company = _job_company(job)
+            if company:
+                cleaned = self.text_cleaner.clean_text(company)
+                _set_job_company(job, cleaned)
+                if company != cleaned:
                     cleaned_fields['company'] = cleaned_fields.get('company', 0) + 1
             
             # 清理描述
@@ -564,6 +883,46 @@ class DataQualityProcessor:
         
         return jobs, cleaned_fields
     
+    def _clean_columns(self, jobs: List[JobPost]) -> Tuple[List[JobPost], Dict[str, int]]:
+        """按欄位批次清理職位資料（與 _clean_jobs 結果相同）"""
+        rows = [_text_row(job) for job in jobs]
+        if self._should_offload(len(rows)):
+            columns, spam = [[], [], []], []
+            for part_columns, part_spam in self._map_ranges(_clean_rows_task, rows):
+                for column, values in zip(columns, part_columns):
+                    column.extend(values)
+                spam.extend(part_spam)
+        else:
+            columns, spam = _clean_text_rows(self.text_cleaner, rows)
+        
+        cleaned_fields = {}
+        for position, ((field, setter), cleaned) in enumerate(zip(_TEXT_COLUMNS, columns)):
+            changed = 0
+            for index, value in enumerate(cleaned):
+                if value is not None and value != rows[index][position]:
+                    setter(jobs[index], value)
+                    changed += 1
+            if changed:
+                cleaned_fields[field] = changed
+        
+        for index in spam:
+            jobs[index].description = "[內容已過濾：檢測到可疑內容]"
+        if spam:
+            cleaned_fields['spam_filtered'] = len(spam)
+        
+        return jobs, cleaned_fields
+    
+    def _count_issues(self, jobs: List[JobPost]) -> Dict[DataQualityIssue, int]:
+        """按欄位統計驗證問題；大批次時分段交給工作進程後合併"""
+        if not self._should_offload(len(jobs)):
+            return self.validator.count_issues(jobs)
+        
+        issues = {issue: 0 for issue in DataQualityIssue}
+        for part in self._map_ranges(_count_issues_task, jobs):
+            for issue, count in part.items():
+                issues[issue] += count
+        return issues
+    
     def _validate_jobs(self, jobs: List[JobPost]) -> Tuple[List[JobPost], Dict[DataQualityIssue, int]]:
         """驗證職位資料"""
         validation_issues = {issue: 0 for issue in DataQualityIssue}
@@ -581,8 +940,9 @@ class DataQualityProcessor:
         
         for job in jobs:
             # 基本有效性檢查
+            company = _job_company(job)
             if (job.title and job.title.strip() and 
-                job.company and job.company.strip()):
+                company and company.strip()):
                 valid_jobs.append(job)
         
         return valid_jobs
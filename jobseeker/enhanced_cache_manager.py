@@ -26,6 +26,7 @@ from .cache_system import (
 )
 from .model import Site, JobPost, ScraperInput
 from .enhanced_logging import get_enhanced_logger, LogCategory
+from .metrics_exporter import MetricFamily, get_registry
 
 
 class CacheIntelligence(Enum):
@@ -291,6 +292,8 @@ class EnhancedCacheManager:
         # 快取預熱任務
         self._prefetch_tasks = set()
         
+        get_registry().register_collector('enhanced_cache', self.collect_metrics)
+        
         self.logger.info(
             f"增強版快取管理器初始化完成",
             category=LogCategory.CACHE,
@@ -505,6 +508,22 @@ class EnhancedCacheManager:
         """獲取快取指標"""
         return self.metrics
     
+    def collect_metrics(self) -> List[MetricFamily]:
+        """匯出各快取層的命中、驅逐與大小（OpenMetrics）"""
+        lookups = MetricFamily('jobseeker_cache_lookups', 'counter', '快取查詢數')
+        evictions = MetricFamily('jobseeker_cache_evictions', 'counter', '快取驅逐數')
+        size = MetricFamily('jobseeker_cache_entries', 'gauge', '快取條目數')
+        for tier, stats in self.job_cache.get_cache_stats().items():
+            lookups.add(stats['hits'], tier=tier, result='hit')
+            lookups.add(stats['misses'], tier=tier, result='miss')
+            evictions.add(stats['evictions'], tier=tier)
+            size.add(stats['total_size'], tier=tier)
+        
+        response_time = MetricFamily(
+            'jobseeker_cache_response_seconds', 'gauge', '快取查詢的平均響應時間（指數移動平均）'
+        ).add(self.metrics.avg_response_time)
+        return [lookups, evictions, size, response_time]
+    
     def get_cache_patterns(self) -> List[CachePattern]:
         """獲取快取模式"""
         if not self.predictive_cache:
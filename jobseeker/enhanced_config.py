@@ -1,7 +1,7 @@
 ﻿from __future__ import annotations
 
 import os
-from typing import Dict, Type
+from typing import Dict, Optional, Type
 
 # 增強版爬蟲配置
 class EnhancedScraperConfig:
@@ -33,6 +33,23 @@ class EnhancedScraperConfig:
         
         return site_config_map.get(site_name.lower(), False)
     
+    # 增強版爬蟲的 "模組:類別" 路徑，供延遲導入
+    ENHANCED_SCRAPER_PATHS = {
+        'ziprecruiter': 'jobseeker.ziprecruiter.enhanced_ziprecruiter:EnhancedZipRecruiter',
+        'google': 'jobseeker.google.enhanced_google:EnhancedGoogle',
+        'bayt': 'jobseeker.bayt.enhanced_bayt:EnhancedBaytScraper',
+    }
+    
+    @classmethod
+    def get_enhanced_scraper_path(cls, site_name: str) -> Optional[str]:
+        """
+        獲取網站的增強版爬蟲路徑（未啟用時返回 None），不導入模組
+        """
+        site_name = site_name.lower().replace('_', '')
+        if not cls.is_enhanced_enabled(site_name):
+            return None
+        return cls.ENHANCED_SCRAPER_PATHS.get(site_name)
+    
     @classmethod
     def get_enhanced_scraper_mapping(cls) -> Dict[str, Type]:
         """
@@ -14,7 +14,7 @@ import asyncio
 import threading
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, asdict, field
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from collections import defaultdict, deque
@@ -28,6 +28,9 @@ from .data_quality import (
 )
 from .model import JobPost, JobResponse, Site
 from .enhanced_logging import get_enhanced_logger, LogCategory
+from .cpu_executor import CPUExecutor, get_cpu_executor
+from .quality_accumulators import DateHistogram, DistinctCounter, RunningStats, ScoreRollup
+from .tracing import run_in_executor
 
 
 class QualityLevel(Enum):
@@ -89,266 +92,260 @@ class QualityImprovement:
     affected_sites: List[str]
 
 
-class QualityAnalyzer:
-    """品質分析器"""
+class JobQualityAccumulator:
+    """
+    品質分析指標的增量累加器
     
-    def __init__(self):
-        self.logger = get_enhanced_logger("quality_analyzer")
-        self.quality_history = deque(maxlen=1000)
-        self.site_quality_stats = defaultdict(list)
+    每批職位折疊一次，同一網站的多批結果可以合併；指標由累計的計數與分佈計算，
+    不需保留職位本身
+    """
     
-    def analyze_quality(self, job_response: JobResponse, site: str) -> QualityMetrics:
-        """分析數據品質"""
-        if not job_response.success or not job_response.jobs:
-            return QualityMetrics(
-                overall_score=0.0,
-                completeness_score=0.0,
-                accuracy_score=0.0,
-                consistency_score=0.0,
-                uniqueness_score=0.0,
-                freshness_score=0.0,
-                timestamp=datetime.now(),
-                site=site,
-                sample_size=0
-            )
-        
-        jobs = job_response.jobs
-        sample_size = len(jobs)
-        
-        # 計算各項品質指標
-        completeness_score = self._calculate_completeness_score(jobs)
-        accuracy_score = self._calculate_accuracy_score(jobs)
-        consistency_score = self._calculate_consistency_score(jobs)
-        uniqueness_score = self._calculate_uniqueness_score(jobs)
-        freshness_score = self._calculate_freshness_score(jobs)
-        
-        # 計算總體品質分數
-        weights = {
-            'completeness': 0.25,
-            'accuracy': 0.25,
-            'consistency': 0.20,
-            'uniqueness': 0.15,
-            'freshness': 0.15
-        }
-        
-        overall_score = (
-            completeness_score * weights['completeness'] +
-            accuracy_score * weights['accuracy'] +
-            consistency_score * weights['consistency'] +
-            uniqueness_score * weights['uniqueness'] +
-            freshness_score * weights['freshness']
-        )
-        
-        metrics = QualityMetrics(
-            overall_score=overall_score,
-            completeness_score=completeness_score,
-            accuracy_score=accuracy_score,
-            consistency_score=consistency_score,
-            uniqueness_score=uniqueness_score,
-            freshness_score=freshness_score,
-            timestamp=datetime.now(),
-            site=site,
-            sample_size=sample_size
-        )
-        
-        # 記錄品質歷史
-        self.quality_history.append(metrics)
-        self.site_quality_stats[site].append(metrics)
-        
-        return metrics
+    REQUIRED_FIELDS = ('title', 'company_name', 'location')
+    OPTIONAL_FIELDS = ('description', 'job_url', 'compensation', 'job_type', 'date_posted')
+    LENGTH_FIELDS = ('title', 'company_name', 'description')
     
-    def _calculate_completeness_score(self, jobs: List[JobPost]) -> float:
-        """計算完整度分數"""
-        if not jobs:
-            return 0.0
-        
-        total_fields = 0
-        filled_fields = 0
-        
-        required_fields = ['title', 'company', 'location']
-        optional_fields = ['description', 'job_url', 'compensation', 'job_type', 'date_posted']
-        
-        for job in jobs:
-            # 必填欄位
-            for field in required_fields:
-                total_fields += 1
-                if getattr(job, field) and str(getattr(job, field)).strip():
-                    filled_fields += 1
-            
-            # 可選欄位（權重較低）
-            for field in optional_fields:
-                total_fields += 0.5
-                if getattr(job, field) and str(getattr(job, field)).strip():
-                    filled_fields += 0.5
-        
-        return (filled_fields / total_fields) * 100 if total_fields > 0 else 0.0
+    # 新鮮度分數（天數上限, 分數）；無法解析的日期 50 分，沒有日期 30 分
+    FRESHNESS_BUCKETS = ((1, 100.0), (7, 90.0), (30, 70.0), (90, 50.0))
+    FRESHNESS_OLDER = 20.0
     
-    def _calculate_accuracy_score(self, jobs: List[JobPost]) -> float:
-        """計算準確度分數"""
-        if not jobs:
-            return 0.0
-        
-        validator = DataValidator()
-        total_checks = 0
-        passed_checks = 0
-        
+    WEIGHTS = {
+        'completeness': 0.25,
+        'accuracy': 0.25,
+        'consistency': 0.20,
+        'uniqueness': 0.15,
+        'freshness': 0.15
+    }
+    
+    def __init__(self):
+        self.sample_size = 0
+        self.completeness_total = 0.0
+        self.completeness_filled = 0.0
+        self.accuracy_total = 0
+        self.accuracy_passed = 0
+        self.lengths = {field: RunningStats() for field in self.LENGTH_FIELDS}
+        self.titles = DistinctCounter()
+        self.titled = 0
+        self.posted = DateHistogram()
+    
+    def add_jobs(self, jobs: List[JobPost], validator: DataValidator):
+        """折疊一批職位"""
         for job in jobs:
-            # 檢查 URL 格式
+            self.sample_size += 1
+            
+            # 完整度：必填欄位權重 1，可選欄位權重 0.5
+            for field in self.REQUIRED_FIELDS:
+                self.completeness_total += 1
+                value = getattr(job, field)
+                if value and str(value).strip():
+                    self.completeness_filled += 1
+            for field in self.OPTIONAL_FIELDS:
+                self.completeness_total += 0.5
+                value = getattr(job, field)
+                if value and str(value).strip():
+                    self.completeness_filled += 0.5
+            
+            # 準確度：URL、電子郵件、薪資範圍與日期格式
+            checks = []
             if job.job_url:
-                total_checks += 1
-                if validator.validate_url(job.job_url):
-                    passed_checks += 1
-            
+                checks.append(validator.validate_url(job.job_url))
             if job.company_url:
-                total_checks += 1
-                if validator.validate_url(job.company_url):
-                    passed_checks += 1
-            
-            # 檢查電子郵件格式
-            if job.emails:
-                for email in job.emails:
-                    total_checks += 1
-                    if validator.validate_email(email):
-                        passed_checks += 1
-            
-            # 檢查薪資範圍
+                checks.append(validator.validate_url(job.company_url))
+            for email in job.emails or ():
+                checks.append(validator.validate_email(email))
             if job.compensation:
-                total_checks += 1
-                if validator.validate_salary(
+                checks.append(validator.validate_salary(
                     job.compensation.min_amount,
                     job.compensation.max_amount,
                     job.compensation.interval
-                ):
-                    passed_checks += 1
-            
-            # 檢查日期格式
+                ))
             if job.date_posted:
-                total_checks += 1
-                if validator.validate_date(str(job.date_posted)):
-                    passed_checks += 1
-        
-        return (passed_checks / total_checks) * 100 if total_checks > 0 else 100.0
-    
-    def _calculate_consistency_score(self, jobs: List[JobPost]) -> float:
-        """計算一致性分數"""
-        if not jobs:
-            return 0.0
-        
-        # 檢查格式一致性
-        title_lengths = []
-        company_lengths = []
-        description_lengths = []
-        
-        for job in jobs:
+                checks.append(validator.validate_date(str(job.date_posted)))
+            self.accuracy_total += len(checks)
+            self.accuracy_passed += sum(checks)
+            
+            # 一致性：欄位長度分佈
+            for field, stats in self.lengths.items():
+                value = getattr(job, field)
+                if value:
+                    stats.add(len(value))
+            
+            # 唯一性：標題相異值
             if job.title:
-                title_lengths.append(len(job.title))
-            if job.company:
-                company_lengths.append(len(job.company))
-            if job.description:
-                description_lengths.append(len(job.description))
-        
-        # 計算變異係數（越小越一致）
-        consistency_scores = []
-        
-        if title_lengths:
-            cv = statistics.stdev(title_lengths) / statistics.mean(title_lengths) if len(title_lengths) > 1 else 0
-            consistency_scores.append(max(0, 100 - cv * 100))
-        
-        if company_lengths:
-            cv = statistics.stdev(company_lengths) / statistics.mean(company_lengths) if len(company_lengths) > 1 else 0
-            consistency_scores.append(max(0, 100 - cv * 100))
+                self.titled += 1
+                self.titles.add(job.title.lower().strip())
+            
+            # 新鮮度：按發布日期計數
+            self._add_posted(job.date_posted)
+    
+    def _add_posted(self, date_posted: Any):
+        if not date_posted:
+            self.posted.add_missing()
+            return
+        try:
+            if isinstance(date_posted, str):
+                self.posted.add_date(datetime.strptime(date_posted, '%Y-%m-%d').date())
+            elif isinstance(date_posted, datetime):
+                self.posted.add_date(date_posted.date())
+            elif isinstance(date_posted, date):
+                self.posted.add_date(date_posted)
+            else:
+                self.posted.add_unparseable()
+        except ValueError:
+            self.posted.add_unparseable()
+    
+    def merge(self, other: 'JobQualityAccumulator'):
+        """合併另一個累加器"""
+        self.sample_size += other.sample_size
+        self.completeness_total += other.completeness_total
+        self.completeness_filled += other.completeness_filled
+        self.accuracy_total += other.accuracy_total
+        self.accuracy_passed += other.accuracy_passed
+        for field, stats in self.lengths.items():
+            stats.merge(other.lengths[field])
+        self.titles.merge(other.titles)
+        self.titled += other.titled
+        self.posted.merge(other.posted)
+    
+    def completeness_score(self) -> float:
+        return (self.completeness_filled / self.completeness_total) * 100 if self.completeness_total > 0 else 0.0
+    
+    def accuracy_score(self) -> float:
+        return (self.accuracy_passed / self.accuracy_total) * 100 if self.accuracy_total > 0 else 100.0
+    
+    def consistency_score(self) -> float:
+        # 變異係數越小越一致
+        scores = [
+            max(0, 100 - stats.stdev / stats.mean * 100)
+            for stats in self.lengths.values() if stats.count
+        ]
+        return statistics.mean(scores) if scores else 100.0
+    
+    def uniqueness_score(self) -> float:
+        if not self.titled:
+            return 100.0
+        return min(len(self.titles), self.titled) / self.titled * 100
+    
+    def freshness_score(self, today: Optional[date] = None) -> float:
+        return self.posted.mean_score(
+            today or datetime.now().date(), self.FRESHNESS_BUCKETS, self.FRESHNESS_OLDER,
+            unparseable_score=50.0, missing_score=30.0, default=50.0
+        )
+    
+    def to_metrics(self, site: str) -> QualityMetrics:
+        """以目前累計的數據計算品質指標"""
+        if not self.sample_size:
+            return QualityMetrics(
+                overall_score=0.0, completeness_score=0.0, accuracy_score=0.0,
+                consistency_score=0.0, uniqueness_score=0.0, freshness_score=0.0,
+                timestamp=datetime.now(), site=site, sample_size=0
+            )
         
-        if description_lengths:
-            cv = statistics.stdev(description_lengths) / statistics.mean(description_lengths) if len(description_lengths) > 1 else 0
-            consistency_scores.append(max(0, 100 - cv * 100))
+        scores = {
+            'completeness': self.completeness_score(),
+            'accuracy': self.accuracy_score(),
+            'consistency': self.consistency_score(),
+            'uniqueness': self.uniqueness_score(),
+            'freshness': self.freshness_score()
+        }
+        return QualityMetrics(
+            overall_score=sum(scores[name] * weight for name, weight in self.WEIGHTS.items()),
+            completeness_score=scores['completeness'],
+            accuracy_score=scores['accuracy'],
+            consistency_score=scores['consistency'],
+            uniqueness_score=scores['uniqueness'],
+            freshness_score=scores['freshness'],
+            timestamp=datetime.now(),
+            site=site,
+            sample_size=self.sample_size
+        )
+
+
+def _rollup_scores(metrics: QualityMetrics) -> Dict[str, float]:
+    return {
+        'overall': metrics.overall_score,
+        'completeness': metrics.completeness_score,
+        'accuracy': metrics.accuracy_score,
+        'consistency': metrics.consistency_score,
+        'uniqueness': metrics.uniqueness_score,
+        'freshness': metrics.freshness_score
+    }
+
+
+class QualityAnalyzer:
+    """品質分析器"""
+    
+    # 每日分數彙總保留天數
+    ROLLUP_RETENTION_DAYS = 90
+    
+    def __init__(self):
+        self.logger = get_enhanced_logger("quality_analyzer")
+        self.quality_history = deque(maxlen=1000)
+        self.validator = DataValidator()
         
-        return statistics.mean(consistency_scores) if consistency_scores else 100.0
+        # 預先彙總：網站 -> 日期 -> 分數彙總，網站 -> 累計職位指標
+        self.site_daily_rollups: Dict[str, Dict[date, ScoreRollup]] = defaultdict(dict)
+        self.site_accumulators: Dict[str, JobQualityAccumulator] = {}
+        self._lock = threading.Lock()
     
-    def _calculate_uniqueness_score(self, jobs: List[JobPost]) -> float:
-        """計算唯一性分數"""
-        if not jobs:
-            return 0.0
+    def analyze_quality(self, job_response: JobResponse, site: str) -> QualityMetrics:
+        """分析數據品質（本批次的指標，並折疊進網站的累計彙總）"""
+        if not getattr(job_response, 'success', True) or not job_response.jobs:
+            return JobQualityAccumulator().to_metrics(site)
         
-        # 使用簡單的標題重複檢測
-        titles = [job.title.lower().strip() for job in jobs if job.title]
-        unique_titles = set(titles)
+        accumulator = JobQualityAccumulator()
+        accumulator.add_jobs(job_response.jobs, self.validator)
+        metrics = accumulator.to_metrics(site)
         
-        if not titles:
-            return 100.0
+        # 記錄品質歷史
+        self.quality_history.append(metrics)
+        self._record(site, metrics, accumulator)
         
-        uniqueness_ratio = len(unique_titles) / len(titles)
-        return uniqueness_ratio * 100
+        return metrics
     
-    def _calculate_freshness_score(self, jobs: List[JobPost]) -> float:
-        """計算新鮮度分數"""
-        if not jobs:
-            return 0.0
-        
-        current_time = datetime.now()
-        freshness_scores = []
-        
-        for job in jobs:
-            if job.date_posted:
-                try:
-                    # 嘗試解析日期
-                    if isinstance(job.date_posted, str):
-                        # 簡化的日期解析
-                        posted_date = datetime.strptime(job.date_posted, '%Y-%m-%d')
-                    else:
-                        posted_date = job.date_posted
-                    
-                    # 計算天數差
-                    days_old = (current_time - posted_date).days
-                    
-                    # 新鮮度分數（越新分數越高）
-                    if days_old <= 1:
-                        freshness_scores.append(100)
-                    elif days_old <= 7:
-                        freshness_scores.append(90)
-                    elif days_old <= 30:
-                        freshness_scores.append(70)
-                    elif days_old <= 90:
-                        freshness_scores.append(50)
-                    else:
-                        freshness_scores.append(20)
-                        
-                except Exception:
-                    # 無法解析日期，給中等分數
-                    freshness_scores.append(50)
+    def _record(self, site: str, metrics: QualityMetrics, accumulator: JobQualityAccumulator):
+        today = metrics.timestamp.date()
+        with self._lock:
+            rollups = self.site_daily_rollups[site]
+            rollups.setdefault(today, ScoreRollup()).add(_rollup_scores(metrics), metrics)
+            expired = today - timedelta(days=self.ROLLUP_RETENTION_DAYS)
+            for day in [day for day in rollups if day < expired]:
+                del rollups[day]
+            
+            if site in self.site_accumulators:
+                self.site_accumulators[site].merge(accumulator)
             else:
-                # 沒有日期資訊，給低分
-                freshness_scores.append(30)
-        
-        return statistics.mean(freshness_scores) if freshness_scores else 50.0
+                self.site_accumulators[site] = accumulator
+    
+    def get_daily_rollups(self, site: str, days: int) -> Dict[date, ScoreRollup]:
+        """指定網站最近 days 天（按日期）的每日分數彙總，依日期排序"""
+        cutoff = (datetime.now() - timedelta(days=days)).date()
+        with self._lock:
+            return {
+                day: rollup for day, rollup in sorted(self.site_daily_rollups.get(site, {}).items())
+                if day >= cutoff
+            }
+    
+    def get_rollup(self, site: str, days: int) -> ScoreRollup:
+        """指定網站最近 days 天合併後的分數彙總"""
+        return ScoreRollup.combine(self.get_daily_rollups(site, days).values())
+    
+    def get_sites(self) -> List[str]:
+        with self._lock:
+            return list(self.site_daily_rollups)
+    
+    def get_cumulative_metrics(self, site: str) -> Optional[QualityMetrics]:
+        """網站所有已分析職位合併後的品質指標"""
+        with self._lock:
+            accumulator = self.site_accumulators.get(site)
+            return accumulator.to_metrics(site) if accumulator else None
     
     def get_quality_trend(self, site: str, days: int = 7) -> QualityTrend:
-        """獲取品質趨勢"""
-        cutoff_time = datetime.now() - timedelta(days=days)
-        site_metrics = [
-            m for m in self.site_quality_stats[site]
-            if m.timestamp >= cutoff_time
-        ]
-        
-        if len(site_metrics) < 3:
-            return QualityTrend.STABLE
-        
-        # 計算趨勢
-        scores = [m.overall_score for m in site_metrics]
-        
-        # 簡單線性回歸
-        n = len(scores)
-        x = list(range(n))
-        
-        x_mean = sum(x) / n
-        y_mean = sum(scores) / n
-        
-        numerator = sum((x[i] - x_mean) * (scores[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
+        """獲取品質趨勢（由每日彙總計算逐筆樣本的線性迴歸斜率）"""
+        rollup = self.get_rollup(site, days)
+        if rollup.count < 3:
             return QualityTrend.STABLE
         
-        slope = numerator / denominator
+        slope = rollup.slope()
         
         # 判斷趨勢
         if abs(slope) < 0.5:
@@ -644,18 +641,19 @@ class QualityImprovementEngine:
 class EnhancedDataQualityManager:
     """增強版數據品質管理器"""
     
-    def __init__(self):
+    def __init__(self, cpu_executor: Optional[CPUExecutor] = None):
         self.logger = get_enhanced_logger("enhanced_data_quality_manager")
         self.quality_analyzer = QualityAnalyzer()
         self.quality_monitor = QualityMonitor()
         self.improvement_engine = QualityImprovementEngine()
         
-        # 品質處理器
+        # 品質處理器（大批次的清理、驗證與重複檢測交給 CPU 工作進程）
         self.quality_processor = DataQualityProcessor(
             remove_duplicates=True,
             clean_text=True,
             validate_data=True,
-            similarity_threshold=0.85
+            similarity_threshold=0.85,
+            executor=cpu_executor or get_cpu_executor()
         )
         
         # 品質歷史
@@ -665,11 +663,11 @@ class EnhancedDataQualityManager:
     async def process_job_response(self, job_response: JobResponse, site: str) -> Tuple[JobResponse, QualityReport, QualityMetrics]:
         """處理職位響應並分析品質"""
         try:
-            # 1. 執行品質處理
-            processed_response, quality_report = self.quality_processor.process_job_response(job_response)
-            
-            # 2. 分析品質指標
-            quality_metrics = self.quality_analyzer.analyze_quality(processed_response, site)
+            # 1-2. 品質處理與指標分析都是 CPU 工作，移出事件循環
+            loop = asyncio.get_running_loop()
+            processed_response, quality_report, quality_metrics = await run_in_executor(
+                loop, None, self._process_and_analyze, job_response, site
+            )
             
             # 3. 檢查品質警報
             alerts = self.quality_monitor.check_quality_thresholds(quality_metrics)
@@ -714,71 +712,67 @@ class EnhancedDataQualityManager:
                 timestamp=datetime.now(), site=site, sample_size=0
             )
     
+    def _process_and_analyze(self, job_response: JobResponse, site: str) -> Tuple[JobResponse, QualityReport, QualityMetrics]:
+        """執行品質處理並分析品質指標（在線程中執行）"""
+        processed_response, quality_report = self.quality_processor.process_job_response(job_response)
+        quality_metrics = self.quality_analyzer.analyze_quality(processed_response, site)
+        return processed_response, quality_report, quality_metrics
+    
     def get_quality_dashboard(self, site: Optional[str] = None, days: int = 7) -> Dict[str, Any]:
-        """獲取品質儀表板數據"""
+        """獲取品質儀表板數據（讀取分析器預先彙總的每日分數）"""
         try:
-            cutoff_time = datetime.now() - timedelta(days=days)
-            
-            # 過濾歷史數據
-            filtered_history = [
-                entry for entry in self.quality_history
-                if entry['timestamp'] >= cutoff_time and (site is None or entry['site'] == site)
-            ]
+            sites = [site] if site is not None else self.quality_analyzer.get_sites()
+            rollups = {
+                site_name: rollup for site_name, rollup in (
+                    (site_name, self.quality_analyzer.get_rollup(site_name, days)) for site_name in sites
+                ) if rollup.count
+            }
             
-            if not filtered_history:
+            if not rollups:
                 return {
                     'timestamp': datetime.now().isoformat(),
                     'site': site,
                     'message': '沒有足夠的歷史數據'
                 }
             
-            # 計算統計數據
-            sites = list(set(entry['site'] for entry in filtered_history))
-            total_entries = len(filtered_history)
-            
-            # 按網站分組
-            site_metrics = defaultdict(list)
-            for entry in filtered_history:
-                site_metrics[entry['site']].append(entry['metrics'])
-            
-            # 計算平均品質分數
-            avg_scores = {}
-            for site_name, metrics_list in site_metrics.items():
-                if metrics_list:
-                    avg_scores[site_name] = {
-                        'overall': statistics.mean([m.overall_score for m in metrics_list]),
-                        'completeness': statistics.mean([m.completeness_score for m in metrics_list]),
-                        'accuracy': statistics.mean([m.accuracy_score for m in metrics_list]),
-                        'consistency': statistics.mean([m.consistency_score for m in metrics_list]),
-                        'uniqueness': statistics.mean([m.uniqueness_score for m in metrics_list]),
-                        'freshness': statistics.mean([m.freshness_score for m in metrics_list])
+            # 平均品質分數直接由彙總的和計算
+            avg_scores = {site_name: rollup.averages() for site_name, rollup in rollups.items()}
+            
+            # 所有已分析職位合併後的指標
+            cumulative_scores = {}
+            for site_name in rollups:
+                metrics = self.quality_analyzer.get_cumulative_metrics(site_name)
+                if metrics:
+                    cumulative_scores[site_name] = {
+                        'overall': metrics.overall_score,
+                        'completeness': metrics.completeness_score,
+                        'accuracy': metrics.accuracy_score,
+                        'consistency': metrics.consistency_score,
+                        'uniqueness': metrics.uniqueness_score,
+                        'freshness': metrics.freshness_score,
+                        'sample_size': metrics.sample_size
                     }
             
             # 獲取最近的警報
             recent_alerts = self.quality_monitor.get_recent_alerts(10)
             
-            # 獲取品質趨勢
+            # 獲取品質趨勢並生成改善建議
             trends = {}
-            for site_name in sites:
+            improvements = []
+            for site_name, rollup in rollups.items():
                 trend = self.quality_analyzer.get_quality_trend(site_name, days)
                 trends[site_name] = trend.value
-            
-            # 生成改善建議
-            improvements = []
-            for site_name, metrics_list in site_metrics.items():
-                if metrics_list:
-                    latest_metrics = metrics_list[-1]
-                    trend = self.quality_analyzer.get_quality_trend(site_name, days)
-                    site_improvements = self.improvement_engine.generate_improvements(latest_metrics, trend)
-                    improvements.extend(site_improvements[:3])  # 每個網站最多3個建議
+                site_improvements = self.improvement_engine.generate_improvements(rollup.latest, trend)
+                improvements.extend(site_improvements[:3])  # 每個網站最多3個建議
             
             return {
                 'timestamp': datetime.now().isoformat(),
                 'site': site,
                 'time_range_days': days,
-                'total_entries': total_entries,
-                'sites': sites,
+                'total_entries': sum(rollup.count for rollup in rollups.values()),
+                'sites': list(rollups),
                 'average_scores': avg_scores,
+                'cumulative_scores': cumulative_scores,
                 'trends': trends,
                 'recent_alerts': [asdict(alert) for alert in recent_alerts],
                 'improvements': [asdict(improvement) for improvement in improvements[:10]],
@@ -796,39 +790,21 @@ class EnhancedDataQualityManager:
             }
     
     def get_quality_trends(self, site: str, days: int = 30) -> Dict[str, Any]:
-        """獲取品質趨勢分析"""
+        """獲取品質趨勢分析（讀取每日彙總）"""
         try:
-            cutoff_time = datetime.now() - timedelta(days=days)
-            site_entries = [
-                entry for entry in self.quality_history
-                if entry['site'] == site and entry['timestamp'] >= cutoff_time
-            ]
+            daily_rollups = self.quality_analyzer.get_daily_rollups(site, days)
             
-            if not site_entries:
+            if not daily_rollups:
                 return {
                     'site': site,
                     'message': '沒有足夠的歷史數據',
                     'days': days
                 }
             
-            # 按日期分組
-            daily_metrics = defaultdict(list)
-            for entry in site_entries:
-                date_key = entry['timestamp'].date()
-                daily_metrics[date_key].append(entry['metrics'])
-            
-            # 計算每日平均
-            daily_averages = {}
-            for date, metrics_list in daily_metrics.items():
-                daily_averages[date.isoformat()] = {
-                    'overall': statistics.mean([m.overall_score for m in metrics_list]),
-                    'completeness': statistics.mean([m.completeness_score for m in metrics_list]),
-                    'accuracy': statistics.mean([m.accuracy_score for m in metrics_list]),
-                    'consistency': statistics.mean([m.consistency_score for m in metrics_list]),
-                    'uniqueness': statistics.mean([m.uniqueness_score for m in metrics_list]),
-                    'freshness': statistics.mean([m.freshness_score for m in metrics_list]),
-                    'sample_size': len(metrics_list)
-                }
+            daily_averages = {
+                day.isoformat(): {**rollup.averages(), 'sample_size': rollup.count}
+                for day, rollup in daily_rollups.items()
+            }
             
             # 計算趨勢
             trend = self.quality_analyzer.get_quality_trend(site, days)
@@ -838,7 +814,7 @@ class EnhancedDataQualityManager:
                 'days': days,
                 'trend': trend.value,
                 'daily_averages': daily_averages,
-                'total_samples': len(site_entries)
+                'total_samples': sum(rollup.count for rollup in daily_rollups.values())
             }
             
         except Exception as e:
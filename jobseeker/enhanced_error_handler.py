@@ -23,6 +23,7 @@ from .error_handling import (
     AuthenticationError, TimeoutError, ErrorType, global_error_handler
 )
 from .enhanced_logging import get_enhanced_logger, LogCategory
+from .metrics_exporter import MetricFamily, get_registry
 
 
 class ErrorSeverity(Enum):
@@ -144,6 +145,23 @@ class EnhancedErrorHandler:
         
         # 初始化恢復策略
         self._init_recovery_strategies()
+        
+        get_registry().register_collector('circuit_breakers', self.collect_metrics)
+    
+    def collect_metrics(self) -> List[MetricFamily]:
+        """匯出熔斷器狀態與錯誤數（OpenMetrics）"""
+        states = MetricFamily('jobseeker_circuit_breaker_state', 'gauge', '熔斷器狀態（當前狀態為 1）')
+        failures = MetricFamily('jobseeker_circuit_breaker_failures', 'gauge', '熔斷器連續失敗次數')
+        for site, breaker in list(self.circuit_breakers.items()):
+            for state in ('CLOSED', 'OPEN', 'HALF_OPEN'):
+                states.add(1 if breaker.state == state else 0, site=site, state=state)
+            failures.add(breaker.failure_count, site=site)
+        
+        errors = MetricFamily('jobseeker_handled_errors', 'counter', '處理過的錯誤數（依網站與類型）')
+        for pattern_key, count in list(self.error_patterns.items()):
+            site, _, error_type = pattern_key.partition(':')
+            errors.add(count, site=site, error_type=error_type)
+        return [states, failures, errors]
     
     def _init_recovery_strategies(self):
         """初始化恢復策略"""
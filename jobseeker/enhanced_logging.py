@@ -5,10 +5,14 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import queue
 import time
 import logging
+import logging.handlers
 import threading
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from functools import wraps
@@ -16,6 +20,8 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from .metrics_exporter import MetricFamily, get_registry
+
 
 class LogLevel(Enum):
     """日誌級別枚舉"""
@@ -26,6 +32,15 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+_LEVEL_NUMBERS = {
+    LogLevel.DEBUG: logging.DEBUG,
+    LogLevel.INFO: logging.INFO,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.CRITICAL: logging.CRITICAL,
+}
+
+
 class LogCategory(Enum):
     """日誌分類枚舉"""
     SCRAPING = "scraping"
@@ -35,6 +50,12 @@ class LogCategory(Enum):
     ERROR = "error"
     CACHE = "cache"
     GENERAL = "general"
+    SYSTEM = "system"
+    API = "api"
+    MONITORING = "monitoring"
+    QUEUE = "queue"
+    WORKER = "worker"
+    SCHEDULER = "scheduler"
 
 
 @dataclass
@@ -59,108 +80,306 @@ class LogEntry:
         return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
 
 
+class _DeferredMessage:
+    """
+    延遲組裝的日誌訊息
+    
+    只保存 LogEntry，訊息字串（含元數據 JSON）在監聽線程格式化時才產生，並緩存供多個處理器共用。
+    """
+    
+    __slots__ = ('entry', 'levelno', 'created', '_text')
+    
+    def __init__(self, entry: LogEntry, levelno: int):
+        self.entry = entry
+        self.levelno = levelno
+        self.created = time.time()
+        self._text = None
+    
+    def __str__(self) -> str:
+        if self._text is None:
+            entry = self.entry
+            text = f"[{entry.category}] {entry.message}"
+            if entry.site:
+                text = f"[{entry.site}] {text}"
+            if entry.duration:
+                text += f" (耗時: {entry.duration:.3f}s)"
+            if entry.metadata:
+                text += f" | 元數據: {json.dumps(entry.metadata, ensure_ascii=False, default=str)}"
+            self._text = text
+        return self._text
+    
+    def to_record(self, name: str) -> logging.LogRecord:
+        """在監聽線程建立標準 LogRecord（時間沿用調用時刻）"""
+        record = logging.LogRecord(
+            name, self.levelno, self.entry.function_name or name, 0, self, None, None,
+            self.entry.function_name
+        )
+        record.created = self.created
+        record.msecs = (self.created - int(self.created)) * 1000
+        return record
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """不在調用線程格式化的 QueueHandler（記錄原樣放入進程內佇列）"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _EntryQueueListener(logging.handlers.QueueListener):
+    """
+    日誌監聽線程
+    
+    除標準 LogRecord 外，也接受 EnhancedLogger 直接放入的 _DeferredMessage
+    （在此才建立 LogRecord）與 flush 用的 threading.Event 標記。
+    """
+    
+    def __init__(self, logger_name: str, queue_, *handlers, respect_handler_level: bool = False):
+        super().__init__(queue_, *handlers, respect_handler_level=respect_handler_level)
+        self.logger_name = logger_name
+    
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        if isinstance(record, _DeferredMessage):
+            record = record.to_record(self.logger_name)
+        super().handle(record)
+
+
+class _JsonLineFormatter(logging.Formatter):
+    """將結構化日誌條目輸出為單行 JSON"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, _DeferredMessage):
+            return json.dumps(record.msg.entry.to_dict(), ensure_ascii=False, default=str)
+        return json.dumps({
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'message': record.getMessage()
+        }, ensure_ascii=False)
+
+
+# 記錄器名稱 -> 監聽器；同名記錄器重建時先停止舊監聽器
+_listeners: Dict[str, _EntryQueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def _stop_all_listeners():
+    """程式結束前寫出所有佇列中的日誌"""
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+        _listeners.clear()
+    for listener in listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+
+
+atexit.register(_stop_all_listeners)
+
+
+class _MetricsShard:
+    """單一線程的指標分片（只由所屬線程寫入，無需加鎖）"""
+    
+    __slots__ = ('thread', 'request_count', 'success_count', 'error_count', 'total_duration',
+                 'min_response_time', 'max_response_time', 'site_metrics', 'error_types',
+                 'hourly_stats', 'current_hour')
+    
+    def __init__(self, thread: Optional[threading.Thread] = None):
+        self.thread = thread
+        self.request_count = 0
+        self.success_count = 0
+        self.error_count = 0
+        self.total_duration = 0.0
+        self.min_response_time = float('inf')
+        self.max_response_time = 0.0
+        # 網站 -> [requests, successes, errors, total_time]
+        self.site_metrics: Dict[str, List[float]] = {}
+        self.error_types: Dict[str, int] = {}
+        # 小時索引 -> [requests, successes, errors]
+        self.hourly_stats: Dict[int, List[int]] = {}
+        self.current_hour = -1
+    
+    def merge_into(self, target: '_MetricsShard'):
+        """把本分片累加到 target"""
+        target.request_count += self.request_count
+        target.success_count += self.success_count
+        target.error_count += self.error_count
+        target.total_duration += self.total_duration
+        target.min_response_time = min(target.min_response_time, self.min_response_time)
+        target.max_response_time = max(target.max_response_time, self.max_response_time)
+        for site, values in list(self.site_metrics.items()):
+            merged = target.site_metrics.setdefault(site, [0, 0, 0, 0.0])
+            for position, value in enumerate(values):
+                merged[position] += value
+        for error_type, count in list(self.error_types.items()):
+            target.error_types[error_type] = target.error_types.get(error_type, 0) + count
+        for hour, values in list(self.hourly_stats.items()):
+            merged = target.hourly_stats.setdefault(hour, [0, 0, 0])
+            for position, value in enumerate(values):
+                merged[position] += value
+
+
 class PerformanceMetrics:
-    """效能指標收集器"""
-    
-    def __init__(self):
-        self.metrics = {
-            'request_count': 0,
-            'success_count': 0,
-            'error_count': 0,
-            'total_duration': 0.0,
-            'avg_response_time': 0.0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0.0,
-            'site_metrics': {},
-            'error_types': {},
-            'hourly_stats': {}
-        }
-        self._lock = threading.Lock()
+    """
+    效能指標收集器
+    
+    每個線程寫入自己的分片，記錄時不取全域鎖；讀取時合併所有分片。
+    每小時統計以整數小時索引為鍵，只保留最近 hourly_retention 小時。
+    """
+    
+    def __init__(self, hourly_retention: int = 168):
+        self.hourly_retention = hourly_retention
+        self._local = threading.local()
+        self._lock = threading.Lock()  # 只保護分片列表
+        self._shards: List[_MetricsShard] = []
+        self._retired = _MetricsShard()  # 已結束線程的分片合併於此
+        self._generation = 0
+    
+    def _shard(self) -> _MetricsShard:
+        """取得當前線程的分片"""
+        local = self._local
+        shard = getattr(local, 'shard', None)
+        if shard is None or local.generation != self._generation:
+            shard = _MetricsShard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+                local.generation = self._generation
+            local.shard = shard
+        return shard
     
     def record_request(self, site: str, duration: float, success: bool, error_type: str = None):
         """記錄請求指標"""
+        shard = self._shard()
+        shard.request_count += 1
+        shard.total_duration += duration
+        if duration < shard.min_response_time:
+            shard.min_response_time = duration
+        if duration > shard.max_response_time:
+            shard.max_response_time = duration
+        
+        if success:
+            shard.success_count += 1
+        else:
+            shard.error_count += 1
+            if error_type:
+                shard.error_types[error_type] = shard.error_types.get(error_type, 0) + 1
+        
+        # 網站特定指標
+        site_metrics = shard.site_metrics.get(site)
+        if site_metrics is None:
+            site_metrics = shard.site_metrics[site] = [0, 0, 0, 0.0]
+        site_metrics[0] += 1
+        site_metrics[3] += duration
+        site_metrics[1 if success else 2] += 1
+        
+        # 每小時統計
+        hour = int(time.time() // 3600)
+        if hour != shard.current_hour:
+            shard.current_hour = hour
+            cutoff = hour - self.hourly_retention
+            for old_hour in [key for key in shard.hourly_stats if key <= cutoff]:
+                del shard.hourly_stats[old_hour]
+        hourly = shard.hourly_stats.get(hour)
+        if hourly is None:
+            hourly = shard.hourly_stats[hour] = [0, 0, 0]
+        hourly[0] += 1
+        hourly[1 if success else 2] += 1
+    
+    def _merged(self) -> _MetricsShard:
+        """合併所有分片（已結束線程的分片併入 _retired 後移除）"""
+        merged = _MetricsShard()
         with self._lock:
-            self.metrics['request_count'] += 1
-            self.metrics['total_duration'] += duration
-            
-            if success:
-                self.metrics['success_count'] += 1
-            else:
-                self.metrics['error_count'] += 1
-                if error_type:
-                    self.metrics['error_types'][error_type] = self.metrics['error_types'].get(error_type, 0) + 1
-            
-            # 更新響應時間統計
-            self.metrics['avg_response_time'] = self.metrics['total_duration'] / self.metrics['request_count']
-            self.metrics['min_response_time'] = min(self.metrics['min_response_time'], duration)
-            self.metrics['max_response_time'] = max(self.metrics['max_response_time'], duration)
-            
-            # 網站特定指標
-            if site not in self.metrics['site_metrics']:
-                self.metrics['site_metrics'][site] = {
-                    'requests': 0, 'successes': 0, 'errors': 0, 'total_time': 0.0
-                }
-            
-            site_metrics = self.metrics['site_metrics'][site]
-            site_metrics['requests'] += 1
-            site_metrics['total_time'] += duration
-            if success:
-                site_metrics['successes'] += 1
-            else:
-                site_metrics['errors'] += 1
+            alive = []
+            for shard in self._shards:
+                if shard.thread is not None and not shard.thread.is_alive():
+                    shard.merge_into(self._retired)
+                else:
+                    alive.append(shard)
+            self._shards = alive
             
-            # 每小時統計
-            hour_key = datetime.now().strftime('%Y-%m-%d-%H')
-            if hour_key not in self.metrics['hourly_stats']:
-                self.metrics['hourly_stats'][hour_key] = {'requests': 0, 'successes': 0, 'errors': 0}
+            cutoff = int(time.time() // 3600) - self.hourly_retention
+            for old_hour in [key for key in self._retired.hourly_stats if key <= cutoff]:
+                del self._retired.hourly_stats[old_hour]
             
-            hourly = self.metrics['hourly_stats'][hour_key]
-            hourly['requests'] += 1
-            if success:
-                hourly['successes'] += 1
-            else:
-                hourly['errors'] += 1
+            self._retired.merge_into(merged)
+            for shard in alive:
+                shard.merge_into(merged)
+        return merged
     
     def get_metrics(self) -> Dict[str, Any]:
         """獲取當前指標"""
-        with self._lock:
-            # 計算成功率
-            success_rate = (self.metrics['success_count'] / self.metrics['request_count'] * 100) if self.metrics['request_count'] > 0 else 0
-            
-            # 計算網站成功率
-            for site, metrics in self.metrics['site_metrics'].items():
-                if metrics['requests'] > 0:
-                    metrics['success_rate'] = metrics['successes'] / metrics['requests'] * 100
-                    metrics['avg_response_time'] = metrics['total_time'] / metrics['requests']
-            
-            return {
-                **self.metrics,
-                'success_rate': success_rate
+        merged = self._merged()
+        
+        site_metrics = {}
+        for site, (requests, successes, errors, total_time) in merged.site_metrics.items():
+            site_metrics[site] = {
+                'requests': requests, 'successes': successes, 'errors': errors, 'total_time': total_time
             }
+            if requests > 0:
+                site_metrics[site]['success_rate'] = successes / requests * 100
+                site_metrics[site]['avg_response_time'] = total_time / requests
+        
+        cutoff = int(time.time() // 3600) - self.hourly_retention
+        hourly_stats = {
+            datetime.fromtimestamp(hour * 3600).strftime('%Y-%m-%d-%H'): {
+                'requests': requests, 'successes': successes, 'errors': errors
+            }
+            for hour, (requests, successes, errors) in sorted(merged.hourly_stats.items())
+            if hour > cutoff
+        }
+        
+        request_count = merged.request_count
+        return {
+            'request_count': request_count,
+            'success_count': merged.success_count,
+            'error_count': merged.error_count,
+            'total_duration': merged.total_duration,
+            'avg_response_time': merged.total_duration / request_count if request_count else 0.0,
+            'min_response_time': merged.min_response_time,
+            'max_response_time': merged.max_response_time,
+            'site_metrics': site_metrics,
+            'error_types': merged.error_types,
+            'hourly_stats': hourly_stats,
+            'success_rate': (merged.success_count / request_count * 100) if request_count > 0 else 0
+        }
     
     def reset_metrics(self):
         """重置指標"""
         with self._lock:
-            self.__init__()
+            self._shards = []
+            self._retired = _MetricsShard()
+            # 各線程下次記錄時發現世代改變，會建立新分片
+            self._generation += 1
 
 
 class EnhancedLogger:
     """增強的日誌記錄器"""
     
     def __init__(self, name: str, log_file: Optional[str] = None, 
-                 enable_console: bool = True, enable_json: bool = False):
+                 enable_console: bool = True, enable_json: bool = False,
+                 default_category: LogCategory = LogCategory.GENERAL,
+                 level: int = logging.DEBUG, max_entries: int = 1000):
         """
         初始化增強日誌記錄器
         
+        日誌調用只建立條目並放入佇列；訊息組裝、序列化與寫入由背景監聽線程完成。
+        
         Args:
             name: 日誌記錄器名稱
             log_file: 日誌檔案路徑
             enable_console: 是否啟用控制台輸出
-            enable_json: 是否啟用 JSON 格式日誌
+            enable_json: 是否啟用 JSON 格式日誌（每行一個 JSON 物件）
+            default_category: debug/info/warning 未指定分類時使用的分類
+            level: 最低記錄級別，低於此級別的調用直接返回
+            max_entries: 內存中保留的最近日誌條目數
         """
         self.name = name
+        self.default_category = default_category
         self.logger = logging.getLogger(f"jobseeker.Enhanced.{name}")
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(level)
         self.logger.propagate = False
         
         # 清除現有處理器
@@ -169,25 +388,25 @@ class EnhancedLogger:
         # 效能指標
         self.metrics = PerformanceMetrics()
         
-        # 日誌條目緩存
-        self.log_entries: List[LogEntry] = []
-        self._log_lock = threading.Lock()
+        # 日誌條目環形緩存（滿時自動丟棄最舊條目）
+        self.log_entries: deque = deque(maxlen=max_entries)
         
         # 設置處理器
         self._setup_handlers(log_file, enable_console, enable_json)
     
     def _setup_handlers(self, log_file: Optional[str], enable_console: bool, enable_json: bool):
-        """設置日誌處理器"""
+        """設置日誌處理器（實際處理器掛在監聽線程上，記錄器只掛佇列處理器）"""
         formatter = logging.Formatter(
             '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
+        handlers: List[logging.Handler] = []
         
         # 控制台處理器
         if enable_console:
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         # 檔案處理器
         if log_file:
@@ -196,15 +415,52 @@ class EnhancedLogger:
             
             file_handler = logging.FileHandler(log_file, encoding='utf-8')
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
             
             # JSON 格式日誌檔案
             if enable_json:
                 json_file = log_path.with_suffix('.json')
                 json_handler = logging.FileHandler(json_file, encoding='utf-8')
-                json_formatter = logging.Formatter('%(message)s')
-                json_handler.setFormatter(json_formatter)
-                self.logger.addHandler(json_handler)
+                json_handler.setFormatter(_JsonLineFormatter())
+                handlers.append(json_handler)
+        
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # 直接使用 self.logger 的第三方代碼同樣經由佇列寫出
+        self.logger.addHandler(_DeferredQueueHandler(self._queue))
+        self._listener = _EntryQueueListener(
+            self.logger.name, self._queue, *handlers, respect_handler_level=True
+        )
+        
+        with _listeners_lock:
+            previous = _listeners.pop(self.logger.name, None)
+            _listeners[self.logger.name] = self._listener
+        if previous is not None:
+            previous.stop()
+            for handler in previous.handlers:
+                handler.close()
+        self._listener.start()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待目前佇列中的日誌全部寫出"""
+        if self._listener._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout):
+            return False
+        for handler in self._listener.handlers:
+            handler.flush()
+        return True
+    
+    def close(self):
+        """停止監聽線程並關閉處理器"""
+        with _listeners_lock:
+            if _listeners.get(self.logger.name) is self._listener:
+                del _listeners[self.logger.name]
+        if self._listener._thread is not None:
+            self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
     
     def _create_log_entry(self, level: LogLevel, category: LogCategory, 
                          message: str, site: Optional[str] = None, 
@@ -220,45 +476,40 @@ class EnhancedLogger:
             message=message,
             duration=duration,
             metadata=metadata,
-            thread_id=str(threading.current_thread().ident),
+            thread_id=str(threading.get_ident()),
             function_name=function_name
         )
     
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """檢查級別是否會被記錄（用於跳過昂貴的訊息組裝）"""
+        return self.logger.isEnabledFor(_LEVEL_NUMBERS[level])
+    
     def log(self, level: LogLevel, category: LogCategory, message: str, 
            site: Optional[str] = None, duration: Optional[float] = None,
            metadata: Optional[Dict[str, Any]] = None, 
            function_name: Optional[str] = None):
         """記錄結構化日誌"""
-        entry = self._create_log_entry(level, category, message, site, duration, metadata, function_name)
-        
-        with self._log_lock:
-            self.log_entries.append(entry)
-            # 保持最近 1000 條日誌
-            if len(self.log_entries) > 1000:
-                self.log_entries = self.log_entries[-1000:]
+        levelno = _LEVEL_NUMBERS[level]
+        if not self.logger.isEnabledFor(levelno):
+            return
         
-        # 記錄到標準日誌
-        log_message = f"[{category.value}] {message}"
-        if site:
-            log_message = f"[{site}] {log_message}"
-        if duration:
-            log_message += f" (耗時: {duration:.3f}s)"
-        if metadata:
-            log_message += f" | 元數據: {json.dumps(metadata, ensure_ascii=False)}"
+        entry = self._create_log_entry(level, category, message, site, duration, metadata, function_name)
+        self.log_entries.append(entry)
         
-        getattr(self.logger, level.value.lower())(log_message)
+        # 只把條目放入佇列：LogRecord、訊息字串與寫入都在監聽線程完成
+        self._queue.put(_DeferredMessage(entry, levelno))
     
-    def debug(self, message: str, category: LogCategory = LogCategory.GENERAL, **kwargs):
+    def debug(self, message: str, category: Optional[LogCategory] = None, **kwargs):
         """記錄 DEBUG 級別日誌"""
-        self.log(LogLevel.DEBUG, category, message, **kwargs)
+        self.log(LogLevel.DEBUG, category or self.default_category, message, **kwargs)
     
-    def info(self, message: str, category: LogCategory = LogCategory.GENERAL, **kwargs):
+    def info(self, message: str, category: Optional[LogCategory] = None, **kwargs):
         """記錄 INFO 級別日誌"""
-        self.log(LogLevel.INFO, category, message, **kwargs)
+        self.log(LogLevel.INFO, category or self.default_category, message, **kwargs)
     
-    def warning(self, message: str, category: LogCategory = LogCategory.GENERAL, **kwargs):
+    def warning(self, message: str, category: Optional[LogCategory] = None, **kwargs):
         """記錄 WARNING 級別日誌"""
-        self.log(LogLevel.WARNING, category, message, **kwargs)
+        self.log(LogLevel.WARNING, category or self.default_category, message, **kwargs)
     
     def error(self, message: str, category: LogCategory = LogCategory.ERROR, **kwargs):
         """記錄 ERROR 級別日誌"""
@@ -295,18 +546,17 @@ class EnhancedLogger:
                        category: Optional[LogCategory] = None,
                        site: Optional[str] = None) -> List[LogEntry]:
         """獲取最近的日誌條目"""
-        with self._log_lock:
-            logs = self.log_entries[-count:]
-            
-            # 過濾條件
-            if level:
-                logs = [log for log in logs if log.level == level.value]
-            if category:
-                logs = [log for log in logs if log.category == category.value]
-            if site:
-                logs = [log for log in logs if log.site == site]
-            
-            return logs
+        logs = list(self.log_entries)[-count:]
+        
+        # 過濾條件
+        if level:
+            logs = [log for log in logs if log.level == level.value]
+        if category:
+            logs = [log for log in logs if log.category == category.value]
+        if site:
+            logs = [log for log in logs if log.site == site]
+        
+        return logs
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """獲取效能指標"""
@@ -314,19 +564,19 @@ class EnhancedLogger:
     
     def export_logs(self, file_path: str, format: str = 'json'):
         """匯出日誌到檔案"""
-        with self._log_lock:
-            if format.lower() == 'json':
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump([entry.to_dict() for entry in self.log_entries], 
-                             f, ensure_ascii=False, indent=2)
-            elif format.lower() == 'csv':
-                import csv
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    if self.log_entries:
-                        writer = csv.DictWriter(f, fieldnames=self.log_entries[0].to_dict().keys())
-                        writer.writeheader()
-                        for entry in self.log_entries:
-                            writer.writerow(entry.to_dict())
+        entries = list(self.log_entries)
+        if format.lower() == 'json':
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump([entry.to_dict() for entry in entries], 
+                         f, ensure_ascii=False, indent=2, default=str)
+        elif format.lower() == 'csv':
+            import csv
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                if entries:
+                    writer = csv.DictWriter(f, fieldnames=entries[0].to_dict().keys())
+                    writer.writeheader()
+                    for entry in entries:
+                        writer.writerow(entry.to_dict())
 
 
 def performance_logger(site: str = None, operation: str = None, 
@@ -347,8 +597,8 @@ def performance_logger(site: str = None, operation: str = None,
                 if args and hasattr(args[0], 'logger') and isinstance(args[0].logger, EnhancedLogger):
                     log_instance = args[0].logger
                 else:
-                    # 創建臨時 logger
-                    log_instance = EnhancedLogger(f"temp_{func_name}")
+                    # 使用共用的臨時 logger（避免每次調用建立處理器與監聽線程）
+                    log_instance = get_enhanced_logger(f"temp_{func_name}")
             
             try:
                 result = func(*args, **kwargs)
@@ -388,8 +638,8 @@ def async_performance_logger(site: str = None, operation: str = None,
                 if args and hasattr(args[0], 'logger') and isinstance(args[0].logger, EnhancedLogger):
                     log_instance = args[0].logger
                 else:
-                    # 創建臨時 logger
-                    log_instance = EnhancedLogger(f"temp_{func_name}")
+                    # 使用共用的臨時 logger（避免每次調用建立處理器與監聽線程）
+                    log_instance = get_enhanced_logger(f"temp_{func_name}")
             
             try:
                 result = await func(*args, **kwargs)
@@ -448,9 +698,26 @@ class LoggerManager:
 logger_manager = LoggerManager()
 
 
+def _collect_logger_metrics() -> List[MetricFamily]:
+    """匯出各日誌記錄器的效能指標（OpenMetrics）"""
+    operations = MetricFamily('jobseeker_logged_operations', 'counter', 'log_performance 記錄的操作數')
+    seconds = MetricFamily('jobseeker_logged_operation_seconds', 'counter', 'log_performance 記錄的操作總耗時')
+    for name, logger in list(logger_manager._loggers.items()):
+        for site, site_metrics in logger.get_performance_metrics()['site_metrics'].items():
+            operations.add(site_metrics['successes'], logger=name, site=site, outcome='success')
+            operations.add(site_metrics['errors'], logger=name, site=site, outcome='error')
+            seconds.add(site_metrics['total_time'], logger=name, site=site)
+    return [operations, seconds]
+
+
+get_registry().register_collector('enhanced_logging', _collect_logger_metrics)
+
+
 # 便利函數
-def get_enhanced_logger(name: str, **kwargs) -> EnhancedLogger:
-    """獲取增強日誌記錄器"""
+def get_enhanced_logger(name: str, category: Optional[LogCategory] = None, **kwargs) -> EnhancedLogger:
+    """獲取增強日誌記錄器（category 為該記錄器的預設分類）"""
+    if category is not None:
+        kwargs['default_category'] = category
     return logger_manager.get_logger(name, **kwargs)
 
 
@@ -28,6 +28,7 @@ from .performance_monitoring import (
     MetricsCollector, ScrapingMetrics
 )
 from .enhanced_logging import get_enhanced_logger, LogCategory
+from .metrics_exporter import MetricFamily, get_registry
 
 
 class HealthStatus(Enum):
@@ -106,6 +107,8 @@ class RealTimeMonitor:
         self.system_metrics_history = deque(maxlen=1000)
         self.performance_alerts = deque(maxlen=100)
         self._lock = threading.RLock()
+        
+        get_registry().register_collector('real_time_monitor', self.collect_metrics)
     
     async def start_monitoring(self):
         """開始實時監控"""
@@ -260,6 +263,25 @@ class RealTimeMonitor:
         """獲取最近的警報"""
         with self._lock:
             return list(self.performance_alerts)[-count:]
+    
+    def collect_metrics(self) -> List[MetricFamily]:
+        """匯出最近一次系統指標（OpenMetrics）"""
+        with self._lock:
+            latest = self.system_metrics_history[-1] if self.system_metrics_history else None
+            alert_count = len(self.performance_alerts)
+        
+        families = [
+            MetricFamily('jobseeker_monitor_recent_alerts', 'gauge', '保留中的效能警報數').add(alert_count)
+        ]
+        if latest is not None:
+            families.extend([
+                MetricFamily('jobseeker_system_cpu_percent', 'gauge', 'CPU 使用率').add(latest.cpu_usage),
+                MetricFamily('jobseeker_system_memory_percent', 'gauge', '記憶體使用率').add(latest.memory_usage),
+                MetricFamily('jobseeker_system_disk_percent', 'gauge', '磁碟使用率').add(latest.disk_usage),
+                MetricFamily('jobseeker_system_threads', 'gauge', '執行緒數').add(latest.thread_count),
+                MetricFamily('jobseeker_system_connections', 'gauge', '網路連接數').add(latest.active_connections),
+            ])
+        return families
 
 
 class PerformanceAnalyzer:
@@ -2,7 +2,6 @@
 
 import math
 import re
-import json
 from typing import Tuple
 from datetime import datetime, timedelta
 
@@ -17,7 +16,7 @@ from jobseeker.model import (
     JobType,
 )
 from jobseeker.util import extract_emails_from_text, extract_job_type, create_session
-from jobseeker.google.util import log, find_job_info_initial_page, find_job_info
+from jobseeker.google.util import log, find_job_info_initial_page, parse_jobs_page
 
 
 class Google(Scraper):
@@ -143,22 +142,9 @@ class Google(Scraper):
         """
         Parses jobs on a page with next page cursor
         """
-        start_idx = job_data.find("[[[")
-        end_idx = job_data.rindex("]]]") + 3
-        s = job_data[start_idx:end_idx]
-        parsed = json.loads(s)[0]
-
-        pattern_fc = r'data-async-fc="([^"]+)"'
-        match_fc = re.search(pattern_fc, job_data)
-        data_async_fc = match_fc.group(1) if match_fc else None
+        job_infos, data_async_fc = parse_jobs_page(job_data)
         jobs_on_page = []
-        for array in parsed:
-            _, job_data = array
-            if not job_data.startswith("[[["):
-                continue
-            job_d = json.loads(job_data)
-
-            job_info = find_job_info(job_d)
+        for job_info in job_infos:
             job_post = self._parse_job(job_info)
             if job_post:
                 jobs_on_page.append(job_post)
@@ -2,7 +2,6 @@
 
 import math
 import re
-import json
 import time
 import random
 from typing import Tuple, Optional
@@ -13,6 +12,7 @@ from bs4 import BeautifulSoup
 
 from .constant import headers_jobs, headers_initial, async_param
 from ..anti_detection import AntiDetectionScraper
+from ..http_replay import install_route_replay_sync
 from ..model import (
     Scraper,
     ScraperInput,
@@ -23,7 +23,7 @@ from ..model import (
     JobType,
 )
 from ..util import extract_emails_from_text, extract_job_type, create_session, create_logger
-from .util import find_job_info_initial_page, find_job_info
+from .util import find_job_info_initial_page, parse_jobs_page
 
 log = create_logger("EnhancedGoogle")
 
@@ -84,6 +84,8 @@ class EnhancedGoogle(Scraper):
                 viewport=browser_config['viewport'],
                 extra_http_headers=browser_config['headers']
             )
+            # 啟用卡帶時改由錄製 / 重放路由處理請求
+            install_route_replay_sync(context)
             
             self.page = context.new_page()
             
@@ -400,29 +402,14 @@ class EnhancedGoogle(Scraper):
         解析職位數據和下一頁游標
         """
         try:
-            start_idx = job_data.find("[[[")
-            end_idx = job_data.rindex("]]]")
-            
-            if start_idx == -1 or end_idx == -1:
+            if job_data.find("[[[") == -1 or job_data.rfind("]]]") == -1:
                 log.warning("無法找到有效的 JSON 數據")
                 return [], None
                 
-            end_idx += 3
-            s = job_data[start_idx:end_idx]
-            parsed = json.loads(s)[0]
-
-            pattern_fc = r'data-async-fc="([^"]+)"'
-            match_fc = re.search(pattern_fc, job_data)
-            data_async_fc = match_fc.group(1) if match_fc else None
+            job_infos, data_async_fc = parse_jobs_page(job_data)
             
             jobs_on_page = []
-            for array in parsed:
-                _, job_data_inner = array
-                if not job_data_inner.startswith("[[["):
-                    continue
-                    
-                job_d = json.loads(job_data_inner)
-                job_info = find_job_info(job_d)
+            for job_info in job_infos:
                 job_post = self._parse_job(job_info)
                 if job_post:
                     jobs_on_page.append(job_post)
@@ -1,42 +1,159 @@
-﻿import re
+﻿import json
+import re
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from jobseeker.util import create_logger
 
 log = create_logger("Google")
 
+JOB_INFO_KEY = "520084652"
 
-def find_job_info(jobs_data: list | dict) -> list | None:
-    """Iterates through the JSON data to find the job listings"""
+_ASYNC_FC_PATTERN = re.compile(r'data-async-fc="([^"]+)"')
+# closing structure that follows the job array on the initial search page
+_INITIAL_PAGE_TAIL = re.compile(r"\s*}\s*]\s*]\s*]\s*]\s*]")
+# JSON string literals (consumed whole so brackets inside them are skipped) or brackets;
+# the alternatives cannot overlap, so matching never backtracks
+_JSON_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]]', re.DOTALL)
+
+_DECODER = json.JSONDecoder()
+
+# path (dict keys / list indices) to the job array learned from the last page
+_job_info_path: tuple | None = None
+
+
+def loads(text: str | bytes):
+    """Decodes JSON with orjson when available (falls back for e.g. integers beyond 64 bits)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _find_job_info_path(jobs_data: list | dict, path: tuple = ()) -> tuple | None:
+    """Depth-first search for the job listings, returning the path to them"""
     if isinstance(jobs_data, dict):
         for key, value in jobs_data.items():
-            if key == "520084652" and isinstance(value, list):
-                return value
-            else:
-                result = find_job_info(value)
-                if result:
-                    return result
+            if key == JOB_INFO_KEY and isinstance(value, list):
+                return path + (key,)
+            result = _find_job_info_path(value, path + (key,))
+            if result:
+                return result
     elif isinstance(jobs_data, list):
-        for item in jobs_data:
-            result = find_job_info(item)
+        for index, item in enumerate(jobs_data):
+            result = _find_job_info_path(item, path + (index,))
             if result:
                 return result
     return None
 
 
+def _follow_path(jobs_data: list | dict, path: tuple) -> list | None:
+    value = jobs_data
+    for step in path:
+        if isinstance(step, int):
+            if not isinstance(value, list) or step >= len(value):
+                return None
+        elif not isinstance(value, dict) or step not in value:
+            return None
+        value = value[step]
+    return value if isinstance(value, list) and value else None
+
+
+def find_job_info(jobs_data: list | dict) -> list | None:
+    """
+    Finds the job listings in the JSON data. Every job on a page shares the same
+    layout, so the path found by the recursive search is cached and tried first
+    """
+    global _job_info_path
+    if _job_info_path is not None:
+        result = _follow_path(jobs_data, _job_info_path)
+        if result is not None:
+            return result
+    path = _find_job_info_path(jobs_data)
+    if path is None:
+        return None
+    _job_info_path = path
+    return _follow_path(jobs_data, path)
+
+
+def _match_bracket(text: str, start: int, stop: int) -> int:
+    """
+    Returns the index just past the array opened at text[start], skipping
+    brackets inside JSON strings, or -1 if it is not closed before text[stop].
+    Linear in stop - start
+    """
+    depth = 0
+    for match in _JSON_TOKEN.finditer(text, start, stop):
+        token = match.group()
+        if token == "[":
+            depth += 1
+        elif token == "]":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return -1
+
+
 def find_job_info_initial_page(html_text: str):
-    pattern = f'520084652":(' + r"\[.*?\]\s*])\s*}\s*]\s*]\s*]\s*]\s*]"
+    """
+    Finds the job arrays embedded in the initial search page. Each array is decoded
+    in place by the JSON scanner, which also reports where it ends, so the page is
+    read once without regex backtracking; the bracket scanner only measures arrays
+    that fail to decode. Neither reads past the next marker (job arrays do not
+    nest the marker), so unterminated arrays keep the whole pass linear
+    """
+    marker = f'{JOB_INFO_KEY}":'
     results = []
-    matches = re.finditer(pattern, html_text)
+    position = html_text.find(marker)
+    while position != -1:
+        start = position + len(marker)
+        next_marker = html_text.find(marker, start)
+        if not html_text.startswith("[", start):
+            position = next_marker
+            continue
 
-    import json
-
-    for match in matches:
+        # decode only up to the next marker: a failed decode reports its line and
+        # column by scanning back through the whole string it was given
+        stop = len(html_text) if next_marker == -1 else next_marker
+        segment = html_text[start:stop]
         try:
-            parsed_data = json.loads(match.group(1))
-            results.append(parsed_data)
-
+            value, end = _DECODER.raw_decode(segment)
+            end += start
+            error = None
         except json.JSONDecodeError as e:
-            log.error(f"Failed to parse match: {str(e)}")
-            results.append({"raw_match": match.group(0), "error": str(e)})
+            value, error = None, e
+            end = _match_bracket(html_text, start, stop)
+        tail = _INITIAL_PAGE_TAIL.match(html_text, end) if end != -1 else None
+        if tail is None:
+            position = next_marker
+            continue
+
+        if error is None:
+            results.append(value)
+        else:
+            log.error(f"Failed to parse match: {str(error)}")
+            results.append({"raw_match": html_text[position:tail.end()], "error": str(error)})
+        position = next_marker if next_marker == -1 or next_marker >= tail.end() else html_text.find(marker, tail.end())
     return results
 
+
+def parse_jobs_page(job_data: str) -> tuple[list, str | None]:
+    """Decodes a jobs callback page into the job info arrays and the next page cursor"""
+    start_idx = job_data.find("[[[")
+    end_idx = job_data.rindex("]]]") + 3
+    parsed = loads(job_data[start_idx:end_idx])[0]
+
+    match_fc = _ASYNC_FC_PATTERN.search(job_data)
+    data_async_fc = match_fc.group(1) if match_fc else None
+    job_infos = []
+    for _, payload in parsed:
+        if not payload.startswith("[[["):
+            continue
+        job_infos.append(find_job_info(loads(payload)))
+    return job_infos, data_async_fc
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 錄製與重放
+將真實的頁面 / GraphQL 回應錄製成夾具檔案，之後離線、可重現地重放
+
+設計要點:
+1. create_session 建立的 requests 與 tls_client 會話在有啟用中的卡帶時經由卡帶處理
+2. Playwright 以 route 攔截請求（install_route_replay），與 HTTP 會話共用同一卷卡帶
+3. 相同請求錄製多次時依序重放（分頁、重試等），用完後停留在最後一筆
+4. 重放可注入固定延遲與可重現的抖動，用於模擬網路往返
+
+用法:
+    with use_cassette('benchmarks/cassettes/indeed.json', mode='record'):
+        scrape_jobs(site_name='indeed', search_term='python')
+
+    with use_cassette('benchmarks/cassettes/indeed.json', latency=0.05):
+        scrape_jobs(site_name='indeed', search_term='python')
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+
+CASSETTE_VERSION = 1
+
+# Playwright 錄製時保存的資源類型；圖片、字型、媒體不影響解析，重放時直接中止
+RECORDED_RESOURCE_TYPES = frozenset({'document', 'xhr', 'fetch', 'script'})
+
+
+# 保存的主體已解壓縮，這些標頭重放時會造成錯誤
+_HOP_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection'})
+
+
+class CassetteMissError(LookupError):
+    """重放模式下找不到對應的錄製回應"""
+
+
+def _body_digest(body: Any) -> Optional[str]:
+    """請求主體摘要（dict / list 以排序後的 JSON 計算）"""
+    if body is None or body == '' or body == b'':
+        return None
+    if isinstance(body, (dict, list, tuple)):
+        body = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha1(body).hexdigest()
+
+
+class Cassette:
+    """
+    錄製卡帶
+
+    Args:
+        path: 夾具檔案路徑（JSON）
+        mode: record 或 replay
+        latency: 重放時每個請求注入的延遲（秒）
+        jitter: 延遲的隨機抖動上限（秒），以 seed 產生可重現序列
+        ignore_params: 比對時忽略的查詢參數（時間戳、追蹤 ID 等）
+        seed: 抖動的隨機種子
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = MODE_REPLAY, latency: float = 0.0,
+                 jitter: float = 0.0, ignore_params: Iterable[str] = (), seed: int = 0):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f'未知的卡帶模式: {mode}')
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.ignore_params = frozenset(ignore_params)
+        self._random = random.Random(seed)
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'replayed': 0, 'recorded': 0, 'misses': 0, 'bytes': 0}
+
+        # 錄製模式重新錄製整卷，不沿用舊內容
+        if mode == MODE_REPLAY:
+            if not self.path.exists():
+                raise FileNotFoundError(f'卡帶不存在: {self.path}')
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        for interaction in document.get('interactions', []):
+            self._interactions.setdefault(interaction['key'], []).append(interaction)
+
+    def save(self):
+        """寫出卡帶（僅錄製模式）"""
+        if self.mode != MODE_RECORD:
+            return
+        with self._lock:
+            interactions = [item for items in self._interactions.values() for item in items]
+        interactions.sort(key=lambda item: item['sequence'])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CASSETTE_VERSION, 'interactions': interactions}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+
+    def request_key(self, method: str, url: str, params: Any = None, body: Any = None) -> str:
+        """請求比對鍵：方法 + 正規化 URL（排序查詢參數）+ 主體摘要"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend(params.items() if isinstance(params, dict) else params)
+        query = sorted((str(key), str(value)) for key, value in query if key not in self.ignore_params)
+        normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+        key = f'{method.upper()} {normalized}'
+        digest = _body_digest(body)
+        return f'{key} #{digest}' if digest else key
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """取出下一筆錄製回應（依序重放，用完停在最後一筆）"""
+        with self._lock:
+            self.stats['requests'] += 1
+            interactions = self._interactions.get(key)
+            if not interactions:
+                self.stats['misses'] += 1
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.stats['replayed'] += 1
+            response = interactions[min(cursor, len(interactions) - 1)]['response']
+            self.stats['bytes'] += response.get('size', 0)
+            return response
+
+    def record(self, key: str, method: str, url: str, status: int, headers: Dict[str, Any],
+               body: bytes, final_url: Optional[str] = None):
+        """保存一筆回應"""
+        response: Dict[str, Any] = {
+            'status': status,
+            'headers': {
+                str(name): str(value) for name, value in headers.items()
+                if str(name).lower() not in _HOP_HEADERS
+            },
+            'url': final_url or url,
+            'size': len(body)
+        }
+        try:
+            response['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            response['body_base64'] = base64.b64encode(body).decode('ascii')
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['recorded'] += 1
+            self.stats['bytes'] += len(body)
+            sequence = sum(len(items) for items in self._interactions.values())
+            self._interactions.setdefault(key, []).append({
+                'key': key, 'sequence': sequence, 'request': {'method': method.upper(), 'url': url},
+                'response': response
+            })
+
+    def next_delay(self) -> float:
+        """下一個注入延遲"""
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def handle(self, method: str, url: str, params: Any, body: Any,
+               send: Callable[[], Any], response_factory: Callable[[], Any]):
+        """
+        處理同步 HTTP 請求
+
+        Args:
+            send: 實際發送請求（錄製模式使用）
+            response_factory: 建立空回應物件（requests.Response 或 tls_client Response）
+        """
+        key = self.request_key(method, url, params, body)
+        if self.mode == MODE_RECORD:
+            response = send()
+            self.record(key, method, url, response.status_code, dict(response.headers),
+                        response.content, getattr(response, 'url', None))
+            return response
+
+        recorded = self.lookup(key)
+        if recorded is None:
+            raise CassetteMissError(f'卡帶 {self.path.name} 中沒有 {key}')
+        delay = self.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        return build_response(recorded, response_factory)
+
+
+def recorded_body(recorded: Dict[str, Any]) -> bytes:
+    if 'body_base64' in recorded:
+        return base64.b64decode(recorded['body_base64'])
+    return recorded.get('body', '').encode('utf-8')
+
+
+def build_response(recorded: Dict[str, Any], response_factory: Callable[[], Any]):
+    """以錄製內容填充回應物件（requests 與 tls_client 的 Response 欄位相同）"""
+    from requests.structures import CaseInsensitiveDict
+
+    response = response_factory()
+    response.status_code = recorded['status']
+    response.url = recorded['url']
+    response.headers = CaseInsensitiveDict(recorded['headers'])
+    response._content = recorded_body(recorded)
+    if hasattr(response, 'reason'):
+        response.reason = 'OK' if response.status_code < 400 else 'Recorded'
+    if hasattr(response, 'encoding') and response.encoding is None:
+        response.encoding = 'utf-8'
+    return response
+
+
+# 目前啟用的卡帶；爬蟲在各自線程中執行，因此使用全域而非 contextvars
+_active_cassette: Optional[Cassette] = None
+_active_lock = threading.Lock()
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """獲取目前啟用的卡帶"""
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(path: Union[str, Path], mode: str = MODE_REPLAY, latency: float = 0.0,
+                 jitter: float = 0.0, ignore_params: Iterable[str] = (), seed: int = 0) -> Iterator[Cassette]:
+    """啟用卡帶；錄製模式離開時寫出檔案"""
+    global _active_cassette
+    cassette = Cassette(path, mode, latency, jitter, ignore_params, seed)
+    with _active_lock:
+        if _active_cassette is not None:
+            raise RuntimeError('已有啟用中的卡帶')
+        _active_cassette = cassette
+    try:
+        yield cassette
+    finally:
+        with _active_lock:
+            _active_cassette = None
+        cassette.save()
+
+
+def _route_key(cassette: Cassette, request) -> str:
+    return cassette.request_key(request.method, request.url, body=request.post_data_buffer)
+
+
+async def _handle_route_async(cassette: Cassette, route):
+    request = route.request
+    if cassette.mode == MODE_RECORD:
+        if request.resource_type not in RECORDED_RESOURCE_TYPES:
+            await route.continue_()
+            return
+        response = await route.fetch()
+        body = await response.body()
+        cassette.record(_route_key(cassette, request), request.method, request.url,
+                        response.status, response.headers, body, response.url)
+        await route.fulfill(response=response, body=body)
+        return
+
+    recorded = cassette.lookup(_route_key(cassette, request))
+    if recorded is None:
+        await route.abort()
+        return
+    delay = cassette.next_delay()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    await route.fulfill(status=recorded['status'], headers=recorded['headers'], body=recorded_body(recorded))
+
+
+def _handle_route_sync(cassette: Cassette, route):
+    request = route.request
+    if cassette.mode == MODE_RECORD:
+        if request.resource_type not in RECORDED_RESOURCE_TYPES:
+            route.continue_()
+            return
+        response = route.fetch()
+        body = response.body()
+        cassette.record(_route_key(cassette, request), request.method, request.url,
+                        response.status, response.headers, body, response.url)
+        route.fulfill(response=response, body=body)
+        return
+
+    recorded = cassette.lookup(_route_key(cassette, request))
+    if recorded is None:
+        route.abort()
+        return
+    delay = cassette.next_delay()
+    if delay > 0:
+        time.sleep(delay)
+    route.fulfill(status=recorded['status'], headers=recorded['headers'], body=recorded_body(recorded))
+
+
+async def install_route_replay(target) -> bool:
+    """
+    在 Playwright 非同步 API 的 BrowserContext 或 Page 上安裝錄製 / 重放路由
+
+    沒有啟用中的卡帶時不做任何事，返回是否已安裝
+    """
+    cassette = get_active_cassette()
+    if cassette is None:
+        return False
+    await target.route('**/*', lambda route: _handle_route_async(cassette, route))
+    return True
+
+
+def install_route_replay_sync(target) -> bool:
+    """install_route_replay 的 Playwright 同步 API 版本"""
+    cassette = get_active_cassette()
+    if cassette is None:
+        return False
+    target.route('**/*', lambda route: _handle_route_sync(cassette, route))
+    return True
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OpenMetrics 指標匯出
+統一的指標註冊表，輸出 OpenMetrics / Prometheus 文字格式，無第三方依賴
+
+設計要點:
+1. 計數器、量表與直方圖以標籤區分（例如每個網站一條延遲直方圖）
+2. 已有自身統計的元件（佇列、快取、熔斷器等）註冊收集函數，於抓取時才讀取
+3. 收集函數若為綁定方法則以弱引用保存，元件釋放後自動移除
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import math
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 抓取延遲的預設分桶（秒）
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    """格式化樣本值"""
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value))
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+class MetricFamily:
+    """
+    指標族：同名同類型的一組樣本，供收集函數回傳
+
+    Args:
+        name: 指標名稱（計數器不含 _total 後綴）
+        metric_type: counter、gauge 或 histogram
+        documentation: 說明文字
+    """
+
+    def __init__(self, name: str, metric_type: str, documentation: str = ''):
+        self.name = name
+        self.type = metric_type
+        self.documentation = documentation
+        self.samples: List[Tuple[str, Dict[str, Any], float]] = []
+
+    def add(self, value: float, suffix: str = '', **labels):
+        """加入一個樣本（計數器自動加上 _total 後綴）"""
+        if self.type == 'counter' and not suffix:
+            suffix = '_total'
+        self.samples.append((self.name + suffix, labels, value))
+        return self
+
+    def render(self) -> List[str]:
+        lines = [f'# TYPE {self.name} {self.type}']
+        if self.documentation:
+            lines.append(f'# HELP {self.name} {_escape_label(self.documentation)}')
+        for sample_name, labels, value in self.samples:
+            lines.append(f'{sample_name}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+
+class _Metric:
+    """帶標籤的指標基類"""
+
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str = '', labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **labels):
+        """取得指定標籤值的子指標"""
+        if labels:
+            values = tuple(str(labels[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f'{self.name} 需要標籤 {self.labelnames}')
+
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _default(self):
+        """無標籤指標直接操作的子指標"""
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.metric_type, self.documentation)
+        for values, child in list(self._children.items()):
+            child.collect_into(family, dict(zip(self.labelnames, values)))
+        return family
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        if amount < 0:
+            raise ValueError('計數器只能遞增')
+        with self._lock:
+            self.value += amount
+
+    def collect_into(self, family: MetricFamily, labels: Dict[str, str]):
+        family.add(self.value, **labels)
+
+
+class _GaugeChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def collect_into(self, family: MetricFamily, labels: Dict[str, str]):
+        family.add(self.value, **labels)
+
+
+class _HistogramChild:
+    __slots__ = ('upper_bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # 最後一格為 +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = len(self.upper_bounds)
+        for position, bound in enumerate(self.upper_bounds):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def collect_into(self, family: MetricFamily, labels: Dict[str, str]):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds + (float('inf'),), counts):
+            cumulative += count
+            family.add(cumulative, '_bucket', **labels, le=_format_value(float(bound)))
+        family.add(cumulative, '_count', **labels)
+        family.add(total, '_sum', **labels)
+
+
+class Counter(_Metric):
+    """計數器"""
+
+    metric_type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """量表"""
+
+    metric_type = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+
+class Histogram(_Metric):
+    """直方圖（固定分桶）"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str = '', labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+
+class MetricsRegistry:
+    """指標註冊表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Optional[Callable[[], Iterable[MetricFamily]]]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f'指標 {name} 已以不同類型或標籤註冊')
+            return metric
+
+    def counter(self, name: str, documentation: str = '', labelnames: Sequence[str] = ()) -> Counter:
+        """取得或建立計數器"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str = '', labelnames: Sequence[str] = ()) -> Gauge:
+        """取得或建立量表"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str = '', labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        """取得或建立直方圖"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[MetricFamily]]):
+        """
+        註冊收集函數（同一 key 重複註冊時取代舊的）
+
+        Args:
+            key: 元件識別名稱
+            collector: 抓取時呼叫，回傳 MetricFamily 列表；綁定方法以弱引用保存
+        """
+        if hasattr(collector, '__self__') and hasattr(collector, '__func__'):
+            reference = weakref.WeakMethod(collector)
+        else:
+            reference = lambda: collector  # noqa: E731
+        with self._lock:
+            self._collectors[key] = reference
+
+    def unregister_collector(self, key: str):
+        """移除收集函數"""
+        with self._lock:
+            self._collectors.pop(key, None)
+
+    def collect(self) -> List[MetricFamily]:
+        """收集所有指標"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+
+        families = [metric.collect() for metric in metrics]
+        for key, reference in collectors:
+            collector = reference()
+            if collector is None:
+                self.unregister_collector(key)
+                continue
+            try:
+                families.extend(collector())
+            except Exception as e:
+                # 單一元件出錯不影響其他指標
+                families.append(
+                    MetricFamily('jobseeker_collector_errors', 'gauge', '收集函數錯誤')
+                    .add(1, collector=key, error=type(e).__name__)
+                )
+        return families
+
+    def render(self) -> str:
+        """輸出 OpenMetrics 文字格式（同名指標族合併輸出）"""
+        merged: Dict[str, MetricFamily] = {}
+        for family in self.collect():
+            existing = merged.get(family.name)
+            if existing is None:
+                merged[family.name] = family
+            elif existing.type == family.type:
+                existing.samples.extend(family.samples)
+
+        lines: List[str] = []
+        for family in merged.values():
+            if family.samples:
+                lines.extend(family.render())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+# 全域註冊表
+REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """獲取全域指標註冊表"""
+    return REGISTRY
+
+
+def wants_openmetrics(accept_header: Optional[str]) -> bool:
+    """根據 Accept 標頭判斷客戶端（如 Prometheus）是否要求文字格式"""
+    if not accept_header:
+        return False
+    accept = accept_header.lower()
+    return 'application/openmetrics-text' in accept or (
+        'text/plain' in accept and 'application/json' not in accept
+    )
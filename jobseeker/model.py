@@ -6,6 +6,8 @@ from datetime import date
 from enum import Enum
 from pydantic import BaseModel
 
+from jobseeker.tracing import traced
+
 
 class JobType(Enum):
     FULL_TIME = (
@@ -326,6 +328,16 @@ class ScraperInput(BaseModel):
 
 
 class Scraper(ABC):
+    # 子類別定義這些方法時自動包上追蹤 span（抓取入口、單頁抓取、頁面解析）
+    _TRACED_METHODS = ("scrape", "_scrape_page", "_parse_jobs")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for method_name in Scraper._TRACED_METHODS:
+            method = cls.__dict__.get(method_name)
+            if callable(method) and not getattr(method, "__isabstractmethod__", False):
+                setattr(cls, method_name, traced(f"{cls.__name__}.{method_name}")(method))
+
     def __init__(
         self, site: Site, proxies: list[str] | None = None, ca_cert: str | None = None, user_agent: str | None = None
     ):
@@ -3,18 +3,20 @@
 提供爬蟲效能監控、指標收集和分析功能。
 """
 
+import math
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict, deque
 import json
-import statistics
 from functools import wraps
 import asyncio
 
+from .metrics_exporter import get_registry
+
 
 class MetricType(Enum):
     """指標類型枚舉"""
@@ -74,6 +76,9 @@ class PerformanceStats:
     avg_data_quality_score: float = 0.0
     total_retries: int = 0
     rate_limit_hits: int = 0
+    p50_response_time: float = 0.0
+    p95_response_time: float = 0.0
+    p99_response_time: float = 0.0
 
     def calculate_rates(self):
         """計算各種比率"""
@@ -82,12 +87,164 @@ class PerformanceStats:
             self.error_rate = self.failed_requests / self.total_requests
 
 
+class LatencyHistogram:
+    """
+    可合併的對數分桶直方圖（DDSketch 式）
+
+    數值按 gamma = (1 + a) / (1 - a) 的對數分桶，分位數的相對誤差不超過 a；
+    兩個直方圖可逐桶相加合併，結果與把所有樣本放在同一直方圖相同。
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def add(self, value: float, count: int = 1):
+        """加入樣本"""
+        if value <= self.min_value:
+            self.zero_count += count
+        else:
+            self.bins[math.ceil(math.log(value) / self._log_gamma)] += count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram'):
+        """合併另一個直方圖（須使用相同精度）"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("只能合併相同精度的直方圖")
+        for index, count in other.bins.items():
+            self.bins[index] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """估算分位數（0 <= q <= 1）"""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # 桶的代表值取上下界的相對中點，並限制在實際範圍內
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class MetricBucket:
+    """單一時間桶的彙總（計數、總和、極值與可選的直方圖）"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'histogram')
+
+    def __init__(self, with_histogram: bool = False):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.histogram = LatencyHistogram() if with_histogram else None
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if self.histogram is not None:
+            self.histogram.add(value)
+
+    def merge(self, other: 'MetricBucket'):
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if other.histogram is not None:
+            if self.histogram is None:
+                self.histogram = LatencyHistogram(other.histogram.relative_accuracy)
+            self.histogram.merge(other.histogram)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class RollupSeries:
+    """
+    固定解析度的環狀時間桶
+
+    保留 slots 個桶（涵蓋 resolution * slots 秒），舊桶在同一位置被新時段覆寫，
+    記憶體用量固定。
+    """
+
+    def __init__(self, resolution: int, slots: int, with_histogram: bool = False):
+        self.resolution = resolution
+        self.slots = slots
+        self.with_histogram = with_histogram
+        self._buckets: List[Optional[Tuple[int, MetricBucket]]] = [None] * slots
+
+    @property
+    def retention(self) -> int:
+        return self.resolution * self.slots
+
+    def add(self, timestamp: float, value: float):
+        index = int(timestamp // self.resolution)
+        slot = index % self.slots
+        current = self._buckets[slot]
+        if current is None or current[0] != index:
+            current = (index, MetricBucket(self.with_histogram))
+            self._buckets[slot] = current
+        current[1].add(value)
+
+    def iter_buckets(self, start: float, end: float):
+        """依時間順序產生 [start, end] 範圍內的 (桶起始時間戳, 桶)"""
+        first = int(start // self.resolution)
+        last = int(end // self.resolution)
+        for index in range(max(first, last - self.slots + 1), last + 1):
+            entry = self._buckets[index % self.slots]
+            if entry is not None and entry[0] == index:
+                yield index * self.resolution, entry[1]
+
+
+# 彙總層級：(解析度秒數, 桶數)，分別涵蓋 1 小時、1 天與 7 天
+ROLLUP_TIERS: Tuple[Tuple[int, int], ...] = ((10, 360), (60, 1440), (3600, 168))
+
+# 需要保留分佈（分位數）的指標
+HISTOGRAM_METRICS = {MetricType.RESPONSE_TIME}
+
+
 class MetricsCollector:
-    """指標收集器"""
+    """
+    指標收集器
+
+    原始指標僅保留最近 max_entries 筆供匯出；統計由各來源、各指標的
+    多層時間桶（10 秒 / 1 分鐘 / 1 小時）合併計算，與樣本數無關。
+    """
     
-    def __init__(self, max_entries: int = 10000):
+    def __init__(self, max_entries: int = 10000,
+                 rollup_tiers: Tuple[Tuple[int, int], ...] = ROLLUP_TIERS):
         self.max_entries = max_entries
         self.metrics: deque = deque(maxlen=max_entries)
+        self.rollup_tiers = tuple(sorted(rollup_tiers))
+        # (來源, 指標類型) -> 各層級的時間桶
+        self.rollups: Dict[Tuple[str, MetricType], List[RollupSeries]] = {}
         self.alerts: List[PerformanceAlert] = []
         self.thresholds: Dict[MetricType, Dict[str, float]] = {
             MetricType.RESPONSE_TIME: {"warning": 5.0, "error": 10.0},
@@ -97,19 +254,98 @@ class MetricsCollector:
         self._lock = threading.Lock()
     
     def add_metric(self, metric_type: MetricType, value: float, source: str, 
-                   metadata: Optional[Dict[str, Any]] = None):
+                   metadata: Optional[Dict[str, Any]] = None,
+                   timestamp: Optional[datetime] = None):
         """添加指標"""
         with self._lock:
             entry = MetricEntry(
-                timestamp=datetime.now(),
+                timestamp=timestamp or datetime.now(),
                 metric_type=metric_type,
                 value=value,
                 source=source,
                 metadata=metadata or {}
             )
             self.metrics.append(entry)
+            self._add_to_rollups(entry)
             self._check_thresholds(entry)
     
+    def _add_to_rollups(self, entry: MetricEntry):
+        """將指標加入各層級時間桶"""
+        key = (entry.source, entry.metric_type)
+        series = self.rollups.get(key)
+        if series is None:
+            with_histogram = entry.metric_type in HISTOGRAM_METRICS
+            series = [RollupSeries(resolution, slots, with_histogram)
+                      for resolution, slots in self.rollup_tiers]
+            self.rollups[key] = series
+        
+        timestamp = entry.timestamp.timestamp()
+        for tier in series:
+            tier.add(timestamp, entry.value)
+    
+    def _select_tier(self, time_window: Optional[timedelta]) -> int:
+        """選擇能涵蓋時間範圍的最細層級"""
+        if time_window is None:
+            return len(self.rollup_tiers) - 1
+        seconds = time_window.total_seconds()
+        for position, (resolution, slots) in enumerate(self.rollup_tiers):
+            if resolution * slots >= seconds:
+                return position
+        return len(self.rollup_tiers) - 1
+    
+    def _merge_rollups(self, source: Optional[str],
+                       time_window: Optional[timedelta]) -> Dict[MetricType, MetricBucket]:
+        """合併符合條件的時間桶，得到各指標類型的彙總"""
+        tier = self._select_tier(time_window)
+        end = time.time()
+        if time_window is None:
+            resolution, slots = self.rollup_tiers[tier]
+            start = end - resolution * slots
+        else:
+            start = end - time_window.total_seconds()
+        
+        merged: Dict[MetricType, MetricBucket] = {}
+        for (series_source, metric_type), series in self.rollups.items():
+            if source and series_source != source:
+                continue
+            target = merged.setdefault(metric_type, MetricBucket())
+            for _, bucket in series[tier].iter_buckets(start, end):
+                target.merge(bucket)
+        return merged
+    
+    def get_timeseries(self, metric_type: MetricType, source: Optional[str] = None,
+                       time_window: timedelta = timedelta(hours=1)) -> List[Dict[str, Any]]:
+        """
+        獲取指標的時間序列（每個時間桶一筆），供儀表板繪圖
+        
+        Returns:
+            [{'timestamp', 'count', 'sum', 'avg', 'min', 'max', 'p95'}]，依時間排序
+        """
+        with self._lock:
+            tier = self._select_tier(time_window)
+            end = time.time()
+            start = end - time_window.total_seconds()
+            
+            points: Dict[int, MetricBucket] = {}
+            for (series_source, series_type), series in self.rollups.items():
+                if series_type != metric_type or (source and series_source != source):
+                    continue
+                for bucket_start, bucket in series[tier].iter_buckets(start, end):
+                    points.setdefault(bucket_start, MetricBucket()).merge(bucket)
+            
+            return [
+                {
+                    'timestamp': datetime.fromtimestamp(bucket_start).isoformat(),
+                    'count': bucket.count,
+                    'sum': bucket.total,
+                    'avg': bucket.mean,
+                    'min': bucket.min,
+                    'max': bucket.max,
+                    'p95': bucket.histogram.quantile(0.95) if bucket.histogram else None
+                }
+                for bucket_start, bucket in sorted(points.items())
+            ]
+    
     def _check_thresholds(self, entry: MetricEntry):
         """檢查閾值並生成警報"""
         if entry.metric_type not in self.thresholds:
@@ -139,60 +375,43 @@ class MetricsCollector:
     
     def get_stats(self, source: Optional[str] = None, 
                   time_window: Optional[timedelta] = None) -> PerformanceStats:
-        """獲取效能統計"""
+        """獲取效能統計（由時間桶合併計算）"""
         with self._lock:
-            filtered_metrics = self._filter_metrics(source, time_window)
-            return self._calculate_stats(filtered_metrics)
+            return self._stats_from_rollups(self._merge_rollups(source, time_window))
     
-    def _filter_metrics(self, source: Optional[str], 
-                       time_window: Optional[timedelta]) -> List[MetricEntry]:
-        """過濾指標"""
-        filtered = list(self.metrics)
-        
-        if source:
-            filtered = [m for m in filtered if m.source == source]
-        
-        if time_window:
-            cutoff = datetime.now() - time_window
-            filtered = [m for m in filtered if m.timestamp >= cutoff]
-        
-        return filtered
-    
-    def _calculate_stats(self, metrics: List[MetricEntry]) -> PerformanceStats:
-        """計算統計數據"""
+    def _stats_from_rollups(self, merged: Dict[MetricType, MetricBucket]) -> PerformanceStats:
+        """由彙總桶計算統計數據"""
         stats = PerformanceStats()
         
-        if not metrics:
-            return stats
-        
-        # 按類型分組指標
-        by_type = defaultdict(list)
-        for metric in metrics:
-            by_type[metric.metric_type].append(metric.value)
+        def count(metric_type: MetricType) -> int:
+            bucket = merged.get(metric_type)
+            return bucket.count if bucket else 0
         
-        # 計算基本統計
-        stats.total_requests = len(by_type.get(MetricType.REQUEST_COUNT, []))
-        stats.successful_requests = len(by_type.get(MetricType.SUCCESS_COUNT, []))
-        stats.failed_requests = len(by_type.get(MetricType.ERROR_COUNT, []))
-        stats.total_retries = len(by_type.get(MetricType.RETRY_COUNT, []))
-        stats.rate_limit_hits = len(by_type.get(MetricType.RATE_LIMIT_HIT, []))
+        stats.total_requests = count(MetricType.REQUEST_COUNT)
+        stats.successful_requests = count(MetricType.SUCCESS_COUNT)
+        stats.failed_requests = count(MetricType.ERROR_COUNT)
+        stats.total_retries = count(MetricType.RETRY_COUNT)
+        stats.rate_limit_hits = count(MetricType.RATE_LIMIT_HIT)
         
         # 計算響應時間統計
-        response_times = by_type.get(MetricType.RESPONSE_TIME, [])
-        if response_times:
-            stats.avg_response_time = statistics.mean(response_times)
-            stats.min_response_time = min(response_times)
-            stats.max_response_time = max(response_times)
+        response_times = merged.get(MetricType.RESPONSE_TIME)
+        if response_times and response_times.count:
+            stats.avg_response_time = response_times.mean
+            stats.min_response_time = response_times.min
+            stats.max_response_time = response_times.max
+            if response_times.histogram is not None:
+                stats.p50_response_time = response_times.histogram.quantile(0.50)
+                stats.p95_response_time = response_times.histogram.quantile(0.95)
+                stats.p99_response_time = response_times.histogram.quantile(0.99)
         
         # 計算資料品質分數
-        quality_scores = by_type.get(MetricType.DATA_QUALITY_SCORE, [])
-        if quality_scores:
-            stats.avg_data_quality_score = statistics.mean(quality_scores)
+        quality_scores = merged.get(MetricType.DATA_QUALITY_SCORE)
+        if quality_scores and quality_scores.count:
+            stats.avg_data_quality_score = quality_scores.mean
         
         # 計算快取命中率
-        cache_hits = len(by_type.get(MetricType.CACHE_HIT, []))
-        cache_misses = len(by_type.get(MetricType.CACHE_MISS, []))
-        total_cache_requests = cache_hits + cache_misses
+        cache_hits = count(MetricType.CACHE_HIT)
+        total_cache_requests = cache_hits + count(MetricType.CACHE_MISS)
         if total_cache_requests > 0:
             stats.cache_hit_rate = cache_hits / total_cache_requests
         
@@ -201,6 +420,20 @@ class MetricsCollector:
         
         return stats
     
+    def _filter_metrics(self, source: Optional[str], 
+                       time_window: Optional[timedelta]) -> List[MetricEntry]:
+        """過濾指標"""
+        filtered = list(self.metrics)
+        
+        if source:
+            filtered = [m for m in filtered if m.source == source]
+        
+        if time_window:
+            cutoff = datetime.now() - time_window
+            filtered = [m for m in filtered if m.timestamp >= cutoff]
+        
+        return filtered
+    
     def get_recent_alerts(self, count: int = 10) -> List[PerformanceAlert]:
         """獲取最近的警報"""
         return sorted(self.alerts, key=lambda x: x.timestamp, reverse=True)[:count]
@@ -225,7 +458,9 @@ class MetricsCollector:
                     }
                     for m in filtered_metrics
                 ],
-                "stats": self._stats_to_dict(self._calculate_stats(filtered_metrics))
+                "stats": self._stats_to_dict(
+                    self._stats_from_rollups(self._merge_rollups(source, time_window))
+                )
             }
             
             with open(filepath, 'w', encoding='utf-8') as f:
@@ -245,7 +480,10 @@ class MetricsCollector:
             "cache_hit_rate": stats.cache_hit_rate,
             "avg_data_quality_score": stats.avg_data_quality_score,
             "total_retries": stats.total_retries,
-            "rate_limit_hits": stats.rate_limit_hits
+            "rate_limit_hits": stats.rate_limit_hits,
+            "p50_response_time": stats.p50_response_time,
+            "p95_response_time": stats.p95_response_time,
+            "p99_response_time": stats.p99_response_time
         }
 
 
@@ -265,17 +503,39 @@ class ScrapingMetrics:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.collector = MetricsCollector()
+            self._setup_exporter_metrics()
             self.initialized = True
     
+    def _setup_exporter_metrics(self):
+        """在全域註冊表建立對應的 OpenMetrics 指標"""
+        registry = get_registry()
+        self.requests_total = registry.counter(
+            'jobseeker_scrape_requests', '爬蟲請求數', ['site'])
+        self.responses_total = registry.counter(
+            'jobseeker_scrape_responses', '爬蟲請求結果數', ['site', 'outcome'])
+        self.errors_total = registry.counter(
+            'jobseeker_scrape_errors', '爬蟲錯誤數（依錯誤類型）', ['site', 'error_type'])
+        self.fetch_duration = registry.histogram(
+            'jobseeker_fetch_duration_seconds', '成功抓取的延遲（秒）', ['site'])
+        self.retries_total = registry.counter(
+            'jobseeker_scrape_retries', '重試次數', ['site'])
+        self.rate_limits_total = registry.counter(
+            'jobseeker_rate_limit_hits', '觸發速率限制次數', ['site'])
+        self.cache_lookups_total = registry.counter(
+            'jobseeker_scrape_cache_lookups', '爬蟲快取查詢數', ['site', 'result'])
+    
     def record_request(self, source: str, metadata: Optional[Dict[str, Any]] = None):
         """記錄請求"""
         self.collector.add_metric(MetricType.REQUEST_COUNT, 1, source, metadata)
+        self.requests_total.labels(source).inc()
     
     def record_success(self, source: str, response_time: float, 
                       metadata: Optional[Dict[str, Any]] = None):
         """記錄成功請求"""
         self.collector.add_metric(MetricType.SUCCESS_COUNT, 1, source, metadata)
         self.collector.add_metric(MetricType.RESPONSE_TIME, response_time, source, metadata)
+        self.responses_total.labels(source, 'success').inc()
+        self.fetch_duration.labels(source).observe(response_time)
     
     def record_error(self, source: str, error_type: str, 
                     metadata: Optional[Dict[str, Any]] = None):
@@ -283,6 +543,8 @@ class ScrapingMetrics:
         metadata = metadata or {}
         metadata['error_type'] = error_type
         self.collector.add_metric(MetricType.ERROR_COUNT, 1, source, metadata)
+        self.responses_total.labels(source, 'error').inc()
+        self.errors_total.labels(source, error_type).inc()
     
     def record_retry(self, source: str, attempt: int, 
                     metadata: Optional[Dict[str, Any]] = None):
@@ -290,18 +552,22 @@ class ScrapingMetrics:
         metadata = metadata or {}
         metadata['attempt'] = attempt
         self.collector.add_metric(MetricType.RETRY_COUNT, 1, source, metadata)
+        self.retries_total.labels(source).inc()
     
     def record_rate_limit(self, source: str, metadata: Optional[Dict[str, Any]] = None):
         """記錄速率限制"""
         self.collector.add_metric(MetricType.RATE_LIMIT_HIT, 1, source, metadata)
+        self.rate_limits_total.labels(source).inc()
     
     def record_cache_hit(self, source: str, metadata: Optional[Dict[str, Any]] = None):
         """記錄快取命中"""
         self.collector.add_metric(MetricType.CACHE_HIT, 1, source, metadata)
+        self.cache_lookups_total.labels(source, 'hit').inc()
     
     def record_cache_miss(self, source: str, metadata: Optional[Dict[str, Any]] = None):
         """記錄快取未命中"""
         self.collector.add_metric(MetricType.CACHE_MISS, 1, source, metadata)
+        self.cache_lookups_total.labels(source, 'miss').inc()
     
     def record_data_quality(self, source: str, score: float, 
                            metadata: Optional[Dict[str, Any]] = None):
@@ -401,6 +667,8 @@ class PerformanceDashboard:
         print(f"  平均: {stats.avg_response_time:.2f}s")
         print(f"  最小: {stats.min_response_time:.2f}s")
         print(f"  最大: {stats.max_response_time:.2f}s")
+        print(f"  P95: {stats.p95_response_time:.2f}s")
+        print(f"  P99: {stats.p99_response_time:.2f}s")
         
         print(f"\n🔄 其他指標:")
         print(f"  重試次數: {stats.total_retries}")
@@ -17,6 +17,7 @@ import logging
 
 from .simple_config import SimpleConfig, PlatformConfig
 from .model import JobPost, JobResponse, ScraperInput, Site
+from .tracing import start_span, submit_with_context
 
 # 設置日誌
 logger = logging.getLogger(__name__)
@@ -180,7 +181,9 @@ class MultiPlatformAdapter:
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # 提交任務
             future_to_platform = {
-                executor.submit(
+                # 子線程沿用當前追蹤 context
+                submit_with_context(
+                    executor,
                     self._search_single_platform, 
                     platform, 
                     query, 
@@ -237,8 +240,11 @@ class MultiPlatformAdapter:
             搜尋結果
         """
         try:
-            adapter = PlatformAdapter(platform_name)
-            return adapter.search(query, location, max_results)
+            with start_span("platform.search", site=platform_name) as span:
+                adapter = PlatformAdapter(platform_name)
+                result = adapter.search(query, location, max_results)
+                span.set_attributes({"jobs": result.job_count, "success": result.success})
+                return result
         except Exception as e:
             logger.error(f"創建 {platform_name} 適配器失敗: {e}")
             return SearchResult(
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可合併的增量品質統計
+每批（每頁或每個平台）資料到達時折疊進累加器，不必每次重新掃描完整資料集；
+同類累加器可以跨批次、跨檢查合併
+
+包含:
+1. HyperLogLog: 固定記憶體的相異值估計
+2. DistinctCounter: 數量少時精確計數，超過上限後改用 HyperLogLog
+3. RunningStats: Welford 平均值與標準差，可合併
+4. DateHistogram: 按發布日期計數，讀取時再依參考日期換算新鮮度
+5. ScoreRollup: 每日分數彙總（平均值與迴歸趨勢所需的和）
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import hashlib
+import math
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+
+class HyperLogLog:
+    """
+    HyperLogLog 相異值估計
+
+    Args:
+        precision: 暫存器數量為 2**precision，標準誤差約 1.04 / sqrt(2**precision)
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision 必須介於 4 與 18 之間')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any):
+        data = value if isinstance(value, bytes) else str(value).encode('utf-8')
+        hashed = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.precision != self.precision:
+            raise ValueError('只能合併相同 precision 的 HyperLogLog')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        # 小範圍修正（線性計數）；64 位元雜湊不需要大範圍修正
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return estimate
+
+
+class DistinctCounter:
+    """
+    相異值計數
+
+    少於 exact_limit 個相異值時保存集合、結果精確；超過後轉為 HyperLogLog，記憶體固定
+    """
+
+    __slots__ = ('exact_limit', 'precision', '_values', '_sketch')
+
+    def __init__(self, exact_limit: int = 65536, precision: int = 12):
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self._values: Optional[set] = set()
+        self._sketch: Optional[HyperLogLog] = None
+
+    @property
+    def exact(self) -> bool:
+        return self._values is not None
+
+    def _to_sketch(self):
+        self._sketch = HyperLogLog(self.precision)
+        for value in self._values:
+            self._sketch.add(value)
+        self._values = None
+
+    def add(self, value: Any):
+        if self._values is None:
+            self._sketch.add(value)
+            return
+        self._values.add(value)
+        if len(self._values) > self.exact_limit:
+            self._to_sketch()
+
+    def merge(self, other: 'DistinctCounter'):
+        if self._values is not None and other._values is not None:
+            self._values |= other._values
+            if len(self._values) > self.exact_limit:
+                self._to_sketch()
+            return
+        if self._values is not None:
+            self._to_sketch()
+        if other._values is not None:
+            for value in other._values:
+                self._sketch.add(value)
+        else:
+            self._sketch.merge(other._sketch)
+
+    def __len__(self) -> int:
+        if self._values is not None:
+            return len(self._values)
+        return int(round(self._sketch.estimate()))
+
+
+class RunningStats:
+    """Welford 累加的數量、平均值與樣本標準差"""
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: 'RunningStats'):
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+
+    @property
+    def stdev(self) -> float:
+        """樣本標準差（與 statistics.stdev 相同，少於兩筆時為 0）"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+
+class DateHistogram:
+    """
+    發布日期直方圖
+
+    按日期（而非入庫當下的天數）計數，新鮮度在讀取時依參考日期換算，
+    因此舊的彙總不會隨時間失準；記憶體只與相異日期數有關
+    """
+
+    __slots__ = ('dates', 'missing', 'unparseable')
+
+    def __init__(self):
+        self.dates: Counter = Counter()
+        self.missing = 0
+        self.unparseable = 0
+
+    def add_date(self, value: date):
+        self.dates[value] += 1
+
+    def add_missing(self):
+        self.missing += 1
+
+    def add_unparseable(self):
+        self.unparseable += 1
+
+    def merge(self, other: 'DateHistogram'):
+        self.dates.update(other.dates)
+        self.missing += other.missing
+        self.unparseable += other.unparseable
+
+    @property
+    def dated(self) -> int:
+        return sum(self.dates.values())
+
+    def mean_score(self, today: date, buckets: Sequence[Tuple[int, float]], older_score: float,
+                   unparseable_score: Optional[float] = None, missing_score: Optional[float] = None,
+                   default: float = 0.0) -> float:
+        """
+        依天數分桶計算平均分數
+
+        Args:
+            buckets: 依天數上限遞增的 (最多天數, 分數)
+            older_score: 超過所有上限時的分數
+            unparseable_score / missing_score: 為 None 時這些記錄不計入平均
+            default: 沒有任何計入記錄時的分數
+        """
+        total = 0.0
+        count = 0
+        for posted, posted_count in self.dates.items():
+            days = (today - posted).days
+            score = next((bucket_score for limit, bucket_score in buckets if days <= limit), older_score)
+            total += score * posted_count
+            count += posted_count
+        for score, extra in ((unparseable_score, self.unparseable), (missing_score, self.missing)):
+            if score is not None and extra:
+                total += score * extra
+                count += extra
+        return total / count if count else default
+
+
+# ScoreRollup 彙總的分數欄位
+ROLLUP_FIELDS = ('overall', 'completeness', 'accuracy', 'consistency', 'uniqueness', 'freshness')
+
+
+class ScoreRollup:
+    """
+    一段期間（通常是一天）的品質分數彙總
+
+    保存各分數的和與依序編號加權的總分和，合併相鄰期間後仍可算出平均值
+    以及對逐筆樣本做線性迴歸的斜率，不需保留每筆樣本
+    """
+
+    __slots__ = ('count', 'sums', 'indexed_overall', 'latest')
+
+    def __init__(self):
+        self.count = 0
+        self.sums: Dict[str, float] = {name: 0.0 for name in ROLLUP_FIELDS}
+        # Σ i·overall_i，i 為樣本在此彙總內的序號（從 0 起）
+        self.indexed_overall = 0.0
+        self.latest: Any = None
+
+    def add(self, scores: Dict[str, float], sample: Any = None):
+        for name in ROLLUP_FIELDS:
+            self.sums[name] += scores[name]
+        self.indexed_overall += self.count * scores['overall']
+        self.count += 1
+        self.latest = sample
+
+    def merge(self, later: 'ScoreRollup'):
+        """合併時間上在後的彙總"""
+        if not later.count:
+            return
+        self.indexed_overall += later.indexed_overall + self.count * later.sums['overall']
+        for name in ROLLUP_FIELDS:
+            self.sums[name] += later.sums[name]
+        self.count += later.count
+        self.latest = later.latest
+
+    def averages(self) -> Dict[str, float]:
+        return {name: self.sums[name] / self.count if self.count else 0.0 for name in ROLLUP_FIELDS}
+
+    def slope(self) -> Optional[float]:
+        """總分對樣本序號的最小平方斜率（樣本少於兩筆時為 None）"""
+        n = self.count
+        if n < 2:
+            return None
+        x_mean = (n - 1) / 2
+        y_mean = self.sums['overall'] / n
+        numerator = self.indexed_overall - n * x_mean * y_mean
+        denominator = n * (n * n - 1) / 12
+        return numerator / denominator
+
+    @classmethod
+    def combine(cls, rollups: Iterable['ScoreRollup']) -> 'ScoreRollup':
+        """依時間順序合併多個彙總"""
+        combined = cls()
+        for rollup in rollups:
+            combined.merge(rollup)
+        return combined
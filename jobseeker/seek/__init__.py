@@ -14,6 +14,8 @@ from urllib.parse import urlencode, urlparse, parse_qs
 from playwright.async_api import async_playwright, Page, Browser
 from bs4 import BeautifulSoup
 
+from jobseeker.browser_resources import ResourcePolicy, install_resource_policy
+from jobseeker.http_replay import install_route_replay
 from jobseeker.model import (
     JobPost, JobResponse, JobType, Location, 
     Compensation, CompensationInterval, Site, Country,
@@ -29,19 +31,34 @@ from .util import (
     is_remote_job, clean_text, format_date, 
     generate_job_id, validate_url
 )
-from jobseeker.util import create_logger, get_scraper_logger
+from .http_search import STRATEGY_BROWSER, STRATEGY_HTTP, SeekHttpSearch, search_strategy_cache
+from jobseeker.error_handling import ErrorType
+from jobseeker.exception import SeekException
+from jobseeker.util import create_logger, create_session, get_scraper_logger
 from jobseeker.enhanced_logging import LogCategory, performance_logger, async_performance_logger
 
+# 暫時性錯誤：HTTP 快速路徑重試一次，且不記錄到決策快取
+TRANSIENT_ERRORS = (ErrorType.NETWORK_ERROR, ErrorType.TIMEOUT_ERROR)
+
 
 class SeekScraper(Scraper):
     """
     Seek.com.au 職位爬蟲類
     
-    使用 Playwright 爬取 Seek.com.au 的職位信息
+    優先以 HTTP 呼叫 Seek 搜尋 API（或解析伺服器渲染頁面），被阻擋或解析失敗時
+    才改用 Playwright 爬取 Seek.com.au 的職位信息
     """
     
-    def __init__(self, proxies: list[str] | str | None = None, ca_cert: str | None = None, user_agent: str | None = None):
-        """初始化爬蟲"""
+    def __init__(self, proxies: list[str] | str | None = None, ca_cert: str | None = None, user_agent: str | None = None,
+                 use_http: bool = True, strategy_cache=None, resource_policy: Optional[ResourcePolicy] = None):
+        """初始化爬蟲
+
+        Args:
+            use_http: 是否先嘗試 HTTP 快速路徑
+            strategy_cache: 抓取方式決策快取（預設為行程內共用的 search_strategy_cache）
+            resource_policy: 瀏覽器路徑的請求攔截策略（預設略過圖片、媒體、字型與追蹤請求；
+                             傳入 full_page_policy() 可載入所有資源）
+        """
         super().__init__(Site.SEEK, proxies=proxies, ca_cert=ca_cert, user_agent=user_agent)
         # 保持向後相容性的傳統日誌
         self.logger = create_logger("Seek")
@@ -51,6 +68,13 @@ class SeekScraper(Scraper):
         self.page: Optional[Page] = None
         self.scraper_input: Optional[ScraperInput] = None
         self.playwright = None
+        self.use_http = use_http
+        self.strategy_cache = strategy_cache or search_strategy_cache
+        # HTTP session 延遲建立，跨頁與跨次爬取重用連線
+        self.session = None
+        # 最近一次爬取實際使用的方式（http / browser）
+        self.fetch_strategy: Optional[str] = None
+        self.resource_policy = resource_policy if resource_policy is not None else ResourcePolicy()
         
     async def __aenter__(self):
         """異步上下文管理器入口"""
@@ -86,6 +110,11 @@ class SeekScraper(Scraper):
             
             # 設置額外的請求頭
             await self.page.set_extra_http_headers(DEFAULT_HEADERS)
+
+            # 啟用卡帶時改由錄製 / 重放路由處理請求
+            await install_route_replay(self.page)
+            # 在重放路由之後安裝，讓攔截策略先處理請求
+            await install_resource_policy(self.page, self.resource_policy)
             
             self.logger.info("瀏覽器初始化成功")
             
@@ -179,6 +208,14 @@ class SeekScraper(Scraper):
         
         # 再次等待
         await asyncio.sleep(random.uniform(1, 3))
+
+    @staticmethod
+    def _page_url(base_url: str, page_num: int) -> str:
+        """構建分頁 URL"""
+        if page_num > 1:
+            separator = '&' if '?' in base_url else '?'
+            return f"{base_url}{separator}page={page_num}"
+        return base_url
     
     async def _extract_job_data(self, job_element) -> Optional[Dict[str, Any]]:
         """從職位元素中提取數據 - 改進版本，支援多重選擇器和更好的錯誤處理"""
@@ -511,9 +548,6 @@ class SeekScraper(Scraper):
         all_jobs = []
         
         try:
-            # 初始化瀏覽器
-            await self._init_browser()
-            
             # 從 scraper_input 獲取參數
             search_term = self.scraper_input.search_term or ""
             location = self.scraper_input.location or ""
@@ -538,35 +572,16 @@ class SeekScraper(Scraper):
             
             self.logger.info(f"開始爬取: {base_url}")
             
-            # 爬取多個頁面
-            for page_num in range(1, max_pages + 1):
-                # 構建分頁 URL
-                if page_num > 1:
-                    separator = '&' if '?' in base_url else '?'
-                    url = f"{base_url}{separator}page={page_num}"
-                else:
-                    url = base_url
-                    
-                self.logger.info(f"爬取第 {page_num} 頁: {url}")
-                
-                # 爬取當前頁面
-                page_jobs = await self._scrape_page(url)
-                
-                if not page_jobs:
-                    self.logger.info(f"第 {page_num} 頁沒有找到職位，停止爬取")
-                    break
-                    
-                all_jobs.extend(page_jobs)
-                self.logger.info(f"第 {page_num} 頁找到 {len(page_jobs)} 個職位")
-                
-                # 檢查是否已達到所需結果數量
-                if len(all_jobs) >= results_wanted:
-                    break
-                
-                # 頁面間延遲
-                if page_num < max_pages:
-                    delay = random.uniform(*DELAYS['between_pages'])
-                    await asyncio.sleep(delay)
+            # 先走 HTTP 快速路徑，失敗時從失敗的頁面起改用瀏覽器
+            browser_start_page = 1
+            if self.use_http and self.strategy_cache.strategy(base_url) == STRATEGY_HTTP:
+                browser_start_page = await self._http_scrape(
+                    base_url, search_term, location, job_type, distance,
+                    max_pages, results_wanted, all_jobs
+                )
+            
+            if browser_start_page is not None:
+                await self._browser_scrape(base_url, browser_start_page, max_pages, results_wanted, all_jobs)
                     
         except Exception as e:
             self.logger.error(f"爬取過程中出錯: {e}")
@@ -590,6 +605,91 @@ class SeekScraper(Scraper):
         self.logger.info(f"總共找到 {len(unique_jobs)} 個唯一職位")
         
         return JobResponse(jobs=unique_jobs)
+
+    async def _http_scrape(self, base_url: str, search_term: str, location: str, job_type: str,
+                           distance: int, max_pages: int, results_wanted: int,
+                           all_jobs: List[JobPost]) -> Optional[int]:
+        """以 HTTP 快速路徑爬取
+
+        網路錯誤（逾時、連線失敗）重試一次；仍失敗或被阻擋時本次改用瀏覽器但不記錄，
+        只有資料結構不符（解析失敗）才記錄到決策快取，在有效期內直接使用瀏覽器
+        
+        Returns:
+            完成時返回 None；否則返回需改用瀏覽器的起始頁
+        """
+        if self.session is None:
+            self.session = create_session(
+                proxies=self.proxies, ca_cert=self.ca_cert, is_tls=False, has_retry=True
+            )
+        search = SeekHttpSearch(self.session)
+        
+        for page_num in range(1, max_pages + 1):
+            url = self._page_url(base_url, page_num)
+            raw_jobs = None
+            for attempt in range(2):
+                try:
+                    raw_jobs = await asyncio.to_thread(
+                        search.fetch_page, search_term, location, job_type, distance, page_num, url
+                    )
+                    break
+                except SeekException as e:
+                    if e.error_type in TRANSIENT_ERRORS and attempt == 0:
+                        self.logger.warning(f"HTTP 快速路徑在第 {page_num} 頁網路錯誤，重試一次: {e}")
+                        await asyncio.sleep(random.uniform(*DELAYS['between_requests']))
+                        continue
+                    self.logger.warning(f"HTTP 快速路徑在第 {page_num} 頁失敗，改用瀏覽器: {e}")
+                    if e.error_type == ErrorType.PARSING_ERROR:
+                        self.strategy_cache.record_failure(base_url, e.error_type.value)
+                    return page_num
+            
+            self.strategy_cache.record_success(base_url)
+            self.fetch_strategy = STRATEGY_HTTP
+            page_jobs = [job for job in map(self._process_job_data, raw_jobs) if job]
+            
+            if not page_jobs:
+                self.logger.info(f"第 {page_num} 頁沒有找到職位，停止爬取")
+                break
+            
+            all_jobs.extend(page_jobs)
+            self.logger.info(f"第 {page_num} 頁（HTTP）找到 {len(page_jobs)} 個職位")
+            
+            if len(all_jobs) >= results_wanted:
+                break
+            
+            if page_num < max_pages:
+                await asyncio.sleep(random.uniform(*DELAYS['between_requests']))
+        
+        return None
+
+    async def _browser_scrape(self, base_url: str, start_page: int, max_pages: int,
+                              results_wanted: int, all_jobs: List[JobPost]):
+        """以 Playwright 從 start_page 起爬取"""
+        if self.browser is None:
+            await self._init_browser()
+        self.fetch_strategy = STRATEGY_BROWSER
+        
+        for page_num in range(start_page, max_pages + 1):
+            url = self._page_url(base_url, page_num)
+            self.logger.info(f"爬取第 {page_num} 頁: {url}")
+            
+            # 爬取當前頁面
+            page_jobs = await self._scrape_page(url)
+            
+            if not page_jobs:
+                self.logger.info(f"第 {page_num} 頁沒有找到職位，停止爬取")
+                break
+                
+            all_jobs.extend(page_jobs)
+            self.logger.info(f"第 {page_num} 頁找到 {len(page_jobs)} 個職位")
+            
+            # 檢查是否已達到所需結果數量
+            if len(all_jobs) >= results_wanted:
+                break
+            
+            # 頁面間延遲
+            if page_num < max_pages:
+                delay = random.uniform(*DELAYS['between_pages'])
+                await asyncio.sleep(delay)
     
 def scrape_jobs(search_term: str = "", location: str = "", 
                job_type: str = "", distance: int = 0, 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek HTTP 搜尋快速路徑
+以連線池 session 直接呼叫 Seek 的職位搜尋 API，取不到時改解析伺服器渲染頁面中的
+window.SEEK_REDUX_DATA，不啟動瀏覽器；被阻擋或解析失敗時由呼叫端退回 Playwright
+
+設計要點:
+1. fetch_page 先呼叫搜尋 API，回應不是預期的 JSON 時改抓 HTML 頁面解析嵌入狀態
+2. 403 / 429 / 驗證頁視為被阻擋（RATE_LIMIT），資料結構不符視為解析失敗（PARSING_ERROR），
+   兩者都以 SeekException 拋出
+3. SearchStrategyCache 以網站主機為鍵記住上次的結果: 資料結構不符（頁面或 API 改版）後
+   在有效期內直接使用瀏覽器，過期後再試一次 HTTP；網路錯誤與阻擋屬暫時性，由呼叫端決定不記錄
+
+用法:
+    search = SeekHttpSearch(session)
+    raw_jobs = search.fetch_page(search_term='python', location='Sydney NSW', page=1)
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from jobseeker.error_handling import ErrorType
+from jobseeker.exception import SeekException
+from .constant import BASE_URL, DEFAULT_HEADERS, JOB_TYPE_MAPPING, JOBS_PER_PAGE, TIMEOUT_CONFIG
+
+SEARCH_API_URL = f"{BASE_URL}/api/jobsearch/v5/search"
+SEARCH_API_PARAMS = {'siteKey': 'AU-Main', 'sourcesystem': 'houston', 'locale': 'en-AU'}
+SEARCH_API_HEADERS = {
+    **DEFAULT_HEADERS,
+    'Accept': 'application/json, text/plain, */*',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin',
+}
+
+STRATEGY_HTTP = 'http'
+STRATEGY_BROWSER = 'browser'
+
+# 被阻擋時的狀態碼與頁面特徵
+BLOCKED_STATUS_CODES = frozenset({401, 403, 429, 503})
+BLOCKED_MARKERS = ('captcha', 'access denied', 'cf-chl', 'request unsuccessful', 'px-captcha')
+
+_REDUX_MARKER = re.compile(r'window\.SEEK_REDUX_DATA\s*=\s*')
+# JavaScript 物件中的 undefined 值（JSON 不接受）
+_UNDEFINED_VALUE = re.compile(r'(?<=[:\[,])\s*undefined(?=\s*[,\]}])')
+_DECODER = json.JSONDecoder()
+
+
+def _job_type_code(job_type: str) -> Optional[str]:
+    """將 'fulltime' / 'full-time' / 'Full Time' 對應到 Seek 的 worktype 代碼"""
+    if not job_type:
+        return None
+    normalized = re.sub(r'[^a-z]', '', job_type.lower())
+    for name, code in JOB_TYPE_MAPPING.items():
+        if re.sub(r'[^a-z]', '', name) == normalized:
+            return code
+    return None
+
+
+def build_search_params(search_term: str = "", location: str = "", job_type: str = "",
+                        distance: int = 0, page: int = 1,
+                        page_size: int = JOBS_PER_PAGE) -> Dict[str, Any]:
+    """組合搜尋 API 查詢參數"""
+    params: Dict[str, Any] = {**SEARCH_API_PARAMS, 'page': page, 'pageSize': page_size}
+    if search_term:
+        params['keywords'] = search_term
+    if location:
+        params['where'] = location
+    work_type = _job_type_code(job_type)
+    if work_type:
+        params['worktype'] = work_type
+    if distance:
+        params['distance'] = distance
+    return params
+
+
+def check_blocked(status_code: int, text: str):
+    """回應為阻擋或驗證頁時拋出 RATE_LIMIT 類型的 SeekException"""
+    if status_code in BLOCKED_STATUS_CODES:
+        raise SeekException(f"Seek 回應狀態碼 {status_code}，判定為被阻擋", error_type=ErrorType.RATE_LIMIT)
+    head = (text or '')[:4096].lower()
+    if any(marker in head for marker in BLOCKED_MARKERS):
+        raise SeekException("Seek 回應為驗證頁面，判定為被阻擋", error_type=ErrorType.RATE_LIMIT)
+
+
+def _first(*values) -> str:
+    for value in values:
+        if value:
+            return str(value)
+    return ''
+
+
+def _label(value) -> str:
+    """Seek 欄位可能是字串或帶 label / description 的物件"""
+    if isinstance(value, dict):
+        return _first(value.get('label'), value.get('description'), value.get('name'))
+    return _first(value)
+
+
+def map_job(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    將搜尋 API 或 SEEK_REDUX_DATA 的職位物件轉成 SeekScraper._process_job_data 使用的欄位
+
+    同時支援 v5（locations / workTypes / salaryLabel / listingDate）與舊版
+    （location / area / workType / salary）欄位，缺少 id 或標題時返回 None
+    """
+    if not isinstance(job, dict):
+        return None
+    job_id = job.get('id')
+    title = job.get('title')
+    if not job_id or not title:
+        return None
+
+    locations = job.get('locations')
+    if isinstance(locations, list) and locations:
+        location = _label(locations[0])
+    else:
+        location = ', '.join(part for part in (_label(job.get('suburb')), _label(job.get('location')),
+                                               _label(job.get('area'))) if part)
+
+    work_types = job.get('workTypes')
+    if isinstance(work_types, list):
+        job_type = ', '.join(_label(work_type) for work_type in work_types)
+    else:
+        job_type = _label(job.get('workType'))
+
+    advertiser = job.get('advertiser') or {}
+    listing_date = _first(job.get('listingDate'), job.get('listedAt'))
+
+    return {
+        'title': title.strip(),
+        'company': _first(job.get('companyName'), advertiser.get('description'), advertiser.get('name')).strip(),
+        'location': location.strip(),
+        'salary': _first(job.get('salaryLabel'), _label(job.get('salary'))).strip(),
+        'job_type': job_type.strip(),
+        # ISO 時間戳只保留日期部分
+        'date_posted': listing_date[:10],
+        'description': _first(job.get('teaser'), job.get('description')).strip(),
+        'job_url': f"{BASE_URL}/job/{job_id}",
+    }
+
+
+def parse_search_response(payload: Any) -> List[Dict[str, Any]]:
+    """解析搜尋 API 回應，結構不符時拋出 PARSING_ERROR"""
+    if not isinstance(payload, dict) or not isinstance(payload.get('data'), list):
+        raise SeekException("搜尋 API 回應缺少 data 陣列", error_type=ErrorType.PARSING_ERROR)
+    return [raw for raw in map(map_job, payload['data']) if raw]
+
+
+def extract_redux_state(html: str) -> Dict[str, Any]:
+    """取出頁面中 window.SEEK_REDUX_DATA 的狀態物件"""
+    match = _REDUX_MARKER.search(html or '')
+    if not match:
+        raise SeekException("頁面中找不到 SEEK_REDUX_DATA", error_type=ErrorType.PARSING_ERROR)
+    try:
+        state, _ = _DECODER.raw_decode(html, match.end())
+    except json.JSONDecodeError:
+        # 伺服器輸出的是 JavaScript 物件，可能含有 undefined；只在 JSON 解碼失敗時才替換
+        end = html.find('</script>', match.end())
+        source = _UNDEFINED_VALUE.sub('null', html[match.end():end if end != -1 else len(html)])
+        try:
+            state, _ = _DECODER.raw_decode(source)
+        except json.JSONDecodeError as e:
+            raise SeekException("SEEK_REDUX_DATA 不是有效的 JSON", error_type=ErrorType.PARSING_ERROR,
+                                original_exception=e)
+    if not isinstance(state, dict):
+        raise SeekException("SEEK_REDUX_DATA 不是物件", error_type=ErrorType.PARSING_ERROR)
+    return state
+
+
+def parse_redux_jobs(html: str) -> List[Dict[str, Any]]:
+    """解析伺服器渲染頁面中的職位列表（results.results.jobs）"""
+    results = extract_redux_state(html).get('results') or {}
+    jobs = (results.get('results') or {}).get('jobs') if isinstance(results, dict) else None
+    if not isinstance(jobs, list):
+        raise SeekException("SEEK_REDUX_DATA 缺少 results.results.jobs", error_type=ErrorType.PARSING_ERROR)
+    return [raw for raw in map(map_job, jobs) if raw]
+
+
+class SearchStrategyCache:
+    """
+    每個網站的抓取方式決策快取
+
+    HTTP 解析失敗（資料結構不符）後記錄為 browser，在 failure_ttl 秒內直接使用瀏覽器；
+    HTTP 成功則記錄為 http。執行緒安全，可在多個爬蟲實例間共用
+    """
+
+    def __init__(self, failure_ttl: float = 1800.0):
+        self.failure_ttl = failure_ttl
+        self._decisions: Dict[str, Tuple[str, float, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def site_key(url: str) -> str:
+        return (urlsplit(url).hostname or url).lower()
+
+    def strategy(self, url: str) -> str:
+        """返回目前應使用的方式（預設 http）"""
+        key = self.site_key(url)
+        with self._lock:
+            decision = self._decisions.get(key)
+            if decision is None:
+                return STRATEGY_HTTP
+            strategy, expires_at, _ = decision
+            if strategy == STRATEGY_BROWSER and time.monotonic() >= expires_at:
+                del self._decisions[key]
+                return STRATEGY_HTTP
+            return strategy
+
+    def record_success(self, url: str):
+        with self._lock:
+            self._decisions[self.site_key(url)] = (STRATEGY_HTTP, float('inf'), '')
+
+    def record_failure(self, url: str, reason: str = ''):
+        with self._lock:
+            self._decisions[self.site_key(url)] = (STRATEGY_BROWSER, time.monotonic() + self.failure_ttl, reason)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """目前的決策（供統計與除錯）"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {'strategy': strategy, 'reason': reason,
+                      'expires_in': None if expires_at == float('inf') else max(0.0, expires_at - now)}
+                for key, (strategy, expires_at, reason) in self._decisions.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._decisions.clear()
+
+
+# 行程內共用的決策快取
+search_strategy_cache = SearchStrategyCache()
+
+
+class SeekHttpSearch:
+    """
+    以 HTTP session 取得 Seek 搜尋結果
+
+    Args:
+        session: requests 相容的 session（jobseeker.util.create_session 建立，可重用連線）
+        timeout: 單次請求逾時秒數
+    """
+
+    def __init__(self, session, timeout: float = TIMEOUT_CONFIG['request']):
+        self.session = session
+        self.timeout = timeout
+        self.api_requests = 0
+        self.html_requests = 0
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]):
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            raise SeekException(f"HTTP 請求失敗: {e}", error_type=ErrorType.NETWORK_ERROR, original_exception=e)
+        check_blocked(response.status_code, response.text)
+        if response.status_code != 200:
+            raise SeekException(f"Seek 回應狀態碼 {response.status_code}", error_type=ErrorType.NETWORK_ERROR)
+        return response
+
+    def fetch_api_page(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self.api_requests += 1
+        response = self._get(SEARCH_API_URL, params, SEARCH_API_HEADERS)
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise SeekException("搜尋 API 回應不是 JSON", error_type=ErrorType.PARSING_ERROR, original_exception=e)
+        return parse_search_response(payload)
+
+    def fetch_html_page(self, page_url: str) -> List[Dict[str, Any]]:
+        self.html_requests += 1
+        return parse_redux_jobs(self._get(page_url, None, DEFAULT_HEADERS).text)
+
+    def fetch_page(self, search_term: str = "", location: str = "", job_type: str = "",
+                   distance: int = 0, page: int = 1, page_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        取得一頁搜尋結果（_process_job_data 格式的原始字典）
+
+        搜尋 API 解析失敗且提供 page_url 時改解析該頁的 SEEK_REDUX_DATA；
+        被阻擋（RATE_LIMIT）時不再嘗試 HTML，直接拋出
+        """
+        params = build_search_params(search_term, location, job_type, distance, page)
+        try:
+            return self.fetch_api_page(params)
+        except SeekException as e:
+            if e.error_type == ErrorType.RATE_LIMIT or not page_url:
+                raise
+        return self.fetch_html_page(page_url)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek OCR 管線
+以影像內容雜湊為鍵的磁碟 OCR 結果快取，加上專用的 OCR 工作進程池，
+OCR 不再在事件循環內同步執行，也不再重複辨識內容相同的影像
+
+設計要點:
+1. 快取鍵為 PNG 位元組的 blake2b 雜湊；視覺上相同的職位卡片截圖位元組相同，
+   跨頁、跨次爬取都能命中。快取使用 cache_system.FileCache，有數量上限與有效期
+2. 每個工作進程在第一次任務時建立一次 PaddleOCR 引擎，之後重用
+3. 辨識對象是裁切後的職位卡片（element.screenshot），不是整頁截圖；
+   多張卡片同時提交，工作進程數決定實際並行度
+4. 傳入現有的 OCR 引擎（engine）時改在單一線程中依序執行，不使用進程池
+   （PaddleOCR 引擎不是線程安全的，同一引擎不會被並行呼叫）
+
+用法:
+    pipeline = OCRPipeline(cache_dir='seek_data/ocr_cache', max_workers=2)
+    results = await pipeline.recognize_many([card_png, ...])
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from paddleocr import PaddleOCR
+    PADDLEOCR_AVAILABLE = True
+except ImportError:
+    PaddleOCR = None
+    PADDLEOCR_AVAILABLE = False
+
+from jobseeker.cache_system import FileCache
+from jobseeker.cpu_executor import CPUExecutor
+
+logger = logging.getLogger(__name__)
+
+# 快取預設上限與有效期（30 天）
+DEFAULT_CACHE_ENTRIES = 5000
+DEFAULT_CACHE_TTL = 30 * 24 * 3600
+
+# 工作進程內的 OCR 引擎（每個進程、每種語言建立一次）
+_worker_engines: Dict[str, Any] = {}
+
+
+def image_digest(image: bytes) -> str:
+    """影像內容雜湊（快取鍵）"""
+    return hashlib.blake2b(image, digest_size=16).hexdigest()
+
+
+def _bbox(value) -> List[List[float]]:
+    try:
+        return [[float(coordinate) for coordinate in point] for point in value]
+    except (TypeError, ValueError):
+        return []
+
+
+def parse_ocr_result(result) -> Dict[str, Any]:
+    """將 PaddleOCR 輸出轉成可序列化的結果字典"""
+    ocr_result = {'enabled': True, 'text': '', 'confidence': 0, 'details': []}
+    lines = result[0] if result else None
+    if not lines:
+        return ocr_result
+
+    extracted_texts = []
+    total_confidence = 0.0
+    for line in lines:
+        if len(line) >= 2:
+            text = line[1][0] if isinstance(line[1], (list, tuple)) else str(line[1])
+            confidence = line[1][1] if isinstance(line[1], (list, tuple)) and len(line[1]) > 1 else 0.8
+            extracted_texts.append(text)
+            total_confidence += float(confidence)
+            ocr_result['details'].append({
+                'text': text,
+                'confidence': float(confidence),
+                'bbox': _bbox(line[0])
+            })
+
+    ocr_result['text'] = ' '.join(extracted_texts)
+    ocr_result['confidence'] = total_confidence / len(lines)
+    return ocr_result
+
+
+def _get_worker_engine(lang: str):
+    engine = _worker_engines.get(lang)
+    if engine is None:
+        if not PADDLEOCR_AVAILABLE:
+            raise RuntimeError('PaddleOCR 未安裝')
+        engine = PaddleOCR(use_angle_cls=True, lang=lang, use_gpu=False, show_log=False)
+        _worker_engines[lang] = engine
+    return engine
+
+
+def ocr_image_bytes(image: bytes, lang: str = 'en') -> Dict[str, Any]:
+    """在工作進程中辨識 PNG 位元組（引擎於首次呼叫時建立）"""
+    return parse_ocr_result(_get_worker_engine(lang).ocr(image, cls=True))
+
+
+class OCRPipeline:
+    """
+    帶快取的非同步 OCR
+
+    Args:
+        cache_dir: 快取目錄（None 時不快取）
+        max_cache_entries: 快取條目上限，超過時淘汰最久未使用的條目
+        cache_ttl: 快取有效期（秒）
+        max_workers: OCR 工作進程數
+        lang: PaddleOCR 語言
+        engine: 已建立的 OCR 引擎；提供時在單一線程中依序執行而不使用進程池
+        executor: 自訂的 CPUExecutor（測試或共用進程池時使用）
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_cache_entries: int = DEFAULT_CACHE_ENTRIES,
+                 cache_ttl: int = DEFAULT_CACHE_TTL, max_workers: int = 1, lang: str = 'en',
+                 engine=None, executor: Optional[CPUExecutor] = None):
+        self.lang = lang
+        self.engine = engine
+        self.cache = FileCache(cache_dir=str(Path(cache_dir)), max_size=max_cache_entries,
+                               default_ttl=cache_ttl) if cache_dir else None
+        if executor is None and engine is None:
+            executor = CPUExecutor(max_workers=max_workers, preload=('jobseeker.seek.ocr_pipeline',))
+        self.executor = executor
+        # 進程內引擎只由這一個線程呼叫
+        self._engine_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='seek-ocr') \
+            if engine is not None else None
+        # 同一影像同時被多次提交時共用同一個辨識任務
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {'cache_hits': 0, 'cache_misses': 0, 'inflight_hits': 0, 'recognized': 0, 'failures': 0}
+
+    async def _run(self, image: bytes) -> Dict[str, Any]:
+        if self.engine is not None:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._engine_thread, partial(self.engine.ocr, image, cls=True))
+            return parse_ocr_result(result)
+        return await self.executor.run(ocr_image_bytes, image, self.lang)
+
+    async def recognize(self, image: bytes) -> Dict[str, Any]:
+        """辨識單張影像；結果包含 digest 與 cached 欄位，失敗時 enabled 為 False"""
+        digest = image_digest(image)
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, digest)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return {**cached, 'digest': digest, 'cached': True}
+
+        pending = self._inflight.get(digest)
+        if pending is not None:
+            self.stats['inflight_hits'] += 1
+            return {**await asyncio.shield(pending), 'digest': digest, 'cached': True}
+
+        self.stats['cache_misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        try:
+            result = await self._run(image)
+        except Exception as e:
+            logger.error(f"OCR處理失敗: {e}")
+            self.stats['failures'] += 1
+            result = {'enabled': False, 'text': '', 'confidence': 0, 'details': [], 'error': str(e)}
+            future.set_result(result)
+        else:
+            future.set_result(result)
+            self.stats['recognized'] += 1
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, digest, result)
+        finally:
+            self._inflight.pop(digest, None)
+            if not future.done():
+                # 被取消時讓等待同一影像的呼叫一併取消
+                future.cancel()
+        return {**result, 'digest': digest, 'cached': False}
+
+    async def recognize_many(self, images: Sequence[bytes]) -> List[Dict[str, Any]]:
+        """同時提交多張影像，按輸入順序返回結果"""
+        return list(await asyncio.gather(*(self.recognize(image) for image in images)))
+
+    def shutdown(self, wait: bool = True):
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+        if self._engine_thread is not None:
+            self._engine_thread.shutdown(wait=wait)
+
+
+def combine_card_results(card_results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """將每張職位卡片的 OCR 結果合併成頁面層級的結果（保留每張卡片的細節）"""
+    recognized = [result for result in card_results if result.get('enabled')]
+    return {
+        'enabled': bool(recognized),
+        'text': '\n'.join(result['text'] for result in recognized if result['text']),
+        'confidence': sum(result['confidence'] for result in recognized) / len(recognized) if recognized else 0,
+        'details': [detail for result in recognized for detail in result['details']],
+        'cards': [
+            {'index': index, 'text': result.get('text', ''), 'confidence': result.get('confidence', 0),
+             'digest': result.get('digest'), 'cached': result.get('cached', False)}
+            for index, result in enumerate(card_results)
+        ],
+    }
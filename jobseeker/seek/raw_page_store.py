@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek 原始頁面的寫入後置（write-behind）存儲
+爬蟲協程只把頁面記錄放進佇列並立即取得檔案路徑，壓縮與寫檔由背景線程分批完成，
+下一頁的導航與解析可以和上一頁的 I/O 重疊
+
+設計要點:
+1. HTML 以內容雜湊定址（blobs/ab/abcdef....html.zst），相同頁面只存一份；
+   頁面記錄（JSON）以 html_digest / html_blob 參照
+2. 有 zstandard 時以 zstd 壓縮，否則退回標準庫 gzip
+3. 佇列有上限，寫入跟不上時 submit 會等待（背壓），記憶體不會無限增長
+4. flush() 等待佇列清空，close() 清空後結束背景線程；load_page() 讀回完整記錄
+
+用法:
+    store = RawPageStore(storage_path / "raw_data")
+    path = await store.submit(page_data, "page_1")
+    await store.close()
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstd = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 背景線程結束標記
+_STOP = object()
+
+
+def _decompress(path: Path) -> bytes:
+    data = path.read_bytes()
+    if path.suffix == '.zst':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError('讀取 .zst 檔案需要安裝 zstandard')
+        return zstd.ZstdDecompressor().decompressobj().decompress(data)
+    if path.suffix == '.gz':
+        return gzip.decompress(data)
+    return data
+
+
+class RawPageStore:
+    """
+    內容定址、壓縮、背景寫入的原始頁面存儲
+
+    Args:
+        root: 存儲根目錄（記錄在 YYYYMMDD/ 子目錄，HTML 在 blobs/）
+        compression_level: 壓縮等級（zstd 1-22，gzip 1-9 時自動截斷）
+        max_pending: 佇列中最多等待寫入的記錄數
+        batch_size: 背景線程每次取出的最大記錄數
+        max_known_digests: 記憶中已寫入 HTML 摘要的上限（LRU），超出時改以 blob 是否存在判斷
+    """
+
+    def __init__(self, root: Path, compression_level: int = 3, max_pending: int = 64, batch_size: int = 16,
+                 max_known_digests: int = 4096):
+        self.root = Path(root)
+        self.compression_level = compression_level
+        self.batch_size = batch_size
+        self.extension = '.html.zst' if ZSTD_AVAILABLE else '.html.gz'
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self.max_known_digests = max_known_digests
+        self._known_digests: 'OrderedDict[str, None]' = OrderedDict()
+        self.stats = {
+            'records_written': 0,
+            'blobs_written': 0,
+            'duplicate_pages': 0,
+            'html_bytes': 0,
+            'compressed_bytes': 0,
+            'batches': 0,
+            'errors': 0
+        }
+
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='seek-raw-page-store', daemon=True)
+                self._thread.start()
+
+    def _record_path(self, data_type: str) -> Path:
+        now = datetime.now()
+        return self.root / now.strftime('%Y%m%d') / f"{data_type}_{now.strftime('%H%M%S_%f')[:-3]}.json"
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / 'blobs' / digest[:2] / f"{digest}{self.extension}"
+
+    async def submit(self, data: Dict[str, Any], data_type: str = "job_listings") -> str:
+        """
+        將記錄放進寫入佇列，返回記錄最終的檔案路徑（寫入在背景完成）
+
+        data 會被淺複製；提交後呼叫端不應再修改其中的巢狀物件
+        """
+        path = self._record_path(data_type)
+        self._ensure_thread()
+        item = (path, dict(data))
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, item)
+        return str(path)
+
+    async def flush(self):
+        """等待目前佇列中的記錄全部寫入"""
+        if self._thread is not None:
+            await asyncio.to_thread(self._queue.join)
+
+    async def close(self):
+        """寫完剩餘記錄並結束背景線程"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        await asyncio.to_thread(self._queue.put, _STOP)
+        await asyncio.to_thread(thread.join)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                    continue
+                try:
+                    self._write(*item)
+                except Exception as e:
+                    logger.error(f"原始數據保存失敗: {e}")
+                    self.stats['errors'] += 1
+            self.stats['batches'] += 1
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _compress(self, data: bytes) -> bytes:
+        if ZSTD_AVAILABLE:
+            return zstd.ZstdCompressor(level=self.compression_level).compress(data)
+        return gzip.compress(data, compresslevel=min(max(self.compression_level, 1), 9))
+
+    def _remember_digest(self, digest: str):
+        """記錄已寫入的摘要，超出上限時淘汰最久未出現的"""
+        self._known_digests[digest] = None
+        self._known_digests.move_to_end(digest)
+        while len(self._known_digests) > self.max_known_digests:
+            self._known_digests.popitem(last=False)
+
+    def _store_html(self, html: str) -> Dict[str, Any]:
+        data = html.encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        blob = self.blob_path(digest)
+        self.stats['html_bytes'] += len(data)
+
+        if digest in self._known_digests:
+            self._known_digests.move_to_end(digest)
+            self.stats['duplicate_pages'] += 1
+        elif blob.exists():
+            self.stats['duplicate_pages'] += 1
+        else:
+            compressed = self._compress(data)
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            temporary = blob.with_name(blob.name + '.tmp')
+            temporary.write_bytes(compressed)
+            os.replace(temporary, blob)
+            self.stats['blobs_written'] += 1
+            self.stats['compressed_bytes'] += len(compressed)
+        self._remember_digest(digest)
+
+        return {
+            'html_digest': digest,
+            'html_blob': blob.relative_to(self.root).as_posix(),
+            'html_size': len(data)
+        }
+
+    def _write(self, path: Path, record: Dict[str, Any]):
+        html = record.pop('html_content', None)
+        if html:
+            record.update(self._store_html(html))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(record, ensure_ascii=False, default=str), encoding='utf-8')
+        self.stats['records_written'] += 1
+
+    def load_page(self, record_path: str) -> Dict[str, Any]:
+        """讀回記錄，並把 html_blob 還原成 html_content"""
+        record = json.loads(Path(record_path).read_text(encoding='utf-8'))
+        blob = record.get('html_blob')
+        if blob:
+            record['html_content'] = _decompress(self.root / blob).decode('utf-8')
+        return record
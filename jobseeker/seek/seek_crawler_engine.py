@@ -9,15 +9,16 @@ Date: 2024
 """
 
 import asyncio
-import json
 import logging
+import math
 import os
+import re
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-import aiofiles
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
 from bs4 import BeautifulSoup
 try:
@@ -26,9 +27,23 @@ except ImportError:
     PaddleOCR = None
     logging.warning("PaddleOCR not installed. OCR functionality will be disabled.")
 
+from ..async_scraping import AsyncRateLimiter
+from ..browser_resources import (
+    SCREENSHOT_ALWAYS, SCREENSHOT_MODES, SCREENSHOT_NEVER, SCREENSHOT_ON_FAILURE,
+    ResourcePolicy, goto_and_wait, install_resource_policy, wait_for_content
+)
 from ..model import JobPost
 from ..util import extract_emails_from_text, extract_salary
 from . import SeekScraper
+from .ocr_pipeline import OCRPipeline, combine_card_results
+from .raw_page_store import RawPageStore
+
+
+# 搜索結果已渲染的標誌
+JOB_LISTING_SELECTOR = '[data-automation="jobListing"]'
+
+# 搜索結果總數
+TOTAL_JOBS_SELECTOR = {'data-automation': 'totalJobsCount'}
 
 
 class SeekCrawlerEngine:
@@ -43,7 +58,13 @@ class SeekCrawlerEngine:
                  timeout: int = 30000,
                  enable_ocr: bool = True,
                  ocr_languages: List[str] = None,
-                 storage_path: str = None):
+                 storage_path: str = None,
+                 resource_policy: Optional[ResourcePolicy] = None,
+                 screenshot_mode: str = SCREENSHOT_ON_FAILURE,
+                 ocr_workers: int = 1,
+                 max_ocr_cards: int = 30,
+                 concurrent_pages: int = 1,
+                 min_request_interval: float = 2.0):
         """
         初始化Seek爬蟲引擎
         
@@ -54,33 +75,58 @@ class SeekCrawlerEngine:
             enable_ocr: 是否啟用OCR功能
             ocr_languages: OCR支持的語言列表
             storage_path: 數據存儲路徑
+            resource_policy: 請求攔截策略（預設略過圖片、媒體、字型與追蹤請求；
+                             傳入 full_page_policy() 可載入所有資源）
+            screenshot_mode: 截圖模式 never / on_failure / always
+            ocr_workers: OCR 工作進程數（0 表示在本進程建立引擎，於線程中執行）
+            max_ocr_cards: 每頁最多辨識的職位卡片數
+            concurrent_pages: 同時開啟的分頁（tab）數；大於 1 時以 page= 參數並行抓取分頁
+            min_request_interval: 兩次頁面導航之間的最短間隔（秒），並行時同樣適用
         """
+        if screenshot_mode not in SCREENSHOT_MODES:
+            raise ValueError(f"screenshot_mode 必須是 {SCREENSHOT_MODES} 之一")
         self.headless = headless
         self.slow_mo = slow_mo
         self.timeout = timeout
         self.enable_ocr = enable_ocr
         self.ocr_languages = ocr_languages or ['en', 'ch_sim']
+        self.resource_policy = resource_policy if resource_policy is not None else ResourcePolicy()
+        self.screenshot_mode = screenshot_mode
+        self.max_ocr_cards = max_ocr_cards
+        self.concurrent_pages = max(1, concurrent_pages)
+        # 所有分頁共用的導航速率限制
+        self.rate_limiter = AsyncRateLimiter(min_request_interval)
+        self.search_url: Optional[str] = None
         
         # 設置存儲路徑
         self.storage_path = Path(storage_path) if storage_path else Path("./seek_data")
         self.storage_path.mkdir(exist_ok=True)
+        # 原始頁面在背景壓縮、去重後寫入，不佔用導航的關鍵路徑
+        self.raw_store = RawPageStore(self.storage_path / "raw_data")
         
         # 初始化組件
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.ocr_engine = None
+        self.ocr_pipeline: Optional[OCRPipeline] = None
         
-        # 初始化OCR引擎
+        # 初始化OCR管線：預設由專用工作進程建立引擎，結果按影像雜湊快取在磁碟
         if self.enable_ocr and PaddleOCR:
             try:
-                self.ocr_engine = PaddleOCR(
-                    use_angle_cls=True,
-                    lang='en',  # 主要語言
-                    use_gpu=False,
-                    show_log=False
+                if ocr_workers <= 0:
+                    self.ocr_engine = PaddleOCR(
+                        use_angle_cls=True,
+                        lang='en',  # 主要語言
+                        use_gpu=False,
+                        show_log=False
+                    )
+                self.ocr_pipeline = OCRPipeline(
+                    cache_dir=str(self.storage_path / "ocr_cache"),
+                    max_workers=max(ocr_workers, 1),
+                    engine=self.ocr_engine
                 )
-                logging.info("PaddleOCR引擎初始化成功")
+                logging.info("PaddleOCR管線初始化成功")
             except Exception as e:
                 logging.error(f"PaddleOCR初始化失敗: {e}")
                 self.enable_ocr = False
@@ -94,6 +140,7 @@ class SeekCrawlerEngine:
             'jobs_extracted': 0,
             'screenshots_taken': 0,
             'ocr_processed': 0,
+            'ocr_cache_hits': 0,
             'errors': 0
         }
     
@@ -143,6 +190,9 @@ class SeekCrawlerEngine:
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             )
             
+            # 略過解析用不到的資源
+            await install_resource_policy(self.context, self.resource_policy)
+            
             # 創建頁面
             self.page = await self.context.new_page()
             self.page.set_default_timeout(self.timeout)
@@ -185,11 +235,14 @@ class SeekCrawlerEngine:
             
             self.logger.info(f"導航到搜索頁面: {search_url}")
             
-            # 導航到頁面
-            await self.page.goto(search_url, wait_until='networkidle')
+            # 導航到頁面（DOM 載入即可，不等待網路閒置）
+            # 第 1 頁同樣經過速率限制器，之後的分頁導航與它保持間隔
+            self.search_url = search_url
+            await self.rate_limiter.acquire()
+            await self.page.goto(search_url, wait_until='domcontentloaded')
             
             # 等待搜索結果加載
-            await self.page.wait_for_selector('[data-automation="jobListing"]', timeout=10000)
+            await self.page.wait_for_selector(JOB_LISTING_SELECTOR, timeout=10000)
             
             self.stats['pages_crawled'] += 1
             self.logger.info("成功導航到搜索頁面並加載結果")
@@ -201,12 +254,14 @@ class SeekCrawlerEngine:
             return False
     
     async def take_intelligent_screenshot(self, 
-                                        filename_prefix: str = "seek_page") -> Optional[str]:
+                                        filename_prefix: str = "seek_page",
+                                        page: Optional[Page] = None) -> Optional[str]:
         """
         智能截圖功能
         
         Args:
             filename_prefix: 文件名前綴
+            page: 要截圖的分頁（預設為主頁面）
             
         Returns:
             Optional[str]: 截圖文件路徑
@@ -222,7 +277,7 @@ class SeekCrawlerEngine:
             filepath = screenshot_dir / filename
             
             # 截取全頁面截圖
-            await self.page.screenshot(
+            await (page or self.page).screenshot(
                 path=str(filepath),
                 full_page=True,
                 type='png'
@@ -237,16 +292,57 @@ class SeekCrawlerEngine:
             self.stats['errors'] += 1
             return None
     
-    async def extract_page_content(self) -> Tuple[str, BeautifulSoup]:
+    def _needs_page_screenshot(self) -> bool:
+        """每頁是否需要整頁截圖（OCR 改用職位卡片的裁切影像，不需要整頁截圖）"""
+        return self.screenshot_mode == SCREENSHOT_ALWAYS
+    
+    @property
+    def ocr_available(self) -> bool:
+        return bool(self.enable_ocr and self.ocr_pipeline)
+    
+    async def capture_job_card_images(self, page: Optional[Page] = None) -> List[bytes]:
+        """
+        截取職位卡片區域的影像供 OCR 使用
+        
+        Args:
+            page: 要截取的分頁（預設為主頁面）
+        
+        Returns:
+            List[bytes]: 每張卡片的 PNG 位元組（最多 max_ocr_cards 張）
+        """
+        images = []
+        try:
+            cards = await (page or self.page).query_selector_all(JOB_LISTING_SELECTOR)
+            for card in cards[:self.max_ocr_cards]:
+                try:
+                    images.append(await card.screenshot(type='png'))
+                except Exception as e:
+                    self.logger.debug(f"職位卡片截圖失敗: {e}")
+        except Exception as e:
+            self.logger.error(f"職位卡片截圖失敗: {e}")
+            self.stats['errors'] += 1
+        return images
+    
+    async def capture_failure_screenshot(self, filename_prefix: str,
+                                         page: Optional[Page] = None) -> Optional[str]:
+        """頁面處理失敗時截圖留存（screenshot_mode 為 never 時略過）"""
+        if self.screenshot_mode == SCREENSHOT_NEVER:
+            return None
+        return await self.take_intelligent_screenshot(filename_prefix, page=page)
+    
+    async def extract_page_content(self, page: Optional[Page] = None) -> Tuple[str, BeautifulSoup]:
         """
         提取頁面HTML內容並創建BeautifulSoup對象
         
+        Args:
+            page: 要提取的分頁（預設為主頁面）
+        
         Returns:
             Tuple[str, BeautifulSoup]: 原始HTML和解析對象
         """
         try:
             # 獲取頁面HTML
-            html_content = await self.page.content()
+            html_content = await (page or self.page).content()
             
             # 創建BeautifulSoup對象
             soup = BeautifulSoup(html_content, 'html.parser')
@@ -271,44 +367,51 @@ class SeekCrawlerEngine:
         """
         ocr_result = {'enabled': False, 'text': '', 'confidence': 0, 'details': []}
         
-        if not self.enable_ocr or not self.ocr_engine or not screenshot_path:
+        if not self.ocr_available or not screenshot_path:
             return ocr_result
         
         try:
-            # 執行OCR識別
-            result = self.ocr_engine.ocr(screenshot_path, cls=True)
-            
-            if result and result[0]:
-                ocr_result['enabled'] = True
-                extracted_texts = []
-                total_confidence = 0
-                
-                for line in result[0]:
-                    if len(line) >= 2:
-                        text = line[1][0] if isinstance(line[1], (list, tuple)) else str(line[1])
-                        confidence = line[1][1] if isinstance(line[1], (list, tuple)) and len(line[1]) > 1 else 0.8
-                        
-                        extracted_texts.append(text)
-                        total_confidence += confidence
-                        
-                        ocr_result['details'].append({
-                            'text': text,
-                            'confidence': confidence,
-                            'bbox': line[0] if len(line) > 0 else []
-                        })
-                
-                ocr_result['text'] = ' '.join(extracted_texts)
-                ocr_result['confidence'] = total_confidence / len(result[0]) if result[0] else 0
-                
-                self.stats['ocr_processed'] += 1
-                self.logger.info(f"OCR處理完成，識別文字長度: {len(ocr_result['text'])}")
-            
-        except Exception as e:
-            self.logger.error(f"OCR處理失敗: {e}")
+            image = await asyncio.to_thread(Path(screenshot_path).read_bytes)
+        except OSError as e:
+            self.logger.error(f"讀取截圖失敗: {e}")
             self.stats['errors'] += 1
+            return ocr_result
         
+        result = await self.ocr_pipeline.recognize(image)
+        self._record_ocr_results([result])
+        if result['enabled'] and result['details']:
+            self.logger.info(f"OCR處理完成，識別文字長度: {len(result['text'])}")
+            return result
         return ocr_result
     
+    async def process_job_cards_ocr(self, card_images: List[bytes]) -> Dict[str, Any]:
+        """
+        辨識職位卡片影像並合併為頁面層級的 OCR 結果
+        
+        Args:
+            card_images: capture_job_card_images 返回的影像
+            
+        Returns:
+            Dict[str, Any]: OCR識別結果（cards 欄位保留每張卡片的文字與是否命中快取）
+        """
+        if not self.ocr_available or not card_images:
+            return {'enabled': False, 'text': '', 'confidence': 0, 'details': []}
+        
+        results = await self.ocr_pipeline.recognize_many(card_images)
+        self._record_ocr_results(results)
+        combined = combine_card_results(results)
+        self.logger.info(f"OCR處理完成: {len(results)} 張卡片，識別文字長度: {len(combined['text'])}")
+        return combined
+    
+    def _record_ocr_results(self, results: List[Dict[str, Any]]):
+        for result in results:
+            if result.get('error'):
+                self.stats['errors'] += 1
+            elif result.get('cached'):
+                self.stats['ocr_cache_hits'] += 1
+            else:
+                self.stats['ocr_processed'] += 1
+    
     async def extract_job_listings(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """
         從BeautifulSoup對象中提取職位列表
@@ -392,31 +495,19 @@ class SeekCrawlerEngine:
                           data: Dict[str, Any], 
                           data_type: str = "job_listings") -> str:
         """
-        保存原始數據到文件
+        保存原始數據到文件（放進寫入佇列，由背景線程壓縮 HTML 並寫入）
         
         Args:
-            data: 要保存的數據
+            data: 要保存的數據（html_content 以內容雜湊去重並壓縮存放）
             data_type: 數據類型
             
         Returns:
-            str: 保存的文件路徑
+            str: 保存的文件路徑（寫入可能尚未完成，需要時呼叫 raw_store.flush()）
         """
         try:
-            # 創建數據目錄
-            data_dir = self.storage_path / "raw_data" / datetime.now().strftime('%Y%m%d')
-            data_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 生成文件名
-            timestamp = datetime.now().strftime('%H%M%S_%f')[:-3]
-            filename = f"{data_type}_{timestamp}.json"
-            filepath = data_dir / filename
-            
-            # 異步保存數據
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, ensure_ascii=False, indent=2))
-            
-            self.logger.info(f"原始數據已保存: {filepath}")
-            return str(filepath)
+            filepath = await self.raw_store.submit(data, data_type)
+            self.logger.debug(f"原始數據已排入寫入佇列: {filepath}")
+            return filepath
             
         except Exception as e:
             self.logger.error(f"數據保存失敗: {e}")
@@ -427,44 +518,28 @@ class SeekCrawlerEngine:
         """
         處理分頁，抓取多頁數據
         
+        目前頁面視為第 1 頁（先呼叫 navigate_to_search）；concurrent_pages 大於 1 時
+        改用 crawl_pages_concurrently 以多個分頁並行抓取
+        
         Args:
             max_pages: 最大抓取頁數
             
         Returns:
             List[Dict[str, Any]]: 所有頁面的職位數據
         """
+        if self.concurrent_pages > 1 and self.search_url:
+            return await self.crawl_pages_concurrently(max_pages)
+        
         all_jobs = []
         current_page = 1
+        # OCR 與保存在背景完成，與下一頁的導航重疊
+        pending_pages: List[asyncio.Task] = []
         
         while current_page <= max_pages:
             try:
                 self.logger.info(f"處理第 {current_page} 頁")
                 
-                # 截圖
-                screenshot_path = await self.take_intelligent_screenshot(
-                    f"page_{current_page}"
-                )
-                
-                # 提取頁面內容
-                html_content, soup = await self.extract_page_content()
-                
-                # 提取職位信息
-                page_jobs = await self.extract_job_listings(soup)
-                
-                # OCR處理（如果啟用）
-                ocr_result = await self.process_ocr_if_needed(screenshot_path)
-                
-                # 保存頁面數據
-                page_data = {
-                    'page_number': current_page,
-                    'jobs': page_jobs,
-                    'html_content': html_content,
-                    'ocr_result': ocr_result,
-                    'screenshot_path': screenshot_path,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                await self.save_raw_data(page_data, f"page_{current_page}")
+                page_jobs, _ = await self._process_loaded_page(current_page, self.page, pending_pages)
                 all_jobs.extend(page_jobs)
                 
                 # 檢查是否有下一頁
@@ -472,9 +547,10 @@ class SeekCrawlerEngine:
                 if not next_button or current_page >= max_pages:
                     break
                 
-                # 點擊下一頁
+                # 點擊下一頁，等待網址改變且新的結果出現
+                previous_url = self.page.url
                 await next_button.click()
-                await self.page.wait_for_load_state('networkidle')
+                await wait_for_content(self.page, JOB_LISTING_SELECTOR, self.timeout, previous_url=previous_url)
                 
                 current_page += 1
                 
@@ -484,15 +560,176 @@ class SeekCrawlerEngine:
             except Exception as e:
                 self.logger.error(f"處理第 {current_page} 頁時出錯: {e}")
                 self.stats['errors'] += 1
+                await self.capture_failure_screenshot(f"page_{current_page}_error")
                 break
         
+        if pending_pages:
+            await asyncio.gather(*pending_pages)
+        await self.raw_store.flush()
+        
+        return all_jobs
+    
+    async def _process_loaded_page(self, page_number: int, page: Page,
+                                   pending_pages: List[asyncio.Task]) -> Tuple[List[Dict[str, Any]], BeautifulSoup]:
+        """
+        處理已載入的搜索結果頁：截圖、解析職位、OCR 與保存
+        
+        Args:
+            page_number: 頁碼
+            page: 已載入該頁的分頁
+            pending_pages: 收集背景 OCR / 保存任務，由呼叫端在結束前等待
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], BeautifulSoup]: 職位數據與解析對象
+        """
+        # 只在需要時截圖
+        screenshot_path = None
+        if self._needs_page_screenshot():
+            screenshot_path = await self.take_intelligent_screenshot(f"page_{page_number}", page=page)
+        
+        # 提取頁面內容
+        html_content, soup = await self.extract_page_content(page)
+        
+        # 提取職位信息
+        page_jobs = await self.extract_job_listings(soup)
+        if not page_jobs and screenshot_path is None:
+            screenshot_path = await self.capture_failure_screenshot(f"page_{page_number}_empty", page=page)
+        
+        # OCR處理（如果啟用）：只截取職位卡片，辨識交給 OCR 工作進程
+        ocr_task = None
+        if self.ocr_available and page_jobs:
+            card_images = await self.capture_job_card_images(page)
+            ocr_task = asyncio.create_task(self.process_job_cards_ocr(card_images))
+        
+        # 保存頁面數據
+        page_data = {
+            'page_number': page_number,
+            'jobs': page_jobs,
+            'html_content': html_content,
+            'ocr_result': {'enabled': False, 'text': '', 'confidence': 0, 'details': []},
+            'screenshot_path': screenshot_path,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        if ocr_task is None:
+            await self.save_raw_data(page_data, f"page_{page_number}")
+        else:
+            pending_pages.append(asyncio.create_task(self._finish_page(page_data, ocr_task)))
+        return page_jobs, soup
+    
+    def _page_url(self, page_number: int) -> str:
+        """搜索結果第 page_number 頁的網址（page= 參數）"""
+        parts = urlsplit(self.search_url)
+        query = [(key, value) for key, value in parse_qsl(parts.query) if key != 'page']
+        if page_number > 1:
+            query.append(('page', str(page_number)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+    
+    @staticmethod
+    def _total_pages(soup: BeautifulSoup, jobs_per_page: int) -> Optional[int]:
+        """依搜索結果總數估計總頁數（頁面沒有顯示總數時返回 None）"""
+        element = soup.find(attrs=TOTAL_JOBS_SELECTOR)
+        digits = re.sub(r'\D', '', element.get_text()) if element else ''
+        if not digits or jobs_per_page <= 0:
+            return None
+        return max(1, math.ceil(int(digits) / jobs_per_page))
+    
+    async def crawl_pages_concurrently(self, max_pages: int = 5) -> List[Dict[str, Any]]:
+        """
+        以多個分頁（tab）並行抓取搜索結果，按頁碼順序合併
+        
+        目前頁面視為第 1 頁並先處理，依結果總數估計實際頁數；第 2 頁起以 page= 網址
+        分配給最多 concurrent_pages 個分頁，每次導航前經過共用的速率限制器，
+        因此並行不會提高每秒請求數。遇到空白或失敗的頁面後不再開始更後面的頁面，
+        結果只保留到該頁之前
+        
+        Args:
+            max_pages: 最大抓取頁數
+            
+        Returns:
+            List[Dict[str, Any]]: 所有頁面的職位數據（按頁碼順序）
+        """
+        pending_pages: List[asyncio.Task] = []
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        extra_tabs: List[Page] = []
+        
+        try:
+            self.logger.info("處理第 1 頁")
+            first_jobs, soup = await self._process_loaded_page(1, self.page, pending_pages)
+            results[1] = first_jobs
+            last_page = 0
+            if first_jobs:
+                last_page = min(max_pages, self._total_pages(soup, len(first_jobs)) or max_pages)
+            
+            if last_page > 1:
+                tabs: asyncio.Queue = asyncio.Queue()
+                tabs.put_nowait(self.page)
+                for _ in range(min(self.concurrent_pages, last_page - 1) - 1):
+                    tab = await self.context.new_page()
+                    tab.set_default_timeout(self.timeout)
+                    extra_tabs.append(tab)
+                    tabs.put_nowait(tab)
+                
+                async def fetch(page_number: int):
+                    nonlocal last_page
+                    tab = await tabs.get()
+                    try:
+                        if page_number > last_page:
+                            return
+                        await self.rate_limiter.acquire()
+                        self.logger.info(f"處理第 {page_number} 頁")
+                        await goto_and_wait(tab, self._page_url(page_number), JOB_LISTING_SELECTOR, self.timeout)
+                        self.stats['pages_crawled'] += 1
+                        page_jobs, _ = await self._process_loaded_page(page_number, tab, pending_pages)
+                    except Exception as e:
+                        self.logger.error(f"處理第 {page_number} 頁時出錯: {e}")
+                        self.stats['errors'] += 1
+                        await self.capture_failure_screenshot(f"page_{page_number}_error", page=tab)
+                        page_jobs = []
+                    finally:
+                        tabs.put_nowait(tab)
+                    results[page_number] = page_jobs
+                    if not page_jobs:
+                        last_page = min(last_page, page_number - 1)
+                
+                await asyncio.gather(*(fetch(page_number) for page_number in range(2, last_page + 1)))
+        
+        except Exception as e:
+            self.logger.error(f"並行分頁抓取失敗: {e}")
+            self.stats['errors'] += 1
+        
+        finally:
+            for tab in extra_tabs:
+                try:
+                    await tab.close()
+                except Exception:
+                    pass
+            if pending_pages:
+                await asyncio.gather(*pending_pages)
+            await self.raw_store.flush()
+        
+        all_jobs = []
+        page_number = 1
+        while results.get(page_number):
+            all_jobs.extend(results[page_number])
+            page_number += 1
         return all_jobs
     
+    async def _finish_page(self, page_data: Dict[str, Any], ocr_task: asyncio.Task):
+        """等待頁面的 OCR 結果後保存原始數據"""
+        try:
+            page_data['ocr_result'] = await ocr_task
+        except Exception as e:
+            self.logger.error(f"OCR處理失敗: {e}")
+            self.stats['errors'] += 1
+        await self.save_raw_data(page_data, f"page_{page_data['page_number']}")
+    
     async def cleanup(self):
         """
         清理資源
         """
         try:
+            await self.raw_store.close()
             if self.page:
                 await self.page.close()
             if self.context:
@@ -501,6 +738,8 @@ class SeekCrawlerEngine:
                 await self.browser.close()
             if hasattr(self, 'playwright'):
                 await self.playwright.stop()
+            if self.ocr_pipeline:
+                self.ocr_pipeline.shutdown(wait=False)
             
             self.logger.info("資源清理完成")
             
@@ -518,6 +757,10 @@ class SeekCrawlerEngine:
             **self.stats,
             'storage_path': str(self.storage_path),
             'ocr_enabled': self.enable_ocr,
+            'ocr_pipeline': dict(self.ocr_pipeline.stats) if self.ocr_pipeline else None,
+            'raw_store': dict(self.raw_store.stats),
+            'screenshot_mode': self.screenshot_mode,
+            'requests_blocked': self.resource_policy.blocked_requests,
             'session_duration': time.time()
         }
 
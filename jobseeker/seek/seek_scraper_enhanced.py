@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
 from .seek_crawler_engine import SeekCrawlerEngine
+from ..browser_resources import SCREENSHOT_NEVER, SCREENSHOT_ON_FAILURE
 from .etl_processor import SeekETLProcessor
 from ..model import JobPost, JobType, Country
 from . import SeekScraper
@@ -36,7 +37,8 @@ class SeekScraperEnhanced:
                  enable_screenshots: bool = True,
                  storage_path: str = None,
                  max_workers: int = 3,
-                 rate_limit_delay: float = 2.0):
+                 rate_limit_delay: float = 2.0,
+                 concurrent_pages: int = 1):
         """
         初始化Seek增強型爬蟲
         
@@ -44,10 +46,11 @@ class SeekScraperEnhanced:
             scraping_mode: 爬蟲模式 ("traditional", "enhanced", "hybrid")
             headless: 是否使用無頭瀏覽器
             enable_ocr: 是否啟用OCR功能
-            enable_screenshots: 是否啟用截圖功能
+            enable_screenshots: 是否啟用截圖功能（列表頁只在失敗時截圖，詳情頁每次截圖）
             storage_path: 數據存儲路徑
             max_workers: 最大並發工作線程數
-            rate_limit_delay: 請求間隔延遲(秒)
+            rate_limit_delay: 請求間隔延遲(秒)，並行分頁時同樣適用
+            concurrent_pages: 增強型引擎同時開啟的分頁（tab）數，預設 1 即逐頁抓取
         """
         self.scraping_mode = scraping_mode
         self.headless = headless
@@ -55,6 +58,7 @@ class SeekScraperEnhanced:
         self.enable_screenshots = enable_screenshots
         self.max_workers = max_workers
         self.rate_limit_delay = rate_limit_delay
+        self.concurrent_pages = concurrent_pages
         
         # 設置存儲路徑
         self.storage_path = Path(storage_path) if storage_path else Path("./seek_enhanced_data")
@@ -124,7 +128,10 @@ class SeekScraperEnhanced:
                 self.crawler_engine = SeekCrawlerEngine(
                     headless=self.headless,
                     enable_ocr=self.enable_ocr,
-                    storage_path=str(self.storage_path / "crawler_data")
+                    storage_path=str(self.storage_path / "crawler_data"),
+                    screenshot_mode=SCREENSHOT_ON_FAILURE if self.enable_screenshots else SCREENSHOT_NEVER,
+                    concurrent_pages=self.concurrent_pages,
+                    min_request_interval=self.rate_limit_delay
                 )
                 
                 if not await self.crawler_engine.initialize_browser():
@@ -421,10 +428,11 @@ class SeekScraperEnhanced:
                 self.logger.error("爬蟲引擎未初始化")
                 return None
             
-            # 導航到職位詳情頁
-            await self.crawler_engine.page.goto(job_url, wait_until='networkidle')
+            # 導航到職位詳情頁（DOM 載入即可，不等待網路閒置）
+            await self.crawler_engine.page.goto(job_url, wait_until='domcontentloaded')
             
             # 截圖
+            screenshot_path = None
             if self.enable_screenshots:
                 screenshot_path = await self.crawler_engine.take_intelligent_screenshot("job_detail")
             
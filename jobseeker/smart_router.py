@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from .simple_config import SimpleConfig
 from .platform_adapter import MultiPlatformAdapter, SearchResult
 from .model import JobPost
+from .metrics_exporter import get_registry
+from .tracing import traced
 
 # 設置日誌
 logger = logging.getLogger(__name__)
@@ -46,7 +48,16 @@ class SmartJobRouter:
         self.config = SimpleConfig()
         self.multi_adapter = MultiPlatformAdapter(max_workers)
         self.search_history = []
+        
+        registry = get_registry()
+        self._search_duration = registry.histogram(
+            'jobseeker_router_search_duration_seconds', '路由器一站式搜尋的總耗時')
+        self._platform_duration = registry.histogram(
+            'jobseeker_router_platform_duration_seconds', '路由器各平台搜尋耗時', ['site', 'outcome'])
+        self._platform_jobs = registry.counter(
+            'jobseeker_router_platform_jobs', '路由器各平台取得的職位數', ['site'])
     
+    @traced("router.search_jobs")
     def search_jobs(
         self, 
         query: str, 
@@ -236,6 +247,14 @@ class SmartJobRouter:
         
         self.search_history.append(history_entry)
         
+        self._search_duration.observe(result.total_execution_time)
+        for platform_result in result.platform_results:
+            outcome = 'success' if platform_result.success else 'error'
+            self._platform_duration.labels(platform_result.platform, outcome).observe(
+                platform_result.execution_time
+            )
+            self._platform_jobs.labels(platform_result.platform).inc(platform_result.job_count)
+        
         # 只保留最近100次搜尋記錄
         if len(self.search_history) > 100:
             self.search_history = self.search_history[-100:]
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+輕量級請求追蹤
+以 contextvars 傳遞當前 span，輸出 OpenTelemetry 相容的 OTLP/JSON
+
+設計要點:
+1. 未設定匯出器時 start_span 返回共用的空 span，幾乎無額外開銷
+2. 線程池與 run_in_executor 不會自動複製 contextvars，
+   透過 wrap_context / submit_with_context / run_in_executor 傳遞
+3. FileSpanExporter 每行寫一份 OTLP/JSON（resourceSpans），
+   可直接交給 OpenTelemetry Collector 的 otlpjsonfile 接收器或其他相容工具
+
+環境變數 JOBSEEKER_TRACE 可在匯入時啟用：console 輸出到控制台，其他值視為檔案路徑。
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar(
+    'jobseeker_current_span', default=None
+)
+
+# OTLP 狀態碼
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """追蹤區段"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_span_id', 'attributes', 'events',
+                 'start_time_ns', 'end_time_ns', 'status_code', 'status_message', '_tracer')
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_span_id: Optional[str],
+                 attributes: Optional[Dict[str, Any]] = None, tracer: Optional['Tracer'] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ''
+        self._tracer = tracer
+
+    @property
+    def is_recording(self) -> bool:
+        return True
+
+    @property
+    def duration(self) -> float:
+        """持續時間（秒），未結束時計算至今"""
+        end = self.end_time_ns if self.end_time_ns is not None else time.time_ns()
+        return (end - self.start_time_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.events.append({'name': name, 'time_ns': time.time_ns(), 'attributes': attributes or {}})
+
+    def record_exception(self, error: BaseException):
+        """記錄例外並標記為錯誤"""
+        self.add_event('exception', {
+            'exception.type': type(error).__name__,
+            'exception.message': str(error)
+        })
+        self.status_code = STATUS_ERROR
+        self.status_message = f'{type(error).__name__}: {error}'
+
+    def end(self):
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        if self._tracer is not None:
+            self._tracer._export(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """轉為 OTLP/JSON 的 span 物件"""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_time_ns),
+            'endTimeUnixNano': str(self.end_time_ns or time.time_ns()),
+            'attributes': _otlp_attributes(self.attributes),
+            'status': {'code': self.status_code}
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        if self.events:
+            span['events'] = [
+                {
+                    'timeUnixNano': str(event['time_ns']),
+                    'name': event['name'],
+                    'attributes': _otlp_attributes(event['attributes'])
+                }
+                for event in self.events
+            ]
+        return span
+
+
+class _NoopSpan:
+    """追蹤停用時使用的空 span"""
+
+    name = ''
+    trace_id = ''
+    span_id = ''
+    parent_span_id = None
+    is_recording = False
+    duration = 0.0
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [_otlp_value(item) for item in value]}}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class SpanExporter:
+    """span 匯出器基類"""
+
+    def export(self, spans: List[Span]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """以縮排樹狀摘要輸出到控制台（根 span 結束時輸出整條追蹤）"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        depth: Dict[str, int] = {}
+        lines = []
+        for span in sorted(spans, key=lambda item: item.start_time_ns):
+            level = depth.get(span.parent_span_id, -1) + 1 if span.parent_span_id else 0
+            depth[span.span_id] = level
+            marker = ' !' if span.status_code == STATUS_ERROR else ''
+            lines.append(f"{'  ' * level}{span.name} {span.duration * 1000:.1f}ms{marker}")
+        with self._lock:
+            self.stream.write(f"[trace {spans[0].trace_id}]\n" + '\n'.join(lines) + '\n')
+            self.stream.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """每條追蹤寫一行 OTLP/JSON"""
+
+    def __init__(self, file_path: str, service_name: str = 'jobseeker'):
+        self.file_path = file_path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        document = {
+            'resourceSpans': [{
+                'resource': {'attributes': _otlp_attributes({'service.name': self.service_name})},
+                'scopeSpans': [{
+                    'scope': {'name': 'jobseeker.tracing'},
+                    'spans': [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+        line = json.dumps(document, ensure_ascii=False)
+        with self._lock:
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class InMemorySpanExporter(SpanExporter):
+    """保存在記憶體中（測試用）"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+class Tracer:
+    """
+    追蹤器
+
+    同一條追蹤的 span 先暫存，根 span 結束時一起交給匯出器，
+    使每條追蹤在檔案中是完整的一筆記錄。根 span 結束後才結束的子 span
+    （例如未等待的背景任務）不再暫存，直接單獨匯出。
+    """
+
+    def __init__(self, max_spans_per_trace: int = 2000):
+        self.exporters: List[SpanExporter] = []
+        self.max_spans_per_trace = max_spans_per_trace
+        self._pending: Dict[str, List[Span]] = {}
+        # 根 span 尚未結束的追蹤
+        self._open_traces: set = set()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter):
+        self.exporters.append(exporter)
+
+    def remove_exporter(self, exporter: SpanExporter):
+        if exporter in self.exporters:
+            self.exporters.remove(exporter)
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                   parent: Optional[Span] = None):
+        """建立 span（不設為當前 span）"""
+        if not self.exporters:
+            return NOOP_SPAN
+        if parent is None:
+            parent = _current_span.get()
+        if parent is not None and parent.is_recording:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            with self._lock:
+                self._open_traces.add(trace_id)
+        return Span(name, trace_id, secrets.token_hex(8), parent_id, attributes, self)
+
+    def _export(self, span: Span):
+        with self._lock:
+            if span.parent_span_id is not None and span.trace_id not in self._open_traces:
+                batch = [span]
+            else:
+                spans = self._pending.setdefault(span.trace_id, [])
+                spans.append(span)
+                if span.parent_span_id is not None and len(spans) < self.max_spans_per_trace:
+                    return
+                batch = self._pending.pop(span.trace_id)
+                if span.parent_span_id is None:
+                    self._open_traces.discard(span.trace_id)
+
+        for exporter in list(self.exporters):
+            try:
+                exporter.export(batch)
+            except Exception:
+                # 追蹤匯出失敗不影響業務流程
+                pass
+
+
+# 全域追蹤器
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """獲取全域追蹤器"""
+    return _tracer
+
+
+def configure_tracing(console: bool = False, file_path: Optional[str] = None,
+                      service_name: str = 'jobseeker') -> Tracer:
+    """
+    啟用追蹤匯出
+
+    Args:
+        console: 是否輸出樹狀摘要到控制台
+        file_path: OTLP/JSON 輸出檔案路徑
+        service_name: 資源屬性 service.name
+    """
+    if console:
+        _tracer.add_exporter(ConsoleSpanExporter())
+    if file_path:
+        _tracer.add_exporter(FileSpanExporter(file_path, service_name))
+    return _tracer
+
+
+def get_current_span():
+    """獲取當前 span（沒有時返回空 span）"""
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def start_span(name: str, **attributes) -> Iterator[Any]:
+    """
+    開始一個子 span 並設為當前 span
+
+    用法:
+        with start_span('indeed.page', page=2) as span:
+            span.set_attribute('jobs', len(jobs))
+    """
+    span = _tracer.start_span(name, attributes)
+    if span is NOOP_SPAN:
+        yield span
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def activate_span(name: str, **attributes):
+    """
+    開始 span 並設為當前 span，返回 (span, token)；
+    用於無法使用 with 的場合（例如 Flask 的 before/after_request）
+    """
+    span = _tracer.start_span(name, attributes)
+    if span is NOOP_SPAN:
+        return span, None
+    return span, _current_span.set(span)
+
+
+def deactivate_span(span, token, error: Optional[BaseException] = None):
+    """結束 activate_span 建立的 span"""
+    if token is None:
+        return
+    if error is not None:
+        span.record_exception(error)
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # token 在其他 context 中建立（例如串流回應結束於不同 context）
+        pass
+    span.end()
+
+
+def traced(name: Optional[str] = None, **attributes):
+    """span 裝飾器，支援同步與非同步函數"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def wrap_context(func: Callable) -> Callable:
+    """綁定當前 contextvars（含當前 span），供其他線程執行"""
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+    return wrapper
+
+
+def submit_with_context(executor, func: Callable, *args, **kwargs):
+    """executor.submit 的版本，子任務沿用當前 span"""
+    return executor.submit(wrap_context(func), *args, **kwargs)
+
+
+def run_in_executor(loop: asyncio.AbstractEventLoop, executor, func: Callable, *args):
+    """loop.run_in_executor 的版本，子任務沿用當前 span"""
+    return loop.run_in_executor(executor, wrap_context(func), *args)
+
+
+_env_target = os.environ.get('JOBSEEKER_TRACE', '').strip()
+if _env_target:
+    if _env_target.lower() == 'console':
+        configure_tracing(console=True)
+    else:
+        configure_tracing(file_path=_env_target)
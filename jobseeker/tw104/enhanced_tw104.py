@@ -13,16 +13,25 @@ import random
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+from ..browser_resources import ResourcePolicy, goto_and_wait, install_resource_policy
+from ..http_replay import install_route_replay
 from .constant import BASE_URL, SEARCH_URL, USER_AGENTS, ANT_DETECTION_CONFIG
 
+# 職位詳情內容已渲染的標誌
+JOB_DETAIL_SELECTOR = '.job-description, .job-content, .content'
+
 
 class EnhancedTW104Scraper:
     """104人力銀行增強版爬蟲"""
     
-    def __init__(self, headless: bool = True, timeout: int = 30000):
+    def __init__(self, headless: bool = True, timeout: int = 30000,
+                 resource_policy: Optional[ResourcePolicy] = None):
         self.headless = headless
         self.timeout = timeout
+        # 請求攔截策略（預設略過圖片、媒體、字型與追蹤請求）
+        self.resource_policy = resource_policy if resource_policy is not None else ResourcePolicy()
         self.base_url = BASE_URL
         self.search_base_url = SEARCH_URL
         self.user_agents = USER_AGENTS
@@ -128,7 +137,7 @@ class EnhancedTW104Scraper:
         """創建瀏覽器上下文"""
         user_agent = random.choice(self.user_agents)
         
-        return await browser.new_context(
+        context = await browser.new_context(
             viewport={'width': 1920, 'height': 1080},
             user_agent=user_agent,
             locale='zh-TW',
@@ -142,6 +151,10 @@ class EnhancedTW104Scraper:
                 'Upgrade-Insecure-Requests': '1'
             }
         )
+        # 啟用卡帶時改由錄製 / 重放路由處理請求；攔截策略後安裝、先處理
+        await install_route_replay(context)
+        await install_resource_policy(context, self.resource_policy)
+        return context
     
     def _build_search_url(
         self, 
@@ -170,12 +183,8 @@ class EnhancedTW104Scraper:
     async def _search_single_page(self, page: Page, search_url: str) -> List[Dict[str, Any]]:
         """搜尋單一頁面"""
         try:
-            # 訪問搜尋頁面
-            await page.goto(search_url, timeout=self.timeout)
-            await page.wait_for_load_state('networkidle')
-            
-            # 等待職位列表載入
-            await page.wait_for_selector('.job-list', timeout=10000)
+            # 訪問搜尋頁面並等待職位列表載入（不等待網路閒置）
+            await goto_and_wait(page, search_url, '.job-list', timeout=self.timeout)
             
             # 提取職位資訊
             jobs = await self._extract_job_info(page)
@@ -317,8 +326,11 @@ class EnhancedTW104Scraper:
                 context = await self._create_context(browser)
                 page = await context.new_page()
                 
-                await page.goto(job_url, timeout=self.timeout)
-                await page.wait_for_load_state('networkidle')
+                await page.goto(job_url, timeout=self.timeout, wait_until='domcontentloaded')
+                try:
+                    await page.wait_for_selector(JOB_DETAIL_SELECTOR, timeout=self.timeout)
+                except PlaywrightTimeoutError:
+                    pass  # 版面不同時仍嘗試提取
                 
                 # 提取詳細資訊
                 details = await page.evaluate("""
@@ -4,7 +4,6 @@ import logging
 import re
 from itertools import cycle
 
-import numpy as np
 import requests
 import tls_client
 import urllib3
@@ -12,6 +11,8 @@ from markdownify import markdownify as md
 from requests.adapters import HTTPAdapter, Retry
 
 from jobseeker.model import CompensationInterval, JobType, Site
+from jobseeker.tracing import start_span
+from jobseeker.http_replay import get_active_cassette
 from jobseeker.enhanced_logging import (
     EnhancedLogger, LogLevel, LogCategory, 
     get_enhanced_logger, create_site_logger,
@@ -99,7 +100,18 @@ class RequestsRotating(RotatingProxySession, requests.Session):
                 self.proxies = next_proxy
             else:
                 self.proxies = {}
-        return requests.Session.request(self, method, url, **kwargs)
+        with start_span("http.request", **{"http.method": method, "http.url": url}) as span:
+            cassette = get_active_cassette()
+            if cassette is not None:
+                response = cassette.handle(
+                    method, url, kwargs.get("params"), kwargs.get("data") or kwargs.get("json"),
+                    lambda: requests.Session.request(self, method, url, **kwargs),
+                    requests.Response,
+                )
+            else:
+                response = requests.Session.request(self, method, url, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
 
 
 class TLSRotating(RotatingProxySession, tls_client.Session):
@@ -114,7 +126,21 @@ class TLSRotating(RotatingProxySession, tls_client.Session):
                 self.proxies = next_proxy
             else:
                 self.proxies = {}
-        response = tls_client.Session.execute_request(self, *args, **kwargs)
+        method = kwargs.get("method", args[0] if args else None)
+        url = kwargs.get("url", args[1] if len(args) > 1 else None)
+        with start_span("http.request", **{"http.method": method, "http.url": url}) as span:
+            cassette = get_active_cassette()
+            if cassette is not None:
+                from tls_client.response import Response as TLSResponse
+
+                response = cassette.handle(
+                    method, url, kwargs.get("params"), kwargs.get("data") or kwargs.get("json"),
+                    lambda: tls_client.Session.execute_request(self, *args, **kwargs),
+                    TLSResponse,
+                )
+            else:
+                response = tls_client.Session.execute_request(self, *args, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
         response.ok = response.status_code in range(200, 400)
         return response
 
@@ -213,6 +239,8 @@ def get_enum_from_job_type(job_type_str: str) -> JobType | None:
 
 
 def currency_parser(cur_str):
+    import numpy as np
+
     # Remove any non-numerical characters
     # except for ',' '.' or '-' (e.g. EUR)
     cur_str = re.sub("[^-0-9.,]", "", cur_str)
@@ -14,6 +14,7 @@ from playwright.sync_api import sync_playwright, Page, Browser
 
 from .constant import headers, get_cookie_data
 from ..anti_detection import AntiDetectionScraper
+from ..http_replay import install_route_replay_sync
 from ..util import (
     extract_emails_from_text,
     create_session,
@@ -92,6 +93,8 @@ class EnhancedZipRecruiter(Scraper):
                 viewport=browser_config['viewport'],
                 extra_http_headers=browser_config['headers']
             )
+            # 啟用卡帶時改由錄製 / 重放路由處理請求
+            install_route_replay_sync(context)
             
             self.page = context.new_page()
             
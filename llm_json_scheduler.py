@@ -9,6 +9,8 @@ Date: 2025-01-27
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
 import time
@@ -19,16 +21,23 @@ from typing import Dict, List, Optional, Any, Union, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import aiofiles
-import aioredis
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import uuid
 
+try:
+    from redis import asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
 # 導入現有組件
 from jobseeker.smart_router import SmartJobRouter
 from jobseeker.intelligent_router import IntelligentRouter
 from jobseeker.data_manager import DataManager
 from jobseeker.enhanced_logging import get_enhanced_logger, LogCategory
+from jobseeker.metrics_exporter import MetricFamily, get_registry
 
 
 class TaskPriority(Enum):
@@ -97,17 +106,27 @@ class LLMFileWatcher(FileSystemEventHandler):
     監控指定目錄中新生成的JSON檔案
     """
 
-    def __init__(self, scheduler: 'LLMJSONScheduler'):
+    def __init__(self, scheduler: 'LLMJSONScheduler', max_pending_reads: int = 32):
         self.scheduler = scheduler
         self.logger = get_enhanced_logger(self.__class__.__name__, LogCategory.MONITORING)
+        # 同時讀取的新檔案上限，避免大量檔案湧入時同時開啟
+        self.max_pending_reads = max_pending_reads
+        self._intake: Optional[asyncio.Semaphore] = None
 
     def on_created(self, event):
-        """檔案創建事件處理"""
+        """檔案創建事件處理（於 watchdog 線程中呼叫）"""
         if not event.is_directory and event.src_path.endswith('.json'):
-            asyncio.create_task(self._handle_new_file(event.src_path))
+            loop = self.scheduler.loop
+            if loop is None or loop.is_closed():
+                self.logger.warning(f"調度器未運行，忽略檔案: {event.src_path}")
+                return
+            asyncio.run_coroutine_threadsafe(self._handle_new_file(event.src_path), loop)
 
     async def _handle_new_file(self, file_path: str):
         """處理新檔案"""
+        if self._intake is None:
+            self._intake = asyncio.Semaphore(self.max_pending_reads)
+        
         try:
             self.logger.info(f"檢測到新的JSON檔案: {file_path}")
             
@@ -115,7 +134,8 @@ class LLMFileWatcher(FileSystemEventHandler):
             await asyncio.sleep(0.5)
             
             # 提取檔案元數據
-            task_info = await self._extract_task_info(file_path)
+            async with self._intake:
+                task_info = await self._extract_task_info(file_path)
             
             # 添加到調度器
             await self.scheduler.add_task(task_info)
@@ -187,16 +207,34 @@ class TaskQueue:
     """
     任務佇列管理器
     支持優先級佇列和負載均衡
+    
+    本地佇列為單一 heap，排序鍵為「基礎分數 - 用戶加成 + 入隊時間 / aging_interval」。
+    所有任務以相同速率老化，因此任何時刻的有效分數（排序鍵 - 現在時間 / aging_interval）
+    與排序鍵順序一致，老化在出隊時自然生效而不需重排；
+    低優先級任務最多等待 (3.0 - 1.0 + 0.5) * aging_interval 秒即會排到新進的高優先級任務之前。
     """
 
-    def __init__(self, redis_url: str = None):
+    BASE_SCORES = {
+        TaskPriority.HIGH: 1.0,
+        TaskPriority.NORMAL: 2.0,
+        TaskPriority.LOW: 3.0
+    }
+    PREMIUM_BONUS = 0.5
+    REDIS_QUEUE_KEY = "llm_tasks:aged"
+
+    def __init__(self, redis_url: str = None, aging_interval: float = 60.0):
+        """
+        Args:
+            redis_url: Redis 連接字串（未提供時使用本地佇列）
+            aging_interval: 任務等待多少秒提升一個優先級
+        """
         self.redis_url = redis_url
         self.redis = None
-        self.local_queues = {
-            TaskPriority.HIGH: asyncio.PriorityQueue(),
-            TaskPriority.NORMAL: asyncio.PriorityQueue(),
-            TaskPriority.LOW: asyncio.PriorityQueue()
-        }
+        self.aging_interval = aging_interval
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._not_empty = asyncio.Condition()
+        self._priority_counts = {priority: 0 for priority in TaskPriority}
         self.queue_stats = {
             'total_added': 0,
             'total_processed': 0,
@@ -206,26 +244,28 @@ class TaskQueue:
 
     async def initialize(self):
         """初始化佇列"""
-        if self.redis_url:
+        if self.redis_url and REDIS_AVAILABLE:
             try:
-                self.redis = await aioredis.from_url(self.redis_url)
+                self.redis = aioredis.from_url(self.redis_url)
+                await self.redis.ping()
                 self.logger.info("Redis佇列已連接")
             except Exception as e:
+                self.redis = None
                 self.logger.warning(f"Redis連接失敗，使用本地佇列: {e}")
 
     async def add_task(self, task_info: TaskInfo):
         """添加任務到佇列"""
         
-        priority_score = self._calculate_priority_score(task_info)
-        
         if self.redis:
-            # 使用Redis佇列
-            await self._add_to_redis_queue(task_info, priority_score)
+            # 使用Redis佇列（分數以牆上時間計算，跨進程一致）
+            await self._add_to_redis_queue(task_info, self._calculate_priority_score(task_info, time.time()))
         else:
-            # 使用本地佇列
-            await self.local_queues[task_info.priority].put(
-                (priority_score, task_info)
-            )
+            # 使用本地佇列，喚醒一個等待中的消費者
+            sort_key = self._calculate_priority_score(task_info, time.monotonic())
+            async with self._not_empty:
+                heapq.heappush(self._heap, (sort_key, next(self._sequence), task_info))
+                self._priority_counts[task_info.priority] += 1
+                self._not_empty.notify()
         
         self.queue_stats['total_added'] += 1
         self.queue_stats['current_size'] += 1
@@ -234,91 +274,130 @@ class TaskQueue:
             f"任務已添加到佇列: {task_info.task_id}, 優先級: {task_info.priority.value}"
         )
 
-    async def get_next_task(self) -> Optional[TaskInfo]:
-        """獲取下一個任務"""
+    async def get_next_task(self, timeout: Optional[float] = None) -> Optional[TaskInfo]:
+        """
+        獲取下一個任務，佇列為空時等待新任務
+        
+        Args:
+            timeout: 最長等待秒數；None 表示一直等待，0 表示不等待
+        
+        Returns:
+            任務，逾時則返回 None
+        """
         
         if self.redis:
-            return await self._get_from_redis_queue()
+            task_info = await self._get_from_redis_queue(timeout)
         else:
-            return await self._get_from_local_queue()
+            task_info = await self._get_from_local_queue(timeout)
+        
+        if task_info is not None:
+            self.queue_stats['total_processed'] += 1
+            self.queue_stats['current_size'] = max(0, self.queue_stats['current_size'] - 1)
+        return task_info
 
-    async def _get_from_local_queue(self) -> Optional[TaskInfo]:
-        """從本地佇列獲取任務"""
+    async def _get_from_local_queue(self, timeout: Optional[float] = None) -> Optional[TaskInfo]:
+        """從本地佇列獲取有效分數最小的任務"""
         
-        # 按優先級順序檢查佇列
-        for priority in [TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW]:
-            queue = self.local_queues[priority]
-            
-            if not queue.empty():
+        async with self._not_empty:
+            if not self._heap:
+                if timeout == 0:
+                    return None
                 try:
-                    _, task_info = await asyncio.wait_for(queue.get(), timeout=0.1)
-                    self.queue_stats['current_size'] -= 1
-                    return task_info
+                    await asyncio.wait_for(
+                        self._not_empty.wait_for(lambda: self._heap), timeout
+                    )
                 except asyncio.TimeoutError:
-                    continue
-        
-        return None
+                    return None
+            
+            _, _, task_info = heapq.heappop(self._heap)
+            self._priority_counts[task_info.priority] -= 1
+            return task_info
 
-    def _calculate_priority_score(self, task_info: TaskInfo) -> float:
-        """計算優先級分數（越小優先級越高）"""
+    def _calculate_priority_score(self, task_info: TaskInfo, now: float) -> float:
+        """
+        計算排序鍵（越小優先級越高）
         
-        base_score = {
-            TaskPriority.HIGH: 1.0,
-            TaskPriority.NORMAL: 2.0,
-            TaskPriority.LOW: 3.0
-        }[task_info.priority]
+        Args:
+            task_info: 任務
+            now: 當前時鐘讀數（本地為 time.monotonic()，Redis 為 time.time()）
+        """
         
-        # 考慮等待時間
-        wait_time = (datetime.now() - task_info.created_at).total_seconds()
-        time_factor = wait_time / 3600  # 每小時降低0.1分
+        base_score = self.BASE_SCORES[task_info.priority]
         
         # 考慮用戶等級
-        user_factor = 0.5 if task_info.user_tier == 'premium' else 0.0
+        user_factor = self.PREMIUM_BONUS if task_info.user_tier == 'premium' else 0.0
+        
+        # 以任務建立時間作為入隊時間，重試的任務保留已等待的時間
+        waited = max(0.0, (datetime.now() - task_info.created_at).total_seconds())
+        
+        return base_score - user_factor + (now - waited) / self.aging_interval
+
+    def effective_score(self, sort_key: float, now: Optional[float] = None) -> float:
+        """排序鍵在指定時間的有效分數（已扣除等待時間的老化）"""
         
-        return base_score - time_factor - user_factor
+        return sort_key - (time.monotonic() if now is None else now) / self.aging_interval
 
     async def _add_to_redis_queue(self, task_info: TaskInfo, priority_score: float):
         """添加任務到Redis佇列"""
         
-        queue_key = f"llm_tasks:{task_info.priority.value}"
         task_data = json.dumps(asdict(task_info), default=str)
         
-        await self.redis.zadd(queue_key, {task_data: priority_score})
+        await self.redis.zadd(self.REDIS_QUEUE_KEY, {task_data: priority_score})
 
-    async def _get_from_redis_queue(self) -> Optional[TaskInfo]:
-        """從Redis佇列獲取任務"""
+    async def _get_from_redis_queue(self, timeout: Optional[float] = None) -> Optional[TaskInfo]:
+        """從Redis佇列獲取任務（BZPOPMIN 阻塞等待）"""
         
-        # 按優先級順序檢查佇列
-        for priority in [TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW]:
-            queue_key = f"llm_tasks:{priority.value}"
-            
-            # 獲取最高優先級的任務
-            result = await self.redis.zpopmin(queue_key, count=1)
-            
-            if result:
-                task_data, _ = result[0]
-                task_dict = json.loads(task_data)
-                
-                # 重建TaskInfo對象
-                task_dict['priority'] = TaskPriority(task_dict['priority'])
-                task_dict['status'] = TaskStatus(task_dict['status'])
-                task_dict['created_at'] = datetime.fromisoformat(task_dict['created_at'])
-                
-                return TaskInfo(**task_dict)
+        # 老化佇列優先，其後為舊版按優先級分開的佇列
+        keys = [self.REDIS_QUEUE_KEY] + [
+            f"llm_tasks:{priority.value}"
+            for priority in [TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW]
+        ]
         
-        return None
+        if timeout == 0:
+            for key in keys:
+                popped = await self.redis.zpopmin(key, count=1)
+                if popped:
+                    return self._task_from_json(popped[0][0])
+            return None
+        
+        result = await self.redis.bzpopmin(keys, timeout=timeout or 0)
+        if not result:
+            return None
+        
+        _, task_data, _ = result
+        return self._task_from_json(task_data)
+
+    @staticmethod
+    def _task_from_json(task_data: Union[str, bytes]) -> TaskInfo:
+        """由 JSON 重建TaskInfo對象"""
+        
+        task_dict = json.loads(task_data)
+        task_dict['priority'] = TaskPriority(task_dict['priority'])
+        task_dict['status'] = TaskStatus(task_dict['status'])
+        task_dict['created_at'] = datetime.fromisoformat(task_dict['created_at'])
+        
+        return TaskInfo(**task_dict)
+
+    def qsize(self) -> int:
+        """本地佇列中的任務數"""
+        
+        return len(self._heap)
 
     def get_queue_stats(self) -> Dict[str, Any]:
         """獲取佇列統計信息"""
         
         local_sizes = {
-            priority.value: queue.qsize() 
-            for priority, queue in self.local_queues.items()
+            priority.value: count 
+            for priority, count in self._priority_counts.items()
         }
         
         return {
             **self.queue_stats,
-            'local_queue_sizes': local_sizes
+            'local_queue_sizes': local_sizes,
+            'aging_interval': self.aging_interval,
+            'head_effective_score': (
+                round(self.effective_score(self._heap[0][0]), 3) if self._heap else None
+            )
         }
 
 
@@ -652,6 +731,24 @@ class LLMJSONScheduler:
             'current_batch': [],
             'last_batch_time': time.time()
         }
+        self._batch_started_at: Optional[float] = None
+        self._batch_event: Optional[asyncio.Event] = None
+        
+        # 派發控制：同時處理的任務數不超過 worker_pool.max_workers
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.running = False
+        self._in_flight: set = set()
+        self._capacity: Optional[asyncio.Condition] = None
+        self._background_tasks: List[asyncio.Task] = []
+        # 延遲重試與額度通知等輔助任務（保留引用，避免執行前被回收）
+        self._side_tasks: set = set()
+        self.dispatch_stats = {
+            'dispatched': 0,
+            'max_in_flight': 0,
+            'batches_flushed': 0
+        }
+        
+        get_registry().register_collector('llm_scheduler', self.collect_metrics)
 
     async def start(self):
         """啟動調度器"""
@@ -661,7 +758,14 @@ class LLMJSONScheduler:
         # 初始化組件
         await self.task_queue.initialize()
         
-        # 啟動檔案監控
+        self.loop = asyncio.get_running_loop()
+        self.running = True
+        self._capacity = asyncio.Condition()
+        self._batch_event = asyncio.Event()
+        
+        # 啟動檔案監控（Observer 停止後無法再次啟動）
+        if self.observer.ident is not None:
+            self.observer = Observer()
         self.observer.schedule(
             self.file_watcher, 
             str(self.watch_directory), 
@@ -670,11 +774,10 @@ class LLMJSONScheduler:
         self.observer.start()
         
         # 啟動任務處理循環
-        asyncio.create_task(self._task_processing_loop())
+        self._background_tasks = [asyncio.create_task(self._task_processing_loop())]
         
-        # 如果是批量模式，啟動批量處理循環
-        if self.processing_mode in [ProcessingMode.BATCH, ProcessingMode.HYBRID]:
-            asyncio.create_task(self._batch_processing_loop())
+        # 批量處理循環（處理模式可在運行時切換，因此總是啟動）
+        self._background_tasks.append(asyncio.create_task(self._batch_processing_loop()))
         
         self.logger.info(f"調度器已啟動，監控目錄: {self.watch_directory}")
         self.logger.info(f"處理模式: {self.processing_mode.value}")
@@ -688,11 +791,33 @@ class LLMJSONScheduler:
         self.observer.stop()
         self.observer.join()
         
+        # 停止派發與批量循環，等待處理中的任務
+        self.running = False
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
+        # 等待中的重試立即送回佇列，交由剩餘任務處理
+        for task in list(self._side_tasks):
+            task.cancel()
+        await asyncio.gather(*list(self._side_tasks), return_exceptions=True)
+        if self._in_flight:
+            await asyncio.gather(*list(self._in_flight), return_exceptions=True)
+        
         # 處理剩餘任務
         await self._process_remaining_tasks()
         
         self.logger.info("調度器已停止")
 
+    async def set_max_workers(self, max_workers: int):
+        """調整同時處理的任務上限"""
+        
+        self.worker_pool.max_workers = max_workers
+        self.worker_pool.semaphore = asyncio.Semaphore(max_workers)
+        if self._capacity is not None:
+            async with self._capacity:
+                self._capacity.notify_all()
+
     async def add_task(self, task_info: TaskInfo):
         """添加任務"""
         
@@ -716,77 +841,143 @@ class LLMJSONScheduler:
                 await self._add_to_batch(task_info)
 
     async def _task_processing_loop(self):
-        """任務處理主循環"""
+        """
+        任務派發主循環
         
-        while True:
+        先取得處理額度（處理中任務數 < worker_pool.max_workers）再出隊，
+        額度用完時任務留在佇列中排序老化，不會產生無上限的協程。
+        """
+        
+        while self.running:
             try:
-                # 獲取下一個任務
+                # 等待空閒的處理額度
+                async with self._capacity:
+                    await self._capacity.wait_for(
+                        lambda: len(self._in_flight) < self.worker_pool.max_workers
+                    )
+                
+                # 等待下一個任務（add_task 時喚醒）
                 task_info = await self.task_queue.get_next_task()
                 
                 if task_info:
-                    # 處理任務
-                    asyncio.create_task(self._process_task(task_info))
-                else:
-                    # 沒有任務時短暫休眠
-                    await asyncio.sleep(1)
+                    self._dispatch(task_info)
                     
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"任務處理循環錯誤: {e}")
                 await asyncio.sleep(5)
 
+    def _dispatch(self, task_info: TaskInfo):
+        """以一個處理額度執行任務"""
+        
+        task = asyncio.create_task(self._process_task(task_info))
+        self._in_flight.add(task)
+        task.add_done_callback(self._release_capacity)
+        
+        self.dispatch_stats['dispatched'] += 1
+        self.dispatch_stats['max_in_flight'] = max(
+            self.dispatch_stats['max_in_flight'], len(self._in_flight)
+        )
+
+    def _release_capacity(self, task: asyncio.Task):
+        """任務結束後歸還處理額度"""
+        
+        self._in_flight.discard(task)
+        if self._capacity is not None and self.running:
+            self._spawn(self._notify_capacity())
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """建立輔助任務並保留引用直到結束"""
+        
+        task = asyncio.create_task(coro)
+        self._side_tasks.add(task)
+        task.add_done_callback(self._side_tasks.discard)
+        return task
+
+    async def _notify_capacity(self):
+        async with self._capacity:
+            self._capacity.notify()
+
     async def _batch_processing_loop(self):
-        """批量處理循環"""
+        """
+        批量處理循環
         
-        while True:
+        批量達到大小上限時由 _add_to_batch 立即喚醒；
+        否則等到批量中第一個任務加入後 batch_timeout 秒再送出。
+        """
+        
+        while self.running:
             try:
-                current_time = time.time()
+                batch = self.batch_config['current_batch']
+                
+                timeout = None
+                if batch and self._batch_started_at is not None:
+                    deadline = self._batch_started_at + self.batch_config['batch_timeout']
+                    timeout = max(0.0, deadline - time.time())
+                
+                try:
+                    await asyncio.wait_for(self._batch_event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._batch_event.clear()
+                
                 batch = self.batch_config['current_batch']
                 
                 # 檢查是否需要處理批量
-                should_process = (
+                should_process = batch and (
                     len(batch) >= self.batch_config['batch_size'] or
-                    (batch and current_time - self.batch_config['last_batch_time'] > self.batch_config['batch_timeout'])
+                    time.time() - self._batch_started_at >= self.batch_config['batch_timeout']
                 )
                 
                 if should_process:
                     await self._process_current_batch()
                 
-                await asyncio.sleep(10)  # 每10秒檢查一次
-                
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"批量處理循環錯誤: {e}")
                 await asyncio.sleep(30)
 
     async def _process_task_immediately(self, task_info: TaskInfo):
-        """立即處理任務"""
+        """立即處理任務（進入佇列，由派發循環在有空閒額度時處理）"""
         
         self.logger.info(f"立即處理任務: {task_info.task_id}")
-        await self._process_task(task_info)
+        await self.task_queue.add_task(task_info)
 
     async def _add_to_batch(self, task_info: TaskInfo):
         """添加到批量處理"""
         
-        self.batch_config['current_batch'].append(task_info)
+        batch = self.batch_config['current_batch']
+        batch.append(task_info)
+        if len(batch) == 1:
+            self._batch_started_at = time.time()
+        
+        # 第一個任務（開始計時）或達到大小上限時喚醒批量循環
+        if self._batch_event is not None and (len(batch) == 1 or len(batch) >= self.batch_config['batch_size']):
+            self._batch_event.set()
+        
         self.logger.info(f"任務已添加到批量處理: {task_info.task_id}")
 
     async def _process_current_batch(self):
-        """處理當前批量"""
+        """送出當前批量（進入佇列，由派發循環以有限並發處理）"""
         
         batch = self.batch_config['current_batch']
         if not batch:
             return
         
-        self.logger.info(f"開始處理批量任務，共 {len(batch)} 個任務")
-        
-        # 並發處理批量任務
-        tasks = [self._process_task(task_info) for task_info in batch]
-        await asyncio.gather(*tasks, return_exceptions=True)
-        
         # 清空批量
         self.batch_config['current_batch'] = []
         self.batch_config['last_batch_time'] = time.time()
+        self._batch_started_at = None
         
-        self.logger.info("批量任務處理完成")
+        self.logger.info(f"開始處理批量任務，共 {len(batch)} 個任務")
+        
+        for task_info in batch:
+            await self.task_queue.add_task(task_info)
+        
+        self.dispatch_stats['batches_flushed'] += 1
+        self.logger.info("批量任務已送入佇列")
 
     async def _process_task(self, task_info: TaskInfo):
         """處理單個任務"""
@@ -812,9 +1003,8 @@ class LLMJSONScheduler:
                     task_info.retry_count += 1
                     task_info.status = TaskStatus.RETRYING
                     
-                    # 延遲重試
-                    await asyncio.sleep(2 ** task_info.retry_count)  # 指數退避
-                    await self.task_queue.add_task(task_info)
+                    # 延遲重試（指數退避），等待期間不佔用處理額度
+                    self._spawn(self._requeue_later(task_info, 2 ** task_info.retry_count))
             
             await self.update_task_status(task_info)
             
@@ -824,6 +1014,14 @@ class LLMJSONScheduler:
             task_info.status = TaskStatus.FAILED
             await self.update_task_status(task_info)
 
+    async def _requeue_later(self, task_info: TaskInfo, delay: float):
+        """延遲後重新加入佇列（調度器停止而被取消時立即加入）"""
+        
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            await self.task_queue.add_task(task_info)
+
     async def _save_processing_result(self, result: ProcessingResult):
         """保存處理結果"""
         
@@ -879,14 +1077,14 @@ class LLMJSONScheduler:
         
         self.logger.info("處理剩餘任務...")
         
-        # 處理批量中的剩餘任務
+        # 批量中的剩餘任務送入佇列
         if self.batch_config['current_batch']:
             await self._process_current_batch()
         
         # 處理佇列中的剩餘任務
         remaining_count = 0
         while True:
-            task_info = await self.task_queue.get_next_task()
+            task_info = await self.task_queue.get_next_task(timeout=0)
             if not task_info:
                 break
             
@@ -911,9 +1109,47 @@ class LLMJSONScheduler:
             'task_status_summary': {
                 status.value: len([t for t in self.task_status.values() if t.status == status])
                 for status in TaskStatus
-            }
+            },
+            'dispatch_stats': self.get_dispatch_stats()
         }
 
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """派發指標：佇列深度與處理中任務數"""
+        
+        return {
+            **self.dispatch_stats,
+            'queue_depth': self.task_queue.queue_stats['current_size'],
+            'batch_depth': len(self.batch_config['current_batch']),
+            'in_flight': len(self._in_flight),
+            'max_workers': self.worker_pool.max_workers,
+            'available_credits': max(0, self.worker_pool.max_workers - len(self._in_flight))
+        }
+
+    def collect_metrics(self) -> List[MetricFamily]:
+        """匯出佇列深度、派發與任務結果（OpenMetrics）"""
+        
+        depth = MetricFamily('jobseeker_llm_queue_depth', 'gauge', '本地佇列中的任務數（依優先級）')
+        for priority, count in list(self.task_queue._priority_counts.items()):
+            depth.add(count, priority=priority.value)
+        
+        queue_stats = self.task_queue.queue_stats
+        tasks = MetricFamily('jobseeker_llm_tasks', 'counter', '任務結果數')
+        tasks.add(self.scheduler_stats['successful_tasks'], outcome='success')
+        tasks.add(self.scheduler_stats['failed_tasks'], outcome='failure')
+        
+        return [
+            depth,
+            MetricFamily('jobseeker_llm_queue_added', 'counter', '加入佇列的任務數').add(queue_stats['total_added']),
+            MetricFamily('jobseeker_llm_queue_processed', 'counter', '取出佇列的任務數').add(queue_stats['total_processed']),
+            MetricFamily('jobseeker_llm_in_flight', 'gauge', '處理中的任務數').add(len(self._in_flight)),
+            MetricFamily('jobseeker_llm_max_workers', 'gauge', '派發上限').add(self.worker_pool.max_workers),
+            MetricFamily('jobseeker_llm_batch_depth', 'gauge', '待處理批次中的任務數').add(
+                len(self.batch_config['current_batch'])
+            ),
+            MetricFamily('jobseeker_llm_dispatched', 'counter', '已派發任務數').add(self.dispatch_stats['dispatched']),
+            tasks
+        ]
+
     async def get_task_status(self, task_id: str) -> Optional[TaskInfo]:
         """獲取特定任務狀態"""
         
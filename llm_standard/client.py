@@ -13,6 +13,25 @@ from .exceptions import (
     ModelUnavailableError
 )
 
+try:
+    from jobseeker.tracing import get_current_span, start_span
+except ImportError:
+    # 獨立使用 llm_standard 時不追蹤
+    from contextlib import nullcontext as _nullcontext
+
+    class _NoopSpan:
+        def set_attribute(self, key, value):
+            pass
+
+        def add_event(self, name, attributes=None):
+            pass
+
+    def get_current_span():
+        return _NoopSpan()
+
+    def start_span(name, **attributes):
+        return _nullcontext(_NoopSpan())
+
 
 class StandardLLMClient:
     """統一LLM客戶端"""
@@ -63,6 +82,11 @@ class StandardLLMClient:
         Returns:
             Dict[str, Any]: 標準格式響應
         """
+        with start_span("llm.execute", **{"llm.provider": self.provider, "llm.model": self.model}):
+            return self._execute(instruction, input_text, **kwargs)
+
+    def _execute(self, instruction: Dict[str, Any], input_text: str, **kwargs) -> Dict[str, Any]:
+        """執行指令（驗證與重試）"""
         # 驗證指令格式
         if self.validate_instructions:
             try:
@@ -95,6 +119,7 @@ class StandardLLMClient:
                 if attempt < self.max_retries and self.auto_retry:
                     # 指數退避
                     delay = (2 ** attempt) * self.adapter.base_delay
+                    get_current_span().add_event("retry", {"attempt": attempt + 1, "error": type(e).__name__})
                     time.sleep(min(delay, 60))  # 最大延遲60秒
                     continue
                 else:
@@ -11,16 +11,24 @@ Date: 2025-01-27
 import asyncio
 import json
 import logging
+import threading
 import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 import aiofiles
-import aioredis
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from redis import asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
 
 # 導入現有組件
 from jobseeker.smart_router import SmartJobRouter
@@ -269,7 +277,7 @@ class TaskTracker:
     
     async def initialize(self):
         """初始化Redis連接"""
-        if self.redis_url:
+        if self.redis_url and REDIS_AVAILABLE:
             try:
                 self.redis_client = await aioredis.from_url(self.redis_url)
                 await self.redis_client.ping()
@@ -314,7 +322,7 @@ class TaskTracker:
         
         if status == TaskStatus.PROCESSING:
             platform_task.started_at = datetime.now()
-        elif status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
+        elif status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
             platform_task.completed_at = datetime.now()
             platform_task.result_data = result_data
             platform_task.error_message = error_message
@@ -343,6 +351,8 @@ class TaskTracker:
             # 如果至少有一個成功
             if any(status == TaskStatus.COMPLETED for status in platform_statuses):
                 job.status = TaskStatus.COMPLETED
+            elif any(status == TaskStatus.CANCELLED for status in platform_statuses):
+                job.status = TaskStatus.CANCELLED
             else:
                 job.status = TaskStatus.FAILED
             
@@ -412,9 +422,152 @@ class TaskTracker:
         }
 
 
+class PlatformExecutor:
+    """
+    平台搜尋執行層
+    
+    同步的爬蟲/路由呼叫一律在各平台專屬的有界線程池中執行，
+    事件循環只負責等待結果，不會被單一平台的搜尋阻塞。
+    """
+    
+    def __init__(self, pool_sizes: Dict[str, int]):
+        """
+        Args:
+            pool_sizes: 平台名稱 -> 線程池大小
+        """
+        self.pool_sizes = dict(pool_sizes)
+        self._pools: Dict[str, ThreadPoolExecutor] = {
+            platform: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"platform-{platform}")
+            for platform, size in self.pool_sizes.items()
+        }
+        self._job_futures: Dict[str, Set[Future]] = {}
+        self._in_flight: Dict[str, int] = {platform: 0 for platform in self.pool_sizes}
+        self._cancelled_total = 0
+        self._stats_lock = threading.Lock()
+    
+    async def run(self, platform: str, job_id: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        在平台線程池中執行同步函數並等待結果
+        
+        等待中的協程被取消時，尚未開始的呼叫會一併取消；
+        已在執行的呼叫無法中斷，其結果將被丟棄。
+        """
+        with self._stats_lock:
+            self._in_flight[platform] += 1
+        future = self._pools[platform].submit(func, *args, **kwargs)
+        self._job_futures.setdefault(job_id, set()).add(future)
+        
+        def _on_done(done: Future):
+            # 於工作線程或事件循環線程中呼叫
+            with self._stats_lock:
+                self._in_flight[platform] -= 1
+                if done.cancelled():
+                    self._cancelled_total += 1
+        
+        future.add_done_callback(_on_done)
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            futures = self._job_futures.get(job_id)
+            if futures is not None:
+                futures.discard(future)
+                if not futures:
+                    del self._job_futures[job_id]
+    
+    def cancel_job(self, job_id: str) -> int:
+        """
+        取消任務尚未開始的呼叫
+        
+        Returns:
+            仍在執行、無法取消的呼叫數
+        """
+        running = 0
+        for future in list(self._job_futures.get(job_id, ())):
+            if not future.cancel():
+                running += 1
+        return running
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """各平台線程池使用情況"""
+        return {
+            'cancelled_total': self._cancelled_total,
+            'platforms': {
+                platform: {
+                    'max_workers': size,
+                    'running': min(self._in_flight[platform], size),
+                    'queued': max(self._in_flight[platform] - size, 0)
+                }
+                for platform, size in self.pool_sizes.items()
+            }
+        }
+    
+    def shutdown(self, wait: bool = False):
+        """關閉所有線程池並取消排隊中的呼叫"""
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class EventLoopLagMonitor:
+    """
+    事件循環延遲監控
+    
+    每隔 interval 秒排程一次喚醒，實際喚醒時間與預期的差距即為循環延遲；
+    有同步阻塞的程式碼在循環上執行時，延遲會明顯上升。
+    """
+    
+    def __init__(self, interval: float = 0.1, window: int = 600):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=window)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """開始監控（須在事件循環中呼叫）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """停止監控"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+    
+    def get_stats(self) -> Dict[str, float]:
+        """延遲統計（毫秒）"""
+        if not self.samples:
+            return {'current_ms': 0.0, 'avg_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0, 'samples': 0}
+        
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            'current_ms': round(self.samples[-1] * 1000, 2),
+            'avg_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+            'p99_ms': round(p99 * 1000, 2),
+            'max_ms': round(self.max_lag * 1000, 2),
+            'samples': len(ordered)
+        }
+
+
 class MultiPlatformScheduler:
     """多平台異步搜尋調度器"""
     
+    # 保留的已取消任務 ID 數上限
+    MAX_CANCELLED_JOBS = 1000
+    
     def __init__(self, 
                  max_concurrent_jobs: int = 10,
                  max_workers_per_platform: int = 3,
@@ -433,6 +586,7 @@ class MultiPlatformScheduler:
         # 工作器管理
         self.platform_workers: Dict[str, Set[str]] = {}
         self.worker_semaphores: Dict[str, asyncio.Semaphore] = {}
+        pool_sizes: Dict[str, int] = {}
         
         # 初始化平台工作器
         for platform in PlatformType:
@@ -440,9 +594,18 @@ class MultiPlatformScheduler:
             capability = self.region_mapper.get_platform_capability(platform)
             max_workers = capability.max_concurrent_tasks if capability else self.max_workers_per_platform
             self.worker_semaphores[platform.value] = asyncio.Semaphore(max_workers)
+            pool_sizes[platform.value] = max_workers
+        
+        # 同步搜尋在各平台線程池中執行，避免阻塞事件循環
+        self.executor = PlatformExecutor(pool_sizes)
+        self.loop_monitor = EventLoopLagMonitor()
         
         # 任務隊列
         self.pending_jobs: asyncio.Queue = asyncio.Queue()
+        self.job_tasks: Dict[str, Set[asyncio.Task]] = {}
+        # 已取消的任務 ID 只在任務仍排隊時需要：出隊時移除，並依取消順序限制保留數量
+        self.cancelled_jobs: Set[str] = set()
+        self._cancelled_order: deque = deque()
         self.running = False
         self.scheduler_task = None
     
@@ -458,6 +621,7 @@ class MultiPlatformScheduler:
             return
         
         self.running = True
+        self.loop_monitor.start()
         self.scheduler_task = asyncio.create_task(self._scheduler_loop())
         self.logger.info("多平台調度器已啟動")
     
@@ -471,6 +635,11 @@ class MultiPlatformScheduler:
             except asyncio.CancelledError:
                 pass
         
+        # 取消仍在進行的平台搜尋
+        for job_id in list(self.job_tasks):
+            await self.cancel_job(job_id)
+        await self.loop_monitor.stop()
+        
         self.logger.info("多平台調度器已停止")
     
     async def submit_search_job(self, query: str, location: str = "", 
@@ -517,12 +686,19 @@ class MultiPlatformScheduler:
                 # 獲取待處理任務
                 job = await asyncio.wait_for(self.pending_jobs.get(), timeout=1.0)
                 
+                if job.job_id in self.cancelled_jobs:
+                    self.cancelled_jobs.discard(job.job_id)
+                    continue
+                
                 # 為每個平台創建異步任務
                 platform_tasks = []
+                job_tasks = self.job_tasks.setdefault(job.job_id, set())
                 for platform in job.target_platforms:
                     task = asyncio.create_task(
                         self._execute_platform_search(job, platform)
                     )
+                    task.add_done_callback(lambda t, job_id=job.job_id: self._discard_task(job_id, t))
+                    job_tasks.add(task)
                     platform_tasks.append(task)
                 
                 # 不等待完成，讓任務異步執行
@@ -533,6 +709,56 @@ class MultiPlatformScheduler:
             except Exception as e:
                 self.logger.error(f"調度器循環錯誤: {e}")
     
+    def _discard_task(self, job_id: str, task: asyncio.Task):
+        """平台任務結束後移除追蹤"""
+        tasks = self.job_tasks.get(job_id)
+        if tasks is not None:
+            tasks.discard(task)
+            if not tasks:
+                del self.job_tasks[job_id]
+    
+    def _remember_cancelled(self, job_id: str):
+        """記錄已取消的任務 ID，超過上限時淘汰最早的記錄"""
+        if job_id in self.cancelled_jobs:
+            return
+        self.cancelled_jobs.add(job_id)
+        self._cancelled_order.append(job_id)
+        while len(self._cancelled_order) > self.MAX_CANCELLED_JOBS:
+            self.cancelled_jobs.discard(self._cancelled_order.popleft())
+    
+    async def cancel_job(self, job_id: str) -> bool:
+        """
+        取消多平台任務
+        
+        排隊中的平台搜尋直接取消；已在線程中執行的搜尋無法中斷，
+        其結果會被丟棄，平台任務狀態標記為已取消。
+        
+        Returns:
+            任務是否存在且尚未結束
+        """
+        job = self.task_tracker.active_jobs.get(job_id)
+        if job is None:
+            return False
+        
+        self._remember_cancelled(job_id)
+        tasks = list(self.job_tasks.get(job_id, ()))
+        for task in tasks:
+            task.cancel()
+        running = self.executor.cancel_job(job_id)
+        
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # 尚未開始的平台任務（仍在隊列中）
+        for platform_name, platform_task in list(job.platform_tasks.items()):
+            if platform_task.status in [TaskStatus.PENDING, TaskStatus.ASSIGNED]:
+                await self.task_tracker.update_platform_task_status(
+                    job_id, platform_name, TaskStatus.CANCELLED
+                )
+        
+        self.logger.info(f"已取消多平台任務: {job_id}, 執行中無法中斷的搜尋: {running}")
+        return True
+    
     async def _execute_platform_search(self, job: MultiPlatformJob, platform: PlatformType):
         """執行單個平台搜尋"""
         platform_name = platform.value
@@ -551,7 +777,9 @@ class MultiPlatformScheduler:
                 start_time = time.time()
                 
                 # 執行搜尋
-                result = await self._perform_platform_search(platform, job.original_query, job.location)
+                result = await self._perform_platform_search(
+                    platform, job.original_query, job.location, job_id=job.job_id
+                )
                 
                 execution_time = time.time() - start_time
                 
@@ -565,6 +793,14 @@ class MultiPlatformScheduler:
                 
                 self.logger.info(f"平台搜尋完成: {job.job_id}_{platform_name}, 找到 {len(result.get('jobs', []))} 個職位")
                 
+            except asyncio.CancelledError:
+                await self.task_tracker.update_platform_task_status(
+                    job.job_id, platform_name, TaskStatus.CANCELLED,
+                    error_message="任務已取消"
+                )
+                self.logger.info(f"平台搜尋已取消: {job.job_id}_{platform_name}")
+                raise
+            
             except Exception as e:
                 # 更新失敗狀態
                 await self.task_tracker.update_platform_task_status(
@@ -574,36 +810,45 @@ class MultiPlatformScheduler:
                 
                 self.logger.error(f"平台搜尋失敗: {job.job_id}_{platform_name}, 錯誤: {e}")
     
-    async def _perform_platform_search(self, platform: PlatformType, query: str, location: str) -> Dict[str, Any]:
+    def _smart_router_search(self, platform: PlatformType, query: str, location: str) -> Dict[str, Any]:
+        """以智能路由器搜尋（同步，於平台線程池中執行）"""
+        result = self.smart_router.search_jobs(
+            query=query,
+            location=location,
+            max_results=25,
+            platforms=[platform.value]
+        )
+        
+        # JobPost 為 pydantic 模型，asdict 只適用 dataclass
+        return {
+            'jobs': [job.dict() for job in result.jobs],
+            'total_jobs': result.total_jobs,
+            'execution_time': result.total_execution_time,
+            'successful_platforms': result.successful_platforms,
+            'failed_platforms': result.failed_platforms
+        }
+    
+    async def _perform_platform_search(self, platform: PlatformType, query: str, location: str,
+                                       job_id: Optional[str] = None) -> Dict[str, Any]:
         """執行實際的平台搜尋"""
+        job_id = job_id or f"adhoc_{uuid.uuid4().hex[:8]}"
         
         # 根據平台類型選擇搜尋方法
         if platform in [PlatformType.LINKEDIN, PlatformType.INDEED, PlatformType.GOOGLE]:
             # 使用智能路由器
-            result = self.smart_router.search_jobs(
-                query=query,
-                location=location,
-                max_results=25,
-                platforms=[platform.value]
+            return await self.executor.run(
+                platform.value, job_id,
+                self._smart_router_search, platform, query, location
             )
-            
-            return {
-                'jobs': [asdict(job) for job in result.jobs],
-                'total_jobs': result.total_jobs,
-                'execution_time': result.total_execution_time,
-                'successful_platforms': result.successful_platforms,
-                'failed_platforms': result.failed_platforms
-            }
         
         elif platform in [PlatformType.SEEK]:
             # 使用路由管理器
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.route_manager.execute_search(
-                    user_query=query,
-                    location=location,
-                    forced_site="seek"
-                )
+            result = await self.executor.run(
+                platform.value, job_id,
+                self.route_manager.execute_search,
+                user_query=query,
+                location=location,
+                forced_site="seek"
             )
             
             return {
@@ -651,7 +896,9 @@ class MultiPlatformScheduler:
             'running': self.running,
             'pending_jobs': self.pending_jobs.qsize(),
             'active_jobs_summary': active_summary,
-            'platform_worker_status': platform_worker_status
+            'platform_worker_status': platform_worker_status,
+            'executor': self.executor.get_stats(),
+            'event_loop_lag': self.loop_monitor.get_stats()
         }
 
 
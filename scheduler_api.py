@@ -15,9 +15,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -27,6 +27,7 @@ from llm_json_scheduler import (
     ProcessingMode, ProcessingResult
 )
 from jobseeker.enhanced_logging import get_enhanced_logger, LogCategory
+from jobseeker.metrics_exporter import OPENMETRICS_CONTENT_TYPE, get_registry, wants_openmetrics
 
 
 # Pydantic模型定義
@@ -62,6 +63,7 @@ class SchedulerStatusResponse(BaseModel):
     processing_mode: str
     batch_config: Dict[str, Any]
     task_status_summary: Dict[str, int]
+    dispatch_stats: Dict[str, Any] = {}
 
 
 class ProcessingModeRequest(BaseModel):
@@ -258,8 +260,20 @@ async def get_scheduler_status(scheduler: LLMJSONScheduler = Depends(get_schedul
 
 
 @app.get("/metrics", response_model=MetricsResponse, summary="獲取性能指標")
-async def get_metrics(scheduler: LLMJSONScheduler = Depends(get_scheduler)):
-    """獲取詳細的性能指標"""
+async def get_metrics(
+    request: Request,
+    format: Optional[str] = Query(None, description="openmetrics 時輸出 OpenMetrics 文字格式"),
+    scheduler: LLMJSONScheduler = Depends(get_scheduler)
+):
+    """
+    獲取詳細的性能指標
+    
+    預設回傳 JSON；Prometheus 等抓取器（Accept: application/openmetrics-text 或 text/plain）
+    或 ?format=openmetrics 時回傳統一註冊表的 OpenMetrics 文字格式。
+    """
+    
+    if format == "openmetrics" or (format is None and wants_openmetrics(request.headers.get("accept"))):
+        return Response(content=get_registry().render(), media_type=OPENMETRICS_CONTENT_TYPE)
     
     try:
         status = scheduler.get_status()
@@ -499,8 +513,7 @@ async def update_worker_config(
     """更改工作線程配置"""
     
     try:
-        scheduler.worker_pool.max_workers = worker_request.max_workers
-        scheduler.worker_pool.semaphore = asyncio.Semaphore(worker_request.max_workers)
+        await scheduler.set_max_workers(worker_request.max_workers)
         
         logger.info(f"最大工作線程數已更改為: {worker_request.max_workers}")
         
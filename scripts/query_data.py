@@ -6,75 +6,61 @@
 """
 
 import json
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import argparse
 
+# 添加項目根目錄到 Python 路徑
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from jobseeker.data_catalog import DataCatalog, ParquetJobStore, duckdb_available
+
 class DataQuery:
     """數據查詢器"""
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.index_file = self.data_dir / "index" / "data_index.json"
-        self.load_index()
-    
-    def load_index(self):
-        """加載數據索引"""
-        if self.index_file.exists():
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                self.index = json.load(f)
-        else:
-            self.index = {"files": {}, "by_site": {}, "by_date": {}, "by_search_term": {}}
+        self.catalog = DataCatalog(
+            self.data_dir / "index" / "catalog.db",
+            legacy_index=self.index_file
+        )
+        self.parquet_store = ParquetJobStore(self.data_dir / "raw" / "parquet")
     
     def list_sites(self) -> List[str]:
         """列出所有網站"""
-        return list(self.index.get("by_site", {}).keys())
+        return self.catalog.distinct("site")
     
     def list_dates(self) -> List[str]:
         """列出所有日期"""
-        return sorted(self.index.get("by_date", {}).keys())
+        return self.catalog.distinct("date")
     
     def list_search_terms(self) -> List[str]:
         """列出所有搜尋詞"""
-        return list(self.index.get("by_search_term", {}).keys())
+        return self.catalog.distinct("search_term")
     
     def get_data_by_site(self, site: str) -> List[Dict]:
         """根據網站獲取數據"""
-        return self.index.get("by_site", {}).get(site, [])
+        return self.catalog.find(site=site)
     
     def get_data_by_date(self, date: str) -> List[Dict]:
         """根據日期獲取數據"""
-        return self.index.get("by_date", {}).get(date, [])
+        return self.catalog.find(date=date)
     
     def get_data_by_search_term(self, search_term: str) -> List[Dict]:
         """根據搜尋詞獲取數據"""
-        return self.index.get("by_search_term", {}).get(search_term, [])
+        return self.catalog.find(search_term=search_term)
     
     def get_data_summary(self) -> Dict:
         """獲取數據摘要"""
-        total_files = len(self.index.get("files", {}))
-        total_records = sum(
-            file_info.get("total_records", 0) 
-            for file_info in self.index.get("files", {}).values()
-        )
-        
-        sites = self.list_sites()
-        dates = self.list_dates()
-        search_terms = self.list_search_terms()
-        
-        return {
-            "total_files": total_files,
-            "total_records": total_records,
-            "sites": sites,
-            "date_range": {
-                "earliest": dates[0] if dates else None,
-                "latest": dates[-1] if dates else None
-            },
-            "unique_search_terms": len(search_terms),
-            "unique_sites": len(sites)
-        }
+        summary = self.catalog.summary()
+        summary["unique_search_terms"] = len(self.list_search_terms())
+        summary["unique_sites"] = len(summary["sites"])
+        return summary
     
     def search_data(self, site: Optional[str] = None, date: Optional[str] = None, 
                    search_term: Optional[str] = None) -> List[Dict]:
@@ -104,6 +90,9 @@ class DataQuery:
     def load_job_data(self, filepath: str) -> List[Dict]:
         """加載職位數據"""
         try:
+            if filepath.endswith(".parquet"):
+                return self.parquet_store.read([filepath]).to_dict("records")
+            
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
@@ -117,6 +106,75 @@ class DataQuery:
             print(f"❌ 加載數據失敗 {filepath}: {e}")
             return []
     
+    def query_jobs(
+        self,
+        site: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        search_term: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+        engine: str = "pyarrow"
+    ) -> pd.DataFrame:
+        """
+        跨文件查詢職位數據
+        
+        先由數據目錄篩選出符合條件的文件，Parquet 文件再將欄位與過濾條件
+        下推到讀取層；舊版 JSON 文件則在載入後以 pandas 過濾。
+        
+        Args:
+            site: 網站
+            date_from: 起始日期 (YYYYMMDD，含)
+            date_to: 結束日期 (YYYYMMDD，含)
+            search_term: 搜尋詞
+            columns: 只讀取的欄位
+            filters: [(欄位, 運算子, 值), ...]，條件之間為 AND
+            engine: Parquet 查詢引擎，pyarrow 或 duckdb
+        """
+        files = self.catalog.find(site=site, search_term=search_term,
+                                  date_from=date_from, date_to=date_to)
+        parquet_files = [f["filepath"] for f in files if f["format"] == "parquet"]
+        json_files = [f["filepath"] for f in files if f["format"] != "parquet"]
+        
+        frames = []
+        if parquet_files:
+            if engine == "duckdb":
+                frames.append(self.parquet_store.query_duckdb(parquet_files, columns, filters))
+            else:
+                frames.append(self.parquet_store.read(parquet_files, columns, filters))
+        
+        for filepath in json_files:
+            df = pd.DataFrame(self.load_job_data(filepath))
+            for column, operator, value in filters or []:
+                if column not in df.columns:
+                    df = df.iloc[0:0]
+                    break
+                df = df[self._filter_mask(df[column], operator, value)]
+            if columns:
+                df = df.reindex(columns=columns)
+            frames.append(df)
+        
+        frames = [df for df in frames if not df.empty]
+        if not frames:
+            return pd.DataFrame(columns=columns or [])
+        return pd.concat(frames, ignore_index=True)
+    
+    @staticmethod
+    def _filter_mask(series: pd.Series, operator: str, value: Any) -> pd.Series:
+        """以 pandas 套用單一過濾條件"""
+        if operator == "in":
+            return series.isin(value)
+        if operator == "not in":
+            return ~series.isin(value)
+        return {
+            "=": series == value,
+            "!=": series != value,
+            "<": series < value,
+            "<=": series <= value,
+            ">": series > value,
+            ">=": series >= value,
+        }[operator]
+    
     def analyze_jobs(self, jobs: List[Dict]) -> Dict:
         """分析職位數據"""
         if not jobs:
@@ -202,6 +260,12 @@ def main():
     parser.add_argument("--site", help="按網站篩選")
     parser.add_argument("--date", help="按日期篩選 (YYYYMMDD)")
     parser.add_argument("--search-term", help="按搜尋詞篩選")
+    parser.add_argument("--date-from", help="起始日期 (YYYYMMDD)")
+    parser.add_argument("--date-to", help="結束日期 (YYYYMMDD)")
+    parser.add_argument("--columns", help="只讀取的欄位，以逗號分隔")
+    parser.add_argument("--engine", choices=["pyarrow", "duckdb"],
+                        default="duckdb" if duckdb_available() else "pyarrow",
+                        help="Parquet 查詢引擎")
     parser.add_argument("--summary", action="store_true", help="顯示數據摘要")
     parser.add_argument("--list-sites", action="store_true", help="列出所有網站")
     parser.add_argument("--list-dates", action="store_true", help="列出所有日期")
@@ -241,13 +305,25 @@ def main():
             search_term=args.search_term
         )
         
+        if not (args.site or args.date or args.search_term):
+            results = query.catalog.find(date_from=args.date_from, date_to=args.date_to)
+        
         print(f"🔍 找到 {len(results)} 個匹配的數據文件")
         
         if args.analyze and results:
-            # 分析第一個文件的數據
-            first_result = results[0]
-            jobs = query.load_job_data(first_result['filepath'])
-            analysis = query.analyze_jobs(jobs)
+            # 分析所有匹配文件的數據
+            date_from = args.date_from or args.date
+            date_to = args.date_to or args.date
+            columns = args.columns.split(",") if args.columns else None
+            df = query.query_jobs(
+                site=args.site,
+                date_from=date_from,
+                date_to=date_to,
+                search_term=args.search_term,
+                columns=columns,
+                engine=args.engine
+            )
+            analysis = query.analyze_jobs(df.to_dict("records"))
             
             print("📊 職位分析:")
             print(f"  總職位數: {analysis.get('total_jobs', 0)}")
@@ -19,7 +19,7 @@ from pathlib import Path
 try:
     from sqlalchemy import (
         create_engine, Column, String, Integer, Float, DateTime, 
-        Text, Boolean, JSON, ForeignKey, Index, UniqueConstraint
+        Text, Boolean, JSON, ForeignKey, Index, UniqueConstraint, insert
     )
     from sqlalchemy.ext.declarative import declarative_base
     from sqlalchemy.orm import sessionmaker, relationship, Session
@@ -580,10 +580,67 @@ class TaskTrackingDatabase:
     
     def _add_tracking_event_memory(self, event_data: Dict[str, Any]) -> bool:
         """在內存中添加追蹤事件"""
-        event_data['id'] = str(uuid.uuid4())
+        event_data.setdefault('id', str(uuid.uuid4()))
         self.tracking_events.append(event_data)
         return True
     
+    def add_tracking_events(self, events: List[Dict[str, Any]]) -> int:
+        """
+        批量添加追蹤事件（單一交易內的多列 INSERT）
+        
+        Args:
+            events: 事件字典列表，欄位同 add_tracking_event，可包含 created_at
+        
+        Returns:
+            寫入的事件數
+        """
+        if not events:
+            return 0
+        
+        rows = []
+        for event in events:
+            row = dict(event)
+            row.setdefault('id', str(uuid.uuid4()))
+            row.setdefault('created_at', datetime.now())
+            rows.append(row)
+        
+        if SQLALCHEMY_AVAILABLE and self.initialized:
+            return self._add_tracking_events_db(rows)
+        return self._add_tracking_events_memory(rows)
+    
+    def _add_tracking_events_db(self, rows: List[Dict[str, Any]]) -> int:
+        """在數據庫中批量添加追蹤事件"""
+        session = self.get_session()
+        if not session:
+            return self._add_tracking_events_memory(rows)
+        
+        try:
+            try:
+                session.execute(insert(TaskTrackingEvent), rows)
+                session.commit()
+                return len(rows)
+            except Exception as e:
+                session.rollback()
+                print(f"批量添加追蹤事件失敗，改為逐筆寫入: {e}")
+            
+            # 整批失敗時逐筆重試，只丟棄有問題的事件
+            written = 0
+            for row in rows:
+                try:
+                    session.execute(insert(TaskTrackingEvent), [row])
+                    session.commit()
+                    written += 1
+                except Exception as e:
+                    session.rollback()
+                    print(f"添加追蹤事件失敗: {e}")
+            return written
+        finally:
+            session.close()
+    
+    def _add_tracking_events_memory(self, rows: List[Dict[str, Any]]) -> int:
+        """在內存中批量添加追蹤事件"""
+        return sum(self._add_tracking_event_memory(row) for row in rows)
+    
     def get_job_statistics(self) -> Dict[str, Any]:
         """獲取任務統計信息"""
         if SQLALCHEMY_AVAILABLE and self.initialized:
@@ -17,6 +17,7 @@ from typing import Dict, List, Optional, Any, Set, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+import queue
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -78,6 +79,209 @@ class TaskProgress:
     platform_results: Dict[str, PlatformTaskResult] = field(default_factory=dict)
 
 
+class EventWriteBehindBuffer:
+    """
+    事件寫後緩衝
+    
+    追蹤事件與任務緩存更新先放入有界佇列，由背景線程批量寫出：
+    數據庫以單一交易的多列 INSERT 寫入，Redis 命令以 pipeline 一次送出。
+    佇列達到 batch_size 或第一筆等待超過 flush_interval 秒時寫出。
+    """
+    
+    def __init__(self,
+                 database: TaskTrackingDatabase,
+                 redis_client=None,
+                 batch_size: int = 100,
+                 flush_interval: float = 0.5,
+                 max_queue_size: int = 10000,
+                 event_retention: int = 86400,
+                 cache_ttl: int = 3600):
+        self.database = database
+        self.redis_client = redis_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.event_retention = event_retention
+        self.cache_ttl = cache_ttl
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.stats = {
+            'events_written': 0,
+            'cache_updates_written': 0,
+            'batches_written': 0,
+            'database_errors': 0,
+            'redis_errors': 0,
+            'backpressure_waits': 0
+        }
+        
+        self._thread = threading.Thread(target=self._writer_loop, name="TaskEventWriter", daemon=True)
+        self._thread.start()
+    
+    def submit_event(self, event: TaskEvent):
+        """加入追蹤事件"""
+        self._put(('event', event))
+    
+    def submit_cache_update(self, job_id: str, data: Dict[str, Any]):
+        """加入任務緩存更新（同步到 Redis）"""
+        if self.redis_client:
+            self._put(('cache', (job_id, data)))
+    
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # 佇列已滿：等待寫出線程騰出空間（反壓），不丟棄事件
+            self.stats['backpressure_waits'] += 1
+            self._queue.put(item)
+    
+    def pending(self) -> int:
+        """尚未寫出的項目數"""
+        return self._queue.qsize()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        同步寫出目前已提交的所有項目
+        
+        Returns:
+            是否在 timeout 內完成
+        """
+        if not self._thread.is_alive():
+            self._write_batch(self._drain_nowait())
+            return True
+        
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        return done.wait(timeout)
+    
+    def close(self, timeout: float = 10.0):
+        """寫出剩餘項目並停止寫出線程"""
+        if self._thread.is_alive():
+            # 停止標記排在已提交項目之後，寫出線程寫完它之前的所有項目才退出
+            self._queue.put(('stop', None))
+            self._thread.join(timeout)
+        if not self._thread.is_alive():
+            # 停止之後才提交的項目直接同步寫出
+            self._write_batch(self._drain_nowait())
+    
+    def _drain_nowait(self) -> List[tuple]:
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+    
+    def _writer_loop(self):
+        """寫出線程：收集一批後寫出，遇到停止標記時寫完該批後退出"""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            
+            while batch[-1][0] not in ('flush', 'stop') and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            if batch[-1][0] == 'flush':
+                # 同步寫出：一併帶走佇列中已有的項目（停止標記之後的項目留在佇列）
+                while batch[-1][0] != 'stop':
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            
+            flush_waiters = [payload for kind, payload in batch if kind == 'flush']
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logging.error(f"事件批量寫出失敗: {e}")
+            finally:
+                for done in flush_waiters:
+                    done.set()
+            
+            if batch[-1][0] == 'stop':
+                return
+    
+    def _write_batch(self, batch: List[tuple]):
+        """批量寫入數據庫與 Redis"""
+        events = [payload for kind, payload in batch if kind == 'event']
+        
+        # 同一任務的多次緩存更新合併為一次 hset
+        cache_updates: Dict[str, Dict[str, Any]] = {}
+        for kind, payload in batch:
+            if kind == 'cache':
+                job_id, data = payload
+                cache_updates.setdefault(job_id, {}).update(data)
+        
+        if events:
+            rows = [
+                {
+                    'job_id': event.job_id,
+                    'event_type': event.event_type.value,
+                    'platform': event.platform,
+                    'message': event.message,
+                    'event_data': event.data,
+                    'old_status': event.old_status,
+                    'new_status': event.new_status,
+                    'created_at': event.timestamp
+                }
+                for event in events
+            ]
+            try:
+                self.stats['events_written'] += self.database.add_tracking_events(rows)
+            except Exception as e:
+                self.stats['database_errors'] += 1
+                logging.warning(f"追蹤事件寫入數據庫失敗: {e}")
+        
+        if self.redis_client and (events or cache_updates):
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for event in events:
+                    event_json = json.dumps({
+                        'job_id': event.job_id,
+                        'event_type': event.event_type.value,
+                        'platform': event.platform,
+                        'message': event.message,
+                        'data': event.data,
+                        'timestamp': event.timestamp.isoformat(),
+                        'old_status': event.old_status,
+                        'new_status': event.new_status
+                    }, default=str)
+                    
+                    # 發布到頻道，並存儲到列表（用於歷史查詢）
+                    pipe.publish('task_events', event_json)
+                    pipe.lpush(f'job_events:{event.job_id}', event_json)
+                for job_id in {event.job_id for event in events}:
+                    pipe.expire(f'job_events:{job_id}', self.event_retention)
+                
+                for job_id, data in cache_updates.items():
+                    pipe.hset(
+                        f'job_cache:{job_id}',
+                        mapping={k: json.dumps(v, default=str) for k, v in data.items()}
+                    )
+                    pipe.expire(f'job_cache:{job_id}', self.cache_ttl)
+                pipe.execute()
+                self.stats['cache_updates_written'] += len(cache_updates)
+            except Exception as e:
+                self.stats['redis_errors'] += 1
+                logging.warning(f"Redis事件發送失敗: {e}")
+        
+        if events or cache_updates:
+            self.stats['batches_written'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """緩衝統計"""
+        return {**self.stats, 'pending': self.pending()}
+
+
 class TaskTrackingService:
     """任務追蹤服務"""
     
@@ -125,10 +329,24 @@ class TaskTrackingService:
             'health_check_interval': 60,  # 健康檢查間隔（秒）
             'batch_size': 100,  # 批處理大小
             'max_retry_attempts': 3,  # 最大重試次數
-            'retry_delay': 5  # 重試延遲（秒）
+            'retry_delay': 5,  # 重試延遲（秒）
+            'event_flush_interval': 0.5,  # 事件寫出間隔（秒）
+            'event_queue_size': 10000  # 事件緩衝上限
         }
         
+        # 事件寫後緩衝（數據庫與 Redis 寫入移出調用線程）
+        self.event_buffer = EventWriteBehindBuffer(
+            self.database,
+            redis_client=self.redis_client,
+            batch_size=self.config['batch_size'],
+            flush_interval=self.config['event_flush_interval'],
+            max_queue_size=self.config['event_queue_size'],
+            event_retention=self.config['event_retention'],
+            cache_ttl=self.config['cache_ttl']
+        )
+        
         # 啟動後台任務
+        self._stop_event = threading.Event()
         self._start_background_tasks()
         
         logging.info("任務追蹤服務已初始化")
@@ -572,49 +790,22 @@ class TaskTrackingService:
             'cache_size': len(self.task_cache),
             'platform_cache_size': len(self.platform_cache),
             'event_listeners': len(self.event_listeners),
-            'redis_connected': self.redis_client is not None
+            'redis_connected': self.redis_client is not None,
+            'event_buffer': self.event_buffer.get_stats()
         }
     
+    def flush_events(self, timeout: Optional[float] = None) -> bool:
+        """同步寫出所有已發送的事件與緩存更新（測試或關閉前使用）"""
+        return self.event_buffer.flush(timeout)
+    
     def _emit_event(self, event: TaskEvent):
         """發送事件"""
         try:
             # 更新統計
             self.stats['total_events'] += 1
             
-            # 存儲到數據庫
-            self.database.add_tracking_event(
-                job_id=event.job_id,
-                event_type=event.event_type.value,
-                platform=event.platform,
-                message=event.message,
-                event_data=event.data,
-                old_status=event.old_status,
-                new_status=event.new_status
-            )
-            
-            # 發送到Redis（如果可用）
-            if self.redis_client:
-                try:
-                    event_data = {
-                        'job_id': event.job_id,
-                        'event_type': event.event_type.value,
-                        'platform': event.platform,
-                        'message': event.message,
-                        'data': event.data,
-                        'timestamp': event.timestamp.isoformat(),
-                        'old_status': event.old_status,
-                        'new_status': event.new_status
-                    }
-                    
-                    # 發布到頻道
-                    self.redis_client.publish('task_events', json.dumps(event_data))
-                    
-                    # 存儲到列表（用於歷史查詢）
-                    self.redis_client.lpush(f'job_events:{event.job_id}', json.dumps(event_data))
-                    self.redis_client.expire(f'job_events:{event.job_id}', self.config['event_retention'])
-                    
-                except Exception as e:
-                    logging.warning(f"Redis事件發送失敗: {e}")
+            # 數據庫與Redis寫入交由寫後緩衝批量處理
+            self.event_buffer.submit_event(event)
             
             # 通知事件監聽器
             for listener in self.event_listeners:
@@ -634,16 +825,8 @@ class TaskTrackingService:
         self.task_cache[job_id].update(data)
         self.task_cache[job_id]['cache_updated_at'] = datetime.now()
         
-        # 同步到Redis
-        if self.redis_client:
-            try:
-                self.redis_client.hset(
-                    f'job_cache:{job_id}',
-                    mapping={k: json.dumps(v, default=str) for k, v in data.items()}
-                )
-                self.redis_client.expire(f'job_cache:{job_id}', self.config['cache_ttl'])
-            except Exception as e:
-                logging.warning(f"Redis緩存更新失敗: {e}")
+        # 同步到Redis（批量寫出）
+        self.event_buffer.submit_cache_update(job_id, dict(data))
     
     def _get_job_from_cache_or_db(self, job_id: str) -> Optional[Dict[str, Any]]:
         """從緩存或數據庫獲取任務"""
@@ -741,10 +924,8 @@ class TaskTrackingService:
     
     def _health_check_loop(self):
         """健康檢查循環"""
-        while True:
+        while not self._stop_event.wait(self.config['health_check_interval']):
             try:
-                time.sleep(self.config['health_check_interval'])
-                
                 # 檢查數據庫連接
                 db_healthy = True
                 try:
@@ -777,10 +958,8 @@ class TaskTrackingService:
     
     def _cache_cleanup_loop(self):
         """緩存清理循環"""
-        while True:
+        while not self._stop_event.wait(3600):  # 每小時清理一次
             try:
-                time.sleep(3600)  # 每小時清理一次
-                
                 current_time = datetime.now()
                 expired_keys = []
                 
@@ -810,10 +989,8 @@ class TaskTrackingService:
     
     def _stats_update_loop(self):
         """統計更新循環"""
-        while True:
+        while not self._stop_event.wait(300):  # 每5分鐘更新一次
             try:
-                time.sleep(300)  # 每5分鐘更新一次
-                
                 # 更新活躍任務數
                 active_count = 0
                 for job_id, cache_data in self.task_cache.items():
@@ -831,6 +1008,10 @@ class TaskTrackingService:
         try:
             logging.info("正在關閉任務追蹤服務...")
             
+            # 停止後台循環並寫出緩衝中的事件
+            self._stop_event.set()
+            self.event_buffer.close()
+            
             # 關閉線程池
             self.executor.shutdown(wait=True)
             
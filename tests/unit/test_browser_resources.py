@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Playwright 輕量頁面模式單元測試
+
+以假的 route / page 物件驗證請求攔截策略、路由安裝條件、
+內容等待方式、Seek 爬蟲的瀏覽器路徑安裝攔截策略，
+以及 Seek 爬蟲引擎只在需要或失敗時截圖。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from jobseeker.browser_resources import (
+    SCREENSHOT_NEVER, ResourcePolicy, full_page_policy, install_resource_policy, wait_for_content
+)
+
+
+class _FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = ('abort', error_code)
+
+    async def fallback(self):
+        self.outcome = ('fallback', None)
+
+
+class _FakePage:
+    def __init__(self, html='', url='https://www.seek.com.au/jobs?page=1'):
+        self.html = html
+        self.url = url
+        self.calls = []
+
+    async def route(self, pattern, handler):
+        self.calls.append(('route', pattern))
+
+    async def wait_for_url(self, predicate, wait_until, timeout):
+        self.calls.append(('wait_for_url', predicate(self.url), predicate(self.url + '2'), wait_until))
+
+    async def wait_for_load_state(self, state, timeout):
+        self.calls.append(('wait_for_load_state', state))
+
+    async def wait_for_selector(self, selector, timeout):
+        self.calls.append(('wait_for_selector', selector))
+
+    async def content(self):
+        return self.html
+
+    async def query_selector(self, selector):
+        return None
+
+    async def set_extra_http_headers(self, headers):
+        self.calls.append(('set_extra_http_headers', bool(headers)))
+
+
+class _FakePlaywright:
+    def __init__(self, page):
+        self.chromium = SimpleNamespace(launch=self._launch)
+        self.page = page
+
+    async def start(self):
+        return self
+
+    async def _launch(self, **kwargs):
+        async def new_page(**kwargs):
+            return self.page
+
+        return SimpleNamespace(new_page=new_page)
+
+
+class TestResourcePolicy:
+    """請求攔截策略測試"""
+
+    @pytest.mark.parametrize('resource_type, url, blocked', [
+        ('image', 'https://www.seek.com.au/logo.png', True),
+        ('font', 'https://fonts.example.com/a.woff2', True),
+        ('document', 'https://www.seek.com.au/jobs', False),
+        ('script', 'https://www.seek.com.au/static/app.js', False),
+        ('script', 'https://www.googletagmanager.com/gtm.js', True),
+        ('xhr', 'https://static.hotjar.com/c/hotjar.js', True),
+        ('script', 'https://notgoogle-analytics.com/x.js', False),
+    ])
+    def test_should_block(self, resource_type, url, blocked):
+        assert ResourcePolicy().should_block(resource_type, url) is blocked
+
+    def test_allowed_domains_take_precedence(self):
+        policy = ResourcePolicy(allowed_domains=('seek.com.au',))
+
+        assert not policy.should_block('image', 'https://image.seek.com.au/logo.png')
+        assert policy.should_block('image', 'https://cdn.example.com/logo.png')
+
+    def test_handle_route_aborts_or_falls_back(self):
+        policy = ResourcePolicy()
+        routes = [_FakeRoute('image', 'https://x.com/a.png'), _FakeRoute('document', 'https://x.com/')]
+
+        async def main():
+            for route in routes:
+                await policy.handle_route(route)
+
+        asyncio.run(main())
+        assert [route.outcome[0] for route in routes] == ['abort', 'fallback']
+        assert (policy.blocked_requests, policy.allowed_requests) == (1, 1)
+
+    def test_install_skips_policies_that_block_nothing(self):
+        page = _FakePage()
+
+        async def main():
+            return (await install_resource_policy(page, full_page_policy()),
+                    await install_resource_policy(page, None),
+                    await install_resource_policy(page, ResourcePolicy()))
+
+        assert asyncio.run(main()) == (False, False, True)
+        assert page.calls == [('route', '**/*')]
+
+
+class TestSeekScraperBrowser:
+    """Seek 爬蟲瀏覽器路徑測試"""
+
+    def _init_browser(self, monkeypatch, **kwargs):
+        from jobseeker.seek import SeekScraper
+
+        page = _FakePage()
+        monkeypatch.setattr('jobseeker.seek.async_playwright', lambda: _FakePlaywright(page))
+        scraper = SeekScraper(**kwargs)
+        asyncio.run(scraper._init_browser())
+        return page
+
+    def test_init_browser_installs_default_policy(self, monkeypatch):
+        page = self._init_browser(monkeypatch)
+
+        assert page.calls == [('set_extra_http_headers', True), ('route', '**/*')]
+
+    def test_full_page_policy_installs_no_route(self, monkeypatch):
+        page = self._init_browser(monkeypatch, resource_policy=full_page_policy())
+
+        assert ('route', '**/*') not in page.calls
+
+
+class TestWaitForContent:
+    """內容等待測試"""
+
+    def test_waits_for_dom_and_selector_instead_of_network_idle(self):
+        page = _FakePage()
+        asyncio.run(wait_for_content(page, '.job-list'))
+
+        assert page.calls == [('wait_for_load_state', 'domcontentloaded'), ('wait_for_selector', '.job-list')]
+
+    def test_pagination_waits_for_url_change_first(self):
+        page = _FakePage()
+        asyncio.run(wait_for_content(page, '.job-list', previous_url=page.url))
+
+        assert page.calls[0] == ('wait_for_url', False, True, 'domcontentloaded')
+
+
+class TestSeekScreenshots:
+    """Seek 截圖時機測試"""
+
+    @pytest.fixture
+    def make_engine(self, tmp_path):
+        engine_module = pytest.importorskip('jobseeker.seek.seek_crawler_engine')
+
+        def make(html, **kwargs):
+            engine = engine_module.SeekCrawlerEngine(enable_ocr=False, storage_path=str(tmp_path), **kwargs)
+            engine.page = _FakePage(html)
+            engine.shots = []
+
+            async def take_intelligent_screenshot(prefix='seek_page', page=None):
+                engine.shots.append(prefix)
+                return prefix
+
+            async def save_raw_data(data, data_type='job_listings'):
+                return ''
+
+            engine.take_intelligent_screenshot = take_intelligent_screenshot
+            engine.save_raw_data = save_raw_data
+            return engine
+
+        return make
+
+    def test_successful_page_takes_no_screenshot(self, make_engine):
+        html = ('<article data-automation="jobListing"><a data-automation="jobTitle" href="/job/1">'
+                'Python Developer</a></article>')
+        engine = make_engine(html)
+
+        jobs = asyncio.run(engine.handle_pagination(max_pages=1))
+
+        assert len(jobs) == 1
+        assert engine.shots == []
+
+    def test_empty_page_takes_failure_screenshot(self, make_engine):
+        engine = make_engine('<html></html>')
+        asyncio.run(engine.handle_pagination(max_pages=1))
+        assert engine.shots == ['page_1_empty']
+
+        quiet = make_engine('<html></html>', screenshot_mode=SCREENSHOT_NEVER)
+        asyncio.run(quiet.handle_pagination(max_pages=1))
+        assert quiet.shots == []
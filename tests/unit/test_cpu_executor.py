@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CPU 進程池執行器單元測試
+
+驗證共享記憶體批次的往返與釋放、工作進程讀取批次、
+事件循環在等待時保持可回應，以及資料品質處理器分散到
+工作進程後的結果與單進程完全相同。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import copy
+import random
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from jobseeker.cpu_executor import CPUExecutor, SharedBatch, load_batch, split_ranges
+from jobseeker.data_quality import DataQualityProcessor
+from jobseeker.model import JobPost, JobResponse, Location
+
+
+def _make_jobs(count, seed=11):
+    rng = random.Random(seed)
+    words = ['python', 'SENIOR', 'click here', 'Ｄａｔａ', '工程師', '<i>remote</i>', 'zzzzzz', 'team']
+    return [
+        JobPost(
+            title=' '.join(rng.choice(words) for _ in range(3)),
+            company_name=rng.choice(['Acme', 'Ａｃｍｅ  Pty', '<b>Foo</b>', None]),
+            job_url=rng.choice([f'https://example.com/job/{index}', 'not-a-url']),
+            location=Location(city=rng.choice(['Sydney', 'Taipei'])),
+            description=' '.join(rng.choice(words) for _ in range(rng.randint(0, 40))) or None
+        )
+        for index in range(count)
+    ]
+
+
+def _report_dict(report):
+    data = report.to_dict()
+    data.pop('processing_time')
+    return data
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with CPUExecutor(max_workers=2) as executor:
+        executor.warm()
+        yield executor
+
+
+class TestSharedBatch:
+    """共享記憶體批次測試"""
+
+    def test_split_ranges_covers_all_rows(self):
+        assert split_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+        assert split_ranges(2, 8) == [(0, 1), (1, 2)]
+        assert split_ranges(0, 4) == []
+
+    def test_records_round_trip_and_release(self):
+        records = [('Python 工程師', None, 1), {'title': 'x', 'salary': 10.5}]
+        batch = SharedBatch.from_records(records)
+        name = batch.handle.name
+
+        assert batch.load() == records
+        batch.close()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_arrow_table_round_trip(self):
+        pa = pytest.importorskip('pyarrow')
+        table = pa.table({'title': ['a', None, 'c'], 'salary': [1, 2, None]})
+
+        with SharedBatch.from_table(table) as batch:
+            assert batch.load().equals(table)
+
+
+class TestCPUExecutor:
+    """工作進程測試"""
+
+    def test_workers_read_shared_batches(self, executor):
+        pa = pytest.importorskip('pyarrow')
+        records = [(index, f'job {index}') for index in range(500)]
+        table = pa.table({'id': list(range(100))})
+
+        with SharedBatch.from_records(records) as rows, SharedBatch.from_table(table) as columns:
+            assert executor.submit(load_batch, rows.handle).result() == records
+            assert executor.submit(load_batch, columns.handle).result().equals(table)
+
+    def test_run_keeps_event_loop_responsive(self, executor):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await executor.run(time.sleep, 0.3)
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(main()) >= 5
+
+
+class TestParallelQualityProcessing:
+    """資料品質分散處理測試"""
+
+    def test_parallel_processing_matches_single_process(self, executor):
+        jobs = _make_jobs(240)
+        results = {}
+        for name, cpu_executor in (('serial', None), ('parallel', executor)):
+            processor = DataQualityProcessor(executor=cpu_executor, parallel_min_jobs=0)
+            response, report = processor.process_job_response(JobResponse(jobs=copy.deepcopy(jobs)))
+            results[name] = (_report_dict(report), [job.model_dump() for job in response.jobs])
+
+        assert results['parallel'] == results['serial']
+        assert results['parallel'][0]['duplicates_removed'] > 0
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+數據目錄與 Parquet 存儲單元測試
+
+驗證 DataCatalog 的查詢、舊版索引匯入，以及分區 Parquet 的讀取下推。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import json
+
+import pytest
+
+from jobseeker.data_catalog import DataCatalog, ParquetJobStore, parquet_available
+from jobseeker.data_manager import DataManager
+
+
+def _metadata(scrape_id, site, timestamp, total=1):
+    return {
+        'scrape_id': scrape_id,
+        'site': site,
+        'search_term': 'python',
+        'location': 'Sydney',
+        'timestamp': timestamp,
+        'total_records': total,
+        'created_at': '2025-01-01T00:00:00',
+    }
+
+
+class TestDataCatalog:
+    """數據目錄測試"""
+
+    def test_find_and_summary(self, tmp_path):
+        catalog = DataCatalog(tmp_path / 'catalog.db')
+        catalog.add('a.json', _metadata('a', 'seek', '20250101_100000', 3))
+        catalog.add('b.json', _metadata('b', 'indeed', '20250102_100000', 5))
+        catalog.add('c.json', _metadata('c', 'seek', '20250103_100000', 2))
+
+        assert [f['scrape_id'] for f in catalog.find(site='seek')] == ['a', 'c']
+        assert [f['scrape_id'] for f in catalog.find(date_from='20250102')] == ['b', 'c']
+        summary = catalog.summary()
+        assert summary['total_records'] == 10
+        assert summary['date_range'] == {'earliest': '20250101', 'latest': '20250103'}
+        assert catalog.site_statistics()['seek']['file_count'] == 2
+        assert catalog.remove_before('20250102') == 1
+
+    def test_import_legacy_index(self, tmp_path):
+        index_file = tmp_path / 'data_index.json'
+        index_file.write_text(json.dumps({
+            'files': {'old': dict(_metadata('old', 'seek', '20240101_000000'), filepath='old.json')}
+        }), encoding='utf-8')
+
+        catalog = DataCatalog(tmp_path / 'catalog.db', legacy_index=index_file)
+        assert catalog.find(site='seek')[0]['filepath'] == 'old.json'
+
+
+@pytest.mark.skipif(not parquet_available(), reason="需要 pyarrow")
+class TestParquetJobStore:
+    """Parquet 存儲測試"""
+
+    def test_read_with_pushdown(self, tmp_path):
+        store = ParquetJobStore(tmp_path)
+        files = [
+            store.append('20250101', 'seek', 's1', [
+                {'title': 'A', 'company': 'X', 'salary': 100},
+                {'title': 'B', 'company': 'Y', 'salary': 200},
+            ]),
+            store.append('20250102', 'indeed', 's2', [
+                {'title': 'C', 'company': 'X', 'extra': {'k': 1}},
+            ]),
+        ]
+
+        frame = store.read([str(f) for f in files], columns=['title', 'site'],
+                           filters=[('company', '=', 'X')])
+        assert sorted(frame['title']) == ['A', 'C']
+        assert list(frame.columns) == ['title', 'site']
+
+        frame = store.read([str(f) for f in files], filters=[('date', '>=', '20250102')])
+        assert list(frame['title']) == ['C']
+        assert json.loads(frame['extra'][0]) == {'k': 1}
+
+    def test_data_manager_writes_parquet(self, tmp_path):
+        manager = DataManager(str(tmp_path), storage_format='parquet')
+        filepath = manager.save_raw_data('seek', [{'title': 'A'}], 'python', 'Sydney')
+
+        assert filepath.endswith('.parquet')
+        assert manager.get_data_by_site('seek')[0]['format'] == 'parquet'
+        assert manager.get_data_summary()['total_records'] == 1
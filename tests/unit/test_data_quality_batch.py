@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+資料品質批次模式單元測試
+
+驗證按欄位批次清理、垃圾檢測與驗證的結果與逐筆處理完全相同。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import copy
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from jobseeker.data_quality import (
+    BATCH_ARROW_MIN_ROWS, DataQualityIssue, DataQualityProcessor, DataValidator, TextCleaner
+)
+from jobseeker.model import Compensation, CompensationInterval, JobPost, JobResponse, Location
+
+
+SAMPLES = [
+    None, '', '   ', 'Python Developer', '<b>Senior</b>  Engineer\n\tSydney',
+    'Ｐｙｔｈｏｎ　工程師', 'café\xa0au lait', ' line para\x85next\x1cend',
+    'CLICK HERE TO APPLY NOW!!!', 'Earn $$$ fast', 'urgent hiring', 'Urgently needed',
+    'sooooo good', 'aaaa bbbb', 'ÉCOLE PRIMAIRE RECRUTE MAINTENANT', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ abc',
+    'make money online', 'immediate start available', 'no skills required!', '工作工作工作工作工作',
+    '<div class="x">Work from home</div>', '!!!!!', '....\n.', 'x' * 4 + '\n' + 'x' * 4,
+]
+
+
+def _samples(count=BATCH_ARROW_MIN_ROWS * 2):
+    return [SAMPLES[index % len(SAMPLES)] for index in range(count)]
+
+
+def _make_jobs(count, seed=7):
+    rng = random.Random(seed)
+    words = ['python', 'developer', 'SENIOR', 'click here', 'Ｄａｔａ', '工程師', '<i>remote</i>',
+             '　', '!!!', 'zzzzzz', 'engineer', 'Sydney', 'team']
+    jobs = []
+    for index in range(count):
+        description = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 60)))
+        jobs.append(JobPost(
+            title=' '.join(rng.choice(words) for _ in range(3)) if index % 13 else ' ',
+            company_name=rng.choice(['Acme', 'Ａｃｍｅ  Pty', '<b>Foo</b>', None]),
+            job_url=rng.choice([f'https://example.com/job/{index}', 'not-a-url']),
+            company_url=rng.choice([None, 'https://acme.example.com', 'acme']),
+            location=Location(city=rng.choice(['Sydney', 'Taipei'])),
+            description=description or None,
+            emails=rng.choice([None, ['hr@example.com'], ['broken']]),
+            compensation=rng.choice([
+                None,
+                Compensation(interval=CompensationInterval.YEARLY, min_amount=80000, max_amount=120000),
+                Compensation(interval=CompensationInterval.YEARLY, min_amount=10, max_amount=20),
+            ]),
+            date_posted=rng.choice([None, date.today(), date.today() - timedelta(days=4000)])
+        ))
+    return jobs
+
+
+def _report_dict(report):
+    data = report.to_dict()
+    data.pop('processing_time')
+    return data
+
+
+class TestTextCleanerBatch:
+    """文字清理批次測試"""
+
+    def test_clean_batch_matches_clean_text(self):
+        pytest.importorskip("pyarrow")
+        cleaner = TextCleaner()
+        values = _samples()
+
+        assert cleaner.clean_batch(values) == [cleaner.clean_text(value) for value in values]
+
+    def test_detect_spam_batch_matches_detect_spam(self):
+        pytest.importorskip("pyarrow")
+        cleaner = TextCleaner()
+        values = _samples()
+
+        expected = [bool(value) and cleaner.detect_spam(value) for value in values]
+        assert cleaner.detect_spam_batch(values) == expected
+        assert any(expected) and not all(expected)
+
+    def test_spam_patterns_share_one_compiled_regex(self):
+        cleaner = TextCleaner()
+
+        assert cleaner.detect_spam('Apply Now for this role')
+        assert cleaner.detect_spam('Bonus $$$')
+        assert not cleaner.detect_spam('Urgently hiring a careful engineer')
+
+
+class TestBatchValidation:
+    """批次驗證測試"""
+
+    def test_count_issues_matches_per_job_validation(self):
+        validator = DataValidator()
+        jobs = _make_jobs(150)
+
+        expected = {issue: 0 for issue in DataQualityIssue}
+        for job in jobs:
+            for issue in validator.validate_job_post(job):
+                expected[issue] += 1
+
+        assert validator.count_issues(jobs) == expected
+
+
+class TestProcessorBatchMode:
+    """處理器批次模式測試"""
+
+    def test_batch_mode_produces_same_report_and_jobs(self):
+        jobs = _make_jobs(200)
+        results = {}
+        for batch_mode in (False, True):
+            processor = DataQualityProcessor(batch_mode=batch_mode)
+            response, report = processor.process_job_response(JobResponse(jobs=copy.deepcopy(jobs)))
+            results[batch_mode] = (_report_dict(report), [job.model_dump() for job in response.jobs])
+
+        assert results[True] == results[False]
+        report = results[True][0]
+        assert report['cleaned_fields']['spam_filtered'] > 0
+        assert report['issues_found']['invalid_url'] > 0
+        assert report['duplicates_removed'] > 0
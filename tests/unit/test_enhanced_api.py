@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增強版 API（/api/v2）單元測試
+
+以獨立的 SQLite 資料庫驗證 FTS5 關鍵詞比對、非 SQLite 後端的 LIKE 退回路徑、
+排序順序，以及聚合統計。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+JOBS = [
+    {'title': 'Python Developer', 'company': 'Acme', 'location': 'Sydney NSW', 'site': 'seek',
+     'salary_max': 120000.0, 'description': 'Django and "REST" APIs'},
+    {'title': 'Golang Engineer', 'company': 'Initech', 'location': 'Melbourne VIC', 'site': 'indeed',
+     'salary_max': 150000.0, 'description': 'Distributed systems'},
+    {'title': 'Data Analyst', 'company': 'Globex', 'location': 'Sydney NSW', 'site': 'seek',
+     'salary_max': 90000.0, 'description': 'SQL dashboards with some python'},
+    {'title': 'Office Manager', 'company': 'Hooli', 'location': 'Perth WA', 'site': 'linkedin',
+     'salary_max': None, 'description': 'Front desk'},
+]
+
+
+@pytest.fixture(scope="module")
+def webapp(tmp_path_factory):
+    if 'web_app.app' in sys.modules:
+        pytest.skip("web_app.app 已以其他資料庫載入")
+    root = tmp_path_factory.mktemp('enhanced_api')
+    os.environ['WEB_APP_DATABASE_URI'] = f"sqlite:///{root / 'app.db'}"
+    os.environ['RESULT_STORE_PATH'] = str(root / 'search_results.db')
+    try:
+        import web_app.app as webapp
+    finally:
+        os.environ.pop('WEB_APP_DATABASE_URI', None)
+        os.environ.pop('RESULT_STORE_PATH', None)
+
+    with webapp.app.app_context():
+        webapp.db.session.add_all([
+            webapp.SearchResult(id='search-old', search_query='python', site='seek', country='australia',
+                                jobs_count=2, created_at=datetime(2025, 1, 1), execution_time=2.0),
+            webapp.SearchResult(id='search-new', search_query='engineer', site='indeed', country='australia',
+                                jobs_count=2, created_at=datetime(2025, 1, 2), execution_time=4.0,
+                                success=False),
+        ])
+        webapp.db.session.flush()
+        for index, job in enumerate(JOBS):
+            webapp.db.session.add(webapp.Job(search_id='search-old' if index < 2 else 'search-new',
+                                             position=index % 2, job_type='full_time', **job))
+        webapp.db.session.commit()
+    return webapp
+
+
+@pytest.fixture
+def client(webapp):
+    webapp.app.config.update(TESTING=True)
+    with webapp.app.test_client() as test_client:
+        yield test_client
+
+
+def _titles(client, query_string):
+    response = client.get('/api/v2/search', query_string=query_string)
+    assert response.status_code == 200, response.get_json()
+    return [job['title'] for job in response.get_json()['data']]
+
+
+class TestFullTextSearch:
+    """全文搜尋測試"""
+
+    def test_keywords_match_any_term_through_fts(self, client):
+        titles = _titles(client, {'keywords': 'golang,dashboards', 'sort': 'title', 'order': 'asc'})
+
+        assert titles == ['Data Analyst', 'Golang Engineer']
+
+    def test_quotes_in_terms_are_escaped(self, client):
+        assert _titles(client, {'keywords': '"REST"'}) == ['Python Developer']
+
+    def test_location_matches_only_location_column(self, client):
+        titles = _titles(client, {'location': 'Sydney', 'sort': 'title', 'order': 'asc'})
+
+        assert titles == ['Data Analyst', 'Python Developer']
+
+    def test_like_fallback_ors_each_term(self, webapp):
+        from web_app.enhanced_api import EnhancedAPIManager, FilterParams, PaginationParams, SearchParams, \
+            SortField, SortOrder, SortParams
+
+        with webapp.app.test_request_context():
+            manager = EnhancedAPIManager(webapp.db)
+            manager.use_fts = False
+            sort = SortParams(field=SortField.TITLE, order=SortOrder.ASC)
+
+            keywords = manager.get_paginated_results(
+                PaginationParams(), sort, FilterParams(keywords=['Golang', 'dashboards']))
+            location = manager.get_paginated_results(
+                PaginationParams(), sort, FilterParams(), SearchParams(location='Perth'))
+
+        assert [job['title'] for job in keywords.data] == ['Data Analyst', 'Golang Engineer']
+        assert [job['title'] for job in location.data] == ['Office Manager']
+
+
+class TestSortingAndStats:
+    """排序與統計測試"""
+
+    def test_sort_by_salary(self, client):
+        titles = _titles(client, {'sort': 'salary', 'order': 'asc'})
+
+        assert titles == ['Office Manager', 'Data Analyst', 'Python Developer', 'Golang Engineer']
+
+    def test_relevance_lists_newest_search_first_in_position_order(self, client):
+        titles = _titles(client, {})
+
+        assert titles == ['Data Analyst', 'Office Manager', 'Python Developer', 'Golang Engineer']
+
+    def test_pagination_counts(self, client):
+        body = client.get('/api/v2/search', query_string={'per_page': 3, 'page': 2}).get_json()
+
+        assert body['pagination']['total_count'] == 4 and body['pagination']['total_pages'] == 2
+        assert len(body['data']) == 1 and body['pagination']['has_prev']
+
+    def test_stats_filtered_by_job_fields(self, client):
+        stats = client.get('/api/v2/search/stats').get_json()
+        assert stats['total_searches'] == 2 and stats['successful_searches'] == 1
+        assert stats['site_stats']['indeed'] == {'count': 1, 'avg_execution_time': 4.0}
+        assert stats['time_stats'] == {'2025-01-02': {'count': 1}, '2025-01-01': {'count': 1}}
+
+        filtered = client.get('/api/v2/search/stats', query_string={'sites': 'linkedin'}).get_json()
+        assert filtered['total_searches'] == 1 and list(filtered['site_stats']) == ['indeed']
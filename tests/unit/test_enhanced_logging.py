@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增強日誌系統單元測試
+
+驗證分片效能指標在多線程下的正確合併與每小時統計的保留上限，
+以及佇列式日誌管線的輸出、級別檢查與環形緩存。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import json
+import logging
+import threading
+from unittest.mock import patch
+
+from jobseeker.enhanced_logging import EnhancedLogger, LogLevel, PerformanceMetrics
+
+
+class TestPerformanceMetrics:
+    """分片效能指標測試"""
+
+    def test_concurrent_threads_merge_on_read(self):
+        metrics = PerformanceMetrics()
+
+        def worker(site):
+            for index in range(500):
+                metrics.record_request(site, 0.01 * (index % 5 + 1), index % 10 != 0,
+                                       error_type=None if index % 10 else 'Timeout')
+
+        threads = [threading.Thread(target=worker, args=(f'site{i % 3}',)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        result = metrics.get_metrics()
+
+        assert result['request_count'] == 6000
+        assert result['error_count'] == 600
+        assert result['error_types'] == {'Timeout': 600}
+        assert sum(site['requests'] for site in result['site_metrics'].values()) == 6000
+        assert result['min_response_time'] == 0.01
+        assert result['max_response_time'] == 0.05
+        assert sum(hour['requests'] for hour in result['hourly_stats'].values()) == 6000
+        # 結束線程的分片已併入彙總，再次讀取結果不變
+        assert metrics.get_metrics()['request_count'] == 6000
+
+    def test_hourly_retention_is_bounded(self):
+        metrics = PerformanceMetrics(hourly_retention=3)
+        with patch('jobseeker.enhanced_logging.time.time') as fake_time:
+            for hour in range(10):
+                fake_time.return_value = hour * 3600 + 1
+                metrics.record_request('seek', 0.1, True)
+
+            result = metrics.get_metrics()
+
+        assert len(result['hourly_stats']) == 3
+        assert result['request_count'] == 10
+
+    def test_reset(self):
+        metrics = PerformanceMetrics()
+        metrics.record_request('seek', 0.2, False, 'HTTPError')
+        metrics.reset_metrics()
+        metrics.record_request('seek', 0.1, True)
+
+        result = metrics.get_metrics()
+
+        assert result['request_count'] == 1
+        assert result['error_types'] == {}
+        assert result['success_rate'] == 100
+
+
+class TestEnhancedLoggerPipeline:
+    """佇列式日誌管線測試"""
+
+    def test_file_and_json_output_after_flush(self, tmp_path):
+        log_file = tmp_path / 'seek.log'
+        logger = EnhancedLogger('pipeline_file', log_file=str(log_file),
+                                enable_console=False, enable_json=True)
+        try:
+            logger.info('開始爬取', site='seek', metadata={'page': 2})
+            logger.log_performance('seek', 0.25, False, 'fetch', error_type='Timeout')
+            logger.flush()
+
+            text = log_file.read_text(encoding='utf-8')
+            assert '[seek] [general] 開始爬取' in text
+            assert '元數據: {"page": 2}' in text
+
+            lines = log_file.with_suffix('.json').read_text(encoding='utf-8').splitlines()
+            records = [json.loads(line) for line in lines]
+            assert [record['level'] for record in records] == ['INFO', 'ERROR']
+            assert records[1]['metadata']['error_type'] == 'Timeout'
+        finally:
+            logger.close()
+
+    def test_level_check_skips_entry_creation(self):
+        logger = EnhancedLogger('pipeline_level', enable_console=False, level=logging.WARNING)
+        try:
+            logger.debug('略過')
+            logger.info('略過')
+            logger.warning('保留')
+
+            assert [entry.message for entry in logger.get_recent_logs()] == ['保留']
+            assert not logger.is_enabled_for(LogLevel.INFO)
+        finally:
+            logger.close()
+
+    def test_ring_buffer_keeps_latest_entries(self):
+        logger = EnhancedLogger('pipeline_ring', enable_console=False, max_entries=50)
+        try:
+            for index in range(200):
+                logger.info(f'訊息 {index}')
+
+            recent = logger.get_recent_logs(count=10)
+            assert len(logger.log_entries) == 50
+            assert [entry.message for entry in recent] == [f'訊息 {index}' for index in range(190, 200)]
+        finally:
+            logger.close()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+串流匯出單元測試
+
+驗證各格式逐批輸出的內容可被完整還原。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import gzip
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from web_app.export_stream import (
+    gzip_stream, iter_csv, iter_json_document, iter_ndjson, iter_parquet, job_parquet_schema, parquet_available
+)
+
+
+ROWS = [
+    {'title': f'Job {i}', 'company': 'ExampleCo', 'salary_min': None if i % 2 else 1000.0 + i}
+    for i in range(7)
+]
+
+
+class TestExportStream:
+    """串流匯出測試"""
+
+    def test_csv_header_written_once(self):
+        chunks = list(iter_csv(ROWS, chunk_rows=3))
+
+        assert len(chunks) == 3
+        text = b''.join(chunks).decode('utf-8')
+        assert text.startswith('\ufeff')
+        frame = pd.read_csv(io.StringIO(text.lstrip('\ufeff')))
+        assert list(frame['title']) == [row['title'] for row in ROWS]
+
+    def test_json_document_is_valid(self):
+        body = b''.join(iter_json_document({'search_info': {'query': 'python'}}, ROWS, chunk_rows=2))
+
+        document = json.loads(body)
+        assert document['search_info']['query'] == 'python'
+        assert len(document['jobs']) == 7
+        assert document['jobs'][1]['salary_min'] is None
+
+    def test_json_document_without_rows(self):
+        assert json.loads(b''.join(iter_json_document({}, []))) == {'jobs': []}
+
+    def test_ndjson_lines(self):
+        lines = b''.join(iter_ndjson(ROWS, chunk_rows=4)).decode('utf-8').splitlines()
+
+        assert [json.loads(line)['title'] for line in lines] == [row['title'] for row in ROWS]
+
+    def test_gzip_stream(self):
+        compressed = b''.join(gzip_stream(iter_ndjson(ROWS, chunk_rows=2)))
+
+        assert gzip.decompress(compressed) == b''.join(iter_ndjson(ROWS))
+
+    @pytest.mark.skipif(not parquet_available(), reason="需要 pyarrow")
+    def test_parquet_row_groups(self):
+        import pyarrow.parquet as pq
+
+        body = b''.join(iter_parquet(ROWS, chunk_rows=3))
+
+        parquet_file = pq.ParquetFile(io.BytesIO(body))
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.read().column('title').to_pylist() == [row['title'] for row in ROWS]
+
+    @pytest.mark.skipif(not parquet_available(), reason="需要 pyarrow")
+    def test_parquet_null_first_chunk_then_numbers(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = [{'title': 'A', 'salary_min': None}, {'title': 'B', 'salary_min': None},
+                {'title': 'C', 'salary_min': 52000.5}, {'title': 'D', 'salary_min': 61000}]
+
+        inferred = pq.read_table(io.BytesIO(b''.join(iter_parquet(rows, chunk_rows=2))))
+        assert inferred.column('salary_min').to_pylist() == [None, None, '52000.5', '61000']
+
+        schema = job_parquet_schema(['title', 'salary_min', 'is_remote'])
+        rows = [dict(row, is_remote=None) for row in rows[:2]] + [
+            {'title': 'C', 'salary_min': 52000.5, 'is_remote': 1},
+            {'title': 'D', 'salary_min': 'negotiable', 'is_remote': 0}]
+        table = pq.read_table(io.BytesIO(b''.join(iter_parquet(rows, chunk_rows=2, schema=schema))))
+        assert table.schema.field('salary_min').type == pa.float64()
+        assert table.column('salary_min').to_pylist() == [None, None, 52000.5, None]
+        assert table.column('is_remote').to_pylist() == [None, None, True, False]
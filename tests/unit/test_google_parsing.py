@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Google Jobs 頁面解析單元測試
+
+驗證職位陣列路徑的快取與失效回退、初始頁面的括號掃描
+（字串內的括號、缺少結尾結構的標記與病態輸入），以及分頁回應的解析。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import json
+import time
+
+import pytest
+
+from jobseeker.google import Google
+from jobseeker.google import util
+
+
+def _job_info(index):
+    info = [None] * 30
+    info[0] = f'Python Developer [{index}]'
+    info[1] = 'Acme "Labs"'
+    info[2] = 'Sydney, NSW, Australia'
+    info[3] = [[f'https://example.com/jobs/{index}']]
+    info[12] = f'{index + 1} days ago'
+    info[19] = 'Remote friendly role ] with [ brackets and \\"quotes\\"'
+    info[28] = f'id-{index}'
+    info[29] = [[1, 'a]'], [2]]
+    return info
+
+
+def _payload(index, wrapper='x'):
+    return [[[None, {wrapper: [0, {util.JOB_INFO_KEY: _job_info(index)}]}]]]
+
+
+def _initial_page(count):
+    scripts = ''.join(
+        '<script>AF_initDataCallback({data:[[[[{"x":1,"' + util.JOB_INFO_KEY + '":'
+        + json.dumps(_job_info(index)) + '}]]]]]});</script>'
+        for index in range(count)
+    )
+    return f'<html>{scripts}<p>"{util.JOB_INFO_KEY}":[1, 2] no closing structure</p></html>'
+
+
+@pytest.fixture(autouse=True)
+def reset_job_info_path(monkeypatch):
+    monkeypatch.setattr(util, '_job_info_path', None)
+
+
+class TestJobInfoPath:
+    """職位陣列路徑快取測試"""
+
+    def test_learns_path_and_reuses_it(self, monkeypatch):
+        assert util.find_job_info(_payload(0)) == _job_info(0)
+        learned = util._job_info_path
+
+        def fail(*args):
+            raise AssertionError('recursive search should not run')
+
+        monkeypatch.setattr(util, '_find_job_info_path', fail)
+        assert util.find_job_info(_payload(1)) == _job_info(1)
+        assert util._job_info_path == learned
+
+    def test_falls_back_to_search_when_layout_changes(self):
+        util.find_job_info(_payload(0))
+        moved = [{'other': [[], {'y': {util.JOB_INFO_KEY: _job_info(2)}}]}]
+
+        assert util.find_job_info(moved) == _job_info(2)
+        assert util._job_info_path[-1] == util.JOB_INFO_KEY
+        assert util.find_job_info([{'nothing': 'here'}]) is None
+
+    def test_loads_handles_integers_beyond_64_bits(self):
+        assert util.loads('[184467440737095516160, "x"]') == [184467440737095516160, 'x']
+
+
+class TestInitialPage:
+    """初始頁面掃描測試"""
+
+    def test_extracts_arrays_with_brackets_inside_strings(self):
+        assert util.find_job_info_initial_page(_initial_page(5)) == [_job_info(index) for index in range(5)]
+
+    def test_pathological_input_stays_linear(self):
+        page = (f'"{util.JOB_INFO_KEY}":[[1,"x"],[2] ] ' + 'y' * 50) * 4000
+
+        started = time.perf_counter()
+        assert util.find_job_info_initial_page(page) == []
+        assert time.perf_counter() - started < 1.0
+
+    def test_unterminated_arrays_stay_linear(self):
+        page = f'"{util.JOB_INFO_KEY}":[1, ' * 16000
+
+        started = time.perf_counter()
+        assert util.find_job_info_initial_page(page) == []
+        assert time.perf_counter() - started < 1.0
+
+    def test_unterminated_array_does_not_hide_the_next_one(self):
+        page = f'"{util.JOB_INFO_KEY}":[1, "x", ' + _initial_page(1)
+
+        assert util.find_job_info_initial_page(page) == [_job_info(0)]
+
+
+class TestJobsPage:
+    """分頁回應解析測試"""
+
+    def test_parse_jobs_returns_posts_and_cursor(self):
+        outer = [[['k', json.dumps(_payload(index))] for index in range(3)] + [['k', 'not json']]]
+        page = ")]}'\n" + json.dumps(outer) + '<div data-async-fc="NEXT_CURSOR"></div>'
+
+        jobs, cursor = Google()._parse_jobs(page)
+
+        assert cursor == 'NEXT_CURSOR'
+        assert [job.id for job in jobs] == ['go-id-0', 'go-id-1', 'go-id-2']
+        assert jobs[0].location.state == 'NSW'
+        assert jobs[0].is_remote
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 錄製與重放單元測試
+
+以本機 HTTP 伺服器錄製回應，關閉伺服器後驗證 requests 與 tls_client
+會話可離線重放，並檢查請求比對、依序重放與延遲注入。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jobseeker.http_replay import Cassette, CassetteMissError, use_cassette
+from jobseeker.util import create_session
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def _respond(self, payload):
+        type(self).hits += 1
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond({'path': self.path, 'hit': type(self).hits})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self._respond({'echo': self.rfile.read(length).decode('utf-8'), 'hit': type(self).hits})
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _CountingHandler.hits = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _CountingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestCassette:
+    """卡帶比對測試"""
+
+    def test_request_key_normalizes_query_and_body(self, tmp_path):
+        cassette = Cassette(tmp_path / 'c.json', mode='record', ignore_params=['_'])
+
+        assert cassette.request_key('get', 'https://x.test/s?b=2&a=1&_=123') == \
+            cassette.request_key('GET', 'https://x.test/s', params={'a': 1, 'b': 2})
+        assert cassette.request_key('POST', 'https://x.test/g', body={'q': 1, 'p': 2}) == \
+            cassette.request_key('POST', 'https://x.test/g', body={'p': 2, 'q': 1})
+        assert cassette.request_key('POST', 'https://x.test/g', body='a') != \
+            cassette.request_key('POST', 'https://x.test/g', body='b')
+
+    def test_replay_requires_existing_cassette(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            Cassette(tmp_path / 'missing.json')
+
+
+class TestSessionReplay:
+    """create_session 錄製重放測試"""
+
+    def test_record_then_replay_offline(self, server, tmp_path):
+        path = tmp_path / 'site.json'
+        session = create_session(is_tls=False)
+
+        with use_cassette(path, mode='record') as cassette:
+            first = session.get(f'{server}/jobs', params={'page': 1}).json()
+            second = session.get(f'{server}/jobs', params={'page': 1}).json()
+            posted = session.post(f'{server}/graphql', json={'query': 'jobs'}).json()
+        assert cassette.stats['recorded'] == 3
+        hits_after_recording = _CountingHandler.hits
+
+        with use_cassette(path) as cassette:
+            # 相同請求依序重放，用完停在最後一筆
+            assert session.get(f'{server}/jobs?page=1').json() == first
+            assert session.get(f'{server}/jobs?page=1').json() == second
+            assert session.get(f'{server}/jobs?page=1').json() == second
+            response = session.post(f'{server}/graphql', json={'query': 'jobs'})
+            assert response.ok and response.json() == posted
+            with pytest.raises(CassetteMissError):
+                session.get(f'{server}/jobs?page=2')
+
+        assert _CountingHandler.hits == hits_after_recording
+        assert cassette.stats['replayed'] == 4
+        assert cassette.stats['misses'] == 1
+
+    def test_tls_session_replay_and_latency(self, server, tmp_path):
+        path = tmp_path / 'tls.json'
+        with use_cassette(path, mode='record'):
+            create_session(is_tls=False).get(f'{server}/detail')
+
+        session = create_session(is_tls=True)
+        with use_cassette(path, latency=0.05):
+            start = time.perf_counter()
+            response = session.get(f'{server}/detail')
+            elapsed = time.perf_counter() - start
+
+        assert response.ok
+        assert response.json()['path'] == '/detail'
+        assert response.headers['Content-Type'] == 'application/json'
+        assert elapsed >= 0.05
+
+    def test_only_one_active_cassette(self, tmp_path):
+        with use_cassette(tmp_path / 'a.json', mode='record'):
+            with pytest.raises(RuntimeError):
+                with use_cassette(tmp_path / 'b.json', mode='record'):
+                    pass
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+完整性檢查器跨平台重複檢測單元測試
+
+驗證阻斷鍵分塊後的近似重複判定、完全相同簽名的重複，
+以及以 job_id 索引取出待處理檢查的順序。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import sys
+import threading
+
+import pytest
+
+
+def _shutdown_global_service():
+    """關閉 task_tracking_service 模組匯入時建立的全局服務，避免其背景循環阻塞直譯器退出"""
+    service_module = sys.modules.get('task_tracking_service')
+    if service_module is not None and hasattr(service_module, 'task_tracking_service'):
+        service_module.task_tracking_service.shutdown()
+
+
+try:
+    integrity = pytest.importorskip("enhanced_data_integrity_checker")
+except pytest.skip.Exception:
+    # 略過時 fixture 不會執行，仍須關閉已建立的全局服務
+    _shutdown_global_service()
+    raise
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stop_global_service():
+    """模組匯入時建立的全局服務在測試結束後關閉"""
+    yield
+    _shutdown_global_service()
+
+
+@pytest.fixture
+def checker():
+    # 只測試純計算方法，不啟動背景任務與外部連接
+    checker = integrity.EnhancedDataIntegrityChecker.__new__(integrity.EnhancedDataIntegrityChecker)
+    checker.config = integrity.IntegrityCheckConfig()
+    checker.check_results = {}
+    checker.pending_checks = {}
+    checker.queue_lock = threading.Lock()
+    return checker
+
+
+def _job(title, company, location='Sydney, NSW', description='python aws remote team'):
+    return {'title': title, 'company': company, 'location': location, 'description': description}
+
+
+class TestBlockedDuplicateDetection:
+    """阻斷鍵重複檢測測試"""
+
+    def test_blocking_key_normalizes_company_title_and_location(self, checker):
+        assert checker._blocking_key(_job('Senior Python Developer', 'Acme Pty Ltd', 'San Francisco, CA')) == \
+            checker._blocking_key(_job('Python Dev', 'ACME', 'San Francisco Bay Area'))
+
+    def test_near_duplicates_found_only_across_platforms_in_same_block(self, checker):
+        platform_data = {
+            'seek': [_job('Python Developer', 'Acme Pty Ltd'), _job('Data Engineer', 'Globex')],
+            'indeed': [
+                _job('Python Developer (Remote)', 'Acme', 'Sydney'),
+                _job('Data Engineer', 'Initech'),
+                _job('Data Engineer', 'Globex'),
+            ],
+        }
+
+        duplicates = checker._detect_cross_platform_duplicates(platform_data)
+
+        pairs = {(d['original_platform'], d['original_index'], d['duplicate_platform'], d['duplicate_index'])
+                 for d in duplicates}
+        assert pairs == {('seek', 0, 'indeed', 0), ('seek', 1, 'indeed', 2)}
+        assert all(d['similarity_score'] >= checker.config.duplicate_threshold for d in duplicates)
+
+    def test_exact_signature_duplicates_within_platform_are_kept(self, checker):
+        job = _job('QA Engineer', 'Hooli')
+        duplicates = checker._detect_cross_platform_duplicates({'seek': [job, dict(job)]})
+
+        assert len(duplicates) == 1
+        assert duplicates[0]['similarity_score'] == 1.0
+
+    def test_profile_similarity_matches_job_similarity(self, checker):
+        job1 = _job('Python Developer', 'Acme', description='python django')
+        job2 = _job('Senior Python Developer', 'Acme Corp', 'Melbourne', 'java spring')
+
+        expected = checker._calculate_job_similarity(job1, job2)
+        profiles = checker._similarity_profile(job1), checker._similarity_profile(job2)
+        assert checker._profile_similarity(*profiles) == pytest.approx(expected)
+
+
+class TestPendingCheckIndex:
+    """待處理檢查索引測試"""
+
+    def test_pop_pending_check_returns_oldest_pending(self, checker):
+        first = integrity.IntegrityCheckResult(job_id='job-1')
+        second = integrity.IntegrityCheckResult(job_id='job-1')
+        first.status = 'completed'
+        for result in (first, second):
+            checker.check_results[result.check_id] = result
+        checker.pending_checks['job-1'] = integrity.deque([first.check_id, second.check_id])
+
+        assert checker._pop_pending_check('job-1') is second
+        assert checker._pop_pending_check('job-1') is None
+        assert 'job-1' not in checker.pending_checks
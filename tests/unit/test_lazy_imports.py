@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+延遲導入單元測試
+
+驗證 import jobseeker 不會載入各爬蟲、pandas 與 Playwright。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import subprocess
+import sys
+
+import jobseeker
+from jobseeker import Site
+
+
+def _modules_loaded_after(code):
+    script = f"import sys\n{code}\nprint(','.join(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, '-c', script], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.strip().split(','))
+
+
+class TestLazyImports:
+    """延遲導入測試"""
+
+    def test_import_does_not_load_scrapers(self):
+        modules = _modules_loaded_after('import jobseeker')
+
+        assert 'pandas' not in modules
+        assert 'playwright' not in modules
+        assert 'jobseeker.linkedin' not in modules
+        assert 'jobseeker.seek' not in modules
+
+    def test_scraper_class_loads_only_its_module(self):
+        modules = _modules_loaded_after(
+            'import jobseeker\njobseeker.get_scraper_class(jobseeker.Site.INDEED)'
+        )
+
+        assert 'jobseeker.indeed' in modules
+        assert 'jobseeker.linkedin' not in modules
+
+    def test_lazy_exports(self):
+        from jobseeker import Indeed
+        from jobseeker.indeed import Indeed as direct
+
+        assert Indeed is direct
+        assert jobseeker.get_scraper_class(Site.INDEED) is direct
+        assert 'SeekScraper' in dir(jobseeker)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM 調度器派發單元測試
+
+驗證處理並發受 worker_pool.max_workers 限制、批量依大小或期限送出，
+以及延遲重試在停止時送回佇列處理。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from llm_json_scheduler import (
+    LLMJSONScheduler, ProcessingMode, TaskInfo, TaskPriority, TaskStatus
+)
+
+
+def _task(task_id, priority=TaskPriority.NORMAL):
+    return TaskInfo(
+        task_id=task_id,
+        file_path=f'{task_id}.json',
+        task_type='job_extraction',
+        priority=priority,
+        status=TaskStatus.PENDING,
+        created_at=datetime.now()
+    )
+
+
+def _make_scheduler(tmp_path, mode, max_workers=3, delay=0.02):
+    scheduler = LLMJSONScheduler(
+        watch_directory=str(tmp_path / 'raw'),
+        output_directory=str(tmp_path / 'processed'),
+        max_workers=max_workers,
+        processing_mode=mode
+    )
+    concurrency = {'current': 0, 'peak': 0}
+
+    async def fake_process(task_info, worker_id):
+        concurrency['current'] += 1
+        concurrency['peak'] = max(concurrency['peak'], concurrency['current'])
+        await asyncio.sleep(delay)
+        concurrency['current'] -= 1
+        return {'task_id': task_info.task_id}
+
+    scheduler.worker_pool._process_by_type = fake_process
+    return scheduler, concurrency
+
+
+async def _wait_completed(scheduler, count, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while scheduler.scheduler_stats['successful_tasks'] < count:
+        assert time.monotonic() < deadline, "等待逾時"
+        await asyncio.sleep(0.01)
+
+
+class TestDispatch:
+    """派發控制測試"""
+
+    def test_burst_is_bounded_by_max_workers(self, tmp_path):
+        async def scenario():
+            scheduler, concurrency = _make_scheduler(tmp_path, ProcessingMode.REALTIME)
+            await scheduler.start()
+            try:
+                for i in range(50):
+                    await scheduler.add_task(_task(f't{i}'))
+                depth = scheduler.get_dispatch_stats()['queue_depth']
+                await _wait_completed(scheduler, 50)
+                return depth, concurrency, scheduler.get_dispatch_stats()
+            finally:
+                await scheduler.stop()
+
+        depth, concurrency, stats = asyncio.run(scenario())
+
+        assert depth > 0
+        assert concurrency['peak'] == 3
+        assert stats['max_in_flight'] <= 3
+        assert stats['dispatched'] == 50
+        assert stats['in_flight'] == 0
+
+    def test_batch_flushes_on_size(self, tmp_path):
+        async def scenario():
+            scheduler, _ = _make_scheduler(tmp_path, ProcessingMode.BATCH)
+            scheduler.batch_config['batch_size'] = 5
+            await scheduler.start()
+            try:
+                started = time.monotonic()
+                for i in range(5):
+                    await scheduler.add_task(_task(f'b{i}', TaskPriority.LOW))
+                await _wait_completed(scheduler, 5)
+                return time.monotonic() - started, scheduler.get_dispatch_stats()
+            finally:
+                await scheduler.stop()
+
+        elapsed, stats = asyncio.run(scenario())
+
+        assert elapsed < 2.0
+        assert stats['batches_flushed'] == 1
+
+    def test_batch_flushes_on_deadline(self, tmp_path):
+        async def scenario():
+            scheduler, _ = _make_scheduler(tmp_path, ProcessingMode.BATCH)
+            scheduler.batch_config['batch_timeout'] = 0.2
+            await scheduler.start()
+            try:
+                started = time.monotonic()
+                await scheduler.add_task(_task('d1', TaskPriority.LOW))
+                await scheduler.add_task(_task('d2', TaskPriority.LOW))
+                await asyncio.sleep(0.05)
+                assert scheduler.get_dispatch_stats()['batch_depth'] == 2
+                await _wait_completed(scheduler, 2)
+                return time.monotonic() - started
+            finally:
+                await scheduler.stop()
+
+        elapsed = asyncio.run(scenario())
+
+        assert 0.2 <= elapsed < 2.0
+
+    def test_pending_retry_is_kept_and_requeued_on_stop(self, tmp_path):
+        async def scenario():
+            scheduler, _ = _make_scheduler(tmp_path, ProcessingMode.REALTIME)
+            process = scheduler.worker_pool._process_by_type
+            calls = []
+
+            async def flaky_process(task_info, worker_id):
+                calls.append(task_info.task_id)
+                if len(calls) == 1:
+                    raise RuntimeError('temporary failure')
+                return await process(task_info, worker_id)
+
+            scheduler.worker_pool._process_by_type = flaky_process
+            await scheduler.start()
+            await scheduler.add_task(_task('retry-me'))
+            deadline = time.monotonic() + 10
+            while not scheduler._side_tasks or scheduler._in_flight:
+                assert time.monotonic() < deadline, "等待逾時"
+                await asyncio.sleep(0.01)
+            pending_retries = len(scheduler._side_tasks)
+            await scheduler.stop()
+            return pending_retries, calls, scheduler
+
+        pending_retries, calls, scheduler = asyncio.run(scenario())
+
+        assert pending_retries == 1
+        assert calls == ['retry-me', 'retry-me']
+        assert scheduler.scheduler_stats['successful_tasks'] == 1
+        assert not scheduler._side_tasks
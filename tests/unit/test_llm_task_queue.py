@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM 任務佇列單元測試
+
+驗證單一 heap 的優先級、老化與事件驅動的出隊。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from llm_json_scheduler import TaskInfo, TaskPriority, TaskQueue, TaskStatus
+
+
+def _task(task_id, priority, age_seconds=0.0, user_tier='free'):
+    return TaskInfo(
+        task_id=task_id,
+        file_path=f'{task_id}.json',
+        task_type='job_extraction',
+        priority=priority,
+        status=TaskStatus.PENDING,
+        created_at=datetime.now() - timedelta(seconds=age_seconds),
+        user_tier=user_tier
+    )
+
+
+async def _drain(queue):
+    order = []
+    while True:
+        task_info = await queue.get_next_task(timeout=0)
+        if task_info is None:
+            return order
+        order.append(task_info.task_id)
+
+
+class TestTaskQueue:
+    """任務佇列測試"""
+
+    def test_priority_order(self):
+        async def scenario():
+            queue = TaskQueue()
+            await queue.add_task(_task('low', TaskPriority.LOW))
+            await queue.add_task(_task('normal', TaskPriority.NORMAL))
+            await queue.add_task(_task('high', TaskPriority.HIGH))
+            await queue.add_task(_task('normal_premium', TaskPriority.NORMAL, user_tier='premium'))
+            assert queue.get_queue_stats()['local_queue_sizes']['normal'] == 2
+            return await _drain(queue)
+
+        assert asyncio.run(scenario()) == ['high', 'normal_premium', 'normal', 'low']
+
+    def test_waiting_tasks_age(self):
+        async def scenario():
+            queue = TaskQueue(aging_interval=60.0)
+            # 低優先級任務等待超過 (3 - 1) * 60 秒後排在新的高優先級任務之前
+            await queue.add_task(_task('old_low', TaskPriority.LOW, age_seconds=130))
+            await queue.add_task(_task('new_high', TaskPriority.HIGH))
+            await queue.add_task(_task('recent_low', TaskPriority.LOW, age_seconds=30))
+            return await _drain(queue)
+
+        assert asyncio.run(scenario()) == ['old_low', 'new_high', 'recent_low']
+
+    def test_get_wakes_on_add(self):
+        async def scenario():
+            queue = TaskQueue()
+            waiter = asyncio.create_task(queue.get_next_task())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+
+            added_at = time.monotonic()
+            await queue.add_task(_task('wake', TaskPriority.LOW))
+            task_info = await waiter
+            return task_info.task_id, time.monotonic() - added_at
+
+        task_id, latency = asyncio.run(scenario())
+        assert task_id == 'wake'
+        assert latency < 0.05
+
+    def test_timeouts(self):
+        async def scenario():
+            queue = TaskQueue()
+            assert await queue.get_next_task(timeout=0) is None
+            assert await queue.get_next_task(timeout=0.01) is None
+            await queue.add_task(_task('later', TaskPriority.NORMAL))
+            return queue.get_queue_stats()
+
+        stats = asyncio.run(scenario())
+        assert stats['current_size'] == 1
+        assert stats['head_effective_score'] is not None
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OpenMetrics 匯出單元測試
+
+驗證註冊表的文字格式輸出、直方圖分桶、收集函數註冊，
+以及 scheduler_api 的 /metrics 內容協商。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import gc
+
+import pytest
+
+from jobseeker.metrics_exporter import (
+    OPENMETRICS_CONTENT_TYPE, MetricFamily, MetricsRegistry, wants_openmetrics
+)
+
+
+class _Component:
+    def collect_metrics(self):
+        return [MetricFamily('component_queue_depth', 'gauge', '佇列深度').add(3, queue='main')]
+
+
+class TestMetricsRegistry:
+    """註冊表測試"""
+
+    def test_counter_and_gauge_rendering(self):
+        registry = MetricsRegistry()
+        requests = registry.counter('scrape_requests', '請求數', ['site'])
+        requests.labels('seek').inc()
+        requests.labels(site='seek').inc(2)
+        registry.gauge('workers', '工作線程數').set(4)
+
+        text = registry.render()
+
+        assert '# TYPE scrape_requests counter' in text
+        assert 'scrape_requests_total{site="seek"} 3.0' in text
+        assert 'workers 4' in text
+        assert text.endswith('# EOF\n')
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram('fetch_seconds', '延遲', ['site'], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            latency.labels('indeed').observe(value)
+
+        text = registry.render()
+
+        assert 'fetch_seconds_bucket{site="indeed",le="0.1"} 1' in text
+        assert 'fetch_seconds_bucket{site="indeed",le="1.0"} 3' in text
+        assert 'fetch_seconds_bucket{site="indeed",le="+Inf"} 4' in text
+        assert 'fetch_seconds_count{site="indeed"} 4' in text
+        assert 'fetch_seconds_sum{site="indeed"} 4.25' in text
+
+    def test_same_name_with_different_labels_is_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter('jobs', labelnames=['site'])
+
+        assert registry.counter('jobs', labelnames=['site']) is registry.counter('jobs', labelnames=['site'])
+        with pytest.raises(ValueError):
+            registry.gauge('jobs')
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter('errors', labelnames=['message']).labels('bad "quote"\n').inc()
+
+        assert 'errors_total{message="bad \\"quote\\"\\n"} 1.0' in registry.render()
+
+    def test_bound_method_collectors_are_weak(self):
+        registry = MetricsRegistry()
+        component = _Component()
+        registry.register_collector('component', component.collect_metrics)
+
+        assert 'component_queue_depth{queue="main"} 3' in registry.render()
+
+        del component
+        gc.collect()
+        assert 'component_queue_depth' not in registry.render()
+
+    def test_failing_collector_does_not_break_scrape(self):
+        registry = MetricsRegistry()
+        registry.counter('ok').inc()
+        registry.register_collector('broken', lambda: 1 / 0)
+
+        text = registry.render()
+
+        assert 'ok_total 1.0' in text
+        assert 'jobseeker_collector_errors{collector="broken",error="ZeroDivisionError"} 1' in text
+
+    def test_accept_header_negotiation(self):
+        assert wants_openmetrics('application/openmetrics-text;version=1.0.0,text/plain;q=0.5')
+        assert wants_openmetrics('text/plain;version=0.0.4')
+        assert not wants_openmetrics('application/json')
+        assert not wants_openmetrics(None)
+
+
+class TestScrapingMetricsExport:
+    """爬蟲指標匯出測試"""
+
+    def test_fetch_latency_histogram_per_site(self):
+        from jobseeker.metrics_exporter import get_registry
+        from jobseeker.performance_monitoring import ScrapingMetrics
+
+        metrics = ScrapingMetrics()
+        metrics.record_request('exporter_test_site')
+        metrics.record_success('exporter_test_site', 0.3)
+
+        text = get_registry().render()
+
+        assert 'jobseeker_scrape_requests_total{site="exporter_test_site"}' in text
+        assert 'jobseeker_fetch_duration_seconds_bucket{site="exporter_test_site",le="0.5"}' in text
+
+
+class TestSchedulerApiMetrics:
+    """scheduler_api /metrics 內容協商測試"""
+
+    def test_openmetrics_and_json(self, tmp_path):
+        pytest.importorskip("httpx")
+        from fastapi.testclient import TestClient
+
+        import scheduler_api
+        from llm_json_scheduler import LLMJSONScheduler
+
+        scheduler = LLMJSONScheduler(
+            watch_directory=str(tmp_path / 'raw'), output_directory=str(tmp_path / 'processed')
+        )
+        scheduler_api.app.dependency_overrides[scheduler_api.get_scheduler] = lambda: scheduler
+        try:
+            client = TestClient(scheduler_api.app)
+
+            text_response = client.get('/metrics', headers={'Accept': 'application/openmetrics-text'})
+            assert text_response.headers['content-type'] == OPENMETRICS_CONTENT_TYPE
+            assert 'jobseeker_llm_in_flight 0' in text_response.text
+            assert text_response.text.endswith('# EOF\n')
+
+            json_response = client.get('/metrics', headers={'Accept': 'application/json'})
+            assert 'scheduler_metrics' in json_response.json()
+        finally:
+            scheduler_api.app.dependency_overrides.clear()
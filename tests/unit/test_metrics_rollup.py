@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+效能指標時間桶彙總單元測試
+
+驗證可合併直方圖的分位數精度，以及統計由時間桶合併計算、
+不受原始指標保留數量限制。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from jobseeker.performance_monitoring import (
+    LatencyHistogram, MetricsCollector, MetricType, RollupSeries
+)
+
+
+class TestLatencyHistogram:
+    """可合併直方圖測試"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(0, 1) for _ in range(5000)]
+        histogram = LatencyHistogram(relative_accuracy=0.01)
+        for value in samples:
+            histogram.add(value)
+
+        ordered = sorted(samples)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert abs(histogram.quantile(q) - exact) / exact <= 0.02
+
+    def test_merge_equals_single_histogram(self):
+        left, right, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 101):
+            (left if value % 2 else right).add(value / 10)
+            combined.add(value / 10)
+
+        left.merge(right)
+
+        assert left.count == combined.count
+        assert left.bins == combined.bins
+        assert left.quantile(0.95) == combined.quantile(0.95)
+
+
+class TestMetricsCollectorRollups:
+    """時間桶彙總測試"""
+
+    def test_stats_cover_more_than_raw_entries(self):
+        collector = MetricsCollector(max_entries=100)
+        for index in range(1000):
+            collector.add_metric(MetricType.REQUEST_COUNT, 1, 'seek')
+            collector.add_metric(MetricType.RESPONSE_TIME, 0.1 + (index % 10) / 10, 'seek')
+
+        stats = collector.get_stats(source='seek', time_window=timedelta(hours=1))
+
+        assert len(collector.metrics) == 100
+        assert stats.total_requests == 1000
+        assert 0.9 <= stats.p95_response_time <= 1.05
+        assert stats.max_response_time == 1.0
+
+    def test_time_window_and_source_filtering(self):
+        collector = MetricsCollector()
+        now = datetime.now()
+        collector.add_metric(MetricType.REQUEST_COUNT, 1, 'seek', timestamp=now - timedelta(hours=3))
+        collector.add_metric(MetricType.REQUEST_COUNT, 1, 'seek', timestamp=now)
+        collector.add_metric(MetricType.REQUEST_COUNT, 1, 'indeed', timestamp=now)
+
+        assert collector.get_stats(time_window=timedelta(hours=1)).total_requests == 2
+        assert collector.get_stats(source='seek', time_window=timedelta(hours=1)).total_requests == 1
+        assert collector.get_stats(source='seek', time_window=timedelta(hours=24)).total_requests == 2
+
+    def test_ring_overwrites_expired_buckets(self):
+        series = RollupSeries(resolution=10, slots=3)
+        series.add(5, 1.0)
+        series.add(35, 2.0)  # 與第一個時段落在同一位置
+
+        buckets = list(series.iter_buckets(0, 40))
+
+        assert [(start, bucket.count) for start, bucket in buckets] == [(30, 1)]
+
+    def test_timeseries_points(self):
+        collector = MetricsCollector()
+        now = datetime.now()
+        for offset in (0, 0, 120):
+            collector.add_metric(MetricType.RESPONSE_TIME, 0.5, 'seek',
+                                 timestamp=now - timedelta(seconds=offset))
+
+        points = collector.get_timeseries(MetricType.RESPONSE_TIME, time_window=timedelta(minutes=5))
+
+        assert sum(point['count'] for point in points) == 3
+        assert points == sorted(points, key=lambda point: point['timestamp'])
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多平台調度器執行層單元測試
+
+驗證同步平台搜尋不會阻塞事件循環、取消任務的傳遞，以及已取消任務 ID 的保留上限。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from multi_platform_scheduler import MultiPlatformScheduler, PlatformType, TaskStatus
+
+
+class BlockingRouter:
+    """模擬同步的智能路由器：每次搜尋阻塞調用線程"""
+
+    def __init__(self, delay=0.05, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.queries = []
+
+    def search_jobs(self, query, location, max_results, platforms):
+        self.queries.append(query)
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        return SimpleNamespace(jobs=[], total_jobs=0, total_execution_time=self.delay,
+                               successful_platforms=platforms, failed_platforms=[])
+
+
+async def _wait_until(predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "等待逾時"
+        await asyncio.sleep(0.02)
+
+
+class TestPlatformExecution:
+    """平台執行層測試"""
+
+    def test_event_loop_stays_responsive_under_load(self):
+        async def scenario():
+            scheduler = MultiPlatformScheduler()
+            scheduler.smart_router = BlockingRouter()
+            await scheduler.start()
+            try:
+                job_ids = [
+                    await scheduler.submit_search_job(
+                        f"python {i}", "Sydney",
+                        target_platforms=[PlatformType.LINKEDIN, PlatformType.INDEED, PlatformType.GOOGLE]
+                    )
+                    for i in range(100)
+                ]
+                await _wait_until(lambda: all(
+                    scheduler.get_job_status(job_id)['overall_status'] == 'completed'
+                    for job_id in job_ids
+                ))
+                return scheduler.get_scheduler_status()
+            finally:
+                await scheduler.stop()
+
+        status = asyncio.run(scenario())
+
+        # 300 次各 50ms 的阻塞搜尋若在循環上執行，延遲將達數秒
+        assert status['event_loop_lag']['samples'] > 0
+        assert status['event_loop_lag']['max_ms'] < 250
+        assert status['executor']['platforms']['linkedin']['max_workers'] == 5
+
+    def test_cancel_job_propagates(self):
+        async def scenario():
+            gate = threading.Event()
+            router = BlockingRouter(delay=0, gate=gate)
+            scheduler = MultiPlatformScheduler()
+            scheduler.smart_router = router
+            await scheduler.start()
+            try:
+                blockers = [
+                    await scheduler.submit_search_job("blocker", "", target_platforms=[PlatformType.LINKEDIN])
+                    for _ in range(5)
+                ]
+                job_id = await scheduler.submit_search_job("queued", "", target_platforms=[PlatformType.LINKEDIN])
+                await _wait_until(lambda: job_id in scheduler.job_tasks)
+
+                cancelled = await scheduler.cancel_job(job_id)
+                gate.set()
+                await _wait_until(lambda: all(
+                    scheduler.get_job_status(b)['overall_status'] == 'completed' for b in blockers
+                ))
+                return cancelled, scheduler.get_job_status(job_id), router.queries
+            finally:
+                await scheduler.stop()
+
+        cancelled, status, queries = asyncio.run(scenario())
+
+        assert cancelled is True
+        assert status['overall_status'] == TaskStatus.CANCELLED.value
+        assert status['platform_status']['linkedin']['status'] == 'cancelled'
+        assert 'queued' not in queries
+
+    def test_cancelled_job_ids_are_bounded(self):
+        scheduler = MultiPlatformScheduler()
+        scheduler.MAX_CANCELLED_JOBS = 3
+
+        for index in range(10):
+            scheduler._remember_cancelled(f'job-{index}')
+
+        assert scheduler.cancelled_jobs == {'job-7', 'job-8', 'job-9'}
+        assert len(scheduler._cancelled_order) == 3
+
+    def test_cancelled_queued_job_is_skipped_and_forgotten(self):
+        async def scenario():
+            scheduler = MultiPlatformScheduler()
+            scheduler.smart_router = BlockingRouter(delay=0)
+            job_id = await scheduler.submit_search_job("queued", "", target_platforms=[PlatformType.LINKEDIN])
+            await scheduler.cancel_job(job_id)
+            assert job_id in scheduler.cancelled_jobs
+
+            await scheduler.start()
+            try:
+                await _wait_until(lambda: scheduler.pending_jobs.empty())
+                await asyncio.sleep(0.05)
+                return job_id, scheduler
+            finally:
+                await scheduler.stop()
+
+        job_id, scheduler = asyncio.run(scenario())
+
+        assert job_id not in scheduler.cancelled_jobs
+        assert scheduler.smart_router.queries == []
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量品質統計單元測試
+
+驗證相異值估計、可合併的平均值與標準差、每日分數彙總的迴歸斜率，
+分批折疊的品質指標與一次計算相同，以及儀表板讀取預先彙總的分數。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from jobseeker.data_quality import DataValidator
+from jobseeker.enhanced_data_quality_manager import (
+    EnhancedDataQualityManager, JobQualityAccumulator
+)
+from jobseeker.model import JobPost, JobResponse, Location
+from jobseeker.quality_accumulators import (
+    DateHistogram, DistinctCounter, HyperLogLog, RunningStats, ScoreRollup
+)
+
+
+def _make_jobs(count, seed=5):
+    rng = random.Random(seed)
+    return [
+        JobPost(
+            title=rng.choice(['Python Developer', 'Data Engineer', 'QA', f'Role {index}']),
+            company_name=rng.choice(['Acme', 'Globex', None]),
+            job_url=rng.choice([f'https://example.com/job/{index}', 'not-a-url']),
+            location=Location(city=rng.choice(['Sydney', 'Taipei'])),
+            description=rng.choice([None, 'short', 'a much longer description ' * rng.randint(1, 20)]),
+            date_posted=rng.choice([None, date.today(), date.today() - timedelta(days=rng.randint(0, 200))])
+        )
+        for index in range(count)
+    ]
+
+
+def _scores(overall):
+    return {name: overall for name in ('overall', 'completeness', 'accuracy', 'consistency',
+                                       'uniqueness', 'freshness')}
+
+
+class TestDistinctCounting:
+    """相異值計數測試"""
+
+    def test_hyperloglog_estimate_within_error_bound(self):
+        sketch = HyperLogLog(precision=12)
+        for index in range(50000):
+            sketch.add(f'job-{index}')
+            sketch.add(f'job-{index}')
+
+        assert sketch.estimate() == pytest.approx(50000, rel=0.05)
+
+    def test_distinct_counter_switches_to_sketch_and_merges(self):
+        first, second = DistinctCounter(exact_limit=1000), DistinctCounter(exact_limit=1000)
+        for index in range(800):
+            first.add(index)
+            second.add(index + 400)
+
+        assert first.exact and len(first) == 800
+        first.merge(second)
+        assert not first.exact
+        assert len(first) == pytest.approx(1200, rel=0.05)
+
+
+class TestRunningStats:
+    """Welford 統計測試"""
+
+    def test_merged_stats_match_statistics_module(self):
+        rng = random.Random(1)
+        values = [rng.uniform(0, 500) for _ in range(300)]
+        parts = [RunningStats() for _ in range(3)]
+        for index, value in enumerate(values):
+            parts[index % 3].add(value)
+        merged = RunningStats()
+        for part in parts:
+            merged.merge(part)
+
+        assert merged.count == len(values)
+        assert merged.mean == pytest.approx(statistics.mean(values))
+        assert merged.stdev == pytest.approx(statistics.stdev(values))
+
+    def test_date_histogram_scores_by_reference_day(self):
+        histogram = DateHistogram()
+        today = date(2025, 1, 31)
+        histogram.add_date(today)
+        histogram.add_date(today - timedelta(days=20))
+        histogram.add_unparseable()
+        histogram.add_missing()
+
+        assert histogram.mean_score(today, ((1, 100), (30, 50)), 0, unparseable_score=10) == pytest.approx(160 / 3)
+        assert histogram.mean_score(today + timedelta(days=60), ((1, 100), (30, 50)), 0) == 0
+
+
+class TestScoreRollup:
+    """每日分數彙總測試"""
+
+    def test_merged_rollups_match_direct_regression(self):
+        rng = random.Random(2)
+        overall = [rng.uniform(40, 90) + index * 0.8 for index in range(40)]
+        days = [ScoreRollup() for _ in range(4)]
+        for index, value in enumerate(overall):
+            days[index // 10].add(_scores(value), index)
+
+        rollup = ScoreRollup.combine(days)
+        x_mean = (len(overall) - 1) / 2
+        y_mean = statistics.mean(overall)
+        expected = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(overall)) / \
+            sum((x - x_mean) ** 2 for x in range(len(overall)))
+
+        assert rollup.count == 40
+        assert rollup.slope() == pytest.approx(expected)
+        assert rollup.averages()['overall'] == pytest.approx(y_mean)
+        assert rollup.latest == 39
+
+
+class TestIncrementalQualityMetrics:
+    """分批品質指標測試"""
+
+    def test_merged_batches_match_single_pass(self):
+        jobs = _make_jobs(300)
+        validator = DataValidator()
+        whole = JobQualityAccumulator()
+        whole.add_jobs(jobs, validator)
+        merged = JobQualityAccumulator()
+        for start in range(0, len(jobs), 70):
+            batch = JobQualityAccumulator()
+            batch.add_jobs(jobs[start:start + 70], validator)
+            merged.merge(batch)
+
+        expected, actual = whole.to_metrics('seek'), merged.to_metrics('seek')
+        for name in ('overall_score', 'completeness_score', 'accuracy_score', 'consistency_score',
+                     'uniqueness_score', 'freshness_score', 'sample_size'):
+            assert getattr(actual, name) == pytest.approx(getattr(expected, name))
+
+    def test_date_objects_score_by_age(self):
+        jobs = _make_jobs(1)
+        jobs[0].date_posted = date.today()
+        accumulator = JobQualityAccumulator()
+        accumulator.add_jobs(jobs, DataValidator())
+
+        assert accumulator.freshness_score() == 100.0
+
+    def test_dashboard_reads_rollups(self):
+        manager = EnhancedDataQualityManager()
+        batches = [_make_jobs(50, seed=seed) for seed in range(4)]
+        metrics = [manager.quality_analyzer.analyze_quality(JobResponse(jobs=jobs), 'seek') for jobs in batches]
+
+        dashboard = manager.get_quality_dashboard()
+        trends = manager.get_quality_trends('seek')
+
+        assert dashboard['sites'] == ['seek']
+        assert dashboard['total_entries'] == 4
+        assert dashboard['average_scores']['seek']['overall'] == \
+            pytest.approx(statistics.mean(m.overall_score for m in metrics))
+        assert dashboard['cumulative_scores']['seek']['sample_size'] == 200
+        assert trends['total_samples'] == 4
+        assert trends['daily_averages'][date.today().isoformat()]['sample_size'] == 4
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜尋結果儲存單元測試
+
+驗證 SearchResultStore 的分頁讀取、記憶體淘汰與跨實例共用。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import pytest
+
+from web_app.result_store import SearchResultStore
+
+
+def _make_jobs(count):
+    return [
+        {
+            'title': f'Job {i}',
+            'company': 'ExampleCo',
+            'location': 'Sydney',
+            'description': 'x' * 10,
+            'salary_min': 1000.0 + i,
+            'salary_max': None,
+            'salary_currency': 'AUD',
+            'interval': 'yearly',
+            'date_posted': '2025-01-01',
+            'job_url': f'https://example.com/{i}',
+            'job_url_direct': '',
+            'site': 'seek',
+            'job_type': 'fulltime',
+            'is_remote': i % 2 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SearchResultStore(tmp_path / 'results.db', max_memory_rows=10)
+
+
+class TestSearchResultStore:
+    """搜尋結果儲存測試"""
+
+    def test_put_and_get_page(self, store):
+        store.put('s1', _make_jobs(7), {'query': 'python'})
+
+        page = store.get_page('s1', 2, 3)
+        assert [job['title'] for job in page] == ['Job 3', 'Job 4', 'Job 5']
+        assert store.get_metadata('s1')['query'] == 'python'
+        assert store.count('s1') == 7
+
+    def test_evicted_results_are_served_from_disk(self, store):
+        store.put('old', _make_jobs(6), {'query': 'old'})
+        store.put('new', _make_jobs(6), {'query': 'new'})
+
+        assert store.get_stats()['memory_searches'] == 1
+        page = store.get_page('old', 1, 2)
+        assert [job['title'] for job in page] == ['Job 0', 'Job 1']
+        assert page[0]['is_remote'] is True
+        assert page[0]['salary_min'] == 1000.0
+        assert len(list(store.iter_rows('old', chunk_size=4))) == 6
+
+    def test_results_shared_between_instances(self, store, tmp_path):
+        store.put('shared', _make_jobs(3), {'query': 'shared'})
+
+        other = SearchResultStore(tmp_path / 'results.db')
+        assert other.exists('shared')
+        assert other.get_page('shared', 1, 10)[2]['title'] == 'Job 2'
+        assert other.latest_search_id() == 'shared'
+
+    def test_purge_expired(self, tmp_path):
+        store = SearchResultStore(tmp_path / 'results.db', ttl_hours=-1)
+        store.put('expired', _make_jobs(2), {})
+
+        assert not store.exists('expired')
+        assert store.get_page('expired', 1, 10) == []
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek 並行分頁單元測試
+
+以假的瀏覽器上下文與分頁驗證 page= 網址、同時開啟的分頁數上限、
+導航間隔（含第 1 頁）不低於速率限制、結果按頁碼合併，以及依總數或空白頁停止。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+SEARCH_URL = 'https://www.seek.com.au/jobs?keywords=python&where=Sydney'
+
+
+def _results_html(page_number, count=2, total=None):
+    cards = ''.join(f'<article data-automation="jobListing"><a data-automation="jobTitle" '
+                    f'href="/job/{page_number}-{index}">Role {page_number}-{index}</a></article>'
+                    for index in range(count))
+    total_html = f'<span data-automation="totalJobsCount">{total}</span>' if total is not None else ''
+    return f'<html>{total_html}{cards}</html>'
+
+
+class _Site:
+    """假的 Seek：記錄每次導航的時間與同時進行的導航數"""
+
+    def __init__(self, pages, total=None, delays=None):
+        self.pages = pages
+        self.total = total
+        self.delays = delays or {}
+        self.navigations = []
+        self.active = 0
+        self.max_active = 0
+
+
+class _FakeTab:
+    def __init__(self, site, html=''):
+        self.site = site
+        self.html = html
+        self.url = SEARCH_URL
+        self.closed = False
+
+    async def goto(self, url, wait_until, timeout=None):
+        page_number = int(parse_qs(urlsplit(url).query).get('page', ['1'])[0])
+        self.site.navigations.append((page_number, time.monotonic()))
+        self.site.active += 1
+        self.site.max_active = max(self.site.max_active, self.site.active)
+        await asyncio.sleep(self.site.delays.get(page_number, 0.03))
+        self.site.active -= 1
+        self.url = url
+        count = self.site.pages.get(page_number, 0)
+        self.html = _results_html(page_number, count)
+
+    async def wait_for_selector(self, selector, timeout):
+        if 'jobListing' not in self.html:
+            raise TimeoutError('no results')
+
+    async def content(self):
+        return self.html
+
+    async def query_selector_all(self, selector):
+        return []
+
+    async def query_selector(self, selector):
+        return None
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self, site):
+        self.site = site
+        self.tabs = []
+
+    async def new_page(self):
+        tab = _FakeTab(self.site)
+        self.tabs.append(tab)
+        return tab
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engine_module = pytest.importorskip('jobseeker.seek.seek_crawler_engine')
+
+    def make(site, **kwargs):
+        engine = engine_module.SeekCrawlerEngine(enable_ocr=False, storage_path=str(tmp_path),
+                                                 screenshot_mode='never', **kwargs)
+        engine.search_url = SEARCH_URL
+        engine.page = _FakeTab(site, _results_html(1, site.pages[1], site.total))
+        engine.context = _FakeContext(site)
+        return engine
+
+    return make
+
+
+class TestConcurrentPagination:
+    """並行分頁測試"""
+
+    def test_page_url_replaces_page_parameter(self, make_engine):
+        engine = make_engine(_Site({1: 2}))
+
+        assert engine._page_url(1) == SEARCH_URL
+        assert parse_qs(urlsplit(engine._page_url(7)).query) == {
+            'keywords': ['python'], 'where': ['Sydney'], 'page': ['7']}
+
+    def test_tabs_respect_cap_and_rate_limit_and_merge_in_order(self, make_engine):
+        site = _Site({page: 2 for page in range(1, 11)}, delays={2: 0.2, 3: 0.01})
+        engine = make_engine(site, concurrent_pages=3, min_request_interval=0.02)
+
+        jobs = asyncio.run(engine.handle_pagination(max_pages=10))
+
+        assert [job['title'] for job in jobs] == [f'Role {page}-{index}' for page in range(1, 11) for index in range(2)]
+        assert site.max_active <= 3 and site.max_active > 1
+        starts = [started for _, started in site.navigations]
+        assert all(later - earlier >= 0.015 for earlier, later in zip(starts, starts[1:]))
+        assert len(engine.context.tabs) == 2 and all(tab.closed for tab in engine.context.tabs)
+
+    def test_total_count_limits_pages(self, make_engine):
+        site = _Site({1: 2, 2: 2, 3: 1}, total=5)
+        engine = make_engine(site, concurrent_pages=4, min_request_interval=0)
+
+        jobs = asyncio.run(engine.handle_pagination(max_pages=10))
+
+        assert len(jobs) == 5
+        assert sorted(page for page, _ in site.navigations) == [2, 3]
+
+    def test_results_stop_at_first_empty_page(self, make_engine):
+        site = _Site({1: 2, 2: 2, 3: 0, 4: 2, 5: 2, 6: 2}, delays={3: 0.0})
+        engine = make_engine(site, concurrent_pages=3, min_request_interval=0)
+
+        jobs = asyncio.run(engine.handle_pagination(max_pages=6))
+
+        assert [job['title'] for job in jobs][-1] == 'Role 2-1' and len(jobs) == 4
+        # 第 3 頁先回報空白，之後的頁面不再開始
+        assert sorted(page for page, _ in site.navigations) == [2, 3, 4]
+
+    def test_first_navigation_counts_toward_rate_limit(self, make_engine):
+        site = _Site({1: 2, 2: 2, 3: 2}, delays={1: 0.0, 2: 0.0})
+        engine = make_engine(site, concurrent_pages=2, min_request_interval=0.1)
+
+        async def main():
+            assert await engine.navigate_to_search('python', 'Sydney')
+            return await engine.handle_pagination(max_pages=3)
+
+        jobs = asyncio.run(main())
+
+        assert len(jobs) == 6
+        starts = [started for _, started in site.navigations]
+        assert [page for page, _ in site.navigations] == [1, 2, 3]
+        assert all(later - earlier >= 0.09 for earlier, later in zip(starts, starts[1:]))
+
+    def test_enhanced_scraper_defaults_to_one_tab(self, tmp_path):
+        enhanced = pytest.importorskip('jobseeker.seek.seek_scraper_enhanced')
+
+        assert enhanced.SeekScraperEnhanced(storage_path=str(tmp_path)).concurrent_pages == 1
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek HTTP 快速路徑單元測試
+
+以假的 session / 回應驗證搜尋 API 與 SEEK_REDUX_DATA 的欄位對應、阻擋判定、
+決策快取的有效期，以及 SeekScraper 只在 HTTP 失敗時才改用瀏覽器（網路錯誤先重試一次，
+只有資料結構不符才記錄到決策快取）。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from jobseeker.error_handling import ErrorType
+from jobseeker.exception import SeekException
+from jobseeker.model import ScraperInput, Site
+from jobseeker.seek import SeekScraper
+from jobseeker.seek import http_search
+from jobseeker.seek.http_search import (
+    STRATEGY_BROWSER, STRATEGY_HTTP, SearchStrategyCache, SeekHttpSearch, build_search_params,
+    map_job, parse_redux_jobs
+)
+
+
+def _api_job(index):
+    return {
+        'id': str(80000000 + index),
+        'title': f'Python Developer {index}',
+        'advertiser': {'id': '1', 'description': 'Acme Labs'},
+        'locations': [{'label': 'Sydney NSW', 'countryCode': 'AU'}],
+        'salaryLabel': '$120,000 - $140,000 per year',
+        'workTypes': ['Full time'],
+        'listingDate': '2025-01-20T03:00:00Z',
+        'teaser': 'Build data pipelines, remote friendly',
+    }
+
+
+class _FakeResponse:
+    def __init__(self, status_code=200, payload=None, text=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = text if text is not None else json.dumps(payload)
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError('not json')
+        return self._payload
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append((url, params))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TestMapping:
+    """欄位對應測試"""
+
+    def test_v5_job_maps_to_process_job_fields(self):
+        raw = map_job(_api_job(1))
+
+        assert raw == {
+            'title': 'Python Developer 1',
+            'company': 'Acme Labs',
+            'location': 'Sydney NSW',
+            'salary': '$120,000 - $140,000 per year',
+            'job_type': 'Full time',
+            'date_posted': '2025-01-20',
+            'description': 'Build data pipelines, remote friendly',
+            'job_url': 'https://www.seek.com.au/job/80000001',
+        }
+        job = SeekScraper()._process_job_data(raw)
+        assert job.location.state == 'NSW'
+        assert job.compensation.min_amount == 120000
+        assert job.is_remote
+
+    def test_legacy_fields_and_missing_ids(self):
+        legacy = {'id': 5, 'title': 'QA', 'companyName': 'Globex', 'location': 'Melbourne',
+                  'area': 'VIC', 'workType': 'Contract/Temp', 'salary': '$90 per hour'}
+
+        raw = map_job(legacy)
+        assert (raw['location'], raw['job_type'], raw['salary']) == ('Melbourne, VIC', 'Contract/Temp', '$90 per hour')
+        assert map_job({'title': 'no id'}) is None
+
+    def test_search_params_map_job_type_codes(self):
+        params = build_search_params('python', 'Sydney NSW', 'fulltime', 25, page=2)
+
+        assert params['keywords'] == 'python' and params['where'] == 'Sydney NSW'
+        assert (params['worktype'], params['distance'], params['page']) == ('242', 25, 2)
+
+    def test_redux_state_with_undefined_values(self):
+        state = {'results': {'results': {'jobs': [_api_job(1), _api_job(2)]}}}
+        source = json.dumps(state).replace('"teaser"', '"extra": undefined, "teaser"', 1)
+        html = f'<script>window.SEEK_REDUX_DATA = {source};</script><script>x = 1</script>'
+
+        assert [raw['job_url'][-1] for raw in parse_redux_jobs(html)] == ['1', '2']
+        with pytest.raises(SeekException) as error:
+            parse_redux_jobs('<html>no state</html>')
+        assert error.value.error_type == ErrorType.PARSING_ERROR
+
+
+class TestHttpSearch:
+    """HTTP 取得結果測試"""
+
+    def test_api_parse_failure_falls_back_to_redux_page(self):
+        html = 'window.SEEK_REDUX_DATA = ' + json.dumps({'results': {'results': {'jobs': [_api_job(3)]}}})
+        session = _FakeSession([_FakeResponse(payload={'unexpected': True}), _FakeResponse(text=html)])
+
+        raw_jobs = SeekHttpSearch(session).fetch_page('python', page=1, page_url='https://www.seek.com.au/python-jobs')
+
+        assert [raw['title'] for raw in raw_jobs] == ['Python Developer 3']
+        assert [url for url, _ in session.calls] == [http_search.SEARCH_API_URL, 'https://www.seek.com.au/python-jobs']
+
+    @pytest.mark.parametrize('response', [
+        _FakeResponse(status_code=403, text='Forbidden'),
+        _FakeResponse(status_code=200, text='<html><title>Access Denied</title></html>'),
+    ])
+    def test_blocked_response_does_not_try_html(self, response):
+        session = _FakeSession([response])
+
+        with pytest.raises(SeekException) as error:
+            SeekHttpSearch(session).fetch_page('python', page_url='https://www.seek.com.au/python-jobs')
+
+        assert error.value.error_type == ErrorType.RATE_LIMIT
+        assert len(session.calls) == 1
+
+
+class TestStrategyCache:
+    """決策快取測試"""
+
+    def test_failure_expires_and_success_sticks(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(http_search.time, 'monotonic', lambda: now[0])
+        cache = SearchStrategyCache(failure_ttl=60)
+        url = 'https://www.seek.com.au/python-jobs'
+
+        assert cache.strategy(url) == STRATEGY_HTTP
+        cache.record_failure(url, 'rate_limit')
+        assert cache.strategy('https://www.seek.com.au/other-jobs') == STRATEGY_BROWSER
+        assert cache.snapshot()['www.seek.com.au']['reason'] == 'rate_limit'
+        now[0] += 61
+        assert cache.strategy(url) == STRATEGY_HTTP
+        cache.record_success(url)
+        now[0] += 10 ** 6
+        assert cache.strategy(url) == STRATEGY_HTTP
+
+
+class TestSeekScraperFastPath:
+    """SeekScraper 路徑選擇測試"""
+
+    @pytest.fixture
+    def make_scraper(self, monkeypatch):
+        def make(responses, results_wanted=30):
+            scraper = SeekScraper(strategy_cache=SearchStrategyCache())
+            scraper.session = _FakeSession(responses)
+            scraper.scraper_input = ScraperInput(site_type=[Site.SEEK], search_term='python',
+                                                 results_wanted=results_wanted)
+            scraper.browser_pages = []
+
+            async def no_sleep(delay):
+                return None
+
+            async def init_browser():
+                scraper.browser = object()
+
+            async def close_browser():
+                scraper.browser = None
+
+            async def scrape_page(url):
+                scraper.browser_pages.append(url)
+                return [scraper._process_job_data(map_job(_api_job(100 + len(scraper.browser_pages))))]
+
+            monkeypatch.setattr('jobseeker.seek.asyncio.sleep', no_sleep)
+            scraper._init_browser = init_browser
+            scraper._close_browser = close_browser
+            scraper._scrape_page = scrape_page
+            return scraper
+
+        return make
+
+    def test_http_results_skip_browser(self, make_scraper):
+        pages = [_FakeResponse(payload={'data': [_api_job(page * 20 + index) for index in range(20)]})
+                 for page in range(2)]
+        scraper = make_scraper(pages)
+
+        response = asyncio.run(scraper._async_scrape())
+
+        assert len(response.jobs) == 30
+        assert scraper.browser_pages == []
+        assert scraper.fetch_strategy == STRATEGY_HTTP
+        assert scraper.strategy_cache.strategy('https://www.seek.com.au') == STRATEGY_HTTP
+
+    def test_block_resumes_in_browser_without_caching(self, make_scraper):
+        pages = [_FakeResponse(payload={'data': [_api_job(index) for index in range(20)]}),
+                 _FakeResponse(status_code=429, text='Too Many Requests'),
+                 _FakeResponse(status_code=429, text='Too Many Requests')]
+        scraper = make_scraper(pages)
+
+        response = asyncio.run(scraper._async_scrape())
+
+        assert len(response.jobs) == 21
+        assert scraper.browser_pages == ['https://www.seek.com.au/python-jobs?page=2']
+        assert scraper.fetch_strategy == STRATEGY_BROWSER
+
+        # 阻擋屬暫時性，下次仍先嘗試 HTTP
+        scraper.browser_pages.clear()
+        asyncio.run(scraper._async_scrape())
+        assert len(scraper.session.calls) == 3
+        assert scraper.browser_pages[0] == 'https://www.seek.com.au/python-jobs'
+
+    def test_network_error_is_retried_once(self, make_scraper):
+        timeout = TimeoutError('read timed out')
+        pages = [timeout, timeout, _FakeResponse(payload={'data': [_api_job(index) for index in range(20)]})]
+        scraper = make_scraper(pages, results_wanted=20)
+
+        response = asyncio.run(scraper._async_scrape())
+
+        assert len(response.jobs) == 20 and scraper.browser_pages == []
+        assert len(scraper.session.calls) == 3
+        assert scraper.fetch_strategy == STRATEGY_HTTP
+
+    def test_repeated_network_errors_fall_back_without_caching(self, make_scraper):
+        scraper = make_scraper([TimeoutError('read timed out')] * 4, results_wanted=1)
+
+        asyncio.run(scraper._async_scrape())
+
+        assert scraper.browser_pages == ['https://www.seek.com.au/python-jobs']
+        assert scraper.strategy_cache.strategy('https://www.seek.com.au') == STRATEGY_HTTP
+        assert scraper.strategy_cache.snapshot() == {}
+
+    def test_structural_miss_is_remembered(self, make_scraper):
+        pages = [_FakeResponse(text='<html>not json</html>'), _FakeResponse(text='<html>no redux state</html>')]
+        scraper = make_scraper(pages, results_wanted=1)
+
+        asyncio.run(scraper._async_scrape())
+        assert scraper.browser_pages == ['https://www.seek.com.au/python-jobs']
+        assert scraper.strategy_cache.strategy('https://www.seek.com.au') == STRATEGY_BROWSER
+
+        # 決策快取生效期間不再嘗試 HTTP
+        scraper.browser_pages.clear()
+        asyncio.run(scraper._async_scrape())
+        assert len(scraper.session.calls) == 2
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek OCR 管線單元測試
+
+以假的 OCR 引擎驗證結果解析、按影像雜湊的磁碟快取（跨實例命中與數量上限）、
+同一影像同時提交只辨識一次、進程內引擎依序呼叫、工作進程失敗時的結果，以及爬蟲引擎只對
+職位卡片做 OCR 並在背景完成後保存。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from jobseeker.seek.ocr_pipeline import OCRPipeline, combine_card_results, image_digest, parse_ocr_result
+
+
+class _FakeEngine:
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def ocr(self, image, cls=True):
+        with self.lock:
+            self.calls.append(image)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        if self.delay:
+            threading.Event().wait(self.delay)
+        with self.lock:
+            self.active -= 1
+        text = image.decode()
+        return [[[[[0, 0], [10, 0], [10, 5], [0, 5]], (text, 0.9)],
+                 [[[0, 6], [10, 6], [10, 9], [0, 9]], ('Sydney NSW', 0.7)]]]
+
+
+class _FailingExecutor:
+    async def run(self, fn, *args):
+        raise RuntimeError('worker crashed')
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class TestParsing:
+    """OCR 輸出解析測試"""
+
+    def test_parse_ocr_result(self):
+        result = parse_ocr_result(_FakeEngine().ocr(b'Python Developer'))
+
+        assert result['text'] == 'Python Developer Sydney NSW'
+        assert result['confidence'] == pytest.approx(0.8)
+        assert result['details'][0]['bbox'][1] == [10.0, 0.0]
+        assert parse_ocr_result([None]) == {'enabled': True, 'text': '', 'confidence': 0, 'details': []}
+
+    def test_combine_card_results_keeps_cards(self):
+        cards = [{**parse_ocr_result(_FakeEngine().ocr(b'A')), 'digest': 'a', 'cached': True},
+                 {'enabled': False, 'text': '', 'confidence': 0, 'details': [], 'error': 'x'}]
+
+        combined = combine_card_results(cards)
+
+        assert combined['enabled'] and combined['text'] == 'A Sydney NSW'
+        assert [card['cached'] for card in combined['cards']] == [True, False]
+
+
+class TestPipeline:
+    """快取與並行測試"""
+
+    def test_disk_cache_hits_across_instances(self, tmp_path):
+        engine = _FakeEngine()
+        first = OCRPipeline(cache_dir=str(tmp_path), engine=engine)
+        result = asyncio.run(first.recognize(b'Data Engineer'))
+
+        second = OCRPipeline(cache_dir=str(tmp_path), engine=engine)
+        cached = asyncio.run(second.recognize(b'Data Engineer'))
+
+        assert not result['cached'] and cached['cached']
+        assert cached['text'] == result['text'] and cached['digest'] == image_digest(b'Data Engineer')
+        assert len(engine.calls) == 1
+        assert second.stats['cache_hits'] == 1
+
+    def test_cache_is_bounded(self, tmp_path):
+        pipeline = OCRPipeline(cache_dir=str(tmp_path), max_cache_entries=2, engine=_FakeEngine())
+        asyncio.run(pipeline.recognize_many([b'one', b'two', b'three']))
+
+        assert pipeline.cache.size() == 2
+
+    def test_identical_images_submitted_together_run_once(self):
+        engine = _FakeEngine(delay=0.05)
+        pipeline = OCRPipeline(engine=engine)
+
+        results = asyncio.run(pipeline.recognize_many([b'card', b'card', b'other']))
+
+        assert [result['text'].split()[0] for result in results] == ['card', 'card', 'other']
+        assert sorted(engine.calls) == [b'card', b'other']
+        assert (pipeline.stats['cache_misses'], pipeline.stats['inflight_hits']) == (2, 1)
+
+    def test_in_process_engine_is_never_called_concurrently(self):
+        engine = _FakeEngine(delay=0.02)
+        pipeline = OCRPipeline(engine=engine)
+
+        asyncio.run(pipeline.recognize_many([f'card {index}'.encode() for index in range(6)]))
+        pipeline.shutdown()
+
+        assert len(engine.calls) == 6 and engine.max_active == 1
+
+    def test_worker_failure_returns_disabled_result(self, tmp_path):
+        pipeline = OCRPipeline(cache_dir=str(tmp_path), executor=_FailingExecutor())
+
+        result = asyncio.run(pipeline.recognize(b'card'))
+
+        assert not result['enabled'] and 'worker crashed' in result['error']
+        assert pipeline.cache.size() == 0
+
+
+class _FakeCard:
+    def __init__(self, text):
+        self.text = text
+
+    async def screenshot(self, type='png'):
+        return self.text.encode()
+
+
+class _FakePage:
+    def __init__(self, html, cards):
+        self.html = html
+        self.cards = cards
+        self.url = 'https://www.seek.com.au/jobs'
+
+    async def content(self):
+        return self.html
+
+    async def query_selector_all(self, selector):
+        return self.cards
+
+    async def query_selector(self, selector):
+        return None
+
+
+class TestCrawlerEngineOCR:
+    """爬蟲引擎 OCR 流程測試"""
+
+    def test_ocr_runs_on_job_cards_without_full_page_screenshot(self, tmp_path):
+        engine_module = pytest.importorskip('jobseeker.seek.seek_crawler_engine')
+        engine = engine_module.SeekCrawlerEngine(enable_ocr=False, storage_path=str(tmp_path))
+        engine.enable_ocr = True
+        engine.ocr_pipeline = OCRPipeline(cache_dir=str(tmp_path / 'ocr_cache'), engine=_FakeEngine())
+        html = ''.join(f'<article data-automation="jobListing"><a data-automation="jobTitle" href="/job/{index}">'
+                       f'Role {index}</a></article>' for index in range(2))
+        engine.page = _FakePage(html, [_FakeCard('Role 0'), _FakeCard('Role 1')])
+        shots, saved = [], []
+
+        async def take_intelligent_screenshot(prefix='seek_page', page=None):
+            shots.append(prefix)
+
+        async def save_raw_data(data, data_type='job_listings'):
+            saved.append(data)
+            return ''
+
+        engine.take_intelligent_screenshot = take_intelligent_screenshot
+        engine.save_raw_data = save_raw_data
+
+        jobs = asyncio.run(engine.handle_pagination(max_pages=1))
+
+        assert len(jobs) == 2 and shots == []
+        assert saved[0]['ocr_result']['text'] == 'Role 0 Sydney NSW\nRole 1 Sydney NSW'
+        assert len(saved[0]['ocr_result']['cards']) == 2
+        assert engine.stats['ocr_processed'] == 2
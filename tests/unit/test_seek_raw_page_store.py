@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seek 原始頁面存儲單元測試
+
+驗證相同 HTML 只存一份壓縮內容、記錄可完整讀回、submit 不等待寫檔，
+以及爬蟲引擎換頁時原始數據經由背景佇列寫入。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from jobseeker.seek.raw_page_store import RawPageStore
+
+
+def _page(number, html):
+    return {'page_number': number, 'jobs': [{'title': f'Role {number}'}], 'html_content': html}
+
+
+class TestRawPageStore:
+    """寫入後置存儲測試"""
+
+    def test_identical_pages_share_one_compressed_blob(self, tmp_path):
+        store = RawPageStore(tmp_path)
+        html = '<html>' + '<article>Python Developer</article>' * 500 + '</html>'
+
+        async def main():
+            paths = [await store.submit(_page(1, html), 'page_1'),
+                     await store.submit(_page(2, html), 'page_2'),
+                     await store.submit(_page(3, '<html>other</html>'), 'page_3')]
+            await store.close()
+            return paths
+
+        paths = asyncio.run(main())
+
+        assert store.stats['records_written'] == 3
+        assert (store.stats['blobs_written'], store.stats['duplicate_pages']) == (2, 1)
+        assert store.stats['compressed_bytes'] < len(html) / 10
+        first, second = (json.loads(Path(path).read_text(encoding='utf-8')) for path in paths[:2])
+        assert 'html_content' not in first and first['html_blob'] == second['html_blob']
+        assert store.load_page(paths[1]) == _page(2, html) | {key: second[key] for key in
+                                                              ('html_digest', 'html_blob', 'html_size')}
+
+    def test_submit_does_not_wait_for_disk(self, tmp_path):
+        store = RawPageStore(tmp_path)
+        release = threading.Event()
+        write = store._write
+
+        def slow_write(path, record):
+            release.wait(5)
+            write(path, record)
+
+        store._write = slow_write
+
+        async def main():
+            path = await store.submit(_page(1, '<html></html>'), 'page_1')
+            pending = not Path(path).exists()
+            release.set()
+            await store.flush()
+            return path, pending
+
+        path, pending = asyncio.run(main())
+        assert pending and Path(path).exists()
+
+    def test_write_errors_are_counted_and_do_not_stop_the_thread(self, tmp_path):
+        store = RawPageStore(tmp_path)
+
+        async def main():
+            await store.submit({'html_content': '<p>x</p>', 'bad': {(1, 2): 'tuple key'}}, 'page_1')
+            path = await store.submit(_page(2, '<p>y</p>'), 'page_2')
+            await store.close()
+            return path
+
+        path = asyncio.run(main())
+        assert store.stats['errors'] == 1
+        assert Path(path).exists()
+
+    def test_known_digests_are_bounded(self, tmp_path):
+        store = RawPageStore(tmp_path, max_known_digests=2)
+
+        async def main():
+            for number in range(5):
+                await store.submit(_page(number, f'<html>{number}</html>'), f'page_{number}')
+            await store.submit(_page(5, '<html>0</html>'), 'page_5')
+            await store.close()
+
+        asyncio.run(main())
+        assert len(store._known_digests) == 2
+        # 已淘汰的摘要仍以 blob 是否存在判斷為重複
+        assert (store.stats['blobs_written'], store.stats['duplicate_pages']) == (5, 1)
+
+
+class _FakePage:
+    def __init__(self, html):
+        self.html = html
+        self.url = 'https://www.seek.com.au/jobs'
+
+    async def content(self):
+        return self.html
+
+    async def query_selector(self, selector):
+        return None
+
+
+class TestCrawlerEnginePersistence:
+    """爬蟲引擎原始數據保存測試"""
+
+    def test_pagination_persists_through_store(self, tmp_path):
+        engine_module = pytest.importorskip('jobseeker.seek.seek_crawler_engine')
+        engine = engine_module.SeekCrawlerEngine(enable_ocr=False, storage_path=str(tmp_path))
+        engine.page = _FakePage('<article data-automation="jobListing"><a data-automation="jobTitle" '
+                                'href="/job/1">Python Developer</a></article>')
+
+        jobs = asyncio.run(engine.handle_pagination(max_pages=1))
+
+        records = list((tmp_path / 'raw_data').glob('*/page_1_*.json'))
+        assert len(jobs) == 1 and len(records) == 1
+        record = engine.raw_store.load_page(str(records[0]))
+        assert record['jobs'][0]['title'] == 'Python Developer'
+        assert 'jobListing' in record['html_content']
+        asyncio.run(engine.raw_store.close())
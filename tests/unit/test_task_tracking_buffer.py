@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+任務追蹤事件寫後緩衝單元測試
+
+驗證事件批量寫入數據庫、Redis 命令合併為 pipeline，以及關閉時寫出剩餘事件。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from task_tracking_models import TaskTrackingDatabase, TaskTrackingEvent
+from task_tracking_service import (
+    EventType, EventWriteBehindBuffer, TaskEvent, TaskTrackingService, task_tracking_service
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stop_global_service():
+    """模組匯入時建立的全局服務在測試結束後關閉"""
+    yield
+    task_tracking_service.shutdown()
+
+
+class _RecordingPipeline:
+    def __init__(self, commands):
+        self.commands = commands
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        self.commands.append(('execute', (), {}))
+
+
+class _RecordingRedis:
+    def __init__(self):
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return _RecordingPipeline(self.commands)
+
+
+def _count_events(database, job_id):
+    session = database.get_session()
+    try:
+        return session.query(TaskTrackingEvent).filter_by(job_id=job_id).count()
+    finally:
+        session.close()
+
+
+def _event(job_id, index):
+    return TaskEvent(
+        job_id=job_id,
+        event_type=EventType.STATUS_CHANGED,
+        platform='seek',
+        message=f'進度 {index}',
+        data={'index': index},
+        timestamp=datetime.now()
+    )
+
+
+class TestEventWriteBehindBuffer:
+    """事件寫後緩衝測試"""
+
+    def test_events_written_in_batches(self, tmp_path):
+        database = TaskTrackingDatabase(f"sqlite:///{tmp_path / 'events.db'}")
+        buffer = EventWriteBehindBuffer(database, batch_size=50, flush_interval=5.0)
+        try:
+            for index in range(120):
+                buffer.submit_event(_event('job-1', index))
+            assert buffer.flush(timeout=10)
+
+            assert _count_events(database, 'job-1') == 120
+            stats = buffer.get_stats()
+            assert stats['events_written'] == 120
+            assert stats['batches_written'] <= 3
+            assert stats['pending'] == 0
+        finally:
+            buffer.close()
+
+    def test_redis_commands_pipelined_and_cache_coalesced(self, tmp_path):
+        database = TaskTrackingDatabase(f"sqlite:///{tmp_path / 'events.db'}")
+        redis_client = _RecordingRedis()
+        buffer = EventWriteBehindBuffer(database, redis_client=redis_client, flush_interval=5.0)
+        try:
+            buffer.submit_event(_event('job-2', 0))
+            buffer.submit_event(_event('job-2', 1))
+            buffer.submit_cache_update('job-2', {'progress': 10})
+            buffer.submit_cache_update('job-2', {'progress': 20, 'status': 'processing'})
+            buffer.flush(timeout=10)
+        finally:
+            buffer.close()
+
+        names = [name for name, _, _ in redis_client.commands]
+        assert names.count('execute') == 1
+        assert names.count('publish') == 2
+        assert names.count('hset') == 1
+        hset_mapping = next(kwargs['mapping'] for name, _, kwargs in redis_client.commands if name == 'hset')
+        assert hset_mapping == {'progress': '20', 'status': '"processing"'}
+
+    def test_service_shutdown_flushes_events(self, tmp_path):
+        database = TaskTrackingDatabase(f"sqlite:///{tmp_path / 'service.db'}")
+        service = TaskTrackingService(database=database, enable_real_time=False)
+        service.event_buffer.flush_interval = 5.0
+
+        job_id = service.create_job('python', 'Sydney', ['seek', 'indeed'])
+        service.start_job(job_id)
+        service.shutdown()
+
+        assert _count_events(database, job_id) >= 2
+        assert service.get_statistics()['event_buffer']['pending'] == 0
+
+    def test_close_writes_everything_queued_before_it(self, tmp_path):
+        database = TaskTrackingDatabase(f"sqlite:///{tmp_path / 'events.db'}")
+        buffer = EventWriteBehindBuffer(database, batch_size=10, flush_interval=5.0)
+        for index in range(95):
+            buffer.submit_event(_event('job-3', index))
+
+        started = time.monotonic()
+        buffer.close(timeout=10)
+
+        assert time.monotonic() - started < 5
+        assert _count_events(database, 'job-3') == 95
+        assert buffer.pending() == 0
+
+    def test_bad_row_does_not_drop_the_batch(self, tmp_path):
+        database = TaskTrackingDatabase(f"sqlite:///{tmp_path / 'events.db'}")
+        rows = [{'job_id': 'job-4', 'event_type': 'status_changed', 'message': str(index)} for index in range(5)]
+        rows[2]['event_type'] = None
+
+        assert database.add_tracking_events(rows) == 4
+        assert _count_events(database, 'job-4') == 4
+
+    def test_batch_insert_closes_session(self, tmp_path):
+        database = TaskTrackingDatabase(f"sqlite:///{tmp_path / 'events.db'}")
+        sessions = []
+        open_session = database.get_session
+
+        def tracked_session():
+            session = open_session()
+            session.close = lambda: sessions.append(session)
+            return session
+
+        database.get_session = tracked_session
+        assert database.add_tracking_events([{'job_id': 'job-5', 'event_type': 'status_changed'}]) == 1
+        assert len(sessions) == 1
+
+    def test_memory_fallback_keeps_event_ids(self):
+        database = TaskTrackingDatabase.__new__(TaskTrackingDatabase)
+        database.tracking_events = []
+        database.get_session = lambda: None
+
+        assert database._add_tracking_events_db([{'id': 'event-1', 'job_id': 'job-6'}, {'job_id': 'job-6'}]) == 2
+        assert database.tracking_events[0]['id'] == 'event-1' and database.tracking_events[1]['id']
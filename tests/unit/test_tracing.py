@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+請求追蹤單元測試
+
+驗證 span 父子關係、線程池與 run_in_executor 的 context 傳遞、
+例外記錄、根 span 之後結束的子 span、OTLP/JSON 輸出，以及爬蟲類別的自動追蹤。
+
+作者: jobseeker Team
+日期: 2025
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from jobseeker.tracing import (
+    STATUS_ERROR, FileSpanExporter, InMemorySpanExporter, get_current_span, get_tracer,
+    run_in_executor, start_span, submit_with_context, traced
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    tracer = get_tracer()
+    tracer.add_exporter(exporter)
+    yield exporter
+    tracer.remove_exporter(exporter)
+
+
+def _by_name(spans):
+    return {span.name: span for span in spans}
+
+
+class TestSpans:
+    """span 基本行為測試"""
+
+    def test_disabled_tracing_is_noop(self):
+        with start_span('noop') as span:
+            span.set_attribute('ignored', 1)
+        assert not span.is_recording
+        assert not get_current_span().is_recording
+
+    def test_nested_spans_share_trace(self, exporter):
+        with start_span('root', query='python'):
+            with start_span('child') as child:
+                child.set_attribute('jobs', 3)
+
+        spans = _by_name(exporter.spans)
+        assert spans['child'].trace_id == spans['root'].trace_id
+        assert spans['child'].parent_span_id == spans['root'].span_id
+        assert spans['root'].parent_span_id is None
+        assert spans['child'].attributes == {'jobs': 3}
+
+    def test_child_ending_after_root_is_exported_not_kept(self, exporter):
+        tracer = get_tracer()
+        with start_span('root'):
+            late = tracer.start_span('background')
+
+        late.end()
+
+        assert [span.name for span in exporter.spans] == ['root', 'background']
+        assert late.trace_id not in tracer._pending
+        assert late.trace_id not in tracer._open_traces
+
+    def test_exception_marks_span_as_error(self, exporter):
+        with pytest.raises(ValueError):
+            with start_span('failing'):
+                raise ValueError('bad page')
+
+        span = exporter.spans[0]
+        assert span.status_code == STATUS_ERROR
+        assert span.events[0]['attributes']['exception.type'] == 'ValueError'
+
+    def test_traced_decorator_supports_async(self, exporter):
+        @traced('fetch')
+        async def fetch():
+            return get_current_span().name
+
+        assert asyncio.run(fetch()) == 'fetch'
+        assert exporter.spans[0].name == 'fetch'
+
+
+class TestContextPropagation:
+    """跨線程 context 傳遞測試"""
+
+    def test_thread_pool_children_attach_to_parent(self, exporter):
+        def work(site):
+            with start_span('scrape_site', site=site):
+                pass
+
+        with start_span('scrape_jobs') as root:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [submit_with_context(executor, work, site) for site in ('seek', 'indeed')]
+                for future in futures:
+                    future.result()
+
+        children = [span for span in exporter.spans if span.name == 'scrape_site']
+        assert len(children) == 2
+        assert all(span.parent_span_id == root.span_id for span in children)
+
+    def test_run_in_executor_keeps_current_span(self, exporter):
+        async def main():
+            with start_span('async_root') as root:
+                loop = asyncio.get_running_loop()
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    inner = await run_in_executor(loop, executor, lambda: get_current_span().span_id)
+            return root.span_id, inner
+
+        root_id, inner_id = asyncio.run(main())
+        assert inner_id == root_id
+
+
+class TestExport:
+    """匯出測試"""
+
+    def test_file_exporter_writes_one_otlp_document_per_trace(self, tmp_path):
+        path = tmp_path / 'traces.jsonl'
+        file_exporter = FileSpanExporter(str(path), service_name='jobseeker-test')
+        tracer = get_tracer()
+        tracer.add_exporter(file_exporter)
+        try:
+            with start_span('root', results_wanted=20):
+                with start_span('child', remote=True):
+                    pass
+        finally:
+            tracer.remove_exporter(file_exporter)
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1
+        document = json.loads(lines[0])
+        resource_spans = document['resourceSpans'][0]
+        assert resource_spans['resource']['attributes'][0]['value'] == {'stringValue': 'jobseeker-test'}
+        spans = resource_spans['scopeSpans'][0]['spans']
+        assert [span['name'] for span in spans] == ['child', 'root']
+        assert spans[0]['parentSpanId'] == spans[1]['spanId']
+        assert len(spans[1]['traceId']) == 32 and len(spans[1]['spanId']) == 16
+        assert spans[1]['attributes'] == [{'key': 'results_wanted', 'value': {'intValue': '20'}}]
+        assert spans[0]['attributes'] == [{'key': 'remote', 'value': {'boolValue': True}}]
+
+
+class TestScraperInstrumentation:
+    """爬蟲自動追蹤測試"""
+
+    def test_scraper_subclass_methods_are_traced(self, exporter):
+        from jobseeker.model import JobResponse, Scraper, Site
+
+        class FakeScraper(Scraper):
+            def __init__(self):
+                super().__init__(Site.INDEED)
+
+            def scrape(self, scraper_input):
+                self._scrape_page(None)
+                return JobResponse(jobs=[])
+
+            def _scrape_page(self, cursor):
+                return [], None
+
+        FakeScraper().scrape(None)
+
+        spans = _by_name(exporter.spans)
+        assert spans['FakeScraper._scrape_page'].parent_span_id == spans['FakeScraper.scrape'].span_id
@@ -30,7 +30,7 @@ if project_root.name == 'web_app':  # Railway 部署時的情況
     project_root = project_root.parent
 sys.path.insert(0, str(project_root))
 
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, make_response
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, flash, redirect, url_for, make_response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user, UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -53,6 +53,8 @@ try:
     from jobseeker.llm_auto_switcher import LLMAutoSwitcher
     from jobseeker.intelligent_decision_engine import DecisionResult, ProcessingStrategy, PlatformSelectionMode
     from jobseeker.test_case_generator import TestCaseGenerator
+    from jobseeker.metrics_exporter import OPENMETRICS_CONTENT_TYPE, get_registry
+    from jobseeker.tracing import activate_span, deactivate_span
 except ImportError as e:
     print(f"警告: 無法導入 jobseeker 模組: {e}")
     print("請確保已正確安裝 jobseeker 套件")
@@ -65,22 +67,66 @@ app.secret_key = os.environ.get('SECRET_KEY', 'jobseeker-web-app-secret-key-2025
 # 啟用 CORS 支援
 CORS(app)
 
+
+@app.before_request
+def start_request_span():
+    """每個請求建立根 span，路由內的搜尋、快取與 LLM 呼叫都掛在其下"""
+    route = request.url_rule.rule if request.url_rule else request.path
+    g.trace_span, g.trace_token = activate_span(
+        f"{request.method} {route}", **{'http.method': request.method, 'http.route': route}
+    )
+
+
+@app.after_request
+def annotate_request_span(response):
+    """記錄狀態碼並回傳 traceparent 供前端或日誌關聯"""
+    span = g.get('trace_span')
+    if span is not None and span.is_recording:
+        span.set_attribute('http.status_code', response.status_code)
+        response.headers['traceparent'] = f"00-{span.trace_id}-{span.span_id}-01"
+    return response
+
+
+@app.teardown_request
+def end_request_span(error=None):
+    span = g.pop('trace_span', None)
+    if span is not None:
+        deactivate_span(span, g.pop('trace_token', None), error)
+
 # 配置
 app.config.update(
     MAX_CONTENT_LENGTH=16 * 1024 * 1024,  # 16MB 最大上傳大小
     UPLOAD_FOLDER=project_root / 'web_app' / 'downloads',
     TEMPLATES_AUTO_RELOAD=True,
     DEBUG=os.environ.get('FLASK_DEBUG', 'False').lower() == 'true',
-    SQLALCHEMY_DATABASE_URI=f"sqlite:///{project_root / 'web_app' / 'db' / 'app.db'}",
-    SQLALCHEMY_TRACK_MODIFICATIONS=False
+    SQLALCHEMY_DATABASE_URI=os.environ.get('WEB_APP_DATABASE_URI', f"sqlite:///{project_root / 'web_app' / 'db' / 'app.db'}"),
+    SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    RESULT_STORE_PATH=Path(os.environ.get('RESULT_STORE_PATH', project_root / 'web_app' / 'db' / 'search_results.db')),
+    RESULT_STORE_MEMORY_ROWS=int(os.environ.get('RESULT_STORE_MEMORY_ROWS', 5000)),
+    RESULT_STORE_TTL_HOURS=float(os.environ.get('RESULT_STORE_TTL_HOURS', 24))
 )
 
 # 確保下載目錄存在
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(project_root / 'web_app' / 'db', exist_ok=True)
 
-# 全域變數儲存搜尋結果
-search_results_cache = {}
+# 搜尋結果儲存（記憶體 LRU + SQLite，多個 worker 共用）
+try:
+    from .result_store import JOB_FIELDS, SearchResultStore
+    from .export_stream import (
+        iter_csv, iter_json_document, iter_ndjson, iter_parquet, gzip_stream, job_parquet_schema, parquet_available
+    )
+except ImportError:
+    from result_store import JOB_FIELDS, SearchResultStore
+    from export_stream import (
+        iter_csv, iter_json_document, iter_ndjson, iter_parquet, gzip_stream, job_parquet_schema, parquet_available
+    )
+
+result_store = SearchResultStore(
+    app.config['RESULT_STORE_PATH'],
+    max_memory_rows=app.config['RESULT_STORE_MEMORY_ROWS'],
+    ttl_hours=app.config['RESULT_STORE_TTL_HOURS']
+)
 
 # 初始化LLM意圖分析器 - 支持自動切換
 try:
@@ -205,6 +251,153 @@ class TestCaseResult(db.Model):
     run = db.relationship('TestRun', backref=db.backref('cases', lazy=True))
 
 
+class SearchResult(db.Model):
+    """一次搜尋的摘要資訊（職位列見 Job）"""
+    id = db.Column(db.String(36), primary_key=True)
+    search_query = db.Column('query', db.String(512), index=True)
+    site = db.Column(db.String(255), index=True)
+    country = db.Column(db.String(64), index=True)
+    location = db.Column(db.String(512))
+    jobs_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    execution_time = db.Column(db.Float, default=0.0)
+    success = db.Column(db.Boolean, default=True)
+    error_message = db.Column(db.Text, nullable=True)
+
+
+class Job(db.Model):
+    """正規化的職位資料，每個職位一列"""
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    search_id = db.Column(db.String(36), db.ForeignKey('search_result.id', ondelete='CASCADE'), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    title = db.Column(db.String(512))
+    company = db.Column(db.String(512), index=True)
+    location = db.Column(db.String(512), index=True)
+    site = db.Column(db.String(64), index=True)
+    job_type = db.Column(db.String(128), index=True)
+    date_posted = db.Column(db.String(10), index=True)  # ISO 格式 YYYY-MM-DD，可直接比較大小
+    salary_min = db.Column(db.Float, index=True)
+    salary_max = db.Column(db.Float, index=True)
+    salary_currency = db.Column(db.String(16))
+    interval = db.Column(db.String(32))
+    is_remote = db.Column(db.Boolean, default=False)
+    job_url = db.Column(db.String(1024))
+    job_url_direct = db.Column(db.String(1024))
+    description = db.Column(db.Text)
+
+    search = db.relationship('SearchResult', backref=db.backref('job_rows', lazy='dynamic', passive_deletes=True))
+
+    __table_args__ = (
+        db.Index('ix_jobs_search_position', 'search_id', 'position'),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'search_id': self.search_id,
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'site': self.site,
+            'job_type': self.job_type,
+            'date_posted': self.date_posted,
+            'salary_min': self.salary_min,
+            'salary_max': self.salary_max,
+            'salary_currency': self.salary_currency,
+            'interval': self.interval,
+            'is_remote': bool(self.is_remote),
+            'job_url': self.job_url,
+            'job_url_direct': self.job_url_direct,
+            'description': self.description
+        }
+
+
+# 職位全文索引（SQLite FTS5，external content 指向 jobs 表，由觸發器同步）
+JOBS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, company, location, description, content='jobs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+    "INSERT INTO jobs_fts(rowid, title, company, location, description) "
+    "VALUES (new.id, new.title, new.company, new.location, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description) "
+    "VALUES ('delete', old.id, old.title, old.company, old.location, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN "
+    "INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description) "
+    "VALUES ('delete', old.id, old.title, old.company, old.location, old.description); "
+    "INSERT INTO jobs_fts(rowid, title, company, location, description) "
+    "VALUES (new.id, new.title, new.company, new.location, new.description); END",
+)
+
+
+def create_job_search_index():
+    """建立職位全文索引（僅 SQLite；編譯時未含 FTS5 則略過）"""
+    if db.engine.dialect.name != 'sqlite':
+        return
+    try:
+        with db.engine.begin() as conn:
+            for statement in JOBS_FTS_DDL:
+                conn.exec_driver_sql(statement)
+    except Exception as e:
+        print(f"⚠️ 無法建立職位全文索引: {e}")
+
+
+def save_search_result(search_id: str, query: str, location: str, country: Optional[str],
+                       result, jobs_list: List[Dict[str, Any]]):
+    """
+    將搜尋摘要與職位列寫入資料庫，供 /api/v2 查詢
+
+    Args:
+        search_id: 搜尋 ID
+        query: 搜尋關鍵詞
+        location: 搜尋地點
+        country: 推斷的國家
+        result: 智能路由器的搜尋結果
+        jobs_list: 職位字典列表
+    """
+    try:
+        db.session.add(SearchResult(
+            id=search_id,
+            search_query=query,
+            site=','.join(result.successful_platforms),
+            country=country,
+            location=location,
+            jobs_count=len(jobs_list),
+            execution_time=result.total_execution_time,
+            success=bool(result.successful_platforms),
+            error_message=None if result.successful_platforms else ','.join(result.failed_platforms)
+        ))
+        db.session.flush()
+        if jobs_list:
+            db.session.execute(db.insert(Job), [
+                {
+                    'search_id': search_id,
+                    'position': position,
+                    'title': job['title'],
+                    'company': job['company'],
+                    'location': job['location'],
+                    'site': job['site'],
+                    'job_type': job['job_type'],
+                    'date_posted': job['date_posted'] or None,
+                    'salary_min': job['salary_min'],
+                    'salary_max': job['salary_max'],
+                    'salary_currency': job['salary_currency'],
+                    'interval': job['interval'],
+                    'is_remote': job['is_remote'],
+                    'job_url': job['job_url'],
+                    'job_url_direct': job['job_url_direct'],
+                    'description': job['description']
+                }
+                for position, job in enumerate(jobs_list)
+            ])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"⚠️ 搜尋結果寫入資料庫失敗: {e}")
+
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -245,6 +438,7 @@ def admin_required(fn):
 # 初始化資料庫
 with app.app_context():
     db.create_all()
+    create_job_search_index()
 
 @app.context_processor
 def inject_global_flags():
@@ -488,18 +682,20 @@ def search_jobs():
         jobs_list = []
         if result.jobs:
             for job in result.jobs:
+                compensation = job.compensation
                 job_dict = {
                     'title': str(job.title or ''),
                     'company': str(job.company_name or ''),
                     'location': str(job.location.city if job.location else ''),
-                    'description': str(job.description or '')[:500] + ('...' if len(str(job.description or '')) > 500 else ''),
-                    'salary_min': None,  # 新架構中需要從compensation解析
-                    'salary_max': None,  # 新架構中需要從compensation解析
-                    'salary_currency': '',  # 新架構中需要從compensation解析
+                    'description': str(job.description or ''),
+                    'salary_min': compensation.min_amount if compensation else None,
+                    'salary_max': compensation.max_amount if compensation else None,
+                    'salary_currency': str(compensation.currency or '') if compensation else '',
+                    'interval': compensation.interval.value if compensation and compensation.interval else '',
                     'date_posted': str(job.date_posted or ''),
                     'job_url': str(job.job_url or ''),
                     'job_url_direct': str(job.job_url_direct or ''),
-                    'site': str(job.site or ''),
+                    'site': str(getattr(job, 'site', '') or ''),
                     'job_type': str(job.job_type or ''),
                     'is_remote': bool(job.is_remote or False)
                 }
@@ -528,20 +724,24 @@ def search_jobs():
             # 粗略過濾
             jobs_list = [j for j in jobs_list if any(tok in (j.get('location','').lower()) for tok in country_tokens)]
 
-        # 快取搜尋結果
-        search_results_cache[search_id] = {
-            'result': result,
-            'timestamp': datetime.now(),
-            'query': parsed.search_term,
-            'location': derived_location
+        # 儲存搜尋結果（完整描述保留在儲存層，回應只帶摘要）
+        routing_info = {
+            'successful_platforms': result.successful_platforms,
+            'failed_platforms': result.failed_platforms,
+            'execution_time': result.total_execution_time
         }
+        result_store.put(search_id, jobs_list, {
+            'timestamp': datetime.now().isoformat(),
+            'query': parsed.search_term,
+            'location': derived_location,
+            'routing_info': routing_info
+        })
+        save_search_result(search_id, parsed.search_term, derived_location, derived_country, result, jobs_list)
         
         # 伺服器端分頁切片
         total = len(jobs_list)
         total_pages = (total + per_page - 1) // per_page if per_page else 1
-        start = (page - 1) * per_page
-        end = start + per_page
-        page_jobs = jobs_list[start:end]
+        page_jobs = [summarize_job(job) for job in result_store.get_page(search_id, page, per_page)]
         
         # 返回成功響應（含分頁資訊）
         return jsonify({
@@ -585,83 +785,60 @@ def search_jobs():
 @app.route('/download/<search_id>/<format>')
 def download_results(search_id, format):
     """
-    下載搜尋結果
+    下載搜尋結果（串流輸出，不寫入暫存檔）
     
     Args:
         search_id: 搜尋 ID
-        format: 下載格式 (csv, json)
+        format: 下載格式 (csv, json, ndjson, parquet)
     """
     try:
         # 檢查搜尋結果是否存在
-        if search_id not in search_results_cache:
+        cached_result = result_store.get_metadata(search_id)
+        if cached_result is None:
             flash('搜尋結果不存在或已過期', 'error')
             return redirect(url_for('index'))
         
-        cached_result = search_results_cache[search_id]
-        result = cached_result['result']
-        
-        if result.combined_jobs_data is None or result.total_jobs == 0:
+        if cached_result['total'] == 0:
             flash('沒有可下載的搜尋結果', 'warning')
             return redirect(url_for('index'))
         
         # 生成檔案名稱
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         query_safe = ''.join(c for c in cached_result['query'][:20] if c.isalnum() or c in (' ', '-', '_')).strip()
+        format = format.lower()
+        rows = result_store.iter_rows(search_id)
         
-        if format.lower() == 'csv':
-            filename = f"jobseeker_{query_safe}_{timestamp}.csv"
-            filepath = app.config['UPLOAD_FOLDER'] / filename
-            
-            # 轉換為標準格式
-            standardized_data = convert_to_standard_format(result.combined_jobs_data)
-            
-            # 儲存 CSV 檔案
-            standardized_data.to_csv(filepath, index=False, encoding='utf-8-sig')
-            
-            return send_file(
-                filepath,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='text/csv'
-            )
-            
-        elif format.lower() == 'json':
-            filename = f"jobseeker_{query_safe}_{timestamp}.json"
-            filepath = app.config['UPLOAD_FOLDER'] / filename
-            
-            # 轉換為 JSON 格式
-            jobs_data = result.combined_jobs_data.fillna('').to_dict('records')
-            
-            export_data = {
+        if format == 'csv':
+            # 逐批轉換為標準格式
+            chunks = iter_csv(rows, transform=convert_to_standard_format)
+            mimetype = 'text/csv'
+        
+        elif format == 'json':
+            header = {
                 'search_info': {
                     'query': cached_result['query'],
                     'location': cached_result['location'],
-                    'timestamp': cached_result['timestamp'].isoformat(),
-                    'total_jobs': result.total_jobs
-                },
-                'routing_info': {
-                    'successful_agents': [agent.value for agent in result.successful_agents],
-                    'failed_agents': [agent.value for agent in result.failed_agents],
-                    'confidence_score': result.routing_decision.confidence_score,
-                    'execution_time': result.total_execution_time
+                    'timestamp': cached_result['timestamp'],
+                    'total_jobs': cached_result['total']
                 },
-                'jobs': jobs_data
+                'routing_info': cached_result.get('routing_info', {})
             }
-            
-            # 儲存 JSON 檔案
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2, default=str)
-            
-            return send_file(
-                filepath,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/json'
-            )
+            chunks = iter_json_document(header, rows, rows_key='jobs')
+            mimetype = 'application/json'
+        
+        elif format == 'ndjson':
+            chunks = iter_ndjson(rows)
+            mimetype = 'application/x-ndjson'
+        
+        elif format == 'parquet' and parquet_available():
+            chunks = iter_parquet(rows, schema=job_parquet_schema(JOB_FIELDS))
+            mimetype = 'application/vnd.apache.parquet'
         
         else:
             flash('不支援的下載格式', 'error')
             return redirect(url_for('index'))
+        
+        return stream_download(chunks, f"jobseeker_{query_safe}_{timestamp}.{format}", mimetype)
             
     except Exception as e:
         print(f"下載錯誤: {e}")
@@ -669,6 +846,24 @@ def download_results(search_id, format):
         return redirect(url_for('index'))
 
 
+def stream_download(chunks, filename: str, mimetype: str) -> Response:
+    """
+    以生成器回應串流下載內容，用戶端接受 gzip 時即時壓縮
+    
+    Args:
+        chunks: 位元組生成器
+        filename: 下載檔名
+        mimetype: 內容類型
+    """
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    # Parquet 已內建壓縮，不再重複 gzip
+    if 'gzip' in request.headers.get('Accept-Encoding', '') and mimetype != 'application/vnd.apache.parquet':
+        chunks = gzip_stream(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+
 @app.route('/demo')
 def demo_results():
     """
@@ -926,12 +1121,10 @@ def get_search_result(search_id: str):
     取得指定搜尋 ID 的結果（用於 Demo/結果頁動態顯示）
     """
     try:
-        if search_id not in search_results_cache:
+        cached = result_store.get_metadata(search_id)
+        if cached is None:
             return jsonify({'success': False, 'error': '搜尋結果不存在或已過期'}), 404
 
-        cached = search_results_cache[search_id]
-        result = cached['result']
-
         # 可選分頁參數
         try:
             page = int(request.args.get('page', 0))
@@ -942,56 +1135,28 @@ def get_search_result(search_id: str):
         except Exception:
             per_page = 0
 
-        jobs_list = []
-        if result.combined_jobs_data is not None:
-            df_clean = result.combined_jobs_data.fillna('')
-            for _, row in df_clean.iterrows():
-                jobs_list.append({
-                    'title': str(row.get('title', '')),
-                    'company': str(row.get('company', '')),
-                    'location': str(row.get('location', '')),
-                    'description': str(row.get('description', ''))[:500] + ('...' if len(str(row.get('description', ''))) > 500 else ''),
-                    'salary_min': float(row['salary_min']) if pd.notna(row.get('salary_min')) else None,
-                    'salary_max': float(row['salary_max']) if pd.notna(row.get('salary_max')) else None,
-                    'salary_currency': str(row.get('salary_currency', '')),
-                    'date_posted': str(row.get('date_posted', '')),
-                    'job_url': str(row.get('job_url', '')),
-                    'job_url_direct': str(row.get('job_url_direct', '')),
-                    'site': str(row.get('site', '')),
-                    'job_type': str(row.get('job_type', '')),
-                    'is_remote': bool(row.get('is_remote', False))
-                })
-
-        # 分頁切片（若提供 page/per_page）
-        total = len(jobs_list)
+        # 分頁切片（若提供 page/per_page），直接從儲存層讀取該頁
+        total = cached['total']
         if page and per_page:
             if page < 1:
                 page = 1
             if per_page < 1:
                 per_page = 10
             total_pages = (total + per_page - 1) // per_page
-            start = (page - 1) * per_page
-            end = start + per_page
-            page_jobs = jobs_list[start:end]
         else:
             total_pages = 1
-            page_jobs = jobs_list
             page = 1
             per_page = total or 1
+        page_jobs = [summarize_job(job) for job in result_store.get_page(search_id, page, per_page)]
 
         return jsonify({
             'success': True,
             'search_id': search_id,
-            'timestamp': cached['timestamp'].isoformat(),
+            'timestamp': cached['timestamp'],
             'query': cached.get('query'),
             'location': cached.get('location'),
-            'total_jobs': result.total_jobs,
-            'routing_info': {
-                'successful_agents': [agent.value for agent in result.successful_agents],
-                'failed_agents': [agent.value for agent in result.failed_agents],
-                'confidence_score': result.routing_decision.confidence_score,
-                'execution_time': result.total_execution_time
-            },
+            'total_jobs': total,
+            'routing_info': cached.get('routing_info', {}),
             'jobs': page_jobs,
             'pagination': {
                 'page': page,
@@ -1012,11 +1177,10 @@ def get_latest_search_result():
     取得最近一次搜尋結果摘要
     """
     try:
-        if not search_results_cache:
+        latest_id = result_store.latest_search_id()
+        if latest_id is None:
             return jsonify({'success': False, 'error': '尚無搜尋記錄'}), 404
 
-        # 找出最新的搜尋
-        latest_id = max(search_results_cache.items(), key=lambda kv: kv[1]['timestamp'])[0]
         return get_search_result(latest_id)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1057,6 +1221,30 @@ def health_check():
     })
 
 
+@app.route('/metrics')
+def openmetrics():
+    """
+    OpenMetrics 指標端點（供 Prometheus 等工具抓取）
+    """
+    return Response(get_registry().render(), content_type=OPENMETRICS_CONTENT_TYPE)
+
+
+def summarize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    產生職位的回應摘要（描述截斷為 500 字）
+    
+    Args:
+        job: 儲存層的職位字典
+        
+    Returns:
+        適合放入 API 回應的職位字典
+    """
+    description = str(job.get('description') or '')
+    summary = dict(job)
+    summary['description'] = description[:500] + ('...' if len(description) > 500 else '')
+    return summary
+
+
 def convert_to_standard_format(df: pd.DataFrame) -> pd.DataFrame:
     """
     轉換職位數據為標準格式
@@ -1083,8 +1271,8 @@ def convert_to_standard_format(df: pd.DataFrame) -> pd.DataFrame:
     
     standardized_df['JOB_TYPE'] = df.get('job_type', '').fillna('')
     standardized_df['INTERVAL'] = df.get('interval', '').fillna('')
-    standardized_df['MIN_AMOUNT'] = df.get('min_amount', '').fillna('')
-    standardized_df['MAX_AMOUNT'] = df.get('max_amount', '').fillna('')
+    standardized_df['MIN_AMOUNT'] = df.get('salary_min', '').fillna('')
+    standardized_df['MAX_AMOUNT'] = df.get('salary_max', '').fillna('')
     standardized_df['JOB_URL'] = df.get('job_url', '').fillna('')
     standardized_df['DESCRIPTION'] = df.get('description', '').fillna('')
     
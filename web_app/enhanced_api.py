@@ -12,16 +12,17 @@ import json
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 from pathlib import Path
 import math
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import desc, asc, func, or_, and_
+from sqlalchemy import desc, asc, func, or_, and_, case, select, text, literal_column, bindparam
 
-from .models import SearchResult, Favorite, User
+from .models import db, SearchResult, Job, Favorite, User
+from .export_stream import iter_csv, iter_json_document
 
 
 class SortOrder(Enum):
@@ -101,9 +102,14 @@ class PaginatedResponse:
 class EnhancedAPIManager:
     """增強版 API 管理器"""
     
+    # jobs_fts 索引的欄位（非 SQLite 後端以 LIKE 比對相同欄位）
+    FTS_COLUMNS = ('title', 'company', 'location', 'description')
+    
     def __init__(self, db: SQLAlchemy):
         self.db = db
         self.logger = current_app.logger
+        # 只有 SQLite 後端建立 jobs_fts 全文索引
+        self.use_fts = db.engine.dialect.name == 'sqlite'
     
     def parse_pagination_params(self) -> PaginationParams:
         """解析分頁參數"""
@@ -199,11 +205,43 @@ class EnhancedAPIManager:
         except (ValueError, TypeError):
             return SearchParams()
     
+    @staticmethod
+    def build_fts_query(terms: List[str], column: Optional[str] = None) -> str:
+        """
+        將關鍵詞組成 FTS5 MATCH 表達式（每個詞以片語引號包住，以 OR 連接）
+        
+        Args:
+            terms: 關鍵詞列表
+            column: 限定搜尋的欄位（可選）
+        """
+        prefix = f'{column} : ' if column else ''
+        phrases = ['"' + term.replace('"', '""') + '"' for term in terms if term and term.strip()]
+        return ' OR '.join(f'{prefix}{phrase}' for phrase in phrases)
+    
+    def fts_match(self, terms: List[str], column: Optional[str] = None):
+        """
+        回傳符合全文搜尋的職位條件（任一關鍵詞符合即可）
+        
+        Args:
+            terms: 關鍵詞列表（至少一個非空）
+            column: 限定搜尋的欄位（可選，須為 FTS_COLUMNS 之一）
+        """
+        terms = [term.strip() for term in terms if term and term.strip()]
+        if self.use_fts:
+            expression = self.build_fts_query(terms, column)
+            matched_ids = select(literal_column('rowid')).select_from(text('jobs_fts')).where(
+                text('jobs_fts MATCH :fts_query').bindparams(bindparam('fts_query', expression, unique=True))
+            )
+            return Job.id.in_(matched_ids)
+        # 非 SQLite 後端退回 LIKE 比對：每個詞在任一欄位出現即符合
+        columns = [getattr(Job, name) for name in ((column,) if column else self.FTS_COLUMNS)]
+        return or_(*(field.contains(term, autoescape=True) for term in terms for field in columns))
+    
     def apply_filters(self, query, filters: FilterParams):
-        """應用過濾條件"""
+        """應用過濾條件（query 需已關聯 Job 與 SearchResult）"""
         # 網站過濾
         if filters.sites:
-            query = query.filter(SearchResult.site.in_(filters.sites))
+            query = query.filter(Job.site.in_(filters.sites))
         
         # 國家過濾
         if filters.countries:
@@ -211,105 +249,73 @@ class EnhancedAPIManager:
         
         # 職位類型過濾
         if filters.job_types:
-            # 這裡需要根據實際的數據結構來調整
-            # 假設 job_type 存儲在 jobs JSON 欄位中
-            conditions = []
-            for job_type in filters.job_types:
-                conditions.append(SearchResult.jobs.contains(f'"job_type": "{job_type}"'))
-            if conditions:
-                query = query.filter(or_(*conditions))
+            query = query.filter(Job.job_type.in_(filters.job_types))
         
         # 薪資過濾
-        if filters.salary_min is not None or filters.salary_max is not None:
-            # 這裡需要根據實際的薪資數據結構來調整
-            # 假設薪資信息存儲在 jobs JSON 欄位中
-            if filters.salary_min is not None:
-                query = query.filter(SearchResult.jobs.contains(f'"min_amount": {filters.salary_min}'))
-            if filters.salary_max is not None:
-                query = query.filter(SearchResult.jobs.contains(f'"max_amount": {filters.salary_max}'))
-        
-        # 日期過濾
+        if filters.salary_min is not None:
+            query = query.filter(Job.salary_min >= filters.salary_min)
+        if filters.salary_max is not None:
+            query = query.filter(Job.salary_max <= filters.salary_max)
+        
+        # 日期過濾（date_posted 以 ISO 字串儲存，可直接比較）
         if filters.date_from:
             try:
                 date_from = datetime.strptime(filters.date_from, '%Y-%m-%d')
-                query = query.filter(SearchResult.created_at >= date_from)
+                query = query.filter(Job.date_posted >= date_from.strftime('%Y-%m-%d'))
             except ValueError:
                 pass
         
         if filters.date_to:
             try:
                 date_to = datetime.strptime(filters.date_to, '%Y-%m-%d')
-                query = query.filter(SearchResult.created_at <= date_to)
+                query = query.filter(Job.date_posted <= date_to.strftime('%Y-%m-%d'))
             except ValueError:
                 pass
         
-        # 關鍵詞過濾
-        if filters.keywords:
-            conditions = []
-            for keyword in filters.keywords:
-                conditions.append(
-                    or_(
-                        SearchResult.query.contains(keyword),
-                        SearchResult.jobs.contains(keyword)
-                    )
-                )
-            if conditions:
-                query = query.filter(or_(*conditions))
+        # 關鍵詞過濾（全文索引）
+        if filters.keywords and any(keyword.strip() for keyword in filters.keywords):
+            query = query.filter(self.fts_match(filters.keywords))
         
         # 公司過濾
         if filters.companies:
-            conditions = []
-            for company in filters.companies:
-                conditions.append(SearchResult.jobs.contains(f'"company": "{company}"'))
-            if conditions:
-                query = query.filter(or_(*conditions))
+            query = query.filter(Job.company.in_(filters.companies))
         
         # 地點過濾
         if filters.locations:
-            conditions = []
-            for location in filters.locations:
-                conditions.append(SearchResult.jobs.contains(f'"location": "{location}"'))
-            if conditions:
-                query = query.filter(or_(*conditions))
+            query = query.filter(Job.location.in_(filters.locations))
         
         # 遠程工作過濾
         if filters.is_remote is not None:
-            if filters.is_remote:
-                query = query.filter(SearchResult.jobs.contains('"is_remote": true'))
-            else:
-                query = query.filter(SearchResult.jobs.contains('"is_remote": false'))
+            query = query.filter(Job.is_remote == filters.is_remote)
         
         return query
     
     def apply_sorting(self, query, sort_params: SortParams):
         """應用排序"""
-        if sort_params.field == SortField.DATE_POSTED:
-            if sort_params.order == SortOrder.ASC:
-                query = query.order_by(asc(SearchResult.created_at))
-            else:
-                query = query.order_by(desc(SearchResult.created_at))
-        
-        elif sort_params.field == SortField.TITLE:
-            # 這裡需要根據實際的數據結構來調整
-            # 假設標題存儲在 jobs JSON 欄位中
-            if sort_params.order == SortOrder.ASC:
-                query = query.order_by(asc(SearchResult.jobs))
-            else:
-                query = query.order_by(desc(SearchResult.jobs))
-        
-        elif sort_params.field == SortField.COMPANY:
-            # 類似地處理公司排序
-            if sort_params.order == SortOrder.ASC:
-                query = query.order_by(asc(SearchResult.jobs))
-            else:
-                query = query.order_by(desc(SearchResult.jobs))
+        sort_columns = {
+            SortField.DATE_POSTED: Job.date_posted,
+            SortField.TITLE: Job.title,
+            SortField.COMPANY: Job.company,
+            SortField.LOCATION: Job.location,
+            SortField.SALARY: Job.salary_max,
+        }
+        
+        if sort_params.field in sort_columns:
+            column = sort_columns[sort_params.field]
+            direction = asc if sort_params.order == SortOrder.ASC else desc
+            # 以 Job.id 作為次要排序，確保分頁穩定
+            query = query.order_by(direction(column), direction(Job.id))
         
         elif sort_params.field == SortField.RELEVANCE:
             # 相關性排序（預設按創建時間倒序）
-            query = query.order_by(desc(SearchResult.created_at))
+            query = query.order_by(desc(SearchResult.created_at), asc(Job.position))
         
         return query
     
+    def base_job_query(self):
+        """職位查詢（關聯所屬搜尋）"""
+        return Job.query.join(SearchResult, Job.search_id == SearchResult.id)
+    
     def get_paginated_results(self, 
                             pagination: PaginationParams,
                             sort_params: SortParams,
@@ -318,22 +324,22 @@ class EnhancedAPIManager:
         """獲取分頁結果"""
         try:
             # 基礎查詢
-            query = SearchResult.query
+            query = self.base_job_query()
             
             # 應用搜尋條件
-            if search_params and search_params.query:
+            if search_params and search_params.query and search_params.query.strip():
                 query = query.filter(
                     or_(
-                        SearchResult.query.contains(search_params.query),
-                        SearchResult.jobs.contains(search_params.query)
+                        SearchResult.search_query.contains(search_params.query),
+                        self.fts_match([search_params.query])
                     )
                 )
             
-            if search_params and search_params.location:
-                query = query.filter(SearchResult.jobs.contains(f'"location": "{search_params.location}"'))
+            if search_params and search_params.location and search_params.location.strip():
+                query = query.filter(self.fts_match([search_params.location], 'location'))
             
             if search_params and search_params.site:
-                query = query.filter(SearchResult.site == search_params.site)
+                query = query.filter(Job.site == search_params.site)
             
             if search_params and search_params.country:
                 query = query.filter(SearchResult.country == search_params.country)
@@ -342,7 +348,7 @@ class EnhancedAPIManager:
             query = self.apply_filters(query, filters)
             
             # 獲取總數
-            total_count = query.count()
+            total_count = query.order_by(None).count()
             
             # 應用排序
             query = self.apply_sorting(query, sort_params)
@@ -351,30 +357,20 @@ class EnhancedAPIManager:
             total_pages = math.ceil(total_count / pagination.per_page)
             offset = (pagination.page - 1) * pagination.per_page
             
-            # 獲取分頁數據
-            results = query.offset(offset).limit(pagination.per_page).all()
+            # 獲取分頁數據（只取當頁所需欄位與所屬搜尋資訊）
+            rows = query.with_entities(Job, SearchResult.search_query, SearchResult.country, SearchResult.created_at) \
+                .offset(offset).limit(pagination.per_page).all()
             
             # 轉換為字典格式
             data = []
-            for result in results:
-                try:
-                    jobs_data = json.loads(result.jobs) if isinstance(result.jobs, str) else result.jobs
-                except (json.JSONDecodeError, TypeError):
-                    jobs_data = []
-                
-                data.append({
-                    'id': result.id,
-                    'query': result.query,
-                    'site': result.site,
-                    'country': result.country,
-                    'location': result.location,
-                    'jobs_count': len(jobs_data) if isinstance(jobs_data, list) else 0,
-                    'jobs': jobs_data,
-                    'created_at': result.created_at.isoformat(),
-                    'execution_time': result.execution_time,
-                    'success': result.success,
-                    'error_message': result.error_message
+            for job, search_query, country, created_at in rows:
+                job_data = job.to_dict()
+                job_data.update({
+                    'query': search_query,
+                    'country': country,
+                    'created_at': created_at.isoformat() if created_at else None
                 })
+                data.append(job_data)
             
             # 構建分頁信息
             pagination_info = {
@@ -421,50 +417,63 @@ class EnhancedAPIManager:
             raise
     
     def get_aggregated_stats(self, filters: FilterParams) -> Dict[str, Any]:
-        """獲取聚合統計"""
+        """獲取聚合統計（單一分組查詢）"""
         try:
             query = SearchResult.query
             
-            # 應用過濾條件
-            query = self.apply_filters(query, filters)
-            
-            # 基本統計
-            total_searches = query.count()
-            successful_searches = query.filter(SearchResult.success == True).count()
-            
-            # 按網站統計
-            site_stats = {}
-            site_results = query.with_entities(
-                SearchResult.site, 
+            # 職位層級的過濾條件轉為搜尋 ID 子查詢
+            job_filters = replace(filters, countries=None)
+            if job_filters != FilterParams():
+                matching_searches = self.apply_filters(self.base_job_query(), job_filters) \
+                    .with_entities(Job.search_id).distinct()
+                query = query.filter(SearchResult.id.in_(matching_searches))
+            if filters.countries:
+                query = query.filter(SearchResult.country.in_(filters.countries))
+            
+            # 一次分組查詢取得網站、國家、日期的組合統計，再於記憶體中彙總
+            day = func.date(SearchResult.created_at).label('day')
+            grouped = query.with_entities(
+                SearchResult.site,
+                SearchResult.country,
+                day,
                 func.count(SearchResult.id).label('count'),
-                func.avg(SearchResult.execution_time).label('avg_time')
-            ).group_by(SearchResult.site).all()
+                func.sum(case((SearchResult.success == True, 1), else_=0)).label('successful'),
+                func.sum(SearchResult.execution_time).label('total_time')
+            ).group_by(SearchResult.site, SearchResult.country, day).all()
+            
+            total_searches = 0
+            successful_searches = 0
+            site_totals: Dict[str, List[float]] = {}
+            country_stats: Dict[str, Dict[str, int]] = {}
+            day_counts: Dict[str, int] = {}
+            
+            for site, country, date, count, successful, total_time in grouped:
+                total_searches += count
+                successful_searches += successful or 0
+                
+                site_entry = site_totals.setdefault(site, [0, 0.0])
+                site_entry[0] += count
+                site_entry[1] += total_time or 0.0
+                
+                country_stats.setdefault(country, {'count': 0})['count'] += count
+                
+                if date:
+                    day_counts[str(date)] = day_counts.get(str(date), 0) + count
             
-            for site, count, avg_time in site_results:
-                site_stats[site] = {
+            # 按網站統計
+            site_stats = {
+                site: {
                     'count': count,
-                    'avg_execution_time': float(avg_time) if avg_time else 0
+                    'avg_execution_time': total_time / count if count else 0
                 }
+                for site, (count, total_time) in site_totals.items()
+            }
             
-            # 按國家統計
-            country_stats = {}
-            country_results = query.with_entities(
-                SearchResult.country,
-                func.count(SearchResult.id).label('count')
-            ).group_by(SearchResult.country).all()
-            
-            for country, count in country_results:
-                country_stats[country] = {'count': count}
-            
-            # 時間統計
-            time_stats = {}
-            time_results = query.with_entities(
-                func.date(SearchResult.created_at).label('date'),
-                func.count(SearchResult.id).label('count')
-            ).group_by(func.date(SearchResult.created_at)).order_by(desc('date')).limit(30).all()
-            
-            for date, count in time_results:
-                time_stats[date.isoformat()] = {'count': count}
+            # 時間統計（最近 30 天）
+            time_stats = {
+                date: {'count': day_counts[date]}
+                for date in sorted(day_counts, reverse=True)[:30]
+            }
             
             return {
                 'total_searches': total_searches,
@@ -491,8 +500,8 @@ class EnhancedAPIManager:
             
             # 從歷史搜尋中獲取建議
             suggestions = SearchResult.query.filter(
-                SearchResult.query.contains(query.strip())
-            ).with_entities(SearchResult.query).distinct().limit(limit).all()
+                SearchResult.search_query.contains(query.strip())
+            ).with_entities(SearchResult.search_query).distinct().limit(limit).all()
             
             return [suggestion[0] for suggestion in suggestions]
             
@@ -509,40 +518,15 @@ class EnhancedAPIManager:
             # 獲取所有國家
             countries = [country[0] for country in SearchResult.query.with_entities(SearchResult.country).distinct().all()]
             
-            # 獲取所有地點（從 jobs 數據中提取）
-            locations = set()
-            results = SearchResult.query.with_entities(SearchResult.jobs).all()
-            for result in results:
-                try:
-                    jobs_data = json.loads(result.jobs) if isinstance(result.jobs, str) else result.jobs
-                    if isinstance(jobs_data, list):
-                        for job in jobs_data:
-                            if isinstance(job, dict) and 'location' in job:
-                                location = job['location']
-                                if isinstance(location, dict) and 'city' in location:
-                                    locations.add(location['city'])
-                                elif isinstance(location, str):
-                                    locations.add(location)
-                except (json.JSONDecodeError, TypeError, KeyError):
-                    continue
-            
-            # 獲取所有公司（從 jobs 數據中提取）
-            companies = set()
-            for result in results:
-                try:
-                    jobs_data = json.loads(result.jobs) if isinstance(result.jobs, str) else result.jobs
-                    if isinstance(jobs_data, list):
-                        for job in jobs_data:
-                            if isinstance(job, dict) and 'company' in job:
-                                companies.add(job['company'])
-                except (json.JSONDecodeError, TypeError, KeyError):
-                    continue
+            # 獲取所有地點與公司（使用索引欄位的 DISTINCT）
+            locations = [row[0] for row in Job.query.with_entities(Job.location).filter(Job.location != '').distinct().all()]
+            companies = [row[0] for row in Job.query.with_entities(Job.company).filter(Job.company != '').distinct().all()]
             
             return {
-                'sites': sorted(sites),
-                'countries': sorted(countries),
-                'locations': sorted(list(locations)),
-                'companies': sorted(list(companies)),
+                'sites': sorted(site for site in sites if site),
+                'countries': sorted(country for country in countries if country),
+                'locations': sorted(location for location in locations if location),
+                'companies': sorted(company for company in companies if company),
                 'job_types': ['full_time', 'part_time', 'contract', 'internship', 'temporary'],
                 'sort_fields': [field.value for field in SortField],
                 'sort_orders': [order.value for order in SortOrder],
@@ -566,7 +550,6 @@ def enhanced_search():
     """增強版搜尋 API"""
     try:
         # 初始化 API 管理器
-        from . import db
         api_manager = EnhancedAPIManager(db)
         
         # 解析參數
@@ -593,7 +576,6 @@ def enhanced_search():
 def search_stats():
     """搜尋統計 API"""
     try:
-        from . import db
         api_manager = EnhancedAPIManager(db)
         
         filters = api_manager.parse_filter_params()
@@ -612,7 +594,6 @@ def search_stats():
 def search_suggestions():
     """搜尋建議 API"""
     try:
-        from . import db
         api_manager = EnhancedAPIManager(db)
         
         query = request.args.get('q', '')
@@ -637,7 +618,6 @@ def search_suggestions():
 def available_filters():
     """可用過濾選項 API"""
     try:
-        from . import db
         api_manager = EnhancedAPIManager(db)
         
         filters = api_manager.get_available_filters()
@@ -655,8 +635,6 @@ def available_filters():
 def get_search_by_id(search_id: str):
     """根據 ID 獲取搜尋結果"""
     try:
-        from . import db
-        
         result = SearchResult.query.filter_by(id=search_id).first()
         if not result:
             return jsonify({
@@ -664,18 +642,15 @@ def get_search_by_id(search_id: str):
                 'search_id': search_id
             }), 404
         
-        try:
-            jobs_data = json.loads(result.jobs) if isinstance(result.jobs, str) else result.jobs
-        except (json.JSONDecodeError, TypeError):
-            jobs_data = []
+        jobs_data = [job.to_dict() for job in result.job_rows.order_by(Job.position)]
         
         return jsonify({
             'id': result.id,
-            'query': result.query,
+            'query': result.search_query,
             'site': result.site,
             'country': result.country,
             'location': result.location,
-            'jobs_count': len(jobs_data) if isinstance(jobs_data, list) else 0,
+            'jobs_count': result.jobs_count,
             'jobs': jobs_data,
             'created_at': result.created_at.isoformat(),
             'execution_time': result.execution_time,
@@ -695,7 +670,6 @@ def get_search_by_id(search_id: str):
 def get_jobs_by_search_id(search_id: str):
     """根據搜尋 ID 獲取職位列表（支援分頁）"""
     try:
-        from . import db
         api_manager = EnhancedAPIManager(db)
         
         # 獲取搜尋結果
@@ -706,24 +680,19 @@ def get_jobs_by_search_id(search_id: str):
                 'search_id': search_id
             }), 404
         
-        try:
-            jobs_data = json.loads(result.jobs) if isinstance(result.jobs, str) else result.jobs
-        except (json.JSONDecodeError, TypeError):
-            jobs_data = []
-        
-        if not isinstance(jobs_data, list):
-            jobs_data = []
-        
         # 解析分頁參數
         pagination = api_manager.parse_pagination_params()
         
         # 計算分頁
-        total_count = len(jobs_data)
+        total_count = result.jobs_count
         total_pages = math.ceil(total_count / pagination.per_page)
         offset = (pagination.page - 1) * pagination.per_page
         
-        # 獲取分頁數據
-        paginated_jobs = jobs_data[offset:offset + pagination.per_page]
+        # 獲取分頁數據（依 search_id + position 索引讀取）
+        paginated_jobs = [
+            job.to_dict()
+            for job in result.job_rows.order_by(Job.position).offset(offset).limit(pagination.per_page)
+        ]
         
         # 構建響應
         return jsonify({
@@ -740,7 +709,7 @@ def get_jobs_by_search_id(search_id: str):
                 'next_page': pagination.page + 1 if pagination.page < total_pages else None
             },
             'search_info': {
-                'query': result.query,
+                'query': result.search_query,
                 'site': result.site,
                 'country': result.country,
                 'location': result.location,
@@ -760,8 +729,6 @@ def get_jobs_by_search_id(search_id: str):
 def export_search_results(search_id: str):
     """導出搜尋結果"""
     try:
-        from . import db
-        
         result = SearchResult.query.filter_by(id=search_id).first()
         if not result:
             return jsonify({
@@ -769,48 +736,37 @@ def export_search_results(search_id: str):
                 'search_id': search_id
             }), 404
         
-        try:
-            jobs_data = json.loads(result.jobs) if isinstance(result.jobs, str) else result.jobs
-        except (json.JSONDecodeError, TypeError):
-            jobs_data = []
-        
         format_type = request.args.get('format', 'json').lower()
         
+        # 依 position 逐批讀取職位，串流輸出
+        jobs = (job.to_dict() for job in result.job_rows.order_by(Job.position).yield_per(500))
+        
         if format_type == 'csv':
             # CSV 格式導出
-            import pandas as pd
-            from io import StringIO
-            
-            if not jobs_data:
+            if not result.jobs_count:
                 return jsonify({'error': '沒有數據可導出'}), 400
             
-            # 轉換為 DataFrame
-            df = pd.DataFrame(jobs_data)
-            
-            # 創建 CSV
-            output = StringIO()
-            df.to_csv(output, index=False, encoding='utf-8')
-            output.seek(0)
-            
-            from flask import make_response
-            response = make_response(output.getvalue())
-            response.headers['Content-Type'] = 'text/csv; charset=utf-8'
-            response.headers['Content-Disposition'] = f'attachment; filename=search_{search_id}.csv'
-            
-            return response
+            return Response(
+                stream_with_context(iter_csv(jobs, bom=False)),
+                mimetype='text/csv',
+                headers={'Content-Disposition': f'attachment; filename=search_{search_id}.csv'}
+            )
             
         else:
             # JSON 格式導出
-            return jsonify({
+            header = {
                 'search_id': search_id,
-                'query': result.query,
+                'query': result.search_query,
                 'site': result.site,
                 'country': result.country,
                 'location': result.location,
                 'created_at': result.created_at.isoformat(),
-                'jobs': jobs_data,
                 'exported_at': datetime.now().isoformat()
-            })
+            }
+            return Response(
+                stream_with_context(iter_json_document(header, jobs, rows_key='jobs')),
+                mimetype='application/json'
+            )
         
     except Exception as e:
         return jsonify({
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+串流匯出
+將職位資料逐批轉為 CSV、JSON、NDJSON 或 Parquet，供 Flask 以生成器回應
+
+設計要點:
+1. 資料以固定批次讀取與序列化，記憶體用量與批次大小成正比，與結果總數無關
+2. 不寫入暫存檔，第一批完成即可開始傳送
+3. 可選的即時 gzip 壓縮（Content-Encoding: gzip）
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import io
+import json
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 匯出為可選功能
+    pa = None
+    pq = None
+
+
+DEFAULT_CHUNK_ROWS = 500
+
+# 職位欄位的 Parquet 型別（未列出的欄位一律為字串）
+JOB_COLUMN_TYPES = {
+    'salary_min': 'float64',
+    'salary_max': 'float64',
+    'is_remote': 'bool',
+}
+
+
+def chunked(rows: Iterable[Dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    """將資料列切成固定大小的批次"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]],
+             transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+             chunk_rows: int = DEFAULT_CHUNK_ROWS,
+             bom: bool = True) -> Iterator[bytes]:
+    """
+    逐批產生 CSV 內容
+
+    Args:
+        rows: 職位字典
+        transform: 每批 DataFrame 的欄位轉換（例如轉為標準格式）
+        chunk_rows: 每批列數
+        bom: 是否在開頭加上 UTF-8 BOM（方便 Excel 開啟）
+    """
+    header = True
+    for chunk in chunked(rows, chunk_rows):
+        frame = pd.DataFrame.from_records(chunk)
+        if transform is not None:
+            frame = transform(frame)
+        text = frame.to_csv(index=False, header=header)
+        if header and bom:
+            text = '\ufeff' + text
+        header = False
+        yield text.encode('utf-8')
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """逐批產生 NDJSON（每行一個職位）"""
+    for chunk in chunked(rows, chunk_rows):
+        yield ''.join(
+            json.dumps(row, ensure_ascii=False, default=str) + '\n' for row in chunk
+        ).encode('utf-8')
+
+
+def iter_json_document(header: Dict[str, Any],
+                       rows: Iterable[Dict[str, Any]],
+                       rows_key: str = 'jobs',
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    逐批產生單一 JSON 物件：header 的欄位加上 rows_key 對應的陣列
+
+    Args:
+        header: 放在陣列之前的欄位（須可 JSON 序列化）
+        rows: 陣列內容
+        rows_key: 陣列欄位名稱
+        chunk_rows: 每批列數
+    """
+    prefix = json.dumps(header, ensure_ascii=False, default=str)[:-1]
+    separator = ', ' if header else ''
+    yield f'{prefix}{separator}{json.dumps(rows_key)}: ['.encode('utf-8')
+
+    first = True
+    for chunk in chunked(rows, chunk_rows):
+        body = ', '.join(json.dumps(row, ensure_ascii=False, default=str) for row in chunk)
+        yield (body if first else ', ' + body).encode('utf-8')
+        first = False
+
+    yield b']}'
+
+
+class _DrainableSink(io.RawIOBase):
+    """收集 ParquetWriter 輸出的位元組，供生成器逐批取出"""
+
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def parquet_available() -> bool:
+    """檢查是否可匯出 Parquet"""
+    return pa is not None
+
+
+def job_parquet_schema(fields: Sequence[str]):
+    """
+    依欄位名稱建立固定的 Parquet 結構（型別見 JOB_COLUMN_TYPES）
+
+    Args:
+        fields: 欄位名稱（通常為 result_store.JOB_FIELDS）
+
+    Raises:
+        RuntimeError: 未安裝 pyarrow
+    """
+    if pa is None:
+        raise RuntimeError('Parquet 匯出需要安裝 pyarrow')
+    return pa.schema([
+        pa.field(name, pa.type_for_alias(JOB_COLUMN_TYPES.get(name, 'string')))
+        for name in fields
+    ])
+
+
+def _coerce(value: Any, arrow_type) -> Any:
+    """將單一值轉為欄位型別；無法轉換的數值寫為空值"""
+    if value is None:
+        return None
+    try:
+        if pa.types.is_floating(arrow_type):
+            return float(value)
+        if pa.types.is_integer(arrow_type):
+            return int(value)
+        if pa.types.is_boolean(arrow_type):
+            if isinstance(value, str):
+                return value.strip().lower() in ('1', 'true', 'yes')
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    if pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _chunk_table(chunk: List[Dict[str, Any]], schema):
+    """以 writer 的結構建立一批資料，型別不符時逐值轉換"""
+    try:
+        return pa.Table.from_pylist(chunk, schema=schema)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        coerced = [
+            {field.name: _coerce(row.get(field.name), field.type) for field in schema}
+            for row in chunk
+        ]
+        return pa.Table.from_pylist(coerced, schema=schema)
+
+
+def iter_parquet(rows: Iterable[Dict[str, Any]],
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 schema=None) -> Iterator[bytes]:
+    """
+    逐批產生 Parquet 檔案內容，每批為一個 row group
+
+    回應標頭送出後無法再回報錯誤，因此所有批次都寫成同一個結構：
+    未指定 schema 時以第一批推斷（全為空值的欄位視為字串），
+    之後與結構不符的值逐值轉換，不會中斷下載
+
+    Args:
+        rows: 職位字典
+        chunk_rows: 每個 row group 的列數
+        schema: 固定的 pyarrow 結構（例如 job_parquet_schema(JOB_FIELDS)）
+
+    Raises:
+        RuntimeError: 未安裝 pyarrow
+    """
+    if pa is None:
+        raise RuntimeError('Parquet 匯出需要安裝 pyarrow')
+
+    sink = _DrainableSink()
+    writer = None
+    try:
+        for chunk in chunked(rows, chunk_rows):
+            if writer is None:
+                if schema is None:
+                    inferred = pa.Table.from_pylist(chunk).schema
+                    schema = pa.schema([
+                        pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                        for field in inferred
+                    ])
+                writer = pq.ParquetWriter(sink, schema, compression='zstd')
+            writer.write_table(_chunk_table(chunk, writer.schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        if writer is not None:
+            writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """將位元組串流即時壓縮為 gzip 格式"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+網頁應用資料模型
+模型與 db 定義於 app.py，此模組供 Blueprint 等子模組匯入使用
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+from .app import db, User, Favorite, SearchResult, Job
+
+__all__ = ['db', 'User', 'Favorite', 'SearchResult', 'Job']
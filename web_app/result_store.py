@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜尋結果儲存
+以記憶體 LRU 作為前端、SQLite 檔案作為後端的搜尋結果儲存層
+
+設計要點:
+1. 每筆搜尋結果以「一列一職位」寫入 SQLite，依 search_id 分組
+2. 記憶體只保留最近使用的結果集，以總列數作為上限，超過即淘汰
+3. 分頁直接以 LIMIT/OFFSET 讀取，不需要載入整個結果集
+4. 資料庫檔案可由多個 gunicorn worker 共用，任一 worker 皆可提供任一頁
+
+Author: jobseeker Team
+Date: 2025-01-27
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# 職位列欄位（順序即 SQLite 欄位順序）
+JOB_FIELDS: Tuple[str, ...] = (
+    'title',
+    'company',
+    'location',
+    'description',
+    'salary_min',
+    'salary_max',
+    'salary_currency',
+    'interval',
+    'date_posted',
+    'job_url',
+    'job_url_direct',
+    'site',
+    'job_type',
+    'is_remote',
+)
+
+
+class SearchResultStore:
+    """搜尋結果儲存（記憶體 LRU + SQLite 溢寫）"""
+
+    def __init__(self,
+                 db_path: Path,
+                 max_memory_rows: int = 5000,
+                 ttl_hours: float = 24.0):
+        """
+        初始化結果儲存
+
+        Args:
+            db_path: SQLite 檔案路徑
+            max_memory_rows: 記憶體前端最多保留的職位列數
+            ttl_hours: 結果保留時數，過期後自動清除
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_memory_rows = max(0, max_memory_rows)
+        self.ttl_seconds = ttl_hours * 3600
+
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]]" = OrderedDict()
+        self._memory_rows = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._init_schema()
+
+    # ==================== 連線與結構 ====================
+
+    def _connection(self) -> sqlite3.Connection:
+        """取得目前執行緒的 SQLite 連線"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """建立資料表"""
+        columns = ', '.join(f'{field}' for field in JOB_FIELDS)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS searches ('
+                'search_id TEXT PRIMARY KEY, '
+                'created_at REAL NOT NULL, '
+                'total INTEGER NOT NULL, '
+                'metadata TEXT NOT NULL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_searches_created_at ON searches(created_at)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS search_jobs ('
+                'search_id TEXT NOT NULL, '
+                'position INTEGER NOT NULL, '
+                f'{columns}, '
+                'PRIMARY KEY (search_id, position)) WITHOUT ROWID'
+            )
+
+    # ==================== 寫入 ====================
+
+    def put(self, search_id: str, jobs: List[Dict[str, Any]], metadata: Dict[str, Any]):
+        """
+        儲存一次搜尋的結果
+
+        Args:
+            search_id: 搜尋 ID
+            jobs: 職位字典列表（欄位見 JOB_FIELDS）
+            metadata: 搜尋資訊（查詢、地點、路由資訊等，須可 JSON 序列化）
+        """
+        created_at = time.time()
+        placeholders = ', '.join('?' for _ in range(len(JOB_FIELDS) + 2))
+        rows = [
+            (search_id, position) + tuple(self._to_column(job.get(field)) for field in JOB_FIELDS)
+            for position, job in enumerate(jobs)
+        ]
+
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM search_jobs WHERE search_id = ?', (search_id,))
+            conn.execute(
+                'INSERT OR REPLACE INTO searches (search_id, created_at, total, metadata) VALUES (?, ?, ?, ?)',
+                (search_id, created_at, len(jobs), json.dumps(metadata, ensure_ascii=False, default=str))
+            )
+            conn.executemany(f'INSERT INTO search_jobs VALUES ({placeholders})', rows)
+
+        self._remember(search_id, dict(metadata, created_at=created_at), list(jobs))
+        self.purge_expired()
+
+    @staticmethod
+    def _to_column(value: Any) -> Any:
+        """將值轉為 SQLite 可儲存的型別"""
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return str(value)
+
+    # ==================== 讀取 ====================
+
+    def exists(self, search_id: str) -> bool:
+        """檢查搜尋結果是否存在"""
+        return self.get_metadata(search_id) is not None
+
+    def get_metadata(self, search_id: str) -> Optional[Dict[str, Any]]:
+        """取得搜尋資訊，包含 total 與 created_at"""
+        with self._lock:
+            entry = self._memory.get(search_id)
+            if entry is not None:
+                self._memory.move_to_end(search_id)
+                return dict(entry[0], total=len(entry[1]))
+
+        row = self._connection().execute(
+            'SELECT created_at, total, metadata FROM searches WHERE search_id = ?', (search_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        metadata = json.loads(row['metadata'])
+        metadata.update(created_at=row['created_at'], total=row['total'])
+        return metadata
+
+    def count(self, search_id: str) -> int:
+        """取得結果集的職位數量"""
+        metadata = self.get_metadata(search_id)
+        return metadata['total'] if metadata else 0
+
+    def get_page(self, search_id: str, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """
+        讀取指定頁的職位
+
+        Args:
+            search_id: 搜尋 ID
+            page: 頁碼（從 1 開始）
+            per_page: 每頁數量
+
+        Returns:
+            該頁的職位字典列表
+        """
+        offset = max(0, (page - 1) * per_page)
+        with self._lock:
+            entry = self._memory.get(search_id)
+            if entry is not None:
+                self._memory.move_to_end(search_id)
+                return entry[1][offset:offset + per_page]
+
+        cursor = self._connection().execute(
+            f'SELECT {", ".join(JOB_FIELDS)} FROM search_jobs '
+            'WHERE search_id = ? ORDER BY position LIMIT ? OFFSET ?',
+            (search_id, per_page, offset)
+        )
+        return [self._row_to_job(row) for row in cursor]
+
+    def iter_rows(self, search_id: str, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        依序逐批讀出整個結果集，記憶體用量與 chunk_size 成正比
+
+        Args:
+            search_id: 搜尋 ID
+            chunk_size: 每批讀取的列數
+        """
+        with self._lock:
+            entry = self._memory.get(search_id)
+        if entry is not None:
+            yield from entry[1]
+            return
+
+        last_position = -1
+        conn = self._connection()
+        while True:
+            rows = conn.execute(
+                f'SELECT position, {", ".join(JOB_FIELDS)} FROM search_jobs '
+                'WHERE search_id = ? AND position > ? ORDER BY position LIMIT ?',
+                (search_id, last_position, chunk_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_job(row)
+            last_position = rows[-1]['position']
+
+    def latest_search_id(self) -> Optional[str]:
+        """取得最近一次搜尋的 ID"""
+        row = self._connection().execute(
+            'SELECT search_id FROM searches ORDER BY created_at DESC LIMIT 1'
+        ).fetchone()
+        return row['search_id'] if row else None
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """將資料列轉為職位字典"""
+        job = {field: row[field] for field in JOB_FIELDS}
+        job['is_remote'] = bool(job['is_remote'])
+        return job
+
+    # ==================== 記憶體前端與清理 ====================
+
+    def _remember(self, search_id: str, metadata: Dict[str, Any], jobs: List[Dict[str, Any]]):
+        """放入記憶體前端，超過列數上限時淘汰最久未使用的結果集"""
+        if len(jobs) > self.max_memory_rows:
+            return
+        with self._lock:
+            previous = self._memory.pop(search_id, None)
+            if previous is not None:
+                self._memory_rows -= len(previous[1])
+            self._memory[search_id] = (metadata, jobs)
+            self._memory_rows += len(jobs)
+            while self._memory_rows > self.max_memory_rows and self._memory:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_rows -= len(evicted)
+
+    def purge_expired(self) -> int:
+        """
+        清除過期的結果集
+
+        Returns:
+            清除的結果集數量
+        """
+        cutoff = time.time() - self.ttl_seconds
+        conn = self._connection()
+        with conn:
+            expired = [row['search_id'] for row in conn.execute(
+                'SELECT search_id FROM searches WHERE created_at < ?', (cutoff,)
+            )]
+            if expired:
+                conn.executemany('DELETE FROM search_jobs WHERE search_id = ?', [(sid,) for sid in expired])
+                conn.executemany('DELETE FROM searches WHERE search_id = ?', [(sid,) for sid in expired])
+
+        with self._lock:
+            for search_id in expired:
+                entry = self._memory.pop(search_id, None)
+                if entry is not None:
+                    self._memory_rows -= len(entry[1])
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得儲存統計"""
+        row = self._connection().execute('SELECT COUNT(*) AS searches FROM searches').fetchone()
+        with self._lock:
+            return {
+                'memory_searches': len(self._memory),
+                'memory_rows': self._memory_rows,
+                'max_memory_rows': self.max_memory_rows,
+                'stored_searches': row['searches'],
+                'db_path': str(self.db_path)
+            }